@@ -0,0 +1,24 @@
+"""add updated_at to form_fields
+
+Revision ID: 2026_10_18_form_fields_updated_at
+Revises: 2026_10_18_tenant_stats
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '2026_10_18_form_fields_updated_at'
+down_revision = '2026_10_18_tenant_stats'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Used as the row version for ETags on the public form-fields endpoint
+    op.execute("ALTER TABLE form_fields ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP")
+
+
+def downgrade():
+    op.drop_column('form_fields', 'updated_at')
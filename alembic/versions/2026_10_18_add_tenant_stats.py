@@ -0,0 +1,45 @@
+"""add tenant stats table
+
+Revision ID: 2026_10_18_tenant_stats
+Revises: 2026_02_22_bank_transfer
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2026_10_18_tenant_stats'
+down_revision = '2026_02_22_bank_transfer'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'tenant_stats',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('tenant_id', sa.String(), nullable=False),
+        sa.Column('total_users', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('active_users', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('pending_users', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_user_activity', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('is_stale', sa.Boolean(), nullable=False, server_default=sa.true()),
+        sa.Column('refreshed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.slug'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_tenant_stats_id'), 'tenant_stats', ['id'], unique=False)
+    op.create_index(op.f('ix_tenant_stats_tenant_id'), 'tenant_stats', ['tenant_id'], unique=True)
+    # Membership lookup used by the grouped stats query
+    op.execute("CREATE INDEX IF NOT EXISTS ix_user_tenants_tenant_active ON user_tenants (tenant_id, is_active)")
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS ix_user_tenants_tenant_active")
+    op.drop_index(op.f('ix_tenant_stats_tenant_id'), table_name='tenant_stats')
+    op.drop_index(op.f('ix_tenant_stats_id'), table_name='tenant_stats')
+    op.drop_table('tenant_stats')
@@ -0,0 +1,30 @@
+"""add app_schema_state for startup schema fingerprints
+
+Revision ID: 2026_10_18_app_schema_state
+Revises: 2026_10_18_perdiem_queue_indexes
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2026_10_18_app_schema_state'
+down_revision = '2026_10_18_perdiem_queue_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'app_schema_state',
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('fingerprint', sa.String(length=64), nullable=False),
+        sa.Column('applied_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade():
+    op.drop_table('app_schema_state')
@@ -0,0 +1,32 @@
+"""rolling summaries for claim conversations
+
+Revision ID: 2026_10_18_claim_conversation_summary
+Revises: 2026_10_18_notification_sync
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2026_10_18_claim_conversation_summary'
+down_revision = '2026_10_18_notification_sync'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('claim_conversations', sa.Column('summary', sa.Text(), nullable=True))
+    op.add_column('claim_conversations', sa.Column('summary_through_id', sa.Integer(), nullable=True))
+    # Recent-history window: WHERE conversation_id = ? AND id > ? ORDER BY id DESC LIMIT n
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_claim_conversation_messages_conversation "
+        "ON claim_conversation_messages (conversation_id, id)"
+    )
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS ix_claim_conversation_messages_conversation")
+    op.drop_column('claim_conversations', 'summary_through_id')
+    op.drop_column('claim_conversations', 'summary')
@@ -0,0 +1,164 @@
+"""cascading, indexed foreign keys for event-owned tables
+
+Revision ID: 2026_10_18_event_cascade_graph
+Revises: 2026_10_18_app_schema_state
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '2026_10_18_event_cascade_graph'
+down_revision = '2026_10_18_app_schema_state'
+branch_labels = None
+depends_on = None
+
+
+# Frozen copy of app.services.event_deletion_service.EVENT_CASCADE_GRAPH and
+# its DDL as of this revision; later changes to the app code must not change
+# what this migration does
+EVENT_CASCADE_GRAPH = [
+    # Owned directly by the event
+    ("event_participants", "event_id", "events"),
+    ("event_agenda", "event_id", "events"),
+    ("event_allocations", "event_id", "events"),
+    ("event_attachments", "event_id", "events"),
+    ("event_badges", "event_id", "events"),
+    ("event_certificates", "event_id", "events"),
+    ("event_items", "event_id", "events"),
+    ("event_welcome_packages", "event_id", "events"),
+    ("event_feedback", "event_id", "events"),
+    ("event_food_menu", "event_id", "events"),
+    ("event_travel_requirements", "event_id", "events"),
+    ("chat_rooms", "event_id", "events"),
+    ("flight_itineraries", "event_id", "events"),
+    ("form_fields", "event_id", "events"),
+    ("passport_records", "event_id", "events"),
+    ("security_briefs", "event_id", "events"),
+    ("security_briefings", "event_id", "events"),
+    ("transport_bookings", "event_id", "events"),
+    ("transport_requests", "event_id", "events"),
+    ("accommodation_allocations", "event_id", "events"),
+    ("vendor_event_accommodations", "event_id", "events"),
+    ("line_manager_recommendations", "event_id", "events"),
+    ("public_registrations", "event_id", "events"),
+    ("registration_idempotency_keys", "event_id", "events"),
+    ("vetting_committees", "event_id", "events"),
+    ("vetting_chat_rooms", "event_id", "events"),
+    ("vetting_member_selections", "event_id", "events"),
+    ("vetting_member_comments", "event_id", "events"),
+    ("vetting_member_submissions", "event_id", "events"),
+    ("event_checkins", "event_id", "events"),
+    ("equipment_requests", "event_id", "events"),
+    ("event_reviews", "event_id", "events"),
+    # Owned by a participant
+    ("accommodation_allocations", "participant_id", "event_participants"),
+    ("event_feedback", "participant_id", "event_participants"),
+    ("form_responses", "registration_id", "event_participants"),
+    ("participant_allocations", "participant_id", "event_participants"),
+    ("participant_badges", "participant_id", "event_participants"),
+    ("participant_certificates", "participant_id", "event_participants"),
+    ("participant_qr_codes", "participant_id", "event_participants"),
+    ("participant_selections", "participant_id", "event_participants"),
+    ("participant_voucher_redemptions", "participant_id", "event_participants"),
+    ("participant_voucher_balances", "participant_id", "event_participants"),
+    ("pending_voucher_redemptions", "participant_id", "event_participants"),
+    ("participant_welcome_deliveries", "participant_id", "event_participants"),
+    ("participant_requirement_status", "participant_id", "event_participants"),
+    ("perdiem_requests", "participant_id", "event_participants"),
+    ("public_registrations", "participant_id", "event_participants"),
+    ("registration_idempotency_keys", "participant_id", "event_participants"),
+    ("room_assignments", "participant_id", "event_participants"),
+    ("vetting_member_selections", "participant_id", "event_participants"),
+    ("vetting_member_comments", "participant_id", "event_participants"),
+    ("event_checkins", "participant_id", "event_participants"),
+    ("equipment_requests", "participant_id", "event_participants"),
+    ("event_reviews", "participant_id", "event_participants"),
+    # Further down the graph
+    ("chat_messages", "chat_room_id", "chat_rooms"),
+    ("vetting_chat_rooms", "chat_room_id", "chat_rooms"),
+    ("vetting_chat_members", "vetting_chat_id", "vetting_chat_rooms"),
+    ("agenda_feedback", "agenda_id", "event_agenda"),
+    ("feedback_responses", "feedback_id", "agenda_feedback"),
+    ("participant_voucher_redemptions", "allocation_id", "event_allocations"),
+    ("participant_voucher_balances", "allocation_id", "event_allocations"),
+    ("pending_voucher_redemptions", "allocation_id", "event_allocations"),
+    ("voucher_venues", "allocation_id", "event_allocations"),
+    ("participant_badges", "event_badge_id", "event_badges"),
+    ("participant_certificates", "event_certificate_id", "event_certificates"),
+    ("participant_allocations", "item_id", "event_items"),
+    ("redemption_logs", "allocation_id", "participant_allocations"),
+    ("participant_welcome_deliveries", "package_item_id", "event_welcome_packages"),
+    ("participant_requirement_status", "requirement_id", "event_travel_requirements"),
+    ("transport_requests", "flight_itinerary_id", "flight_itineraries"),
+    ("form_responses", "field_id", "form_fields"),
+    ("user_brief_acknowledgments", "brief_id", "security_briefs"),
+    ("transport_status_updates", "booking_id", "transport_bookings"),
+    ("perdiem_approval_steps", "perdiem_request_id", "perdiem_requests"),
+    ("participant_selections", "committee_id", "vetting_committees"),
+    ("vetting_chat_rooms", "vetting_committee_id", "vetting_committees"),
+    ("vetting_committee_members", "committee_id", "vetting_committees"),
+    ("vetting_committee_approvers", "committee_id", "vetting_committees"),
+    ("vetting_role_assignments", "committee_id", "vetting_committees"),
+]
+
+CASCADE_DDL = """
+    DO $$
+    DECLARE
+        fk record;
+        column_number smallint;
+    BEGIN
+        IF to_regclass('{child}') IS NULL OR to_regclass('{parent}') IS NULL THEN
+            RETURN;
+        END IF;
+        SELECT attnum INTO column_number FROM pg_attribute
+        WHERE attrelid = '{child}'::regclass AND attname = '{column}' AND NOT attisdropped;
+        IF column_number IS NULL THEN
+            RETURN;
+        END IF;
+
+        FOR fk IN
+            SELECT conname FROM pg_constraint
+            WHERE contype = 'f' AND conrelid = '{child}'::regclass AND confrelid = '{parent}'::regclass
+              AND conkey = ARRAY[column_number] AND confdeltype <> 'c'
+        LOOP
+            EXECUTE format('ALTER TABLE {child} DROP CONSTRAINT %I', fk.conname);
+        END LOOP;
+
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_constraint
+            WHERE contype = 'f' AND conrelid = '{child}'::regclass AND confrelid = '{parent}'::regclass
+              AND conkey = ARRAY[column_number]
+        ) THEN
+            ALTER TABLE {child} ADD CONSTRAINT {child}_{column}_fkey
+                FOREIGN KEY ({column}) REFERENCES {parent}(id) ON DELETE CASCADE NOT VALID;
+            BEGIN
+                ALTER TABLE {child} VALIDATE CONSTRAINT {child}_{column}_fkey;
+            EXCEPTION WHEN foreign_key_violation THEN
+                RAISE NOTICE 'orphaned rows in {child}.{column}; constraint left NOT VALID';
+            END;
+        END IF;
+
+        -- Any index leading with the column serves the cascade lookup
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_index
+            WHERE indrelid = '{child}'::regclass AND indkey[0] = column_number
+        ) THEN
+            CREATE INDEX ix_{child}_{column} ON {child} ({column});
+        END IF;
+    END $$;
+"""
+
+
+def upgrade():
+    # Each statement replaces non-cascading FKs on one edge of EVENT_CASCADE_GRAPH
+    # and indexes the FK column; tables that don't exist are skipped
+    for child, column, parent in EVENT_CASCADE_GRAPH:
+        op.execute(CASCADE_DDL.format(child=child, column=column, parent=parent))
+
+
+def downgrade():
+    # The previous constraints were a mix of NO ACTION/CASCADE with generated
+    # names; cascading FKs and the extra indexes are kept
+    pass
@@ -0,0 +1,23 @@
+"""event check-in stats index
+
+Revision ID: 2026_10_18_event_stats_indexes
+Revises: 2026_10_18_voucher_balances
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '2026_10_18_event_stats_indexes'
+down_revision = '2026_10_18_voucher_balances'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_event_checkins_event_date', 'event_checkins', ['event_id', 'checkin_date'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_event_checkins_event_date', table_name='event_checkins')
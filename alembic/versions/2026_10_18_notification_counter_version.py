@@ -0,0 +1,25 @@
+"""version counter on notification counters
+
+Revision ID: 2026_10_18_notification_counter_version
+Revises: 2026_10_18_tenant_stats_version
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2026_10_18_notification_counter_version'
+down_revision = '2026_10_18_tenant_stats_version'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Bumped by every invalidation; a refresh only clears is_stale when it is unchanged
+    op.add_column('notification_counters', sa.Column('version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade():
+    op.drop_column('notification_counters', 'version')
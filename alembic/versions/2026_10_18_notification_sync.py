@@ -0,0 +1,49 @@
+"""notification delta sync indexes and per-user counters
+
+Revision ID: 2026_10_18_notification_sync
+Revises: 2026_10_18_event_stats_indexes
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2026_10_18_notification_sync'
+down_revision = '2026_10_18_event_stats_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'notification_counters',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('total', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('unread', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('urgent', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('is_stale', sa.Boolean(), nullable=False, server_default=sa.true()),
+        sa.Column('refreshed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_notification_counters_id'), 'notification_counters', ['id'], unique=False)
+    op.create_index(op.f('ix_notification_counters_user_id'), 'notification_counters', ['user_id'], unique=True)
+    # Delta sync walks the user's own rows and the broadcast rows by (updated_at, id)
+    op.execute("CREATE INDEX IF NOT EXISTS ix_notifications_user_updated ON notifications (user_id, updated_at, id)")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_notifications_broadcast_updated "
+        "ON notifications (tenant_id, updated_at, id) WHERE user_id IS NULL"
+    )
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS ix_notifications_broadcast_updated")
+    op.execute("DROP INDEX IF EXISTS ix_notifications_user_updated")
+    op.drop_index(op.f('ix_notification_counters_user_id'), table_name='notification_counters')
+    op.drop_index(op.f('ix_notification_counters_id'), table_name='notification_counters')
+    op.drop_table('notification_counters')
@@ -0,0 +1,28 @@
+"""add per diem approval queue indexes
+
+Revision ID: 2026_10_18_perdiem_queue_indexes
+Revises: 2026_10_18_registration_idempotency
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '2026_10_18_perdiem_queue_indexes'
+down_revision = '2026_10_18_registration_idempotency'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Queue lookups filter on status (and approver for the pending queue), newest first
+    op.execute("CREATE INDEX IF NOT EXISTS ix_perdiem_requests_status_approver ON perdiem_requests (status, approver_email, id)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_perdiem_requests_participant_status ON perdiem_requests (participant_id, status)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_events_tenant_id ON events (tenant_id)")
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS ix_events_tenant_id")
+    op.execute("DROP INDEX IF EXISTS ix_perdiem_requests_participant_status")
+    op.execute("DROP INDEX IF EXISTS ix_perdiem_requests_status_approver")
@@ -0,0 +1,71 @@
+"""add registration idempotency keys and unique public registration email per event
+
+Revision ID: 2026_10_18_registration_idempotency
+Revises: 2026_10_18_form_fields_updated_at
+Create Date: 2026-10-18
+
+"""
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2026_10_18_registration_idempotency'
+down_revision = '2026_10_18_form_fields_updated_at'
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+def upgrade():
+    op.create_table(
+        'registration_idempotency_keys',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('idempotency_key', sa.String(length=255), nullable=False),
+        sa.Column('event_id', sa.Integer(), nullable=False),
+        sa.Column('participant_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['event_id'], ['events.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['participant_id'], ['event_participants.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_registration_idempotency_keys_id'), 'registration_idempotency_keys', ['id'], unique=False)
+    op.create_index(op.f('ix_registration_idempotency_keys_idempotency_key'), 'registration_idempotency_keys', ['idempotency_key'], unique=True)
+
+    # Concurrent duplicate public registrations are rejected by this index.
+    # Other registration paths let one email register once per role, so only
+    # public_form rows are covered. Built CONCURRENTLY so event_participants
+    # stays writable; skipped (not failed) when legacy rows differing only in
+    # email case are in the way
+    conn = op.get_bind()
+    duplicates = conn.execute(sa.text("""
+        SELECT COUNT(*) FROM (
+            SELECT 1 FROM event_participants
+            WHERE invited_by = 'public_form'
+            GROUP BY event_id, lower(email) HAVING COUNT(*) > 1
+        ) duplicates
+    """)).scalar()
+    if duplicates:
+        logger.warning(
+            f"{duplicates} (event, email) pairs are registered more than once through the public form; "
+            f"uq_event_participants_public_email not created"
+        )
+        return
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_event_participants_public_email
+                ON event_participants (event_id, lower(email))
+                WHERE invited_by = 'public_form'
+        """)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS uq_event_participants_public_email")
+    op.drop_index(op.f('ix_registration_idempotency_keys_idempotency_key'), table_name='registration_idempotency_keys')
+    op.drop_index(op.f('ix_registration_idempotency_keys_id'), table_name='registration_idempotency_keys')
+    op.drop_table('registration_idempotency_keys')
@@ -0,0 +1,25 @@
+"""version counter on tenant stats
+
+Revision ID: 2026_10_18_tenant_stats_version
+Revises: 2026_10_18_user_event_access
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2026_10_18_tenant_stats_version'
+down_revision = '2026_10_18_user_event_access'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Bumped by every invalidation; a refresh only clears is_stale when it is unchanged
+    op.add_column('tenant_stats', sa.Column('version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade():
+    op.drop_column('tenant_stats', 'version')
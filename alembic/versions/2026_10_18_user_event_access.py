@@ -0,0 +1,61 @@
+"""user_event_access index of vetting committee members and approvers
+
+Revision ID: 2026_10_18_user_event_access
+Revises: 2026_10_18_claim_conversation_summary
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2026_10_18_user_event_access'
+down_revision = '2026_10_18_claim_conversation_summary'
+branch_labels = None
+depends_on = None
+
+
+BACKFILL = """
+INSERT INTO user_event_access (email, user_id, event_id, committee_id, reason)
+SELECT lower(m.email), m.user_id, c.event_id, c.id, 'committee_member'
+FROM vetting_committee_members m JOIN vetting_committees c ON c.id = m.committee_id
+UNION
+SELECT lower(c.approver_email), c.approver_id, c.event_id, c.id, 'approver'
+FROM vetting_committees c
+WHERE c.approver_email IS NOT NULL OR c.approver_id IS NOT NULL
+UNION
+SELECT lower(a.email), a.user_id, c.event_id, c.id, 'approver'
+FROM vetting_committee_approvers a JOIN vetting_committees c ON c.id = a.committee_id
+"""
+
+
+def upgrade():
+    op.create_table(
+        'user_event_access',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('email', sa.String(length=255), nullable=True),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('event_id', sa.Integer(), nullable=False),
+        sa.Column('committee_id', sa.Integer(), nullable=False),
+        sa.Column('reason', sa.String(length=20), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['event_id'], ['events.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['committee_id'], ['vetting_committees.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_user_event_access_id'), 'user_event_access', ['id'], unique=False)
+    op.create_index(op.f('ix_user_event_access_committee_id'), 'user_event_access', ['committee_id'], unique=False)
+    op.create_index('ix_user_event_access_email_event', 'user_event_access', ['email', 'event_id'], unique=False)
+    op.create_index('ix_user_event_access_user_event', 'user_event_access', ['user_id', 'event_id'], unique=False)
+    op.execute(BACKFILL)
+
+
+def downgrade():
+    op.drop_index('ix_user_event_access_user_event', table_name='user_event_access')
+    op.drop_index('ix_user_event_access_email_event', table_name='user_event_access')
+    op.drop_index(op.f('ix_user_event_access_committee_id'), table_name='user_event_access')
+    op.drop_index(op.f('ix_user_event_access_id'), table_name='user_event_access')
+    op.drop_table('user_event_access')
@@ -0,0 +1,51 @@
+"""materialized participant voucher balances
+
+Revision ID: 2026_10_18_voucher_balances
+Revises: 2026_10_18_event_cascade_graph
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2026_10_18_voucher_balances'
+down_revision = '2026_10_18_event_cascade_graph'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'participant_voucher_balances',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('allocation_id', sa.Integer(), nullable=False),
+        sa.Column('participant_id', sa.Integer(), nullable=False),
+        sa.Column('redeemed_quantity', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('redemption_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_redeemed_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['allocation_id'], ['event_allocations.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['participant_id'], ['event_participants.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('allocation_id', 'participant_id', name='uq_participant_voucher_balances_allocation_participant')
+    )
+    op.create_index(op.f('ix_participant_voucher_balances_id'), 'participant_voucher_balances', ['id'], unique=False)
+    op.create_index(op.f('ix_participant_voucher_balances_participant_id'), 'participant_voucher_balances', ['participant_id'], unique=False)
+
+    op.execute("""
+        INSERT INTO participant_voucher_balances
+            (allocation_id, participant_id, redeemed_quantity, redemption_count, last_redeemed_at)
+        SELECT allocation_id, participant_id, COALESCE(SUM(quantity), 0), COUNT(*), MAX(redeemed_at)
+        FROM participant_voucher_redemptions
+        GROUP BY allocation_id, participant_id
+        ON CONFLICT (allocation_id, participant_id) DO NOTHING
+    """)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_participant_voucher_balances_participant_id'), table_name='participant_voucher_balances')
+    op.drop_index(op.f('ix_participant_voucher_balances_id'), table_name='participant_voucher_balances')
+    op.drop_table('participant_voucher_balances')
@@ -518,6 +518,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func, text
 from app.db.database import get_db
 from app.models.event import Event
+from app.services import event_stats
 
 @api_router.get("/events/{event_id}/accommodation-stats")
 def get_event_accommodation_stats(event_id: int, db: Session = Depends(get_db)):
@@ -530,55 +531,21 @@ def get_event_accommodation_stats(event_id: int, db: Session = Depends(get_db)):
 
     # Get participant statistics during migration period
     try:
-        # Count participants by accommodation preference
-        preference_result = db.execute(text("""
-            SELECT
-                COUNT(*) as total_confirmed,
-                COUNT(CASE WHEN ep.accommodation_preference = 'staying_at_venue' THEN 1 END) as staying_at_venue,
-                COUNT(CASE WHEN ep.accommodation_preference = 'travelling_daily' THEN 1 END) as travelling_daily,
-                COUNT(CASE WHEN ep.accommodation_preference IS NULL OR ep.accommodation_preference = '' THEN 1 END) as not_specified
-            FROM event_participants ep
-            WHERE ep.event_id = :event_id AND ep.status = 'confirmed'
-        """), {"event_id": event_id})
-
-        pref_stats = preference_result.fetchone()
-        total_confirmed = pref_stats.total_confirmed or 0
-        staying_at_venue = pref_stats.staying_at_venue or 0
-        travelling_daily = pref_stats.travelling_daily or 0
-        not_specified = pref_stats.not_specified or 0
-
-        # Count attended participants by accommodation preference
-        attended_result = db.execute(text("""
-            SELECT
-                COUNT(*) as total_attended,
-                COUNT(CASE WHEN ep.accommodation_preference = 'staying_at_venue' THEN 1 END) as attended_staying_at_venue,
-                COUNT(CASE WHEN ep.accommodation_preference = 'travelling_daily' THEN 1 END) as attended_travelling_daily
-            FROM event_participants ep
-            WHERE ep.event_id = :event_id AND ep.status = 'attended'
-        """), {"event_id": event_id})
-
-        attended_stats = attended_result.fetchone()
-        attended_staying_at_venue = attended_stats.attended_staying_at_venue or 0
-        attended_travelling_daily = attended_stats.attended_travelling_daily or 0
-
-        # Try to get actual bookings from accommodation_allocations table
-        booking_result = db.execute(text("""
-            SELECT
-                COUNT(*) as total_bookings,
-                COUNT(CASE WHEN aa.status = 'checked_in' THEN 1 END) as checked_in_visitors,
-                COUNT(CASE WHEN aa.status = 'released' THEN 1 END) as checked_out_visitors
-            FROM accommodation_allocations aa
-            JOIN event_participants ep ON aa.participant_id = ep.id
-            WHERE ep.event_id = :event_id AND aa.status IN ('booked', 'checked_in', 'released')
-        """), {"event_id": event_id})
-
-        booking_stats = booking_result.fetchone()
+        participant_stats = event_stats.get_stats(db, event_id, "participants")
+        booking_stats = event_stats.get_stats(db, event_id, "accommodation")
+
+        total_confirmed = participant_stats["confirmed"]
+        staying_at_venue = participant_stats["confirmed_staying_at_venue"]
+        travelling_daily = participant_stats["confirmed_travelling_daily"]
+        not_specified = participant_stats["confirmed_not_specified"]
+        attended_staying_at_venue = participant_stats["attended_staying_at_venue"]
+        attended_travelling_daily = participant_stats["attended_travelling_daily"]
 
         return {
-            "total_bookings": booking_stats.total_bookings or staying_at_venue,
-            "booked_rooms": booking_stats.total_bookings or staying_at_venue,
-            "checked_in_visitors": booking_stats.checked_in_visitors or 0,
-            "checked_out_visitors": booking_stats.checked_out_visitors or 0,
+            "total_bookings": booking_stats["bookings"] or staying_at_venue,
+            "booked_rooms": booking_stats["bookings"] or staying_at_venue,
+            "checked_in_visitors": booking_stats["checked_in"],
+            "checked_out_visitors": booking_stats["checked_out"],
             # New fields for accommodation preference tally
             "total_confirmed": total_confirmed,
             "staying_at_venue": staying_at_venue,
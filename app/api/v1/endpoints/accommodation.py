@@ -4,11 +4,20 @@ from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
 from app import crud, schemas
 from app.api import deps
+from app.core.cache import cached
 from app.db.database import get_db
 from app.models.user import UserRole
 from app.models.tenant import Tenant
 from sqlalchemy import text
+import logging
 
+logger = logging.getLogger(__name__)
+
+@cached(
+    lambda db, tenant_context, current_user: f"{tenant_context}:{current_user.tenant_id}",
+    name="tenant_id_from_context",
+    tags=lambda db, tenant_context, current_user: [f"tenant:{tenant_context}", f"tenant:{current_user.tenant_id}"],
+)
 def get_tenant_id_from_context(db, tenant_context, current_user):
     """Helper function to get tenant ID from context"""
     if tenant_context and tenant_context.isdigit():
@@ -304,16 +313,16 @@ def create_room_allocation(
     tenant_context: str = Depends(deps.get_tenant_context),
 ) -> Any:
     """Allocate visitor to room with gender validation"""
-    print(f"[DEBUG] DEBUG: ===== ROOM ALLOCATION ENDPOINT REACHED =====")
-    print(f"[DEBUG] DEBUG: Request method: POST")
-    print(f"[DEBUG] DEBUG: Request path: /room-allocations")
-    print(f"[DEBUG] DEBUG: User: {current_user.email}, Tenant: {tenant_context}")
-    print(f"[DEBUG] DEBUG: Allocation data: {allocation_data}")
-    print(f"[DEBUG] DEBUG: User role: {current_user.role}")
+    logger.debug(f"[DEBUG] DEBUG: ===== ROOM ALLOCATION ENDPOINT REACHED =====")
+    logger.debug(f"[DEBUG] DEBUG: Request method: POST")
+    logger.debug(f"[DEBUG] DEBUG: Request path: /room-allocations")
+    logger.debug(f"[DEBUG] DEBUG: User: {current_user.email}, Tenant: {tenant_context}")
+    logger.debug(f"[DEBUG] DEBUG: Allocation data: {allocation_data}")
+    logger.debug(f"[DEBUG] DEBUG: User role: {current_user.role}")
     
     try:
         if current_user.role not in [UserRole.SUPER_ADMIN, UserRole.MT_ADMIN, UserRole.HR_ADMIN]:
-            print(f"[DEBUG] DEBUG: Permission denied for role: {current_user.role}")
+            logger.warning(f"Permission denied for role: {current_user.role}")
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Not enough permissions"
@@ -385,13 +394,11 @@ def create_room_allocation(
         allocation = crud.accommodation_allocation.create_with_tenant(
             db, obj_in=allocation_schema, tenant_id=tenant_id, user_id=current_user.id
         )
-        print(f"[DEBUG] DEBUG: ===== ALLOCATION CREATED SUCCESSFULLY: {allocation.id} =====")
+        logger.debug(f"[DEBUG] DEBUG: ===== ALLOCATION CREATED SUCCESSFULLY: {allocation.id} =====")
         return allocation
 
     except Exception as e:
-        print(f"[DEBUG] DEBUG: Error creating allocation: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"Error creating allocation: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error creating allocation: {str(e)}"
@@ -525,7 +532,7 @@ def create_vendor_allocation(
                 detail=f"Hotel '{vendor.vendor_name}' is not available for this event. Please contact admin to set up accommodation for this event."
             )
         
-        print(f"[HOTEL] VALIDATION: Vendor {vendor.vendor_name} is properly set up for event {event_id}")
+        logger.debug(f"[HOTEL] VALIDATION: Vendor {vendor.vendor_name} is properly set up for event {event_id}")
         
         # Check room availability based on type using event-specific setup
         if room_type == "single":
@@ -534,7 +541,7 @@ def create_vendor_allocation(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=f"No single rooms available at {vendor.vendor_name} for this event"
                 )
-            print(f"[HOTEL] AVAILABILITY: {vendor_event_setup.single_rooms} single rooms available for event {event_id}")
+            logger.debug(f"[HOTEL] AVAILABILITY: {vendor_event_setup.single_rooms} single rooms available for event {event_id}")
         
         else:
             raise HTTPException(
@@ -557,7 +564,7 @@ def create_vendor_allocation(
                     detail=f"Not enough double rooms available at {vendor.vendor_name} for this event. Need {rooms_needed}, have {vendor_event_setup.double_rooms}"
                 )
             vendor_event_setup.double_rooms -= rooms_needed
-            print(f"[HOTEL] BOOKING: Reserved {rooms_needed} double rooms for event {event_id}")
+            logger.debug(f"[HOTEL] BOOKING: Reserved {rooms_needed} double rooms for event {event_id}")
         else:
             # For single rooms, allocate 1 person per room
             if vendor_event_setup.single_rooms < len(participant_ids):
@@ -566,7 +573,7 @@ def create_vendor_allocation(
                     detail=f"Not enough single rooms available at {vendor.vendor_name} for this event. Need {len(participant_ids)}, have {vendor_event_setup.single_rooms}"
                 )
             vendor_event_setup.single_rooms -= len(participant_ids)
-            print(f"[HOTEL] BOOKING: Reserved {len(participant_ids)} single rooms for event {event_id}")
+            logger.debug(f"[HOTEL] BOOKING: Reserved {len(participant_ids)} single rooms for event {event_id}")
         
         for participant_id in participant_ids:
             if participant_id:
@@ -588,7 +595,7 @@ def create_vendor_allocation(
         
         # Commit vendor event setup changes
         db.commit()
-        print(f"[HOTEL] SUCCESS: Updated event setup occupancy to {vendor_event_setup.current_occupants}")
+        logger.debug(f"[HOTEL] SUCCESS: Updated event setup occupancy to {vendor_event_setup.current_occupants}")
         
         # Return serialized response
         if len(allocations) == 1:
@@ -617,10 +624,8 @@ def create_vendor_allocation(
         
     except Exception as e:
         db.rollback()
-        print(f"[HOTEL] ERROR: Failed to create vendor allocation: {str(e)}")
-        print(f"[HOTEL] ERROR: Event ID: {allocation_data.get('event_id')}, Vendor ID: {allocation_data.get('vendor_accommodation_id')}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"[HOTEL] ERROR: Failed to create vendor allocation: {str(e)}")
+        logger.error(f"[HOTEL] ERROR: Event ID: {allocation_data.get('event_id')}, Vendor ID: {allocation_data.get('vendor_accommodation_id')}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error creating vendor allocation: {str(e)}"
@@ -780,30 +785,30 @@ def get_vendor_event_setups(
     tenant_context: str = Depends(deps.get_tenant_context),
 ) -> Any:
     """Get all event setups for a vendor accommodation with event details"""
-    print(f"[HOTEL] DEBUG: ===== GET VENDOR EVENT SETUPS ENDPOINT CALLED =====")
-    print(f"[HOTEL] DEBUG: Vendor ID: {vendor_id}, Tenant: {tenant_context}")
+    logger.debug(f"[HOTEL] DEBUG: ===== GET VENDOR EVENT SETUPS ENDPOINT CALLED =====")
+    logger.debug(f"[HOTEL] DEBUG: Vendor ID: {vendor_id}, Tenant: {tenant_context}")
     tenant_id = get_tenant_id_from_context(db, tenant_context, current_user)
     
     from app.models.guesthouse import VendorEventAccommodation, AccommodationAllocation
     from app.models.event import Event
     
-    print(f"[HOTEL] DEBUG: Querying setups for vendor {vendor_id}, tenant {tenant_id}")
+    logger.debug(f"[HOTEL] DEBUG: Querying setups for vendor {vendor_id}, tenant {tenant_id}")
     setups = db.query(VendorEventAccommodation).filter(
         VendorEventAccommodation.vendor_accommodation_id == vendor_id,
         VendorEventAccommodation.tenant_id == tenant_id,
         VendorEventAccommodation.is_active == True
     ).all()
-    print(f"[HOTEL] DEBUG: Found {len(setups)} setups for vendor {vendor_id}")
+    logger.debug(f"[HOTEL] DEBUG: Found {len(setups)} setups for vendor {vendor_id}")
     
     # Build response with event details and calculate actual occupants
     result = []
-    print(f"[HOTEL] DEBUG: Processing {len(setups)} setups...")
+    logger.debug(f"[HOTEL] DEBUG: Processing {len(setups)} setups...")
     for setup in setups:
-        print(f"[HOTEL] DEBUG: Processing setup {setup.id} for event {setup.event_id}")
+        logger.debug(f"[HOTEL] DEBUG: Processing setup {setup.id} for event {setup.event_id}")
         # Calculate current occupants from actual allocations for this vendor and event
         current_occupants = 0
         if setup.event_id:
-            print(f"[HOTEL] DEBUG: Counting allocations for setup {setup.id}, event {setup.event_id}, vendor {setup.vendor_accommodation_id}")
+            logger.debug(f"[HOTEL] DEBUG: Counting allocations for setup {setup.id}, event {setup.event_id}, vendor {setup.vendor_accommodation_id}")
             # Count allocations for this specific vendor accommodation and event
             allocations_query = db.query(AccommodationAllocation).filter(
                 AccommodationAllocation.event_id == setup.event_id,
@@ -814,23 +819,23 @@ def get_vendor_event_setups(
             )
             allocations_list = allocations_query.all()
             current_occupants = len(allocations_list)
-            print(f"[HOTEL] DEBUG: Found {current_occupants} allocations for setup {setup.id}")
+            logger.debug(f"[HOTEL] DEBUG: Found {current_occupants} allocations for setup {setup.id}")
             for alloc in allocations_list:
-                print(f"[HOTEL] DEBUG: - Allocation {alloc.id}: {alloc.guest_name}, status={alloc.status}")
+                logger.debug(f"[HOTEL] DEBUG: - Allocation {alloc.id}: {alloc.guest_name}, status={alloc.status}")
             
             # Update the setup's current_occupants in the database
             setup.current_occupants = current_occupants
             db.commit()
-            print(f"[HOTEL] DEBUG: Updated setup {setup.id} current_occupants to {current_occupants}")
+            logger.debug(f"[HOTEL] DEBUG: Updated setup {setup.id} current_occupants to {current_occupants}")
         else:
-            print(f"[HOTEL] DEBUG: Setup {setup.id} has no event_id, skipping occupancy calculation")
-            print(f"[HOTEL] DEBUG: Setup {setup.id} event_name: {setup.event_name}")
+            logger.debug(f"[HOTEL] DEBUG: Setup {setup.id} has no event_id, skipping occupancy calculation")
+            logger.debug(f"[HOTEL] DEBUG: Setup {setup.id} event_name: {setup.event_name}")
             # Try to find allocations by event name if no event_id
             if setup.event_name:
                 # Find event by name
                 event = db.query(Event).filter(Event.title == setup.event_name).first()
                 if event:
-                    print(f"[HOTEL] DEBUG: Found event {event.id} for setup {setup.id} by name '{setup.event_name}'")
+                    logger.debug(f"[HOTEL] DEBUG: Found event {event.id} for setup {setup.id} by name '{setup.event_name}'")
                     # Count allocations using the found event_id
                     allocations_query = db.query(AccommodationAllocation).filter(
                         AccommodationAllocation.event_id == event.id,
@@ -841,17 +846,17 @@ def get_vendor_event_setups(
                     )
                     allocations_list = allocations_query.all()
                     current_occupants = len(allocations_list)
-                    print(f"[HOTEL] DEBUG: Found {current_occupants} allocations for setup {setup.id} by event name")
+                    logger.debug(f"[HOTEL] DEBUG: Found {current_occupants} allocations for setup {setup.id} by event name")
                     for alloc in allocations_list:
-                        print(f"[HOTEL] DEBUG: - Allocation {alloc.id}: {alloc.guest_name}, status={alloc.status}")
+                        logger.debug(f"[HOTEL] DEBUG: - Allocation {alloc.id}: {alloc.guest_name}, status={alloc.status}")
                     
                     # Update the setup with the correct event_id and occupants
                     setup.event_id = event.id
                     setup.current_occupants = current_occupants
                     db.commit()
-                    print(f"[HOTEL] DEBUG: Updated setup {setup.id} with event_id {event.id} and {current_occupants} occupants")
+                    logger.debug(f"[HOTEL] DEBUG: Updated setup {setup.id} with event_id {event.id} and {current_occupants} occupants")
                 else:
-                    print(f"[HOTEL] DEBUG: No event found with name '{setup.event_name}' for setup {setup.id}")
+                    logger.debug(f"[HOTEL] DEBUG: No event found with name '{setup.event_name}' for setup {setup.id}")
         
         # Calculate room usage instead of person occupancy
         single_rooms_used = 0
@@ -879,7 +884,7 @@ def get_vendor_event_setups(
             ).count()
             double_rooms_used = (double_allocations + 1) // 2  # Round up for partial room usage
             
-            print(f"[HOTEL] DEBUG: Setup {setup.id} room usage: {single_rooms_used}S used, {double_rooms_used}D used")
+            logger.debug(f"[HOTEL] DEBUG: Setup {setup.id} room usage: {single_rooms_used}S used, {double_rooms_used}D used")
         
         # Calculate remaining capacity
         remaining_single = setup.single_rooms - single_rooms_used
@@ -912,9 +917,9 @@ def get_vendor_event_setups(
                 }
         
         result.append(setup_data)
-        print(f"[HOTEL] DEBUG: Added setup {setup.id} to result with {current_occupants} occupants")
+        logger.debug(f"[HOTEL] DEBUG: Added setup {setup.id} to result with {current_occupants} occupants")
     
-    print(f"[HOTEL] DEBUG: Returning {len(result)} setups for vendor {vendor_id}")
+    logger.debug(f"[HOTEL] DEBUG: Returning {len(result)} setups for vendor {vendor_id}")
     return result
 
 # Dashboard endpoints
@@ -957,10 +962,10 @@ def get_allocations(
 ) -> Any:
     """Get all allocations for tenant with complete related data"""
     try:
-        print(f"[HOTEL] DEBUG: ===== GET ALLOCATIONS ENDPOINT CALLED =====")
-        print(f"[HOTEL] DEBUG: Starting get_allocations for tenant_context: {tenant_context}")
-        print(f"[HOTEL] DEBUG: Event ID filter: {event_id}")
-        print(f"[HOTEL] DEBUG: User: {current_user.email}")
+        logger.debug(f"[HOTEL] DEBUG: ===== GET ALLOCATIONS ENDPOINT CALLED =====")
+        logger.debug(f"[HOTEL] DEBUG: Starting get_allocations for tenant_context: {tenant_context}")
+        logger.debug(f"[HOTEL] DEBUG: Event ID filter: {event_id}")
+        logger.debug(f"[HOTEL] DEBUG: User: {current_user.email}")
         
         from app.models.guesthouse import AccommodationAllocation, Room, GuestHouse, VendorAccommodation
         from app.models.event import Event
@@ -968,7 +973,7 @@ def get_allocations(
         from app.models.user import User
         
         tenant_id = get_tenant_id_from_context(db, tenant_context, current_user)
-        print(f"[HOTEL] DEBUG: Resolved tenant_id: {tenant_id}")
+        logger.debug(f"[HOTEL] DEBUG: Resolved tenant_id: {tenant_id}")
         
         query = db.query(AccommodationAllocation).filter(
             AccommodationAllocation.tenant_id == tenant_id
@@ -976,15 +981,15 @@ def get_allocations(
         
         if event_id:
             query = query.filter(AccommodationAllocation.event_id == event_id)
-            print(f"DEBUG: Filtering by event_id: {event_id}")
+            logger.debug(f"DEBUG: Filtering by event_id: {event_id}")
         
         allocations = query.all()
-        print(f"[HOTEL] DEBUG: Found {len(allocations)} allocations")
-        print(f"[HOTEL] DEBUG: ===== ALLOCATIONS ENDPOINT COMPLETE =====")
+        logger.debug(f"[HOTEL] DEBUG: Found {len(allocations)} allocations")
+        logger.debug(f"[HOTEL] DEBUG: ===== ALLOCATIONS ENDPOINT COMPLETE =====")
         
         result = []
         for allocation in allocations:
-            print(f"DEBUG: Processing allocation {allocation.id}")
+            logger.debug(f"DEBUG: Processing allocation {allocation.id}")
             
             allocation_data = {
                 "id": allocation.id,
@@ -1008,7 +1013,7 @@ def get_allocations(
             
             # Get room data
             if allocation.room_id:
-                print(f"DEBUG: Fetching room data for room_id: {allocation.room_id}")
+                logger.debug(f"DEBUG: Fetching room data for room_id: {allocation.room_id}")
                 room = db.query(Room).filter(Room.id == allocation.room_id).first()
                 if room:
                     guesthouse = db.query(GuestHouse).filter(GuestHouse.id == room.guesthouse_id).first()
@@ -1021,13 +1026,13 @@ def get_allocations(
                             "name": guesthouse.name if guesthouse else "Unknown Guesthouse"
                         }
                     }
-                    print(f"DEBUG: Room data added: {allocation_data['room']}")
+                    logger.debug(f"DEBUG: Room data added: {allocation_data['room']}")
                 else:
-                    print(f"DEBUG: Room not found for room_id: {allocation.room_id}")
+                    logger.warning(f"Room not found for room_id: {allocation.room_id}")
             
             # Get vendor data
             if allocation.vendor_accommodation_id:
-                print(f"DEBUG: Fetching vendor data for vendor_id: {allocation.vendor_accommodation_id}")
+                logger.debug(f"DEBUG: Fetching vendor data for vendor_id: {allocation.vendor_accommodation_id}")
                 vendor = db.query(VendorAccommodation).filter(
                     VendorAccommodation.id == allocation.vendor_accommodation_id
                 ).first()
@@ -1075,25 +1080,25 @@ def get_allocations(
                         "current_occupants": vendor.current_occupants,
                         "roommate_name": roommate_name
                     }
-                    print(f"DEBUG: Vendor data added: {allocation_data['vendor_accommodation']}")
+                    logger.debug(f"DEBUG: Vendor data added: {allocation_data['vendor_accommodation']}")
                 else:
-                    print(f"DEBUG: Vendor not found for vendor_id: {allocation.vendor_accommodation_id}")
+                    logger.warning(f"Vendor not found for vendor_id: {allocation.vendor_accommodation_id}")
             
             # Get event data
             if allocation.event_id:
-                print(f"DEBUG: Fetching event data for event_id: {allocation.event_id}")
+                logger.debug(f"DEBUG: Fetching event data for event_id: {allocation.event_id}")
                 event = db.query(Event).filter(Event.id == allocation.event_id).first()
                 if event:
                     allocation_data["event"] = {
                         "title": event.title
                     }
-                    print(f"DEBUG: Event data added: {allocation_data['event']}")
+                    logger.debug(f"DEBUG: Event data added: {allocation_data['event']}")
                 else:
-                    print(f"DEBUG: Event not found for event_id: {allocation.event_id}")
+                    logger.warning(f"Event not found for event_id: {allocation.event_id}")
             
             # Get participant data with gender from registration
             if allocation.participant_id:
-                print(f"DEBUG: Fetching participant data for participant_id: {allocation.participant_id}")
+                logger.debug(f"DEBUG: Fetching participant data for participant_id: {allocation.participant_id}")
                 participant = db.query(EventParticipant).filter(
                     EventParticipant.id == allocation.participant_id
                 ).first()
@@ -1120,20 +1125,18 @@ def get_allocations(
                         "role": participant.participant_role or participant.role,
                         "gender": gender
                     }
-                    print(f"DEBUG: Participant data added: {allocation_data['participant']}")
+                    logger.debug(f"DEBUG: Participant data added: {allocation_data['participant']}")
                 else:
-                    print(f"DEBUG: Participant not found for participant_id: {allocation.participant_id}")
+                    logger.warning(f"Participant not found for participant_id: {allocation.participant_id}")
             
             result.append(allocation_data)
-            print(f"DEBUG: Completed processing allocation {allocation.id}")
+            logger.debug(f"DEBUG: Completed processing allocation {allocation.id}")
         
-        print(f"[HOTEL] DEBUG: Returning {len(result)} processed allocations")
+        logger.debug(f"[HOTEL] DEBUG: Returning {len(result)} processed allocations")
         return result
         
     except Exception as e:
-        print(f"[HOTEL] DEBUG: Error in get_allocations: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"[HOTEL] Error in get_allocations: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error fetching allocations: {str(e)}"
@@ -1495,8 +1498,8 @@ def get_participant_accommodation(
     """Get accommodation details for a specific participant"""
     # Determine tenant context from headers or user
     tenant_context = x_tenant_context or x_tenant_id or current_user.tenant_id
-    print(f"[DEBUG] DEBUG: get_participant_accommodation - Participant: {participant_id}, Event: {event_id}, User: {current_user.email}, Role: {current_user.role}, Tenant Context: {tenant_context}")
-    print(f"[DEBUG] DEBUG: Headers - X-Tenant-ID: {x_tenant_id}, X-Tenant-Context: {x_tenant_context}")
+    logger.debug(f"[DEBUG] DEBUG: get_participant_accommodation - Participant: {participant_id}, Event: {event_id}, User: {current_user.email}, Role: {current_user.role}, Tenant Context: {tenant_context}")
+    logger.debug(f"[DEBUG] DEBUG: Headers - X-Tenant-ID: {x_tenant_id}, X-Tenant-Context: {x_tenant_context}")
     
     from app.models.guesthouse import AccommodationAllocation, Room, GuestHouse, VendorAccommodation
     from app.models.event_participant import EventParticipant
@@ -1509,24 +1512,24 @@ def get_participant_accommodation(
             event = db.query(Event).filter(Event.id == event_id).first()
             if event:
                 tenant_id = event.tenant_id
-                print(f"[DEBUG] DEBUG: Using event's tenant_id: {tenant_id}")
+                logger.debug(f"[DEBUG] DEBUG: Using event's tenant_id: {tenant_id}")
             else:
-                print(f"[DEBUG] DEBUG: Event {event_id} not found")
+                logger.warning(f"Event {event_id} not found")
                 return []
         else:
             # If no event_id provided, try to get it from tenant context as fallback
             if tenant_context:
                 tenant_id = get_tenant_id_from_context(db, tenant_context, current_user)
-                print(f"[DEBUG] DEBUG: Using fallback tenant_id: {tenant_id}")
+                logger.debug(f"[DEBUG] DEBUG: Using fallback tenant_id: {tenant_id}")
             else:
-                print(f"[DEBUG] DEBUG: No tenant context available")
+                logger.debug(f"[DEBUG] DEBUG: No tenant context available")
                 return []
         
         if not tenant_id:
-            print(f"[DEBUG] DEBUG: No tenant_id available")
+            logger.debug(f"[DEBUG] DEBUG: No tenant_id available")
             return []
         
-        print(f"[DEBUG] DEBUG: Final tenant_id: {tenant_id}, type: {type(tenant_id)}")
+        logger.debug(f"[DEBUG] DEBUG: Final tenant_id: {tenant_id}, type: {type(tenant_id)}")
         
         # Get participant's accommodation allocations
         query = db.query(AccommodationAllocation).filter(
@@ -1538,13 +1541,13 @@ def get_participant_accommodation(
         # Filter by event if provided
         if event_id:
             query = query.filter(AccommodationAllocation.event_id == event_id)
-            print(f"DEBUG: Filtering by event_id: {event_id}")
+            logger.debug(f"DEBUG: Filtering by event_id: {event_id}")
         
         allocations = query.all()
         
-        print(f"DEBUG: Found {len(allocations)} allocations for participant {participant_id}")
+        logger.debug(f"DEBUG: Found {len(allocations)} allocations for participant {participant_id}")
         for i, allocation in enumerate(allocations):
-            print(f"DEBUG: Allocation {i+1}: ID={allocation.id}, Event ID={allocation.event_id}, Type={allocation.accommodation_type}, Status={allocation.status}, room_type={allocation.room_type}, notes={allocation.notes}")
+            logger.debug(f"DEBUG: Allocation {i+1}: ID={allocation.id}, Event ID={allocation.event_id}, Type={allocation.accommodation_type}, Status={allocation.status}, room_type={allocation.room_type}, notes={allocation.notes}")
         
         accommodations = []
         for allocation in allocations:
@@ -1668,8 +1671,8 @@ def get_participant_accommodation(
                 if vendor:
                     # Get roommates for shared vendor rooms
                     roommates = []
-                    print(f"[DEBUG] Checking roommates for allocation {allocation.id}, room_type={allocation.room_type}, participant_id={allocation.participant_id}")
-                    print(f"[DEBUG] Allocation notes: {allocation.notes}")
+                    logger.debug(f"[DEBUG] Checking roommates for allocation {allocation.id}, room_type={allocation.room_type}, participant_id={allocation.participant_id}")
+                    logger.debug(f"[DEBUG] Allocation notes: {allocation.notes}")
 
                     if allocation.room_type == "double":
                         # First try to find roommate from notes (more accurate)
@@ -1680,7 +1683,7 @@ def get_participant_accommodation(
                             match = re.search(r'\(shared with (.+?)\)', allocation.notes)
                             if match:
                                 roommate_from_notes = match.group(1)
-                                print(f"[DEBUG] Found roommate name from notes: {roommate_from_notes}")
+                                logger.debug(f"[DEBUG] Found roommate name from notes: {roommate_from_notes}")
 
                         # Find other allocations for the same event and vendor with double room type
                         other_allocations = db.query(AccommodationAllocation).filter(
@@ -1690,7 +1693,7 @@ def get_participant_accommodation(
                             AccommodationAllocation.id != allocation.id,
                             AccommodationAllocation.status.in_(["booked", "checked_in"])
                         ).all()
-                        print(f"[DEBUG] Found {len(other_allocations)} other double room allocations")
+                        logger.debug(f"[DEBUG] Found {len(other_allocations)} other double room allocations")
 
                         for other_alloc in other_allocations:
                             if other_alloc.participant_id:
@@ -1704,7 +1707,7 @@ def get_participant_accommodation(
                                 """), {"participant_id": other_alloc.participant_id}).fetchone()
 
                                 if roommate_result:
-                                    print(f"[DEBUG] Checking potential roommate: {roommate_result.full_name}")
+                                    logger.debug(f"[DEBUG] Checking potential roommate: {roommate_result.full_name}")
 
                                     # Only add as roommate if:
                                     # 1. Name matches the roommate from notes, OR
@@ -1714,13 +1717,13 @@ def get_participant_accommodation(
                                     # Check if this person is mentioned in our notes
                                     if roommate_from_notes and roommate_result.full_name.lower() == roommate_from_notes.lower():
                                         is_actual_roommate = True
-                                        print(f"[DEBUG] Match found via notes: {roommate_result.full_name}")
+                                        logger.debug(f"[DEBUG] Match found via notes: {roommate_result.full_name}")
 
                                     # Also check if our name is in the other allocation's notes (reverse check)
                                     if not is_actual_roommate and other_alloc.notes:
                                         if allocation.guest_name and allocation.guest_name.lower() in other_alloc.notes.lower():
                                             is_actual_roommate = True
-                                            print(f"[DEBUG] Match found via reverse check: {roommate_result.full_name}")
+                                            logger.debug(f"[DEBUG] Match found via reverse check: {roommate_result.full_name}")
 
                                     if is_actual_roommate:
                                         # Normalize gender
@@ -1739,9 +1742,9 @@ def get_participant_accommodation(
                                             "role": roommate_result.role,
                                             "gender": gender
                                         })
-                                        print(f"[DEBUG] Added roommate: {roommate_result.full_name}, gender: {gender}")
+                                        logger.debug(f"[DEBUG] Added roommate: {roommate_result.full_name}, gender: {gender}")
                                     else:
-                                        print(f"[DEBUG] Not a match: {roommate_result.full_name}")
+                                        logger.debug(f"[DEBUG] Not a match: {roommate_result.full_name}")
                     
                     accommodation_data = {
                         "allocation_id": allocation.id,
@@ -1764,18 +1767,16 @@ def get_participant_accommodation(
                         "description": vendor.description,
                         "roommates": roommates
                     }
-                    print(f"DEBUG: Adding vendor accommodation: {accommodation_data}")
+                    logger.debug(f"DEBUG: Adding vendor accommodation: {accommodation_data}")
                     accommodations.append(accommodation_data)
         
-        print(f"[DEBUG] DEBUG: Returning {len(accommodations)} accommodation details")
+        logger.debug(f"[DEBUG] DEBUG: Returning {len(accommodations)} accommodation details")
         for i, acc in enumerate(accommodations):
-            print(f"[DEBUG] DEBUG: Accommodation {i+1}: {acc['type']} - {acc['name']} - room_type={acc.get('room_type')} - room_capacity={acc.get('room_capacity')} - is_shared={acc.get('is_shared')} - roommates={len(acc.get('roommates', []))}")
+            logger.debug(f"[DEBUG] DEBUG: Accommodation {i+1}: {acc['type']} - {acc['name']} - room_type={acc.get('room_type')} - room_capacity={acc.get('room_capacity')} - is_shared={acc.get('is_shared')} - roommates={len(acc.get('roommates', []))}")
         return accommodations
         
     except Exception as e:
-        print(f"[DEBUG] DEBUG: Error in get_participant_accommodation: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"Error in get_participant_accommodation: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error fetching participant accommodation: {str(e)}"
@@ -1963,9 +1964,9 @@ def update_vendor_event_setup(
                 new_single=setup.single_rooms,
                 new_double=setup.double_rooms
             )
-            print(f"[ACCOMMODATION] Auto re-booking triggered for event {setup.event_id}: {rebook_result}")
+            logger.debug(f"[ACCOMMODATION] Auto re-booking triggered for event {setup.event_id}: {rebook_result}")
         except Exception as e:
-            print(f"[ACCOMMODATION] Auto re-booking failed for event {setup.event_id}: {str(e)}")
+            logger.error(f"[ACCOMMODATION] Auto re-booking failed for event {setup.event_id}: {str(e)}")
 
     # Return setup with rebook info if applicable
     result = setup
@@ -4,7 +4,7 @@ from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import desc
 from typing import List, Optional
-from datetime import datetime
+from datetime import datetime, timedelta
 import logging
 import os
 import io
@@ -21,24 +21,12 @@ from app.schemas.travel_request import (
     TravelRequestSummary, DestinationResponse
 )
 from app.api.deps import get_current_user
+from app.core.service_registry import service_registry
 
-# Azure Blob Storage
-try:
-    from azure.storage.blob import BlobServiceClient, generate_blob_sas, BlobSasPermissions
-    from datetime import timedelta
-    azure_connection_string = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
-    azure_container_name = os.getenv("AZURE_TRAVEL_TICKETS_CONTAINER", "travel-tickets")
-    azure_account_name = os.getenv("AZURE_STORAGE_ACCOUNT_NAME")
-    azure_account_key = os.getenv("AZURE_STORAGE_ACCOUNT_KEY")
-    if azure_connection_string:
-        blob_service_client = BlobServiceClient.from_connection_string(azure_connection_string)
-        azure_available = True
-    else:
-        blob_service_client = None
-        azure_available = False
-except Exception as e:
-    blob_service_client = None
-    azure_available = False
+# Azure Blob Storage (SDK and client are created on first upload)
+azure_container_name = os.getenv("AZURE_TRAVEL_TICKETS_CONTAINER", "travel-tickets")
+azure_account_name = os.getenv("AZURE_STORAGE_ACCOUNT_NAME")
+azure_account_key = os.getenv("AZURE_STORAGE_ACCOUNT_KEY")
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -458,7 +446,8 @@ async def upload_ticket(
             detail="Can only upload tickets for approved travel requests"
         )
 
-    if not azure_available:
+    blob_service_client = service_registry.optional("azure_blob_client")
+    if not blob_service_client:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="File storage service not available"
@@ -486,12 +475,13 @@ async def upload_ticket(
 
         # Generate SAS URL for access
         if azure_account_name and azure_account_key:
-            sas_token = generate_blob_sas(
+            azure_blob = service_registry.get("azure_blob")
+            sas_token = azure_blob.generate_blob_sas(
                 account_name=azure_account_name,
                 container_name=azure_container_name,
                 blob_name=blob_name,
                 account_key=azure_account_key,
-                permission=BlobSasPermissions(read=True),
+                permission=azure_blob.BlobSasPermissions(read=True),
                 expiry=datetime.utcnow() + timedelta(days=365)
             )
             file_url = f"https://{azure_account_name}.blob.core.windows.net/{azure_container_name}/{blob_name}?{sas_token}"
@@ -13,6 +13,7 @@ from app.models.event_participant import EventParticipant
 from app.models.user import User
 from app.schemas.allocation import AllocationCreate, AllocationUpdate, Allocation
 from app.core.email_service import email_service
+from app.services import voucher_ledger
 from app.api.deps import get_current_user
 from datetime import datetime
 
@@ -408,23 +409,16 @@ async def get_participant_voucher_allocations(
 
     allocations = query.all()
 
-    # Get redemptions for this participant
-    from app.models.participant_voucher_redemption import ParticipantVoucherRedemption
+    # Redeemed balances for this participant
+    balances = voucher_ledger.get_balances(db, [allocation.id for allocation in allocations], [participant_id])
 
     voucher_allocations = []
     for allocation in allocations:
-        # Get voucher type and total quantity
-        voucher_type = allocation.voucher_type if allocation.voucher_type else "Drinks"
-        total_quantity = (allocation.vouchers_per_participant if allocation.vouchers_per_participant and allocation.vouchers_per_participant > 0
-                          else allocation.drink_vouchers_per_participant)
-
-        # Get redemptions for this allocation and participant
-        redemptions = db.query(ParticipantVoucherRedemption).filter(
-            ParticipantVoucherRedemption.allocation_id == allocation.id,
-            ParticipantVoucherRedemption.participant_id == participant_id
-        ).all()
+        voucher_type = voucher_ledger.voucher_type(allocation)
+        total_quantity = voucher_ledger.voucher_quantity(allocation)
 
-        total_redeemed = sum(r.quantity for r in redemptions)
+        balance = balances.get((allocation.id, participant_id))
+        total_redeemed = balance.redeemed_quantity if balance else 0
         remaining = total_quantity - total_redeemed
 
         # Get associated venues for this allocation
@@ -452,7 +446,7 @@ async def get_participant_voucher_allocations(
             "total_quantity": total_quantity,
             "redeemed_quantity": max(0, total_redeemed),
             "remaining_quantity": remaining,
-            "allows_over_redemption": voucher_type == "Drinks",
+            "allows_over_redemption": voucher_ledger.allows_over_redemption(allocation),
             "status": allocation.status,
             "created_at": allocation.created_at.isoformat() if allocation.created_at else None,
             "venues": venues  # New: list of valid venues for this allocation
@@ -492,15 +486,7 @@ async def get_participant_allocations(
     for allocation in allocations:
         # Always show drink voucher allocations if they exist
         if hasattr(allocation, 'drink_vouchers_per_participant') and allocation.drink_vouchers_per_participant > 0:
-            # Get participant-specific redemptions from database
-            from app.models.participant_voucher_redemption import ParticipantVoucherRedemption
-            
-            redemptions = db.query(ParticipantVoucherRedemption).filter(
-                ParticipantVoucherRedemption.allocation_id == allocation.id,
-                ParticipantVoucherRedemption.participant_id == participant_id
-            ).all()
-            
-            net_redeemed = sum(r.quantity for r in redemptions)
+            net_redeemed = voucher_ledger.get_redeemed(db, allocation.id, participant_id)
             original_quantity = allocation.drink_vouchers_per_participant
             remaining_quantity = original_quantity - net_redeemed
             
@@ -734,16 +720,10 @@ async def get_voucher_stats(
     total_redeemed_vouchers = 0
     if voucher_allocations:
         try:
-            from app.models.participant_voucher_redemption import ParticipantVoucherRedemption
-            from sqlalchemy import func
-            
-            # Sum all redemptions for all allocations in this event
-            for allocation in voucher_allocations:
-                redeemed_sum = db.query(func.sum(ParticipantVoucherRedemption.quantity)).filter(
-                    ParticipantVoucherRedemption.allocation_id == allocation.id
-                ).scalar() or 0
-                total_redeemed_vouchers += redeemed_sum
-                
+            # Sum all balances for all allocations in this event
+            total_redeemed_vouchers = voucher_ledger.total_redeemed(
+                db, [allocation.id for allocation in voucher_allocations]
+            )
         except Exception as e:
             print(f"Error calculating redeemed vouchers: {e}")
             total_redeemed_vouchers = 0
@@ -1151,28 +1131,11 @@ async def redeem_voucher(
     if not participant_id:
         raise HTTPException(status_code=400, detail="Participant ID is required")
     
-    # Create redemption record
-    from app.models.participant_voucher_redemption import ParticipantVoucherRedemption
-    
-    redemption = ParticipantVoucherRedemption(
-        allocation_id=allocation_id,
-        participant_id=participant_id,
-        quantity=quantity,
-        redeemed_at=datetime.utcnow()
-    )
-    
-    db.add(redemption)
+    # Record the redemption and update the participant's balance
+    net_redeemed = voucher_ledger.redeem(db, allocation, participant_id, quantity)
     db.commit()
-    
-    # Calculate totals for this participant
-    redemptions = db.query(ParticipantVoucherRedemption).filter(
-        ParticipantVoucherRedemption.allocation_id == allocation_id,
-        ParticipantVoucherRedemption.participant_id == participant_id
-    ).all()
-    
-    net_redeemed = sum(r.quantity for r in redemptions)
-    
-    remaining = allocation.drink_vouchers_per_participant - net_redeemed
+
+    remaining = voucher_ledger.voucher_quantity(allocation) - net_redeemed
     
     return {
         "message": "Vouchers redeemed successfully",
@@ -1202,28 +1165,11 @@ async def reassign_voucher(
     if not participant_id:
         raise HTTPException(status_code=400, detail="Participant ID is required")
     
-    # Create negative redemption record (reassignment)
-    from app.models.participant_voucher_redemption import ParticipantVoucherRedemption
-    
-    reassignment = ParticipantVoucherRedemption(
-        allocation_id=allocation_id,
-        participant_id=participant_id,
-        quantity=-quantity,  # Negative for reassignment
-        redeemed_at=datetime.utcnow()
-    )
-    
-    db.add(reassignment)
+    # Negative redemption (reassignment) against the participant's balance
+    net_redeemed = voucher_ledger.redeem(db, allocation, participant_id, -quantity)
     db.commit()
-    
-    # Calculate totals for this participant
-    redemptions = db.query(ParticipantVoucherRedemption).filter(
-        ParticipantVoucherRedemption.allocation_id == allocation_id,
-        ParticipantVoucherRedemption.participant_id == participant_id
-    ).all()
-    
-    net_redeemed = sum(r.quantity for r in redemptions)
-    
-    remaining = allocation.drink_vouchers_per_participant - net_redeemed
+
+    remaining = voucher_ledger.voucher_quantity(allocation) - net_redeemed
     
     return {
         "message": "Vouchers reassigned successfully",
@@ -116,13 +116,18 @@ def auto_book_all_participants(
     current_user = Depends(deps.get_current_user),
     tenant_context: str = Depends(deps.get_tenant_context),
 ) -> Any:
-    """Automatically book accommodation for all confirmed participants who are staying at venue with optimal pairing"""
+    """Automatically book accommodation for all confirmed participants who are staying at venue with optimal pairing.
+
+    The whole event is planned in memory by the room allocation engine and
+    written with a single bulk insert.
+    """
+    from app.services.room_allocation_engine import plan_room_allocations, write_room_plan
 
     tenant_id = get_tenant_id_from_context(db, tenant_context, current_user)
 
     # Get event with accommodation setup
     event_query = text("""
-        SELECT e.id, e.title, e.vendor_accommodation_id, e.start_date, e.end_date,
+        SELECT e.id, e.title, e.vendor_accommodation_id, e.start_date, e.end_date, e.accommodation_type,
                vea.id as accommodation_setup_id, vea.single_rooms, vea.double_rooms
         FROM events e
         LEFT JOIN vendor_event_accommodations vea ON e.id = vea.event_id
@@ -163,68 +168,69 @@ def auto_book_all_participants(
             "travelling_daily_count": travelling_daily_count
         }
     
-    # Group participants by role and gender
-    facilitators = []
-    male_visitors = []
-    female_visitors = []
-    other_visitors = []
-
-    for p in participants:
-        # Check BOTH role fields - if EITHER says facilitator/organizer, they get single room
-        role_value = (p.role or '').lower()
-        participant_role_value = (p.participant_role or '').lower()
-        is_facilitator = role_value in ['facilitator', 'organizer'] or participant_role_value in ['facilitator', 'organizer']
-        if is_facilitator:
-            facilitators.append(p)
-        else:
-            gender = _normalize_gender(p.gender_identity)
-            if gender == 'male':
-                male_visitors.append(p)
-            elif gender == 'female':
-                female_visitors.append(p)
-            else:
-                other_visitors.append(p)
-    
-    results = []
-
-    # Book facilitators in single rooms
-    for facilitator in facilitators:
-        try:
-            result = _book_single_room(db, event, facilitator, tenant_id, current_user.id)
-            results.append({"participant_id": facilitator.id, "participant_name": facilitator.full_name, "status": "success", "result": result, "room_type": "single"})
-        except Exception as e:
-            results.append({"participant_id": facilitator.id, "participant_name": facilitator.full_name, "status": "error", "error": str(e)})
-
-    # Book visitors with optimal pairing - pair same gender visitors into double rooms
-    # Male visitors
-    male_pairs = []
-    for i in range(0, len(male_visitors) - 1, 2):
-        male_pairs.append((male_visitors[i], male_visitors[i + 1]))
-    male_unpaired = male_visitors[-1:] if len(male_visitors) % 2 == 1 else []
-
-    # Female visitors
-    female_pairs = []
-    for i in range(0, len(female_visitors) - 1, 2):
-        female_pairs.append((female_visitors[i], female_visitors[i + 1]))
-    female_unpaired = female_visitors[-1:] if len(female_visitors) % 2 == 1 else []
-
-    # Book paired visitors in double rooms
-    for visitor1, visitor2 in male_pairs + female_pairs:
-        try:
-            result = _book_paired_double_room(db, event, visitor1, visitor2, tenant_id, current_user.id)
-            results.append({"participant_id": visitor1.id, "participant_name": visitor1.full_name, "status": "success", "result": result, "room_type": "double", "paired_with": visitor2.full_name})
-            results.append({"participant_id": visitor2.id, "participant_name": visitor2.full_name, "status": "success", "result": result, "room_type": "double", "paired_with": visitor1.full_name})
-        except Exception as e:
-            results.append({"participant_id": visitor1.id, "participant_name": visitor1.full_name, "status": "error", "error": str(e)})
-            results.append({"participant_id": visitor2.id, "participant_name": visitor2.full_name, "status": "error", "error": str(e)})
-
-    # Book unpaired visitors in single rooms
-    for visitor in male_unpaired + female_unpaired + other_visitors:
-        try:
-            result = _book_single_room(db, event, visitor, tenant_id, current_user.id)
-            results.append({"participant_id": visitor.id, "participant_name": visitor.full_name, "status": "success", "result": result, "room_type": "single"})
-        except Exception as e:
-            results.append({"participant_id": visitor.id, "participant_name": visitor.full_name, "status": "error", "error": str(e)})
+    # Participants that already hold a vendor booking keep it
+    already_booked = {
+        row.participant_id for row in db.execute(text("""
+            SELECT participant_id FROM accommodation_allocations
+            WHERE event_id = :event_id AND accommodation_type = 'vendor'
+            AND status IN ('booked', 'checked_in') AND participant_id IS NOT NULL
+        """), {"event_id": event_id}).fetchall()
+    }
+    # The public_registrations join can repeat a participant; plan each one once
+    to_book = list({p.id: p for p in participants if p.id not in already_booked}.values())
+
+    plan = plan_room_allocations(to_book, event.single_rooms, event.double_rooms)
+
+    results = [
+        {"participant_id": p.id, "participant_name": p.full_name, "status": "skipped", "message": "Participant already has accommodation"}
+        for p in participants if p.id in already_booked
+    ]
+
+    try:
+        booked = write_room_plan(
+            db, plan,
+            event=event,
+            vendor_accommodation_id=event.vendor_accommodation_id,
+            tenant_id=tenant_id,
+            created_by=current_user.id,
+        )
+
+        singles_used = len([room for room in plan["rooms"] if room["room_type"] == "single"])
+        doubles_used = len([room for room in plan["rooms"] if room["room_type"] == "double"])
+        db.execute(text("""
+            UPDATE vendor_event_accommodations
+            SET single_rooms = single_rooms - :singles_used,
+                double_rooms = double_rooms - :doubles_used
+            WHERE id = :accommodation_setup_id
+        """), {
+            "singles_used": singles_used,
+            "doubles_used": doubles_used,
+            "accommodation_setup_id": event.accommodation_setup_id
+        })
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Bulk room booking failed for event {event_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to book rooms: {str(e)}"
+        )
+
+    for entry in booked:
+        participant = entry["participant"]
+        result = {
+            "participant_id": participant.id,
+            "participant_name": participant.full_name,
+            "status": "success",
+            "result": {"allocation_id": entry["allocation_id"]},
+            "room_type": entry["room_type"]
+        }
+        if entry["paired_with"]:
+            result["paired_with"] = entry["paired_with"]
+        results.append(result)
+
+    for participant in plan["unassigned"]:
+        results.append({"participant_id": participant.id, "participant_name": participant.full_name, "status": "error", "error": "No rooms available"})
     
     success_count = len([r for r in results if r["status"] == "success"])
     error_count = len([r for r in results if r["status"] == "error"])
@@ -435,93 +441,6 @@ def _book_single_room(db, event, participant, tenant_id, user_id):
     return {"message": "Single room booked successfully", "allocation_id": allocation.id}
 
 
-def _book_paired_double_room(db, event, visitor1, visitor2, tenant_id, user_id):
-    """Book two visitors together in a double room"""
-    from app import crud
-    from app.schemas.accommodation import AccommodationAllocationCreate
-
-    # Check double room availability
-    vendor_query = text("""
-        SELECT double_rooms FROM vendor_event_accommodations
-        WHERE id = :accommodation_setup_id AND double_rooms > 0
-    """)
-    vendor = db.execute(vendor_query, {"accommodation_setup_id": event.accommodation_setup_id}).fetchone()
-
-    if not vendor:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="No double rooms available"
-        )
-
-    # Get board type from event and rate from vendor
-    board_type = _get_event_board_type(db, event.id)
-    rate_per_day, rate_currency = _get_vendor_rate_for_board_type(db, event.vendor_accommodation_id, board_type)
-
-    import logging
-    logger = logging.getLogger(__name__)
-    logger.info(f"📝 Creating double room allocation for pair: {visitor1.full_name} and {visitor2.full_name}")
-
-    # Create allocation for first visitor (notes include roommate name for matching)
-    allocation_data1 = AccommodationAllocationCreate(
-        guest_name=visitor1.full_name,
-        guest_email=visitor1.email,
-        check_in_date=event.start_date,
-        check_out_date=event.end_date,
-        number_of_guests=2,
-        accommodation_type="vendor",
-        vendor_accommodation_id=event.vendor_accommodation_id,
-        room_type="double",
-        participant_id=visitor1.id,
-        event_id=event.id,
-        board_type=board_type,
-        rate_per_day=rate_per_day,
-        rate_currency=rate_currency,
-        notes=f"Auto-assigned double room (shared with {visitor2.full_name})"
-    )
-
-    allocation1 = crud.accommodation_allocation.create_with_tenant(
-        db, obj_in=allocation_data1, tenant_id=tenant_id, user_id=user_id
-    )
-    logger.info(f"✅ Created allocation {allocation1.id} for {visitor1.full_name}, room_type={allocation1.room_type}")
-
-    # Create allocation for second visitor (notes include roommate name for matching)
-    allocation_data2 = AccommodationAllocationCreate(
-        guest_name=visitor2.full_name,
-        guest_email=visitor2.email,
-        check_in_date=event.start_date,
-        check_out_date=event.end_date,
-        number_of_guests=2,
-        accommodation_type="vendor",
-        vendor_accommodation_id=event.vendor_accommodation_id,
-        room_type="double",
-        participant_id=visitor2.id,
-        event_id=event.id,
-        board_type=board_type,
-        rate_per_day=rate_per_day,
-        rate_currency=rate_currency,
-        notes=f"Auto-assigned double room (shared with {visitor1.full_name})"
-    )
-
-    allocation2 = crud.accommodation_allocation.create_with_tenant(
-        db, obj_in=allocation_data2, tenant_id=tenant_id, user_id=user_id
-    )
-    logger.info(f"✅ Created allocation {allocation2.id} for {visitor2.full_name}, room_type={allocation2.room_type}")
-
-    # Update room count (take 1 double room)
-    db.execute(text("""
-        UPDATE vendor_event_accommodations
-        SET double_rooms = double_rooms - 1
-        WHERE id = :accommodation_setup_id
-    """), {"accommodation_setup_id": event.accommodation_setup_id})
-
-    db.commit()
-
-    return {
-        "message": f"Double room booked for {visitor1.full_name} and {visitor2.full_name}",
-        "allocation_ids": [allocation1.id, allocation2.id]
-    }
-
-
 def _book_visitor_room(db, event, participant, gender, tenant_id, user_id):
     """Book room for visitor - try to match with same gender"""
     from app import crud
@@ -4,7 +4,8 @@ Bulk Badge Generation Endpoint
 Generates multiple badges in a single PDF for printing.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Header
+from fastapi import APIRouter, Depends, HTTPException, Header, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List
 from pydantic import BaseModel
@@ -14,7 +15,8 @@ from app.models.event_badge import EventBadge
 from app.models.event_participant import EventParticipant
 from app.models.event import Event
 from app.services.badge_generation import replace_template_variables
-from io import BytesIO
+from app.services.bulk_badge_printing import chunked, stream_merged_pdf, stream_zip
+from app.services.qr_service import qr_data_uri
 import os
 
 router = APIRouter()
@@ -29,12 +31,11 @@ class BulkBadgeRequest(BaseModel):
 async def generate_bulk_badges(
     event_id: int,
     request: BulkBadgeRequest,
+    format: str = Query("pdf", pattern="^(pdf|zip)$", description="pdf (merged; sent only once complete, memory grows with the batch) or zip (one PDF per chunk, streamed as rendered in bounded memory)"),
     db: Session = Depends(get_db),
     x_tenant_id: str = Header(None)
 ):
-    """Generate multiple badges in a single PDF with 2 badges per page"""
-    from weasyprint import HTML, CSS
-    
+    """Generate multiple badges with 2 badges per page, rendered in parallel chunks"""
     # Get event
     event = db.query(Event).filter(Event.id == event_id).first()
     if not event:
@@ -45,6 +46,8 @@ async def generate_bulk_badges(
     badge_query = text("""
         SELECT 
             eb.id as event_badge_id,
+            bt.id as template_id,
+            bt.updated_at as template_updated_at,
             bt.template_content,
             bt.logo_url,
             eb.template_variables
@@ -59,8 +62,13 @@ async def generate_bulk_badges(
     if not badge_result:
         raise HTTPException(status_code=404, detail="No badge template assigned to this event")
     
-    # Get participants
-    participants = db.query(EventParticipant).filter(
+    # Get participants (plain values only; badges render after the session is released)
+    participants = db.query(
+        EventParticipant.id,
+        EventParticipant.full_name,
+        EventParticipant.badge_name,
+        EventParticipant.role
+    ).filter(
         EventParticipant.id.in_(request.participant_ids),
         EventParticipant.event_id == event_id
     ).all()
@@ -72,69 +80,40 @@ async def generate_bulk_badges(
     template_vars = badge_result.template_variables or {}
     tagline = template_vars.get('tagline', '') or template_vars.get('badgeTagline', '')
     
-    # Build combined HTML with 2 badges per page
-    badges_html = []
-    for participant in participants:
-        template_data = {
-            'participant_name': participant.full_name,
-            'badge_name': participant.badge_name or participant.full_name,
-            'event_name': event.title,
-            'event_dates': f"{event.start_date.strftime('%B %d, %Y')} - {event.end_date.strftime('%B %d, %Y')}",
-            'start_date': event.start_date.strftime('%B %d, %Y'),
-            'end_date': event.end_date.strftime('%B %d, %Y'),
-            'tagline': tagline,
-            'participant_role': participant.role or 'Participant',
-            'logo': badge_result.logo_url or '',
-            'qr_code': f"https://api.qrserver.com/v1/create-qr-code/?size=200x200&data={os.getenv('API_BASE_URL', 'http://localhost:8000')}/api/v1/events/{event_id}/participant/{participant.id}/badge/generate"
-        }
-        badge_html = replace_template_variables(badge_result.template_content, template_data)
-        badges_html.append(f'<div class="badge-container">{badge_html}</div>')
-    
-    # Combine all badges with grid layout
-    combined_html = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <style>
-            @page {{
-                size: A4 landscape;
-                margin: 0;
-            }}
-            body {{
-                margin: 0;
-                padding: 0;
-            }}
-            .badge-container {{
-                width: 50%;
-                height: 100vh;
-                float: left;
-                page-break-inside: avoid;
-            }}
-            .badge-container:nth-child(2n+1) {{
-                page-break-after: avoid;
-            }}
-            .badge-container:nth-child(2n) {{
-                page-break-after: always;
-            }}
-            .badge-container:last-child {{
-                page-break-after: auto;
-            }}
-        </style>
-    </head>
-    <body>
-        {''.join(badges_html)}
-    </body>
-    </html>
-    """
-    
-    # Generate PDF
-    pdf_bytes = HTML(string=combined_html).write_pdf()
-    
-    from fastapi.responses import Response
-    return Response(
-        content=pdf_bytes,
+    event_data = {
+        'event_name': event.title,
+        'event_dates': f"{event.start_date.strftime('%B %d, %Y')} - {event.end_date.strftime('%B %d, %Y')}",
+        'start_date': event.start_date.strftime('%B %d, %Y'),
+        'end_date': event.end_date.strftime('%B %d, %Y'),
+        'tagline': tagline,
+        'logo': badge_result.logo_url or '',
+    }
+    template_content = badge_result.template_content
+    cache_key = ("badge", badge_result.template_id, badge_result.template_updated_at)
+    api_base_url = os.getenv('API_BASE_URL', 'http://localhost:8000')
+
+    def badges():
+        # Built lazily, one chunk at a time, as render workers free up
+        for participant in participants:
+            template_data = {
+                **event_data,
+                'participant_name': participant.full_name,
+                'badge_name': participant.badge_name or participant.full_name,
+                'participant_role': participant.role or 'Participant',
+                # Inlined, so printing makes no request per badge
+                'qr_code': qr_data_uri(f"{api_base_url}/api/v1/events/{event_id}/participant/{participant.id}/badge/generate")
+            }
+            yield replace_template_variables(template_content, template_data, cache_key=cache_key)
+
+    filename = f"bulk-badges-event-{event_id}"
+    if format == "zip":
+        return StreamingResponse(
+            stream_zip(chunked(badges()), filename),
+            media_type="application/zip",
+            headers={"Content-Disposition": f"attachment; filename={filename}.zip"}
+        )
+    return StreamingResponse(
+        stream_merged_pdf(chunked(badges())),
         media_type="application/pdf",
-        headers={
-            "Content-Disposition": f"attachment; filename=bulk-badges-event-{event_id}.pdf"
-        }
+        headers={"Content-Disposition": f"attachment; filename={filename}.pdf"}
     )
@@ -22,34 +22,15 @@ class ImageUrlRequest(BaseModel):
 from app.api.deps import get_current_user
 from app.models.user import User
 
-# Try to import Azure services
-print("🔄 Starting Azure services import...")
-try:
-    from app.services.azure_services import AzureDocumentIntelligenceService, AzureOpenAIService
-    print("✅ Azure services modules imported")
-    document_service = AzureDocumentIntelligenceService()
-    print("✅ Document Intelligence service initialized")
-    openai_service = AzureOpenAIService()
-    print("✅ OpenAI service initialized")
-    azure_available = True
-    print("✅ Azure services imported and initialized successfully")
-except Exception as e:
-    print(f"❌ Failed to import or initialize Azure services: {e}")
-    import traceback
-    print(f"❌ Full traceback: {traceback.format_exc()}")
-    document_service = None
-    openai_service = None
-    azure_available = False
-
-print(f"🔄 Cash claims module loading complete. Azure available: {azure_available}")
+# Azure services are loaded on first use (the SDKs are slow to import)
+from app.core.service_registry import service_registry
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
-print(f"🔄 Cash claims router and logger initialized")
 
-# Initialize Azure services
-# document_service = AzureDocumentIntelligenceService()
-# openai_service = AzureOpenAIService()
+def get_document_service():
+    """Azure Document Intelligence service, or None when the SDK or config is unavailable"""
+    return service_registry.optional("azure_document_intelligence")
 
 @router.get("/", response_model=List[ClaimResponse])
 async def get_user_claims(
@@ -202,7 +183,6 @@ async def cancel_claim_submission(
     
     return claim
 
-print(f"🔄 Defining test endpoint...")
 
 @router.get("/test-endpoint")
 async def test_endpoint():
@@ -218,7 +198,6 @@ async def test_auth_endpoint(current_user: User = Depends(get_current_user)):
     logger.info(f"🎯 TEST AUTH ENDPOINT CALLED - User: {current_user.id}")
     return {"message": "Authentication works!", "user_id": current_user.id, "timestamp": datetime.utcnow().isoformat()}
 
-print(f"🔄 Defining simple GET test endpoint...")
 
 @router.get("/working-test")
 def working_test():
@@ -237,11 +216,12 @@ async def test_receipt_upload(request: dict):
     
     logger.info(f"📷 Image URL: {image_url}")
     
-    if not azure_available or not document_service:
+    document_service = get_document_service()
+    if not document_service:
         return {
             "success": False,
             "message": "Azure Document Intelligence service not available",
-            "azure_available": azure_available
+            "azure_available": False
         }
     
     try:
@@ -268,7 +248,6 @@ def minimal_test_post(data: dict):
     """Absolutely minimal POST test"""
     return {"received": data, "status": "working"}
 
-print(f"🔄 Defining extract_receipt_data endpoint...")
 
 @router.post("/extract-receipt-no-auth")
 async def extract_receipt_data_no_auth(request: ImageUrlRequest):
@@ -277,7 +256,8 @@ async def extract_receipt_data_no_auth(request: ImageUrlRequest):
         logger.info(f"🎯 EXTRACT RECEIPT NO AUTH CALLED")
         logger.info(f"📷 Image URL: {request.image_url}")
 
-        if not azure_available or not document_service:
+        document_service = get_document_service()
+        if not document_service:
             logger.warning("⚠️ Azure Document Intelligence service not available")
             return {
                 "success": False,
@@ -12,15 +12,6 @@ from app.models.certificate_template import CertificateTemplate
 import logging
 from typing import Optional
 from datetime import datetime
-import cloudinary
-import cloudinary.uploader
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.pdfgen import canvas
-from reportlab.lib.units import inch
-from reportlab.lib.colors import black, red
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image
-from reportlab.lib.enums import TA_CENTER, TA_LEFT
 import io
 import os
 
@@ -30,6 +21,14 @@ router = APIRouter()
 
 def generate_certificate_pdf(participant: EventParticipant, event: Event, template_variables: dict) -> bytes:
     """Generate certificate PDF content."""
+    # reportlab is only needed here, import it on first use
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import inch
+    from reportlab.lib.colors import black, red
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+    from reportlab.lib.enums import TA_CENTER
+
     buffer = io.BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=1*inch, bottomMargin=1*inch)
     
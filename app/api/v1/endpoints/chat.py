@@ -1100,6 +1100,8 @@ def mark_room_as_read(
                 Notification.title.like(f"%{room.name}%")
             )
         ).update({"is_read": True})
+        from app import crud
+        crud.notification_counter.mark_stale(db, user_ids=[current_user.id])
         
         db.commit()
         
@@ -1,7 +1,7 @@
 import logging
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.db.database import get_db
@@ -35,6 +35,7 @@ def _get_conversation_service(db: Session, user_id: int):
 @router.post("/chat", response_model=ChatResponse)
 async def chat(
     request: ChatRequest,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -51,6 +52,8 @@ async def chat(
             conversation_id=request.conversation_id,
             image_url=request.image_url,
         )
+        from app.services.claim_agent.conversation_service import refresh_conversation_summary
+        background_tasks.add_task(refresh_conversation_summary, result["conversation_id"])
         return ChatResponse(**result)
     except HTTPException:
         raise
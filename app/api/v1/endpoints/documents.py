@@ -3,30 +3,27 @@ from sqlalchemy.orm import Session
 from app.db.database import get_db
 from app.api.deps import get_current_user
 from app.models.user import User
-import cloudinary
-import cloudinary.uploader
-import cloudinary.utils
 import os
 from dotenv import load_dotenv
 from datetime import datetime, timedelta
-from azure.storage.blob import BlobServiceClient, ContentSettings
 from typing import Optional
+from app.core.metrics import track_outbound
+from app.core.service_registry import service_registry
 
 # Load environment variables
 load_dotenv()
 
 router = APIRouter()
 
-# Configure Cloudinary (for logos and avatars)
+# Cloudinary (logos and avatars) and Azure Storage (documents) SDKs are
+# loaded and configured on first use
 CLOUDINARY_CLOUD_NAME = os.getenv("CLOUDINARY_CLOUD_NAME")
-CLOUDINARY_API_KEY = os.getenv("CLOUDINARY_API_KEY")
-CLOUDINARY_API_SECRET = os.getenv("CLOUDINARY_API_SECRET")
 
-cloudinary.config(
-    cloud_name=CLOUDINARY_CLOUD_NAME,
-    api_key=CLOUDINARY_API_KEY,
-    api_secret=CLOUDINARY_API_SECRET
-)
+def _cloudinary():
+    return service_registry.get("cloudinary")
+
+def _azure_blob():
+    return service_registry.get("azure_blob")
 
 # Configure Azure Storage (for documents)
 AZURE_STORAGE_CONNECTION_STRING = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
@@ -67,7 +64,7 @@ async def upload_document(
         file_content = await file.read()
 
         # Create blob service client
-        blob_service_client = BlobServiceClient.from_connection_string(AZURE_STORAGE_CONNECTION_STRING)
+        blob_service_client = _azure_blob().BlobServiceClient.from_connection_string(AZURE_STORAGE_CONNECTION_STRING)
         
         # Use msafiri-documents container for all documents
         container_name = 'msafiri-documents'
@@ -93,7 +90,7 @@ async def upload_document(
         blob_client.upload_blob(
             file_content, 
             overwrite=True, 
-            content_settings=ContentSettings(content_type='application/pdf')
+            content_settings=_azure_blob().ContentSettings(content_type='application/pdf')
         )
         
         # Generate blob URL
@@ -144,14 +141,15 @@ async def upload_logo(
         file_obj.name = file.filename
 
         # Upload logo to Cloudinary
-        result = cloudinary.uploader.upload(
-            file_obj,
-            folder="msafiri-documents/logos",
-            resource_type="image",
-            use_filename=True,
-            unique_filename=True,
-            overwrite=False
-        )
+        with track_outbound("cloudinary"):
+            result = _cloudinary().uploader.upload(
+                file_obj,
+                folder="msafiri-documents/logos",
+                resource_type="image",
+                use_filename=True,
+                unique_filename=True,
+                overwrite=False
+            )
 
         print(f"DEBUG: Logo upload successful: {result['secure_url']}")
 
@@ -178,7 +176,7 @@ async def generate_signed_url(
         # Generate authenticated signed URL that expires in 7 days
         expiration_time = int((datetime.now() + timedelta(days=7)).timestamp())
 
-        authenticated_url = cloudinary.utils.private_download_url(
+        authenticated_url = _cloudinary().utils.private_download_url(
             public_id,
             format="pdf",
             resource_type="raw",
@@ -205,7 +203,7 @@ async def delete_document(
 
     try:
         # Create blob service client
-        blob_service_client = BlobServiceClient.from_connection_string(AZURE_STORAGE_CONNECTION_STRING)
+        blob_service_client = _azure_blob().BlobServiceClient.from_connection_string(AZURE_STORAGE_CONNECTION_STRING)
         container_client = blob_service_client.get_container_client(AZURE_STORAGE_CONTAINER_NAME)
         blob_client = container_client.get_blob_client(public_id)
         
@@ -225,7 +223,7 @@ async def delete_logo(
 ):
     """Delete logo from Cloudinary"""
     try:
-        result = cloudinary.uploader.destroy(public_id, resource_type="image")
+        result = _cloudinary().uploader.destroy(public_id, resource_type="image")
         if result["result"] == "ok":
             return {"success": True, "message": "Logo deleted successfully"}
         else:
@@ -249,7 +247,7 @@ async def delete_event_attachment(
             )
 
         # Create blob service client
-        blob_service_client = BlobServiceClient.from_connection_string(AZURE_STORAGE_CONNECTION_STRING)
+        blob_service_client = _azure_blob().BlobServiceClient.from_connection_string(AZURE_STORAGE_CONNECTION_STRING)
         container_client = blob_service_client.get_container_client('msafiri-documents')
         blob_client = container_client.get_blob_client(public_id)
         
@@ -292,7 +290,7 @@ async def upload_avatar(
         file_content = await file.read()
 
         # Create blob service client
-        blob_service_client = BlobServiceClient.from_connection_string(AZURE_STORAGE_CONNECTION_STRING)
+        blob_service_client = _azure_blob().BlobServiceClient.from_connection_string(AZURE_STORAGE_CONNECTION_STRING)
         
         # Use msafiri-documents container for all documents
         container_name = 'msafiri-documents'
@@ -318,7 +316,7 @@ async def upload_avatar(
         blob_client.upload_blob(
             file_content, 
             overwrite=True, 
-            content_settings=ContentSettings(content_type=file.content_type)
+            content_settings=_azure_blob().ContentSettings(content_type=file.content_type)
         )
         
         # Generate blob URL
@@ -370,7 +368,7 @@ async def upload_template_assets(
         file_content = await file.read()
 
         # Create blob service client
-        blob_service_client = BlobServiceClient.from_connection_string(AZURE_STORAGE_CONNECTION_STRING)
+        blob_service_client = _azure_blob().BlobServiceClient.from_connection_string(AZURE_STORAGE_CONNECTION_STRING)
         
         # Use msafiri-documents container for all documents
         container_name = 'msafiri-documents'
@@ -396,7 +394,7 @@ async def upload_template_assets(
         blob_client.upload_blob(
             file_content, 
             overwrite=True, 
-            content_settings=ContentSettings(content_type=file.content_type)
+            content_settings=_azure_blob().ContentSettings(content_type=file.content_type)
         )
         
         # Generate blob URL
@@ -448,7 +446,7 @@ async def upload_receipt(
         file_content = await file.read()
 
         # Create blob service client
-        blob_service_client = BlobServiceClient.from_connection_string(AZURE_STORAGE_CONNECTION_STRING)
+        blob_service_client = _azure_blob().BlobServiceClient.from_connection_string(AZURE_STORAGE_CONNECTION_STRING)
         
         # Use msafiri-documents container with receipts folder
         container_name = 'msafiri-documents'
@@ -474,7 +472,7 @@ async def upload_receipt(
         blob_client.upload_blob(
             file_content, 
             overwrite=True, 
-            content_settings=ContentSettings(content_type=file.content_type)
+            content_settings=_azure_blob().ContentSettings(content_type=file.content_type)
         )
         
         # Generate blob URL
@@ -521,7 +519,7 @@ async def upload_event_attachment(
         file_content = await file.read()
 
         # Create blob service client
-        blob_service_client = BlobServiceClient.from_connection_string(AZURE_STORAGE_CONNECTION_STRING)
+        blob_service_client = _azure_blob().BlobServiceClient.from_connection_string(AZURE_STORAGE_CONNECTION_STRING)
         
         # Use msafiri-documents container for all documents
         container_name = 'msafiri-documents'
@@ -547,7 +545,7 @@ async def upload_event_attachment(
         blob_client.upload_blob(
             file_content, 
             overwrite=True, 
-            content_settings=ContentSettings(content_type=file.content_type)
+            content_settings=_azure_blob().ContentSettings(content_type=file.content_type)
         )
         
         # Generate blob URL
@@ -6,8 +6,7 @@ from app.api import deps
 from app.db.database import get_db
 from app.models.event_attachment import EventAttachment
 from pydantic import BaseModel
-import cloudinary
-import cloudinary.uploader
+from app.core.service_registry import service_registry
 import os
 
 router = APIRouter()
@@ -116,7 +115,7 @@ def delete_attachment(
     if attachment.public_id:
         try:
             resource_type = attachment.resource_type or "raw"
-            cloudinary.uploader.destroy(attachment.public_id, resource_type=resource_type)
+            service_registry.get("cloudinary").uploader.destroy(attachment.public_id, resource_type=resource_type)
         except Exception as e:
             print(f"Warning: Failed to delete from Cloudinary: {str(e)}")
     
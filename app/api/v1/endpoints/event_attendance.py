@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func, desc
+from sqlalchemy import and_, desc
 from typing import List
 from datetime import datetime, date
 import base64
@@ -10,6 +10,7 @@ from app.models.event_attendance import EventCheckin, EquipmentRequest, EventRev
 from app.models.event_participant import EventParticipant
 from app.models.participant_qr import ParticipantQR
 from app.models.event import Event
+from app.services import event_stats
 from app.schemas.event_attendance import (
     EventCheckinCreate, EventCheckin as CheckinSchema,
     EquipmentRequestCreate, EquipmentRequest as RequestSchema,
@@ -135,37 +136,15 @@ def get_attendance_stats(
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
-    # Get total participants
-    total_participants = db.query(EventParticipant).filter(
-        EventParticipant.event_id == event_id
-    ).count()
-    
-    # Get total unique check-ins
-    total_checkins = db.query(EventCheckin.participant_id).filter(
-        EventCheckin.event_id == event_id
-    ).distinct().count()
-    
-    # Get daily check-ins
-    daily_checkins = db.query(
-        EventCheckin.checkin_date,
-        func.count(EventCheckin.id).label('count')
-    ).filter(
-        EventCheckin.event_id == event_id
-    ).group_by(EventCheckin.checkin_date).all()
-    
-    daily_data = [
-        {"date": str(date), "checkins": count}
-        for date, count in daily_checkins
-    ]
-    
-    # Get badges printed
-    badges_printed = db.query(EventCheckin).filter(
-        and_(
-            EventCheckin.event_id == event_id,
-            EventCheckin.badge_printed == True
-        )
-    ).count()
-    
+    participant_stats = event_stats.get_stats(db, event_id, "participants")
+    checkin_stats = event_stats.get_stats(db, event_id, "checkins")
+
+    total_participants = participant_stats["registered"]
+    # Unique participants checked in on any day
+    total_checkins = checkin_stats["participants"]
+    daily_data = checkin_stats["daily"]
+    badges_printed = checkin_stats["badges_printed"]
+
     attendance_rate = (total_checkins / total_participants * 100) if total_participants > 0 else 0
     
     return AttendanceStats(
@@ -13,13 +13,58 @@ from app.models.certificate_template import CertificateTemplate
 from app.models.badge_template import BadgeTemplate
 from app.schemas.event_certificate import EventCertificateCreate, EventCertificateUpdate, EventCertificateResponse, ParticipantCertificateResponse, AssignCertificatesRequest
 from app.schemas.event_badge import EventBadgeCreate, EventBadgeUpdate, EventBadgeResponse, ParticipantBadgeResponse
-import qrcode
-from io import BytesIO
-import base64
+from app.services.qr_service import qr_data_uri
+from app.services.template_engine import CompiledTemplate, compile_template
 import os
 
 router = APIRouter()
 
+BADGE_SIZE_MULTIPLIERS = {
+    'small': 0.75,
+    'standard': 1.0,
+    'large': 1.25
+}
+
+
+def _badge_sizing(size_multiplier: float):
+    """Template preparation scaling the default badge dimensions in the template CSS"""
+    def resize(html_content: str) -> str:
+        width = int(280 * size_multiplier)
+        height = int(450 * size_multiplier)
+        red_height = int(273 * size_multiplier)
+        white_height = int(177 * size_multiplier)
+        html_content = html_content.replace('width: 280px;', f'width: {width}px;')
+        html_content = html_content.replace('height: 450px;', f'height: {height}px;')
+        html_content = html_content.replace('height: 273px;', f'height: {red_height}px;')
+        html_content = html_content.replace('height: 177px;', f'height: {white_height}px;')
+        html_content = html_content.replace('top: 273px;', f'top: {red_height}px;')
+        return html_content
+    return resize
+
+
+def _compiled_template(template, kind: str, size_multiplier: float = None) -> CompiledTemplate:
+    """Template parsed once per template id and version (and badge size)"""
+    cache_key = (kind, template.id, template.updated_at, size_multiplier)
+    prepare = _badge_sizing(size_multiplier) if size_multiplier is not None else None
+    return compile_template(template.template_content or '', cache_key, prepare=prepare)
+
+
+def _placeholder_values(compiled: CompiledTemplate, variables: dict) -> dict:
+    """Every {{placeholder}} in the template, empty when there is no variable for it"""
+    return {
+        name: variables.get(name, '')
+        for name in compiled.placeholders
+        if not name.startswith('#each ')
+    }
+
+
+def _list_block_html(value: str, item_style: str = '', list_style: str = '') -> str:
+    """Course objectives/contents as a list; rich-text HTML is used as-is"""
+    if '<li>' in value or '<p>' in value:
+        return value
+    items = '\n'.join([f'<li{item_style}>{line.strip()}</li>' for line in value.split('\n') if line.strip()])
+    return f'<ul{list_style}>{items}</ul>'
+
 @router.get("/{event_id}/certificates", response_model=List[EventCertificateResponse])
 def get_event_certificates(
     event_id: int,
@@ -362,32 +407,15 @@ def generate_participant_certificate(
             'certificateDate': template_vars.get('certificateDate', datetime.now().strftime('%B %d, %Y')),
             'certificate_date': template_vars.get('certificateDate', datetime.now().strftime('%B %d, %Y')),
         })
-    # Use template content exactly as stored in database
-    html_content = template.template_content or ''
-
     # Apply dynamic sizing for badges
+    size_multiplier = None
     if is_badge and hasattr(template, 'badge_size'):
-        size_multiplier = {
-            'small': 0.75,
-            'standard': 1.0,
-            'large': 1.25
-        }.get(template.badge_size, 1.0)
-
-        base_width = 280
-        base_height = 450
-        width = int(base_width * size_multiplier)
-        height = int(base_height * size_multiplier)
-        red_height = int(273 * size_multiplier)
-        white_height = int(177 * size_multiplier)
-
+        size_multiplier = BADGE_SIZE_MULTIPLIERS.get(template.badge_size, 1.0)
         print(f"[SIZE] Badge size: {template.badge_size}")
-        print(f"[SIZE] Dimensions: {width}px x {height}px (multiplier: {size_multiplier}x)")
+        print(f"[SIZE] Dimensions: {int(280 * size_multiplier)}px x {int(450 * size_multiplier)}px (multiplier: {size_multiplier}x)")
 
-        html_content = html_content.replace('width: 280px;', f'width: {width}px;')
-        html_content = html_content.replace('height: 450px;', f'height: {height}px;')
-        html_content = html_content.replace('height: 273px;', f'height: {red_height}px;')
-        html_content = html_content.replace('height: 177px;', f'height: {white_height}px;')
-        html_content = html_content.replace('top: 273px;', f'top: {red_height}px;')
+    # Template content as stored in database, parsed once per template version
+    compiled = _compiled_template(template, template_type, size_multiplier)
 
     # Get all template variables dynamically
     all_variables = template_vars.copy() if template_vars else {}
@@ -406,132 +434,79 @@ def generate_participant_certificate(
         'certificateDate': template_vars.get('certificateDate', datetime.now().strftime('%B %d, %Y')),
     })
 
-    # Handle special placeholders FIRST before general variable replacement
+    # Special placeholders take precedence over template variables
     # For certificates, use larger logo sizes that match typical certificate designs
-    if '{{logo}}' in html_content:
+    special_values = {}
+    if 'logo' in compiled.placeholders:
         if is_badge:
             # For badges, use smaller logo
             logo_html = f'<img src="{template.logo_url}" alt="Logo" style="max-width: 80px; max-height: 40px; object-fit: contain;" />' if template.logo_url else ''
         else:
             # For certificates, use larger logo to match design templates
             logo_html = f'<img src="{template.logo_url}" alt="Organization Logo" style="max-height: 100px; max-width: 300px; display: block; margin: 0 auto;" />' if template.logo_url else ''
-        html_content = html_content.replace('{{logo}}', logo_html)
+        special_values['logo'] = logo_html
         print(f"[LOGO] Logo replaced with: {template.logo_url}")
 
-    if '{{participantAvatar}}' in html_content:
-        avatar_html = f'<img src="{template.avatar_url}" alt="Avatar" class="avatar" />' if template.avatar_url else ''
-        html_content = html_content.replace('{{participantAvatar}}', avatar_html)
+    if 'participantAvatar' in compiled.placeholders:
+        special_values['participantAvatar'] = f'<img src="{template.avatar_url}" alt="Avatar" class="avatar" />' if template.avatar_url else ''
         print(f"[BADGE] Avatar replaced with: {template.avatar_url}")
 
     # Generate QR code for certificates (same URL as generation endpoint)
-    if '{{qrCode}}' in html_content or not is_badge:
+    if 'qrCode' in compiled.placeholders or not is_badge:
         # Create public certificate URL
         api_url = os.getenv('NEXT_PUBLIC_API_URL', 'http://localhost:8000')
         cert_url = f"{api_url}/api/v1/events/{event_id}/certificates/{certificate_id}/generate/{participant_id}"
 
-        # Generate QR code
-        qr = qrcode.QRCode(version=1, box_size=10, border=2)
-        qr.add_data(cert_url)
-        qr.make(fit=True)
-        qr_img = qr.make_image(fill_color="black", back_color="white")
-
-        # Convert to base64
-        buffer = BytesIO()
-        qr_img.save(buffer, format='PNG')
-        qr_base64 = base64.b64encode(buffer.getvalue()).decode()
-        qr_img_tag = f'<img src="data:image/png;base64,{qr_base64}" alt="QR Code" style="width: 80px; height: 80px; object-fit: contain;" />'
+        qr_img_tag = f'<img src="{qr_data_uri(cert_url)}" alt="QR Code" style="width: 80px; height: 80px; object-fit: contain;" />'
 
         # Replace QR code placeholder
-        html_content = html_content.replace('{{qrCode}}', qr_img_tag)
+        special_values['qrCode'] = qr_img_tag
         print(f"[QR] QR code generated for certificate URL: {cert_url}")
 
     # Generate QR code for badge - ALWAYS if this is a badge
+    badge_qr_img_tag = None
     if is_badge:
         # Create public badge URL using NEW badge-specific endpoint
         api_url = os.getenv('NEXT_PUBLIC_API_URL', 'http://localhost:8000')
         badge_url = f"{api_url}/api/v1/events/{event_id}/badges/{certificate_id}/generate/{participant_id}"
 
-        # Generate QR code
-        qr = qrcode.QRCode(version=1, box_size=10, border=2)
-        qr.add_data(badge_url)
-        qr.make(fit=True)
-        qr_img = qr.make_image(fill_color="black", back_color="white")
-
-        # Convert to base64
-        buffer = BytesIO()
-        qr_img.save(buffer, format='PNG')
-        qr_base64 = base64.b64encode(buffer.getvalue()).decode()
-        qr_img_tag = f'<img src="data:image/png;base64,{qr_base64}" alt="QR Code" style="width: 100%; height: 100%; object-fit: contain;" />'
-
-        # Replace all possible QR placeholders
-        html_content = html_content.replace('{{qrCode}}', qr_img_tag)
-        html_content = html_content.replace('>QR</div>', f'>{qr_img_tag}</div>')
-        # Also try direct text replacement
-        import re
-        html_content = re.sub(r'<div class="qr-code">QR</div>', f'<div class="qr-code">{qr_img_tag}</div>', html_content)
+        badge_qr_img_tag = f'<img src="{qr_data_uri(badge_url)}" alt="QR Code" style="width: 100%; height: 100%; object-fit: contain;" />'
+        special_values.setdefault('qrCode', badge_qr_img_tag)
 
         print(f"[QR] QR code generated for URL: {badge_url}")
-        print(f"[QR] QR replacements made in HTML")
 
     # Handle logo watermark placeholder (typically used on second page of certificates)
-    if '{{logoWatermark}}' in html_content:
-        watermark_html = f'<img src="{template.logo_url}" alt="Watermark" style="max-width: 400px; max-height: 400px;" />' if template.logo_url else ''
-        html_content = html_content.replace('{{logoWatermark}}', watermark_html)
+    if 'logoWatermark' in compiled.placeholders:
+        special_values['logoWatermark'] = f'<img src="{template.logo_url}" alt="Watermark" style="max-width: 400px; max-height: 400px;" />' if template.logo_url else ''
         print(f"[LOGO] Logo watermark replaced with: {template.logo_url}")
 
-    # Find all remaining placeholders in the template
-    import re
-    placeholders = re.findall(r'{{(\w+)}}', html_content)
-
-    # Replace all variables found in template
-    print(f"\n[FIND] Step 8: Replacing template variables...")
-    print(f"   Variables to replace: {list(all_variables.keys())[:10]}... ({len(all_variables)} total)")
-    print(f"   Placeholders found in template: {placeholders[:10]}... ({len(placeholders)} total)")
-
-    for placeholder in placeholders:
-        value = all_variables.get(placeholder, '')
-        html_content = html_content.replace(f'{{{{{placeholder}}}}}', str(value))
-    
     # Handle Handlebars {{#each}} blocks for lists
     # The frontend sends HTML from Rich Text Editor, so we handle both HTML and plain text
-
-    # Replace {{#each courseObjectives}} with actual list items
     objectives = template_vars.get('courseObjectives', '')
-    print(f"[FIND] DEBUG: Course objectives raw value: '{objectives[:100] if objectives else 'EMPTY'}'")
     if objectives:
-        # Check if it's already HTML or plain text
-        if '<li>' in objectives or '<p>' in objectives:
-            # Already HTML from Rich Text Editor - use as-is but extract content
-            objectives_html = objectives
-        else:
-            # Plain text - convert to list items
-            objectives_html = '\n'.join([f'<li style="margin-bottom: 4px;">{obj.strip()}</li>' for obj in objectives.split('\n') if obj.strip()])
-            objectives_html = f'<ul style="font-size: 11px; line-height: 1.6; color: #333; padding-left: 20px;">{objectives_html}</ul>'
-
-        objectives_pattern = r'{{#each courseObjectives}}.*?{{/each}}'
-        html_content = re.sub(objectives_pattern, objectives_html, html_content, flags=re.DOTALL | re.IGNORECASE)
-        print(f"[FIND] DEBUG: Course objectives pattern replaced")
-    else:
-        print("[FIND] DEBUG: No course objectives found")
-
-    # Replace {{#each courseContents}} with actual list items
+        special_values['#each courseObjectives'] = _list_block_html(
+            objectives,
+            item_style=' style="margin-bottom: 4px;"',
+            list_style=' style="font-size: 11px; line-height: 1.6; color: #333; padding-left: 20px;"'
+        )
     contents = template_vars.get('courseContents', '')
-    print(f"[FIND] DEBUG: Course contents raw value: '{contents[:100] if contents else 'EMPTY'}'")
     if contents:
-        # Check if it's already HTML or plain text
-        if '<li>' in contents or '<p>' in contents:
-            # Already HTML from Rich Text Editor - use as-is
-            contents_html = contents
-        else:
-            # Plain text - convert to list items
-            contents_html = '\n'.join([f'<li style="margin-bottom: 4px;">{content.strip()}</li>' for content in contents.split('\n') if content.strip()])
-            contents_html = f'<ul style="font-size: 11px; line-height: 1.6; color: #333; padding-left: 20px;">{contents_html}</ul>'
+        special_values['#each courseContents'] = _list_block_html(
+            contents,
+            item_style=' style="margin-bottom: 4px;"',
+            list_style=' style="font-size: 11px; line-height: 1.6; color: #333; padding-left: 20px;"'
+        )
 
-        contents_pattern = r'{{#each courseContents}}.*?{{/each}}'
-        html_content = re.sub(contents_pattern, contents_html, html_content, flags=re.DOTALL | re.IGNORECASE)
-        print(f"[FIND] DEBUG: Course contents pattern replaced")
-    else:
-        print("[FIND] DEBUG: No course contents found")
+    # All variables substituted in a single pass over the compiled template
+    print(f"\n[FIND] Step 8: Replacing template variables...")
+    print(f"   Placeholders found in template: {sorted(compiled.placeholders)[:10]}... ({len(compiled.placeholders)} total)")
+    values = _placeholder_values(compiled, all_variables)
+    values.update(special_values)
+    html_content = compiled.render(values)
+
+    if badge_qr_img_tag:
+        # Static "QR" boxes in badge designs
+        html_content = html_content.replace('>QR</div>', f'>{badge_qr_img_tag}</div>')
     
     # Add enhanced print styles using template specifications
     if is_badge and hasattr(template, 'badge_size') and hasattr(template, 'orientation'):
@@ -617,7 +592,6 @@ def generate_participant_badge(
 
     from fastapi.responses import HTMLResponse
     import json
-    import re
     from datetime import datetime
 
     # Get the event badge
@@ -675,33 +649,14 @@ def generate_participant_badge(
     print(f"   Variables count: {len(template_vars)}")
     print(f"   Variables keys: {list(template_vars.keys())}")
 
-    # Use template content from database
-    html_content = template.template_content or ''
-
     # Calculate dimensions based on badge size
-    size_multiplier = {
-        'small': 0.75,
-        'standard': 1.0,
-        'large': 1.25
-    }.get(template.badge_size, 1.0)
-
-    base_width = 280
-    base_height = 450
-    width = int(base_width * size_multiplier)
-    height = int(base_height * size_multiplier)
-    red_height = int(273 * size_multiplier)
-    white_height = int(177 * size_multiplier)
+    size_multiplier = BADGE_SIZE_MULTIPLIERS.get(template.badge_size, 1.0)
 
     print(f"[SIZE] Badge size: {template.badge_size}")
-    print(f"[SIZE] Dimensions: {width}px x {height}px (multiplier: {size_multiplier}x)")
-    print(f"[SIZE] Red section: {red_height}px, White section: {white_height}px")
+    print(f"[SIZE] Dimensions: {int(280 * size_multiplier)}px x {int(450 * size_multiplier)}px (multiplier: {size_multiplier}x)")
 
-    # Replace size values in CSS
-    html_content = html_content.replace('width: 280px;', f'width: {width}px;')
-    html_content = html_content.replace('height: 450px;', f'height: {height}px;')
-    html_content = html_content.replace('height: 273px;', f'height: {red_height}px;')
-    html_content = html_content.replace('height: 177px;', f'height: {white_height}px;')
-    html_content = html_content.replace('top: 273px;', f'top: {red_height}px;')
+    # Template content from database with sizes applied, parsed once per template version
+    compiled = _compiled_template(template, "badge", size_multiplier)
 
     # Add participant and event data to variables
     participant_role = participant.participant_role or participant.role or ''
@@ -713,47 +668,30 @@ def generate_participant_badge(
         'participantName': participant.full_name or '',
         'participantRole': participant_role.upper() if participant_role else ''
     })
+    values = _placeholder_values(compiled, all_variables)
 
-    # Handle logo replacement FIRST
-    if '{{logo}}' in html_content:
-        logo_html = f'<img src="{template.logo_url}" alt="Logo" style="max-width: 80px; max-height: 40px; object-fit: contain;" />' if template.logo_url else ''
-        html_content = html_content.replace('{{logo}}', logo_html)
+    # Logo and avatar take precedence over template variables
+    if 'logo' in compiled.placeholders:
+        values['logo'] = f'<img src="{template.logo_url}" alt="Logo" style="max-width: 80px; max-height: 40px; object-fit: contain;" />' if template.logo_url else ''
         print(f"[BADGE] Logo replaced with: {template.logo_url}")
 
-    # Handle avatar replacement
-    if '{{participantAvatar}}' in html_content:
-        avatar_html = f'<img src="{template.avatar_url}" alt="Avatar" class="avatar" />' if template.avatar_url else ''
-        html_content = html_content.replace('{{participantAvatar}}', avatar_html)
+    if 'participantAvatar' in compiled.placeholders:
+        values['participantAvatar'] = f'<img src="{template.avatar_url}" alt="Avatar" class="avatar" />' if template.avatar_url else ''
         print(f"[BADGE] Avatar replaced with: {template.avatar_url}")
 
     # Generate QR code for badge with BADGE-SPECIFIC URL
     api_url = os.getenv('NEXT_PUBLIC_API_URL', 'http://localhost:8000')
     badge_url = f"{api_url}/api/v1/events/{event_id}/badges/{badge_id}/generate/{participant_id}"
 
-    # Generate QR code
-    qr = qrcode.QRCode(version=1, box_size=10, border=2)
-    qr.add_data(badge_url)
-    qr.make(fit=True)
-    qr_img = qr.make_image(fill_color="black", back_color="white")
-
-    # Convert to base64
-    buffer = BytesIO()
-    qr_img.save(buffer, format='PNG')
-    qr_base64 = base64.b64encode(buffer.getvalue()).decode()
-    qr_img_tag = f'<img src="data:image/png;base64,{qr_base64}" alt="QR Code" style="width: 100%; height: 100%; object-fit: contain;" />'
-
-    # Replace all possible QR placeholders
-    html_content = html_content.replace('{{qrCode}}', qr_img_tag)
-    html_content = html_content.replace('>QR</div>', f'>{qr_img_tag}</div>')
-    html_content = re.sub(r'<div class="qr-code">QR</div>', f'<div class="qr-code">{qr_img_tag}</div>', html_content)
+    qr_img_tag = f'<img src="{qr_data_uri(badge_url)}" alt="QR Code" style="width: 100%; height: 100%; object-fit: contain;" />'
+    values['qrCode'] = qr_img_tag
 
     print(f"[QR] QR code generated for badge URL: {badge_url}")
 
-    # Replace all other template variables
-    placeholders = re.findall(r'{{(\w+)}}', html_content)
-    for placeholder in placeholders:
-        value = all_variables.get(placeholder, '')
-        html_content = html_content.replace(f'{{{{{placeholder}}}}}', str(value))
+    # All template variables substituted in a single pass
+    html_content = compiled.render(values)
+    # Static "QR" boxes in badge designs
+    html_content = html_content.replace('>QR</div>', f'>{qr_img_tag}</div>')
 
     # Add print styles
     enhanced_styles = f'''
@@ -886,82 +824,56 @@ def assign_participants_to_certificate(
     if should_publish:
         print(f"[CERT] Step 13: Generating PDFs and sending notifications")
         event = db.query(Event).filter(Event.id == event_id).first()
-        
+        from app.services.certificate_generation import generate_certificate
+        import asyncio
+
+        template = db.query(CertificateTemplate).filter(
+            CertificateTemplate.id == event_certificate.certificate_template_id
+        ).first()
+
+        if template:
+            # Template parsed once and event-level values built once for all participants
+            compiled = _compiled_template(template, "certificate")
+            template_vars = event_certificate.template_variables or {}
+
+            # Later keys take precedence, matching the order the values used to be replaced in
+            base_values = {}
+            if template.logo_url:
+                base_values['logo'] = f'<img src="{template.logo_url}" alt="Logo" style="max-height: 100px; max-width: 300px;" />'
+                base_values['logoWatermark'] = f'<img src="{template.logo_url}" alt="Watermark" style="max-width: 400px; max-height: 400px;" />'
+            base_values.update({key: str(value) if value else '' for key, value in template_vars.items()})
+            if event:
+                base_values['eventTitle'] = event.title or ''
+                if event.start_date:
+                    base_values['startDate'] = event.start_date.strftime('%B %d, %Y')
+                if event.end_date:
+                    base_values['endDate'] = event.end_date.strftime('%B %d, %Y')
+
+            # Handle course objectives and contents lists
+            objectives = template_vars.get('courseObjectives', '')
+            if objectives:
+                base_values['#each courseObjectives'] = _list_block_html(objectives)
+            contents = template_vars.get('courseContents', '')
+            if contents:
+                base_values['#each courseContents'] = _list_block_html(contents)
+
+            # Use API_BASE_URL for server deployment
+            api_url = os.getenv('API_BASE_URL') or os.getenv('NEXT_PUBLIC_API_URL', 'http://localhost:8000')
+
         for participant in confirmed_participants:
             try:
-                # Generate PDF certificate
-                from app.services.certificate_generation import generate_certificate
-                import asyncio
-                
-                template = db.query(CertificateTemplate).filter(
-                    CertificateTemplate.id == event_certificate.certificate_template_id
-                ).first()
-                
                 if template:
-                    # Get template variables from event certificate
-                    template_vars = event_certificate.template_variables or {}
-                    
-                    # Build complete HTML with all variables replaced
-                    html_content = template.template_content
-                    
-                    # Replace participant name
-                    participant_name = participant.certificate_name or participant.full_name
-                    html_content = html_content.replace('{{participantName}}', participant_name)
-                    
-                    # Replace event details
-                    if event:
-                        html_content = html_content.replace('{{eventTitle}}', event.title or '')
-                        if event.start_date:
-                            html_content = html_content.replace('{{startDate}}', event.start_date.strftime('%B %d, %Y'))
-                        if event.end_date:
-                            html_content = html_content.replace('{{endDate}}', event.end_date.strftime('%B %d, %Y'))
-                    
-                    # Replace template variables
-                    for key, value in template_vars.items():
-                        html_content = html_content.replace(f'{{{{{key}}}}}', str(value) if value else '')
-                    
-                    # Handle logo
-                    if template.logo_url:
-                        logo_html = f'<img src="{template.logo_url}" alt="Logo" style="max-height: 100px; max-width: 300px;" />'
-                        html_content = html_content.replace('{{logo}}', logo_html)
-                        html_content = html_content.replace('{{logoWatermark}}', f'<img src="{template.logo_url}" alt="Watermark" style="max-width: 400px; max-height: 400px;" />')
-                    
-                    # Handle course objectives and contents lists
-                    import re
-                    objectives = template_vars.get('courseObjectives', '')
-                    if objectives:
-                        if '<li>' in objectives:
-                            objectives_html = objectives
-                        else:
-                            objectives_html = '\n'.join([f'<li>{obj.strip()}</li>' for obj in objectives.split('\n') if obj.strip()])
-                            objectives_html = f'<ul>{objectives_html}</ul>'
-                        html_content = re.sub(r'{{#each courseObjectives}}.*?{{/each}}', objectives_html, html_content, flags=re.DOTALL)
-                    
-                    contents = template_vars.get('courseContents', '')
-                    if contents:
-                        if '<li>' in contents:
-                            contents_html = contents
-                        else:
-                            contents_html = '\n'.join([f'<li>{content.strip()}</li>' for content in contents.split('\n') if content.strip()])
-                            contents_html = f'<ul>{contents_html}</ul>'
-                        html_content = re.sub(r'{{#each courseContents}}.*?{{/each}}', contents_html, html_content, flags=re.DOTALL)
-                    
                     # Generate QR code
-                    import qrcode
-                    from io import BytesIO
-                    import base64
-                    # Use API_BASE_URL for server deployment
-                    api_url = os.getenv('API_BASE_URL') or os.getenv('NEXT_PUBLIC_API_URL', 'http://localhost:8000')
                     cert_url = f"{api_url}/api/v1/events/{event_id}/certificates/{event_certificate.id}/generate/{participant.id}"
-                    qr = qrcode.QRCode(version=1, box_size=10, border=2)
-                    qr.add_data(cert_url)
-                    qr.make(fit=True)
-                    qr_img = qr.make_image(fill_color="black", back_color="white")
-                    buffer = BytesIO()
-                    qr_img.save(buffer, format='PNG')
-                    qr_base64 = base64.b64encode(buffer.getvalue()).decode()
-                    qr_img_tag = f'<img src="data:image/png;base64,{qr_base64}" alt="QR Code" style="width: 80px; height: 80px;" />'
-                    html_content = html_content.replace('{{qrCode}}', qr_img_tag)
+                    qr_img_tag = f'<img src="{qr_data_uri(cert_url)}" alt="QR Code" style="width: 80px; height: 80px;" />'
+
+                    # Build complete HTML with all variables replaced in one pass
+                    participant_name = participant.certificate_name or participant.full_name
+                    html_content = compiled.render({
+                        'qrCode': qr_img_tag,
+                        **base_values,
+                        'participantName': participant_name,
+                    })
                     
                     # Now generate PDF from the complete HTML
                     pdf_url = asyncio.run(generate_certificate(
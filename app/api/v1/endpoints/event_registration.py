@@ -2,7 +2,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List, Any
-from app.db.database import get_db
+from app.db.database import get_db, SessionLocal
 from app.api.deps import get_current_user
 from app.models.event import Event
 from app.models.event_participant import EventParticipant
@@ -13,9 +13,25 @@ import os
 from datetime import datetime
 from app.core.email_service import email_service
 from app.core.config import settings
+from app.services.tabular_export import export_response
 
 router = APIRouter()
 
+# Personal data hidden for not_selected participants (data privacy)
+REDACTED_FIELDS = [
+    "oc", "position", "country", "contract_status", "contract_type",
+    "gender_identity", "sex", "pronouns", "project_of_work", "personal_email",
+    "msf_email", "hrco_email", "career_manager_email", "line_manager_email",
+    "phone_number", "dietary_requirements", "accommodation_needs",
+    "certificate_name", "badge_name", "motivation_letter",
+    "code_of_conduct_confirm", "travel_requirements_confirm",
+    "travelling_internationally", "accommodation_type", "daily_meals",
+    "decline_reason", "declined_at", "vetting_comments"
+]
+
+# The only columns of a not_selected participant shown as-is (as in the listing)
+NOT_SELECTED_VISIBLE_FIELDS = ("id", "full_name", "role", "status", "created_at")
+
 class EventRegistrationRequest(BaseModel):
     event_id: int
     user_email: str
@@ -148,16 +164,7 @@ async def get_event_registrations(
                 "invitation_accepted": False,
                 "invitation_accepted_at": None,
                 # Redacted fields
-                **{field: "[REDACTED]" for field in [
-                    "oc", "position", "country", "contract_status", "contract_type",
-                    "gender_identity", "sex", "pronouns", "project_of_work", "personal_email",
-                    "msf_email", "hrco_email", "career_manager_email", "line_manager_email",
-                    "phone_number", "dietary_requirements", "accommodation_needs",
-                    "certificate_name", "badge_name", "motivation_letter",
-                    "code_of_conduct_confirm", "travel_requirements_confirm",
-                    "travelling_internationally", "accommodation_type", "daily_meals",
-                    "decline_reason", "declined_at", "vetting_comments"
-                ]}
+                **{field: "[REDACTED]" for field in REDACTED_FIELDS}
             })
         else:
             # Convert row to dict and return all fields
@@ -176,6 +183,52 @@ async def get_event_registrations(
     
     return result
 
+def _registration_rows(event_id: int, status_filter: str, columns: List[str]):
+    """Registration rows streamed from a server-side cursor"""
+    from sqlalchemy import text
+
+    query = f"SELECT {', '.join(columns)} FROM event_participants WHERE event_id = :event_id"
+    params = {"event_id": event_id}
+    if status_filter:
+        query += " AND status = :status_filter"
+        params["status_filter"] = status_filter
+    query += " ORDER BY id"
+
+    redacted = {index for index, column in enumerate(columns) if column not in NOT_SELECTED_VISIBLE_FIELDS}
+    status_index = columns.index("status")
+    db = SessionLocal()
+    try:
+        result = db.execute(text(query).execution_options(stream_results=True, max_row_buffer=1000), params)
+        for row in result:
+            if row[status_index] == "not_selected":
+                yield ["[REDACTED]" if index in redacted else value for index, value in enumerate(row)]
+            else:
+                yield list(row)
+    finally:
+        db.close()
+
+@router.get("/event/{event_id}/registrations/export")
+def export_event_registrations(
+    event_id: int,
+    status_filter: str = Query(None, description="Filter by status: registered, selected, not_selected, waiting, canceled, attended"),
+    format: str = Query("csv", description="csv or xlsx"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Download all registrations for an event"""
+    event = db.query(Event).filter(Event.id == event_id).first()
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+
+    columns = [column.name for column in EventParticipant.__table__.columns]
+    return export_response(
+        format,
+        f"event_{event_id}_registrations",
+        columns,
+        _registration_rows(event_id, status_filter, columns),
+        sheet_name="Registrations"
+    )
+
 @router.get("/participant/{participant_id}")
 async def get_participant_details(
     participant_id: int,
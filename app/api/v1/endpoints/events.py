@@ -1,47 +1,51 @@
 # File: app/api/v1/endpoints/events.py
 from typing import Any, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query, Request
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 from app import crud, schemas
 from app.api import deps
 from app.db.database import get_db
+from app.core import capabilities
+from app.crud import vetting_committee as crud_vetting
+from app.core.capabilities import VETTING_ROLES
+from app.core.http_cache import compute_etag, response_cache, row_version
 from app.models.user import UserRole
-from app.models.user_roles import UserRole as UserRoleModel
-from app.models.vetting_committee import VettingCommittee, VettingStatus, VettingCommitteeMember
+from app.services import event_deletion_service
 
 router = APIRouter()
 
-def can_create_events(user_role: UserRole) -> bool:
-    """Check if user role can create events (any role with ADMIN except SUPER_ADMIN)"""
-    admin_roles = [UserRole.MT_ADMIN, UserRole.HR_ADMIN, UserRole.EVENT_ADMIN]
-    return user_role in admin_roles
-
-def can_create_events_by_relationship_roles(user_roles: List[UserRoleModel]) -> bool:
-    """Check if user has admin roles in the relationship table"""
-    admin_role_types = ['MT_ADMIN', 'HR_ADMIN', 'EVENT_ADMIN']
-    return any(role.role in admin_role_types for role in user_roles)
-
 @router.get("/published", response_model=List[schemas.Event])
 def get_published_events(
     *,
+    request: Request,
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 100
 ) -> Any:
-    """Get published events (public endpoint for mobile)."""
+    """Get published events (public endpoint for mobile).
+
+    Supports conditional requests: clients sending a matching If-None-Match
+    get a 304 without the events being loaded.
+    """
     import logging
+    from app.models.event import Event
     logger = logging.getLogger(__name__)
     
     try:
         logger.info(f"🎯 === PUBLISHED EVENTS GET REQUEST START ===")
         logger.info(f"📊 Skip: {skip}, Limit: {limit}")
         
-        # Get all published events regardless of tenant
-        events = crud.event.get_published_events(db, skip=skip, limit=limit)
-        logger.info(f"📊 Found {len(events)} published events")
+        published = db.query(Event).filter(Event.status.ilike('published'))
+        etag = compute_etag(request, *row_version(published, Event))
         
-        return events
+        def build():
+            # Get all published events regardless of tenant
+            events = crud.event.get_published_events(db, skip=skip, limit=limit)
+            logger.info(f"📊 Found {len(events)} published events")
+            return [schemas.Event.model_validate(event) for event in events]
+        
+        return response_cache.respond(request, etag, build, max_age=60)
         
     except Exception as e:
         logger.error(f"💥 PUBLISHED EVENTS GET ERROR: {str(e)}")
@@ -231,6 +235,7 @@ def get_event_for_mobile(
 @router.get("/{event_id}/public", response_model=schemas.Event)
 def get_event_public(
     *,
+    request: Request,
     db: Session = Depends(get_db),
     event_id: int
 ) -> Any:
@@ -252,16 +257,20 @@ def get_event_public(
         
         logger.info(f"✅ Returning public event details: {event.title}")
         
-        # Add tenant_slug to response
-        if hasattr(event, 'tenant') and event.tenant:
-            event.tenant_slug = event.tenant.slug
-        else:
-            # Fallback: get tenant by ID
-            tenant = crud.tenant.get(db, id=event.tenant_id)
-            if tenant:
-                event.tenant_slug = tenant.slug
+        etag = compute_etag(request, event.id, event.tenant_id, event.updated_at)
         
-        return event
+        def build():
+            # Add tenant_slug to response
+            if hasattr(event, 'tenant') and event.tenant:
+                event.tenant_slug = event.tenant.slug
+            else:
+                # Fallback: get tenant by ID
+                tenant = crud.tenant.get(db, id=event.tenant_id)
+                if tenant:
+                    event.tenant_slug = tenant.slug
+            return schemas.Event.model_validate(event)
+        
+        return response_cache.respond(request, etag, build, max_age=300)
         
     except HTTPException:
         raise
@@ -286,20 +295,8 @@ def create_event(
     logger = logging.getLogger(__name__)
     
     try:
-        # Check user roles from relationship table
-        user_roles = db.query(UserRoleModel).filter(
-            UserRoleModel.user_id == current_user.id
-        ).all()
-        
-        # Check if user has admin roles in the relationship table
-        admin_role_types = ['MT_ADMIN', 'HR_ADMIN', 'EVENT_ADMIN']
-        has_admin_role_in_relationship = any(role.role in admin_role_types for role in user_roles)
-        
-        # Check permissions - check both single role and relationship roles
-        has_single_role_permission = can_create_events(current_user.role)
-        
-        # Allow if either permission method grants access
-        if not has_single_role_permission and not has_admin_role_in_relationship:
+        # Primary and relationship-table roles both count
+        if not capabilities.resolve(db, current_user).can_create_events:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Only admin roles can create events"
@@ -511,80 +508,25 @@ def get_events(
             )
     
     # Check if user only has GUEST and VETTING_COMMITTEE/VETTING_APPROVER roles
-    all_roles = getattr(current_user, 'all_roles', [current_user.role.value if current_user.role else ''])
-    admin_roles = ['SUPER_ADMIN', 'MT_ADMIN', 'EVENT_ADMIN', 'HR_ADMIN', 'super_admin', 'mt_admin', 'event_admin', 'hr_admin']
-    vetting_roles = ['VETTING_COMMITTEE', 'VETTING_APPROVER', 'vetting_committee', 'vetting_approver']
-    
-    has_admin_role = any(role in admin_roles for role in all_roles)
+    caps = capabilities.resolve(db, current_user)
+    has_admin_role = caps.is_admin
     has_only_vetting_and_guest = (
-        not has_admin_role and 
-        any(role in vetting_roles for role in all_roles) and
-        all(role in ['GUEST', 'VETTING_COMMITTEE', 'VETTING_APPROVER', 'guest', 'vetting_committee', 'vetting_approver'] for role in all_roles)
+        not has_admin_role and
+        caps.has_any(VETTING_ROLES) and
+        caps.has_only(VETTING_ROLES | {'GUEST'})
     )
     
     logger.info(f"🔍 GET EVENTS - User: {current_user.email}")
-    logger.info(f"🔍 All roles: {all_roles}")
+    logger.info(f"🔍 All roles: {sorted(caps.roles)}")
     logger.info(f"🔍 Has admin role: {has_admin_role}")
     logger.info(f"🔍 Has only vetting and guest: {has_only_vetting_and_guest}")
     
     # If user only has GUEST and VETTING_COMMITTEE roles, filter to only show vetting events
     if has_only_vetting_and_guest:
-        logger.info(f"🔍 Filtering events for vetting committee member: {current_user.email}")
-        
-        # Get committees where user is member or approver
-        from app.models.event import Event
-        from sqlalchemy import or_
-        
-        vetting_event_ids = set()
-        
-        # Check if user is a committee member
-        member_committees = db.query(VettingCommittee).join(
-            VettingCommitteeMember, VettingCommittee.id == VettingCommitteeMember.committee_id
-        ).filter(
-            VettingCommitteeMember.email.ilike(current_user.email)
-        ).all()
-        
-        logger.info(f"🔍 Found {len(member_committees)} committees where user is member")
-        for committee in member_committees:
-            logger.info(f"🔍 Member committee: ID={committee.id}, Event ID={committee.event_id}")
-            vetting_event_ids.add(committee.event_id)
-        
-        # Check if user is an approver (legacy system)
-        approver_committees = db.query(VettingCommittee).filter(
-            or_(
-                VettingCommittee.approver_email.ilike(current_user.email),
-                VettingCommittee.approver_id == current_user.id
-            )
-        ).all()
-        
-        logger.info(f"🔍 Found {len(approver_committees)} committees where user is approver (legacy)")
-        for committee in approver_committees:
-            logger.info(f"🔍 Approver committee: ID={committee.id}, Event ID={committee.event_id}")
-            vetting_event_ids.add(committee.event_id)
-        
-        # Check new approvers table
-        from app.models.vetting_committee import VettingCommitteeApprover
-        new_approver_records = db.query(VettingCommitteeApprover).filter(
-            VettingCommitteeApprover.email.ilike(current_user.email)
-        ).all()
-        
-        logger.info(f"🔍 Found {len(new_approver_records)} approver records in new table")
-        for approver_record in new_approver_records:
-            committee = db.query(VettingCommittee).filter(
-                VettingCommittee.id == approver_record.committee_id
-            ).first()
-            if committee:
-                logger.info(f"🔍 New approver committee: ID={committee.id}, Event ID={committee.event_id}")
-                vetting_event_ids.add(committee.event_id)
-        
-        logger.info(f"🔍 Total vetting event IDs: {vetting_event_ids}")
-        
-        if not vetting_event_ids:
-            logger.info(f"📊 No vetting events found for user {current_user.email}")
-            return []
-        
-        # Get events by IDs
-        events = db.query(Event).filter(Event.id.in_(vetting_event_ids)).offset(skip).limit(limit).all()
+        # Events of committees where user is member or approver (legacy fields or approvers table)
+        events = crud_vetting.get_events_for_user(
+            db, user_id=current_user.id, email=current_user.email, skip=skip, limit=limit
+        )
         logger.info(f"📊 Found {len(events)} vetting events for user {current_user.email}")
         return events
     
@@ -853,6 +795,7 @@ def delete_event(
     *,
     db: Session = Depends(get_db),
     event_id: int,
+    background_tasks: BackgroundTasks,
     current_user: schemas.User = Depends(deps.get_current_user)
 ) -> Any:
     """Delete event (only allowed for draft events)."""
@@ -872,8 +815,9 @@ def delete_event(
     logger.info(f"📊 Event details - Status: {event.status}, Tenant: {event.tenant_id}")
     logger.info(f"👤 User details - Role: {current_user.role}, Tenant: {current_user.tenant_id}")
     
-    # Only allow deletion of draft events
-    if event.status.lower() != 'draft':
+    # Only allow deletion of draft events (or retrying one whose purge failed)
+    resuming_purge = event.status == event_deletion_service.DELETING_STATUS
+    if event.status.lower() != 'draft' and not resuming_purge:
         logger.error(f"❌ Cannot delete non-draft event: {event.status}")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -881,19 +825,10 @@ def delete_event(
         )
     
     # Check permissions using both role systems
-    user_roles = db.query(UserRoleModel).filter(
-        UserRoleModel.user_id == current_user.id
-    ).all()
-    
-    logger.info(f"🔐 User roles from relationship: {[role.role for role in user_roles]}")
-    
-    has_single_role_permission = can_create_events(current_user.role)
-    has_relationship_role_permission = can_create_events_by_relationship_roles(user_roles)
+    caps = capabilities.resolve(db, current_user)
+    logger.info(f"🔐 User roles: {sorted(caps.roles)}")
     
-    logger.info(f"🔐 Single role permission: {has_single_role_permission}")
-    logger.info(f"🔐 Relationship role permission: {has_relationship_role_permission}")
-    
-    if not has_single_role_permission and not has_relationship_role_permission:
+    if not caps.can_create_events:
         logger.error(f"❌ User lacks admin permissions")
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -916,64 +851,20 @@ def delete_event(
             detail="Cannot delete events from other tenants"
         )
     
-    # ULTIMATE SOLUTION: Use raw connection to bypass SQLAlchemy transaction management
+    # Event-owned rows go through the ON DELETE CASCADE graph (see event_deletion_service)
+    participant_count = event_deletion_service.count_participants(db, event_id)
+    if resuming_purge or participant_count > event_deletion_service.LARGE_EVENT_PARTICIPANTS:
+        logger.info(f"🗑️ Scheduling chunked purge of event {event_id} ({participant_count} participants)")
+        if not resuming_purge:
+            event_deletion_service.mark_for_purge(db, event)
+        background_tasks.add_task(event_deletion_service.purge_event, event_id)
+        return {"message": "Draft event deletion started", "status": event_deletion_service.DELETING_STATUS}
+
     try:
-        # Get raw connection
-        connection = db.get_bind().raw_connection()
-        cursor = connection.cursor()
-        
-        logger.info(f"✅ Using raw SQL connection for event deletion: {event_id}")
-        
-        # Execute deletion commands directly
-        deletion_commands = [
-            f"DELETE FROM accommodation_allocations WHERE participant_id IN (SELECT id FROM event_participants WHERE event_id = {event_id});",
-            f"DELETE FROM accommodation_allocations WHERE event_id = {event_id};",
-            f"DELETE FROM public_registrations WHERE participant_id IN (SELECT id FROM event_participants WHERE event_id = {event_id});",
-            f"DELETE FROM line_manager_recommendations WHERE event_id = {event_id};",
-            f"DELETE FROM transport_requests WHERE flight_itinerary_id IN (SELECT id FROM flight_itineraries WHERE event_id = {event_id});",
-            f"DELETE FROM transport_requests WHERE event_id = {event_id};",
-            f"DELETE FROM passport_records WHERE event_id = {event_id};",
-            f"DELETE FROM flight_itineraries WHERE event_id = {event_id};",
-            f"DELETE FROM event_participants WHERE event_id = {event_id};",
-            f"DELETE FROM vendor_event_accommodations WHERE event_id = {event_id};",
-            f"DELETE FROM event_agenda WHERE event_id = {event_id};",
-            f"DELETE FROM chat_rooms WHERE event_id = {event_id};",
-            f"DELETE FROM event_attachments WHERE event_id = {event_id};",
-            f"DELETE FROM events WHERE id = {event_id};"
-        ]
-        
-        for i, command in enumerate(deletion_commands):
-            try:
-                cursor.execute(command)
-                logger.info(f"✅ Executed command {i+1}: {command[:50]}...")
-            except Exception as e:
-                logger.warning(f"⚠️ Command {i+1} failed: {str(e)[:100]}")
-                # Continue with next command
-        
-        # Commit all changes
-        connection.commit()
-        cursor.close()
-        connection.close()
-        
-        # Clean up vetting roles for users who were part of this event's vetting committee
-        try:
-            from app.services.vetting_role_cleanup_service import cleanup_orphaned_vetting_roles_for_deleted_event
-            cleanup_orphaned_vetting_roles_for_deleted_event(db, event_id)
-        except Exception as e:
-            logger.warning(f"[WARNING] Failed to cleanup vetting roles for deleted event: {str(e)}")
-        
-        logger.info(f"🎉 Event deleted successfully using raw SQL: {event_id}")
-        
+        event_deletion_service.delete_event(db, event_id)
     except Exception as e:
-        logger.error(f"💥 Raw SQL deletion failed: {str(e)}")
+        logger.error(f"💥 Event deletion failed: {str(e)}")
         logger.exception("Full traceback:")
-        try:
-            if 'connection' in locals():
-                connection.rollback()
-                cursor.close()
-                connection.close()
-        except Exception:
-            pass
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete event: {str(e)}"
@@ -999,14 +890,7 @@ def update_event_status(
         )
     
     # Check permissions
-    user_roles = db.query(UserRoleModel).filter(
-        UserRoleModel.user_id == current_user.id
-    ).all()
-    
-    has_single_role_permission = can_create_events(current_user.role)
-    has_relationship_role_permission = can_create_events_by_relationship_roles(user_roles)
-    
-    if not has_single_role_permission and not has_relationship_role_permission:
+    if not capabilities.resolve(db, current_user).can_create_events:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only admin roles can update event status"
@@ -1720,14 +1604,7 @@ async def generate_poa_for_participant(
     logger = logging.getLogger(__name__)
     
     # Check permissions
-    user_roles = db.query(UserRoleModel).filter(
-        UserRoleModel.user_id == current_user.id
-    ).all()
-    
-    has_single_role_permission = can_create_events(current_user.role)
-    has_relationship_role_permission = can_create_events_by_relationship_roles(user_roles)
-    
-    if not has_single_role_permission and not has_relationship_role_permission:
+    if not capabilities.resolve(db, current_user).can_create_events:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only admin roles can generate POA documents"
@@ -1873,14 +1750,7 @@ async def generate_poa_for_event(
     logger = logging.getLogger(__name__)
     
     # Check permissions
-    user_roles = db.query(UserRoleModel).filter(
-        UserRoleModel.user_id == current_user.id
-    ).all()
-    
-    has_single_role_permission = can_create_events(current_user.role)
-    has_relationship_role_permission = can_create_events_by_relationship_roles(user_roles)
-    
-    if not has_single_role_permission and not has_relationship_role_permission:
+    if not capabilities.resolve(db, current_user).can_create_events:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only admin roles can generate POA documents"
@@ -2047,15 +1917,7 @@ def update_event_loi_template(
         )
     
     # Check permissions
-    user_roles = db.query(UserRoleModel).filter(
-        UserRoleModel.user_id == current_user.id,
-        UserRoleModel.user_id == current_user.id
-    ).all()
-    
-    has_single_role_permission = can_create_events(current_user.role)
-    has_relationship_role_permission = can_create_events_by_relationship_roles(user_roles)
-    
-    if not has_single_role_permission and not has_relationship_role_permission:
+    if not capabilities.resolve(db, current_user).can_create_events:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only admin roles can update event LOI template"
@@ -1,15 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from pydantic import BaseModel
+from sqlalchemy import text
+from itertools import groupby
 import json
 
-from app.db.database import get_db
+from app.db.database import get_db, SessionLocal
 from app.api.deps import get_current_user
 from app.models.user import User
 from app.models.form_field import FormField, FormResponse
 from app.models.event import Event
-import json
+from app.services.tabular_export import export_response
 
 router = APIRouter()
 
@@ -188,6 +190,63 @@ def get_event_form_responses(
         "field_label": r.field_label
     } for r in responses]
 
+def _form_response_rows(event_id: int, field_ids: List[int]):
+    """One row per registration, streamed from a server-side cursor ordered by registration"""
+    db = SessionLocal()
+    try:
+        result = db.execute(
+            text("""
+                SELECT ep.id AS registration_id, ep.full_name, ep.email, ep.status, ep.created_at,
+                       fr.field_id, fr.field_value
+                FROM form_responses fr
+                JOIN form_fields ff ON ff.id = fr.field_id
+                JOIN event_participants ep ON ep.id = fr.registration_id
+                WHERE ff.event_id = :event_id
+                ORDER BY ep.id
+            """).execution_options(stream_results=True, max_row_buffer=1000),
+            {"event_id": event_id}
+        )
+        column = {field_id: index for index, field_id in enumerate(field_ids)}
+        for _, responses in groupby(result, key=lambda r: r.registration_id):
+            first = next(responses)
+            values = [""] * len(field_ids)
+            for response in (first, *responses):
+                if response.field_id in column:
+                    values[column[response.field_id]] = response.field_value
+            # Data privacy: not_selected registrations keep only their name
+            if first.status == "not_selected":
+                yield [first.registration_id, first.full_name, "[REDACTED]", first.status, first.created_at] + \
+                    ["[REDACTED]"] * len(field_ids)
+            else:
+                yield [first.registration_id, first.full_name, first.email, first.status, first.created_at] + values
+    finally:
+        db.close()
+
+@router.get("/event/{event_id}/responses/export")
+def export_event_form_responses(
+    event_id: int,
+    format: str = Query("csv", description="csv or xlsx"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Download form responses pivoted to one row per registration"""
+    event = db.query(Event).filter(Event.id == event_id).first()
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+
+    fields = db.query(FormField.id, FormField.field_label).filter(
+        FormField.event_id == event_id
+    ).order_by(FormField.order_index, FormField.id).all()
+
+    header = ["Registration ID", "Full Name", "Email", "Status", "Registered At"] + [f.field_label for f in fields]
+    return export_response(
+        format,
+        f"event_{event_id}_form_responses",
+        header,
+        _form_response_rows(event_id, [f.id for f in fields]),
+        sheet_name="Form responses"
+    )
+
 @router.post("/events/{event_id}/restore-complete-fields")
 def restore_complete_form_fields(
     event_id: int,
@@ -12,6 +12,7 @@ from app.models.user import User
 from app.models.tenant import Tenant
 from app.models.event_participant import EventParticipant
 from app.services.loi_generation import generate_loi_document
+from app.services.qr_service import qr_data_uri
 
 router = APIRouter()
 
@@ -366,8 +367,7 @@ async def generate_loi_from_template(
             # Use FRONTEND_URL from environment (already includes /portal)
             frontend_url = os.getenv('FRONTEND_URL', 'http://localhost:3000/portal')
             public_url = f"{frontend_url}/public/loi/{participant_id}-{event.id if event else 0}"
-            # Generate actual QR code using Google Charts API (no dependencies needed)
-            qr_code_url = f"https://api.qrserver.com/v1/create-qr-code/?size=150x150&data={public_url}"
+            qr_code_url = qr_data_uri(public_url)
             qr_code_html = f'''
             <div style="text-align: center; margin: 10px 0;">
                 <img src="{qr_code_url}" alt="QR Code" style="width: 100px; height: 100px; border: 1px solid #ccc; padding: 5px;" />
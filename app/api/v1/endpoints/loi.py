@@ -241,7 +241,7 @@ async def generate_slugs_for_existing_records(db: Session = Depends(get_db)):
                 record.generate_slug()
                 updated_count += 1
             except Exception as e:
-                print(f"Error generating slug for record ID {record.id}: {e}")
+                logger.error(f"Error generating slug for record ID {record.id}: {e}")
         
         db.commit()
         
@@ -286,7 +286,7 @@ async def generate_loi_pdf(
     
     try:
         logger.info(f"🔄 Generating LOI PDF for event {event_id}, participant {participant_id}")
-        print(f"🔄 LOI Generation Request - Event ID: {event_id}, Participant ID: {participant_id}")
+        logger.debug(f"🔄 LOI Generation Request - Event ID: {event_id}, Participant ID: {participant_id}")
         
         # Get the event's assigned invitation template
         event = db.query(Event).filter(Event.id == event_id).first()
@@ -515,13 +515,13 @@ async def generate_loi_pdf(
             template_html = template_html.replace('{{signature_footer}}', '')
         
         # Generate LOI PDF and upload to Cloudinary with all data
-        print(f"🔄 Calling generate_loi_document with parameters:")
-        print(f"   - participant_id: {participant_id} (type: {type(participant_id)})")
-        print(f"   - event_id: {event_id} (type: {type(event_id)})")
-        print(f"   - participant_name: {participant.full_name}")
-        print(f"   - passport_number: {passport_number}")
-        print(f"   - nationality: {nationality}")
-        print(f"   - template_html length: {len(template_html)}")
+        logger.debug(f"🔄 Calling generate_loi_document with parameters:")
+        logger.debug(f"   - participant_id: {participant_id} (type: {type(participant_id)})")
+        logger.debug(f"   - event_id: {event_id} (type: {type(event_id)})")
+        logger.debug(f"   - participant_name: {participant.full_name}")
+        logger.debug(f"   - passport_number: {passport_number}")
+        logger.debug(f"   - nationality: {nationality}")
+        logger.debug(f"   - template_html length: {len(template_html)}")
         
         pdf_url, loi_slug = await generate_loi_document(
             participant_id=participant_id,
@@ -6,15 +6,30 @@ from app.models.event_participant import EventParticipant
 from app.models.allocation import EventAllocation
 from app.models.event import Event
 from app.core.deps import get_current_user
+from app.services import voucher_ledger
+from app.services.qr_service import qr_data_uri
 from pydantic import BaseModel
 from typing import List, Optional
-import qrcode
-import io
-import base64
 from datetime import datetime
 import secrets
+import logging
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+def _redeem_within_policy(db: Session, allocation: EventAllocation, participant_id: int,
+                          quantity: int, redeemed_by: str, notes: Optional[str]) -> int:
+    """Redeem against the balance, capped at the allocation unless the voucher type allows over-redemption"""
+    limit = None if voucher_ledger.allows_over_redemption(allocation) else voucher_ledger.voucher_quantity(allocation)
+    try:
+        return voucher_ledger.redeem(db, allocation, participant_id, quantity, redeemed_by, notes, limit=limit)
+    except voucher_ledger.VoucherBalanceExceeded as e:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Cannot redeem {quantity} {e.voucher_type}. Only {e.remaining} remaining."
+        )
+
 
 class VoucherRedemptionRequest(BaseModel):
     allocation_id: int
@@ -41,7 +56,7 @@ def get_participant_allocations(
     """Get allocations for current participant, optionally filtered by event"""
     
     try:
-        print(f"🔍 ALLOCATIONS DEBUG: Starting allocation fetch for user: {current_user.email}")
+        logger.debug(f"🔍 ALLOCATIONS DEBUG: Starting allocation fetch for user: {current_user.email}")
         
         # Get participant records for current user
         participants_query = db.query(EventParticipant).filter(
@@ -53,65 +68,58 @@ def get_participant_allocations(
             participants_query = participants_query.filter(
                 EventParticipant.event_id == event_id
             )
-            print(f"🔍 ALLOCATIONS DEBUG: Filtering by event_id: {event_id}")
+            logger.debug(f"🔍 ALLOCATIONS DEBUG: Filtering by event_id: {event_id}")
         
         participants = participants_query.all()
         
-        print(f"🔍 ALLOCATIONS DEBUG: Found {len(participants)} participants for user {current_user.email}")
+        logger.debug(f"🔍 ALLOCATIONS DEBUG: Found {len(participants)} participants for user {current_user.email}")
         
         if not participants:
-            print(f"🔍 ALLOCATIONS DEBUG: No participants found, returning empty allocations")
+            logger.debug(f"🔍 ALLOCATIONS DEBUG: No participants found, returning empty allocations")
             return {"allocations": []}
         
         all_allocations = []
-        
-        for participant in participants:
-            print(f"🔍 ALLOCATIONS DEBUG: Processing participant {participant.id} for event {participant.event_id}")
-            
-            # Get event details
-            event = db.query(Event).filter(Event.id == participant.event_id).first()
-            if not event:
-                print(f"🔍 ALLOCATIONS DEBUG: No event found for event_id {participant.event_id}")
-                continue
-                
-            print(f"🔍 ALLOCATIONS DEBUG: Found event: {event.title}")
-                
-            # Get ALL voucher allocations for this event (including new voucher types)
-            from sqlalchemy import or_
-            voucher_allocations = db.query(EventAllocation).filter(
-                EventAllocation.event_id == participant.event_id,
-                or_(
-                    EventAllocation.drink_vouchers_per_participant > 0,
-                    EventAllocation.vouchers_per_participant > 0
-                )
-            ).all()
-
-            print(f"🔍 ALLOCATIONS DEBUG: Found {len(voucher_allocations)} voucher allocations for event {participant.event_id}")
 
-            for allocation in voucher_allocations:
-                # Determine voucher quantity - prefer new field, fallback to legacy
-                voucher_qty = allocation.vouchers_per_participant if allocation.vouchers_per_participant > 0 else allocation.drink_vouchers_per_participant
-                voucher_type = allocation.voucher_type if allocation.voucher_type else "Drinks"
+        # Events and voucher allocations for all of the user's participations, then
+        # every balance in one lookup
+        event_ids = {participant.event_id for participant in participants}
+        events = {event.id: event for event in db.query(Event).filter(Event.id.in_(event_ids)).all()}
+        from sqlalchemy import or_
+        allocations_by_event = {}
+        for allocation in db.query(EventAllocation).filter(
+            EventAllocation.event_id.in_(event_ids),
+            or_(
+                EventAllocation.drink_vouchers_per_participant > 0,
+                EventAllocation.vouchers_per_participant > 0
+            )
+        ).all():
+            allocations_by_event.setdefault(allocation.event_id, []).append(allocation)
+        balances = voucher_ledger.get_balances(
+            db,
+            [allocation.id for allocations in allocations_by_event.values() for allocation in allocations],
+            [participant.id for participant in participants]
+        )
 
-                print(f"🔍 ALLOCATIONS DEBUG: Processing allocation {allocation.id} - Type: {voucher_type}, Qty: {voucher_qty}")
+        for participant in participants:
+            logger.debug(f"🔍 ALLOCATIONS DEBUG: Processing participant {participant.id} for event {participant.event_id}")
 
-                # Calculate remaining vouchers for this participant
-                try:
-                    from app.models.participant_voucher_redemption import ParticipantVoucherRedemption
+            event = events.get(participant.event_id)
+            if not event:
+                logger.debug(f"🔍 ALLOCATIONS DEBUG: No event found for event_id {participant.event_id}")
+                continue
 
-                    redemptions = db.query(ParticipantVoucherRedemption).filter(
-                        ParticipantVoucherRedemption.allocation_id == allocation.id,
-                        ParticipantVoucherRedemption.participant_id == participant.id
-                    ).all()
+            voucher_allocations = allocations_by_event.get(participant.event_id, [])
+            logger.debug(f"🔍 ALLOCATIONS DEBUG: Found {len(voucher_allocations)} voucher allocations for event {participant.event_id}")
 
-                    total_redeemed = sum(r.quantity for r in redemptions)
-                except Exception as redemption_error:
-                    print(f"🔍 ALLOCATIONS DEBUG: Error querying redemptions (table may not exist): {redemption_error}")
-                    total_redeemed = 0
+            for allocation in voucher_allocations:
+                voucher_qty = voucher_ledger.voucher_quantity(allocation)
+                voucher_type = voucher_ledger.voucher_type(allocation)
 
+                balance = balances.get((allocation.id, participant.id))
+                total_redeemed = balance.redeemed_quantity if balance else 0
                 remaining = voucher_qty - total_redeemed
 
-                print(f"🔍 ALLOCATIONS DEBUG: Allocation {allocation.id} - Total: {voucher_qty}, Redeemed: {total_redeemed}, Remaining: {remaining}")
+                logger.debug(f"🔍 ALLOCATIONS DEBUG: Allocation {allocation.id} - Total: {voucher_qty}, Redeemed: {total_redeemed}, Remaining: {remaining}")
 
                 # Get venues for Lunch/Dinner vouchers
                 venues_data = []
@@ -125,9 +133,9 @@ def get_participant_allocations(
                                 "latitude": getattr(v.vendor_accommodation, 'latitude', None),
                                 "longitude": getattr(v.vendor_accommodation, 'longitude', None)
                             } for v in allocation.venues if v.vendor_accommodation]
-                            print(f"🔍 ALLOCATIONS DEBUG: Found {len(venues_data)} venues for {voucher_type}: {venues_data}")
+                            logger.debug(f"🔍 ALLOCATIONS DEBUG: Found {len(venues_data)} venues for {voucher_type}: {venues_data}")
                     except Exception as venue_error:
-                        print(f"🔍 ALLOCATIONS DEBUG: Error loading venues: {venue_error}")
+                        logger.warning(f"ALLOCATIONS: Error loading venues: {venue_error}")
 
                 allocation_data = {
                     "id": allocation.id,
@@ -146,15 +154,13 @@ def get_participant_allocations(
                 }
 
                 all_allocations.append(allocation_data)
-                print(f"🔍 ALLOCATIONS DEBUG: Added allocation to list: {allocation_data}")
+                logger.debug(f"🔍 ALLOCATIONS DEBUG: Added allocation to list: {allocation_data}")
         
-        print(f"🔍 ALLOCATIONS DEBUG: Returning {len(all_allocations)} total allocations")
+        logger.debug(f"🔍 ALLOCATIONS DEBUG: Returning {len(all_allocations)} total allocations")
         return {"allocations": all_allocations}
         
     except Exception as e:
-        print(f"❌ ALLOCATIONS ERROR: {str(e)}")
-        import traceback
-        print(f"❌ ALLOCATIONS TRACEBACK: {traceback.format_exc()}")
+        logger.exception(f"❌ ALLOCATIONS ERROR: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error fetching allocations: {str(e)}")
 
 @router.post("/participant/voucher-redemption/initiate")
@@ -165,14 +171,6 @@ def initiate_voucher_redemption(
 ):
     """Initiate voucher redemption process - generates QR code for scanning"""
 
-    # Get participant
-    participant = db.query(EventParticipant).filter(
-        EventParticipant.email == current_user.email
-    ).first()
-
-    if not participant:
-        raise HTTPException(status_code=404, detail="Participant not found")
-
     # Get allocation
     allocation = db.query(EventAllocation).filter(
         EventAllocation.id == request.allocation_id
@@ -181,27 +179,25 @@ def initiate_voucher_redemption(
     if not allocation:
         raise HTTPException(status_code=404, detail="Allocation not found")
 
-    # Get voucher type - use new field or default to Drinks
-    voucher_type = allocation.voucher_type if allocation.voucher_type else "Drinks"
-
-    # Determine voucher quantity - prefer new field, fallback to legacy
-    total_vouchers = allocation.vouchers_per_participant if allocation.vouchers_per_participant and allocation.vouchers_per_participant > 0 else allocation.drink_vouchers_per_participant
+    # The participant record for the allocation's event
+    participant = db.query(EventParticipant).filter(
+        EventParticipant.email == current_user.email,
+        EventParticipant.event_id == allocation.event_id
+    ).first()
 
-    # Check remaining vouchers
-    from app.models.participant_voucher_redemption import ParticipantVoucherRedemption
+    if not participant:
+        raise HTTPException(status_code=404, detail="Participant not found")
 
-    redemptions = db.query(ParticipantVoucherRedemption).filter(
-        ParticipantVoucherRedemption.allocation_id == request.allocation_id,
-        ParticipantVoucherRedemption.participant_id == participant.id
-    ).all()
+    voucher_type = voucher_ledger.voucher_type(allocation)
+    total_vouchers = voucher_ledger.voucher_quantity(allocation)
 
-    total_redeemed = sum(r.quantity for r in redemptions)
-    remaining = total_vouchers - total_redeemed
+    # Check remaining vouchers (the balance is re-checked atomically on completion)
+    remaining = total_vouchers - voucher_ledger.get_redeemed(db, allocation.id, participant.id)
 
     # Check over-redemption based on voucher type
     # Only Drinks allow over-redemption, all other items are restricted
     is_over_redemption = request.quantity > remaining
-    allows_over_redemption = voucher_type == "Drinks"
+    allows_over_redemption = voucher_ledger.allows_over_redemption(allocation)
 
     if is_over_redemption:
         if not allows_over_redemption:
@@ -212,7 +208,7 @@ def initiate_voucher_redemption(
             )
         else:
             # Drinks can be over-redeemed, but log it
-            print(f"WARNING: Over-redemption detected - Participant {participant.id} requesting {request.quantity} drink vouchers but only {remaining} remaining")
+            logger.warning(f"WARNING: Over-redemption detected - Participant {participant.id} requesting {request.quantity} drink vouchers but only {remaining} remaining")
     
     # Generate redemption token
     redemption_token = secrets.token_urlsafe(32)
@@ -245,17 +241,8 @@ def initiate_voucher_redemption(
         "voucher_type": voucher_type
     }
 
-    # Create QR code image
-    qr = qrcode.QRCode(version=1, box_size=10, border=5)
-    qr.add_data(f"msafiri://redeem/{redemption_token}")
-    qr.make(fit=True)
-
-    img = qr.make_image(fill_color="black", back_color="white")
-    img_buffer = io.BytesIO()
-    img.save(img_buffer, format='PNG')
-    img_buffer.seek(0)
-
-    qr_data_url = f"data:image/png;base64,{base64.b64encode(img_buffer.getvalue()).decode()}"
+    # Create QR code image (single-use token, kept out of the disk cache)
+    qr_data_url = qr_data_uri(f"msafiri://redeem/{redemption_token}", border=5, persist=False)
 
     return QRCodeResponse(
         qr_token=redemption_token,
@@ -332,54 +319,32 @@ def confirm_voucher_redemption(
     if not current_user.role or current_user.role not in ["ADMIN", "HR_ADMIN", "EVENT_ADMIN"]:
         raise HTTPException(status_code=403, detail="Admin access required")
 
-    # Get pending redemption
-    from app.models.pending_voucher_redemption import PendingVoucherRedemption
-
-    pending = db.query(PendingVoucherRedemption).filter(
-        PendingVoucherRedemption.token == token,
-        PendingVoucherRedemption.status == "pending"
-    ).first()
+    # Claim the pending redemption; a second confirmation of the same token finds nothing
+    pending = voucher_ledger.claim_pending(db, token, current_user.email)
 
     if not pending:
         raise HTTPException(status_code=404, detail="Redemption request not found or already processed")
 
-    # Create actual redemption record
-    from app.models.participant_voucher_redemption import ParticipantVoucherRedemption
-
-    redemption = ParticipantVoucherRedemption(
-        allocation_id=pending.allocation_id,
-        participant_id=pending.participant_id,
-        quantity=pending.quantity,
-        redeemed_at=datetime.utcnow(),
-        redeemed_by=current_user.email,
-        notes=pending.notes
-    )
-
-    db.add(redemption)
-
-    # Mark pending as completed
-    pending.status = "completed"
-    pending.processed_at = datetime.utcnow()
-    pending.processed_by = current_user.email
-
-    db.commit()
-
-    # Calculate new remaining balance
     allocation = db.query(EventAllocation).filter(
         EventAllocation.id == pending.allocation_id
     ).first()
 
-    # Get voucher type and total quantity
-    voucher_type = allocation.voucher_type if allocation and allocation.voucher_type else "Drinks"
-    total_vouchers = (allocation.vouchers_per_participant if allocation and allocation.vouchers_per_participant and allocation.vouchers_per_participant > 0
-                      else allocation.drink_vouchers_per_participant if allocation else 0)
+    if not allocation:
+        db.rollback()
+        raise HTTPException(status_code=404, detail="Allocation not found")
 
-    all_redemptions = db.query(ParticipantVoucherRedemption).filter(
-        ParticipantVoucherRedemption.allocation_id == pending.allocation_id,
-        ParticipantVoucherRedemption.participant_id == pending.participant_id
-    ).all()
+    voucher_type = voucher_ledger.voucher_type(allocation)
+    total_vouchers = voucher_ledger.voucher_quantity(allocation)
 
-    total_redeemed = sum(r.quantity for r in all_redemptions)
+    try:
+        total_redeemed = _redeem_within_policy(
+            db, allocation, pending.participant_id, pending.quantity, current_user.email, pending.notes
+        )
+    except HTTPException:
+        db.rollback()
+        raise
+
+    db.commit()
     remaining = total_vouchers - total_redeemed
 
     return {
@@ -398,7 +363,7 @@ def complete_voucher_redemption(
     """Complete voucher redemption from QR scanner"""
     
     try:
-        print(f"🔍 REDEMPTION DEBUG: Received request: {request}")
+        logger.debug(f"🔍 REDEMPTION DEBUG: Received request: {request}")
         
         # Handle comprehensive voucher data format
         if 'allocation_id' in request and 'quantity' in request:
@@ -407,7 +372,7 @@ def complete_voucher_redemption(
             scanner_email = request.get('scanner_email')
             voucher_type_from_request = request.get('voucher_type')
 
-            print(f"🔍 REDEMPTION DEBUG: Processing allocation {allocation_id}, quantity {quantity}, type {voucher_type_from_request}")
+            logger.debug(f"🔍 REDEMPTION DEBUG: Processing allocation {allocation_id}, quantity {quantity}, type {voucher_type_from_request}")
 
             # Get allocation
             allocation = db.query(EventAllocation).filter(
@@ -417,10 +382,7 @@ def complete_voucher_redemption(
             if not allocation:
                 raise HTTPException(status_code=404, detail="Allocation not found")
 
-            # Get voucher type and total quantity
-            voucher_type = allocation.voucher_type if allocation.voucher_type else "Drinks"
-            total_vouchers = (allocation.vouchers_per_participant if allocation.vouchers_per_participant and allocation.vouchers_per_participant > 0
-                              else allocation.drink_vouchers_per_participant)
+            voucher_type = voucher_ledger.voucher_type(allocation)
 
             # Try to get participant_email from request if provided
             participant_email = request.get('participant_email')
@@ -438,40 +400,14 @@ def complete_voucher_redemption(
             if not participant:
                 raise HTTPException(status_code=404, detail="Participant not found")
 
-            # Check remaining vouchers and enforce over-redemption restriction
-            from app.models.participant_voucher_redemption import ParticipantVoucherRedemption
-
-            existing_redemptions = db.query(ParticipantVoucherRedemption).filter(
-                ParticipantVoucherRedemption.allocation_id == allocation_id,
-                ParticipantVoucherRedemption.participant_id == participant.id
-            ).all()
-
-            total_redeemed = sum(r.quantity for r in existing_redemptions)
-            remaining = total_vouchers - total_redeemed
-
-            # Only drinks allow over-redemption
-            allows_over_redemption = voucher_type == "Drinks"
-            is_over_redemption = quantity > remaining
-
-            if is_over_redemption and not allows_over_redemption:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Cannot redeem {quantity} {voucher_type}. Only {remaining} remaining."
-                )
-
-            # Create single redemption record for the total quantity
-            redemption = ParticipantVoucherRedemption(
-                allocation_id=allocation_id,
-                participant_id=participant.id,
-                quantity=quantity,
-                redeemed_at=datetime.utcnow(),
-                redeemed_by=scanner_email or "scanner",
-                notes=f"Scanned redemption via mobile app - {voucher_type}"
+            # Single redemption for the total quantity; only drinks allow over-redemption
+            _redeem_within_policy(
+                db, allocation, participant.id, quantity, scanner_email or "scanner",
+                f"Scanned redemption via mobile app - {voucher_type}"
             )
-            db.add(redemption)
             db.commit()
 
-            print(f"🔍 REDEMPTION DEBUG: Successfully created redemption record for {voucher_type}")
+            logger.debug(f"🔍 REDEMPTION DEBUG: Successfully created redemption record for {voucher_type}")
 
             return {
                 "success": True,
@@ -486,39 +422,25 @@ def complete_voucher_redemption(
             token = request['qr_token']
             scanner_email = request.get('scanner_email')
             
-            print(f"🔍 REDEMPTION DEBUG: Processing token {token}")
-            
-            from app.models.pending_voucher_redemption import PendingVoucherRedemption
-            
-            pending = db.query(PendingVoucherRedemption).filter(
-                PendingVoucherRedemption.token == token,
-                PendingVoucherRedemption.status == "pending"
-            ).first()
+            logger.debug(f"🔍 REDEMPTION DEBUG: Processing token {token}")
             
+            pending = voucher_ledger.claim_pending(db, token, scanner_email or "scanner")
+
             if not pending:
                 raise HTTPException(status_code=404, detail="Redemption token not found or already processed")
-            
-            # Create actual redemption record
-            from app.models.participant_voucher_redemption import ParticipantVoucherRedemption
-            
-            redemption = ParticipantVoucherRedemption(
-                allocation_id=pending.allocation_id,
-                participant_id=pending.participant_id,
-                quantity=pending.quantity,
-                redeemed_at=datetime.utcnow(),
-                redeemed_by=scanner_email or "scanner",
-                notes=pending.notes
+
+            allocation = db.query(EventAllocation).filter(
+                EventAllocation.id == pending.allocation_id
+            ).first()
+
+            if not allocation:
+                raise HTTPException(status_code=404, detail="Allocation not found")
+
+            _redeem_within_policy(
+                db, allocation, pending.participant_id, pending.quantity, scanner_email or "scanner", pending.notes
             )
-            
-            db.add(redemption)
-            
-            # Mark pending as completed
-            pending.status = "completed"
-            pending.processed_at = datetime.utcnow()
-            pending.processed_by = scanner_email or "scanner"
-            
             db.commit()
-            
+
             participant = db.query(EventParticipant).filter(
                 EventParticipant.id == pending.participant_id
             ).first()
@@ -532,11 +454,13 @@ def complete_voucher_redemption(
         
         else:
             raise HTTPException(status_code=400, detail="Invalid request format")
-            
+
+    except HTTPException:
+        db.rollback()
+        raise
     except Exception as e:
-        print(f"❌ REDEMPTION ERROR: {str(e)}")
-        import traceback
-        print(f"❌ REDEMPTION TRACEBACK: {traceback.format_exc()}")
+        db.rollback()
+        logger.exception(f"❌ REDEMPTION ERROR: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error processing redemption: {str(e)}")
 
 @router.get("/admin/pending-redemptions")
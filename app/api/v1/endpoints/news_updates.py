@@ -1,10 +1,12 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
 from app.db.database import get_db
+from app.core.http_cache import compute_etag, response_cache, row_version
 from app.api.deps import get_current_user
 from app.models.user import User
 from app.models.tenant import Tenant
+from app.models.news_update import NewsUpdate
 from app.schemas.news_update import (
     NewsUpdateCreate, 
     NewsUpdateUpdate, 
@@ -59,6 +61,7 @@ def create_news_update(
 
 @router.get("/", response_model=NewsUpdateListResponse)
 def get_news_updates(
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
     skip: int = Query(0, ge=0),
@@ -76,34 +79,41 @@ def get_news_updates(
         tenant_numeric_id = _get_tenant_numeric_id(db, current_user.tenant_id)
         logger.info(f"Tenant slug: {current_user.tenant_id}, Numeric ID: {tenant_numeric_id}")
         
-        news_updates = crud_news_update.get_news_updates(
-            db=db,
-            tenant_id=tenant_numeric_id,
-            skip=skip,
-            limit=limit,
-            published_only=published_only,
-            search=search
-        )
-        
-        total = crud_news_update.get_news_updates_count(
-            db=db,
-            tenant_id=tenant_numeric_id,
-            published_only=published_only,
-            search=search
-        )
+        # ETag keys on the tenant's news rows; search results skip the body cache
+        tenant_news = db.query(NewsUpdate).filter(NewsUpdate.tenant_id == tenant_numeric_id)
+        etag = compute_etag(request, tenant_numeric_id, *row_version(tenant_news, NewsUpdate))
         
-        pages = math.ceil(total / limit) if total > 0 else 0
-        page = (skip // limit) + 1
+        def build():
+            news_updates = crud_news_update.get_news_updates(
+                db=db,
+                tenant_id=tenant_numeric_id,
+                skip=skip,
+                limit=limit,
+                published_only=published_only,
+                search=search
+            )
+            
+            total = crud_news_update.get_news_updates_count(
+                db=db,
+                tenant_id=tenant_numeric_id,
+                published_only=published_only,
+                search=search
+            )
+            
+            pages = math.ceil(total / limit) if total > 0 else 0
+            page = (skip // limit) + 1
+            
+            logger.info(f"Found {len(news_updates)} news updates, total: {total}")
+            
+            return NewsUpdateListResponse(
+                items=news_updates,
+                total=total,
+                page=page,
+                size=limit,
+                pages=pages
+            )
         
-        logger.info(f"Found {len(news_updates)} news updates, total: {total}")
-        
-        return NewsUpdateListResponse(
-            items=news_updates,
-            total=total,
-            page=page,
-            size=limit,
-            pages=pages
-        )
+        return response_cache.respond(request, etag, build, max_age=60, private=True, cache_body=not search)
     except Exception as e:
         logger.error(f"Error getting news updates: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
@@ -2,7 +2,10 @@
 from typing import Any, List, Optional, Dict
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
+from sqlalchemy import func, select
 from pydantic import BaseModel
+from datetime import datetime, timedelta
+import base64
 from app import crud, schemas
 from app.api import deps
 import logging
@@ -140,37 +143,98 @@ def get_mobile_notifications(
     )
     
     # Format for mobile consumption
-    result = []
-    for notification in notifications:
-        # Handle enum values safely
-        notification_type = "general"
-        if notification.notification_type:
-            if hasattr(notification.notification_type, 'value'):
-                notification_type = notification.notification_type.value
-            else:
-                notification_type = str(notification.notification_type)
-        
-        priority = "medium"
-        if notification.priority:
-            if hasattr(notification.priority, 'value'):
-                priority = notification.priority.value
-            else:
-                priority = str(notification.priority)
-        
-        result.append({
-            "id": notification.id,
-            "title": notification.title,
-            "message": notification.message,
-            "type": notification_type,
-            "priority": priority,
-            "isRead": notification.is_read,
-            "createdAt": notification.created_at.isoformat(),
-            "readAt": notification.read_at.isoformat() if notification.read_at else None,
-            "actionUrl": notification.action_url,
-            "sender": notification.triggered_by
-        })
-    
-    return result
+    return [_mobile_notification(notification) for notification in notifications]
+
+def _mobile_notification(notification) -> Dict[str, Any]:
+    # Handle enum values safely
+    notification_type = "general"
+    if notification.notification_type:
+        if hasattr(notification.notification_type, 'value'):
+            notification_type = notification.notification_type.value
+        else:
+            notification_type = str(notification.notification_type)
+
+    priority = "medium"
+    if notification.priority:
+        if hasattr(notification.priority, 'value'):
+            priority = notification.priority.value
+        else:
+            priority = str(notification.priority)
+
+    return {
+        "id": notification.id,
+        "title": notification.title,
+        "message": notification.message,
+        "type": notification_type,
+        "priority": priority,
+        "isRead": notification.is_read,
+        "createdAt": notification.created_at.isoformat(),
+        "readAt": notification.read_at.isoformat() if notification.read_at else None,
+        "actionUrl": notification.action_url,
+        "sender": notification.triggered_by
+    }
+
+# Changes committed up to this many seconds before a sync are sent again on the
+# next one, so rows whose transaction started earlier but committed later
+# (updated_at is the transaction start time) are never skipped
+SYNC_REPLAY_SECONDS = 30
+
+def _encode_sync_cursor(updated_at: datetime, notification_id: int) -> str:
+    raw = f"{updated_at.isoformat()}|{notification_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def _decode_sync_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        updated_at, notification_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(updated_at), int(notification_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid sync cursor")
+
+@router.get("/mobile/sync")
+def sync_mobile_notifications(
+    db: Session = Depends(get_db),
+    current_user: schemas.User = Depends(deps.get_current_user),
+    since: Optional[str] = Query(None, description="Cursor returned by the previous sync; omit for a full sync"),
+    limit: int = Query(100, ge=1, le=500),
+) -> Any:
+    """Notifications created or changed (including read state) since the cursor, plus unread counts.
+
+    Clients upsert the returned notifications by id, store ``cursor`` and keep
+    calling while ``has_more`` is true. Recent changes can be returned twice.
+    """
+    position = _decode_sync_cursor(since) if since else None
+    notifications = crud.notification.get_changes(
+        db,
+        user_id=current_user.id,
+        tenant_id=current_user.tenant_id,
+        since=position,
+        limit=limit + 1
+    )
+    has_more = len(notifications) > limit
+    notifications = notifications[:limit]
+
+    if notifications and notifications[-1].updated_at is not None:
+        position = (notifications[-1].updated_at, notifications[-1].id)
+    if not has_more:
+        replay_from = db.execute(select(func.now())).scalar() - timedelta(seconds=SYNC_REPLAY_SECONDS)
+        if position is None or position[0] > replay_from:
+            position = (replay_from, 0)
+
+    own = crud.notification_counter.get_for_user(db, user_id=current_user.id)
+    broadcasts = crud.notification.get_broadcast_stats(db, tenant_id=current_user.tenant_id)
+
+    return {
+        "notifications": [
+            {**_mobile_notification(notification),
+             "updatedAt": notification.updated_at.isoformat() if notification.updated_at else None}
+            for notification in notifications
+        ],
+        "cursor": _encode_sync_cursor(*position),
+        "has_more": has_more,
+        "unread": own["unread"] + broadcasts["unread"],
+        "urgent": own["urgent"] + broadcasts["urgent"]
+    }
 
 @router.get("/stats", response_model=schemas.NotificationStats)
 def get_notification_stats(
@@ -1,9 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
-import qrcode
-import io
-import base64
 import json
 import uuid
 from typing import List
@@ -15,6 +12,7 @@ from app.models.inventory import Inventory
 from app.models.event import Event
 from app.schemas.participant_qr import ParticipantQRResponse, QRAllocationData, AllocationItem
 from app.api.deps import get_current_user
+from app.services.qr_service import qr_data_uri
 from app.models.user import User
 from datetime import datetime
 
@@ -53,7 +51,6 @@ def generate_participant_qr(
             items = []
             if allocation.notes and allocation.notes.startswith("ITEMS:"):
                 try:
-                    import json
                     items_str = allocation.notes.split("|NOTES:")[0].replace("ITEMS:", "")
                     items = json.loads(items_str.replace("'", '"'))
                 except Exception:
@@ -95,12 +92,8 @@ def generate_participant_qr(
             if vouchers_per_participant > 0:
                 # Get participant-specific redemptions from database
                 try:
-                    from app.models.participant_voucher_redemption import ParticipantVoucherRedemption
-                    redemptions = db.query(ParticipantVoucherRedemption).filter(
-                        ParticipantVoucherRedemption.allocation_id == allocation.id,
-                        ParticipantVoucherRedemption.participant_id == participant_id
-                    ).all()
-                    net_redeemed = sum(r.quantity for r in redemptions)
+                    from app.services import voucher_ledger
+                    net_redeemed = voucher_ledger.get_redeemed(db, allocation.id, participant_id)
                 except:
                     net_redeemed = 0
                 
@@ -179,23 +172,16 @@ def generate_participant_qr(
             base_url = os.getenv('FRONTEND_URL', 'http://localhost:3000')
             qr_url = f"{base_url}/public/qr/{qr_token}"
             
-            qr = qrcode.QRCode(version=1, box_size=10, border=5)
-            qr.add_data(qr_url)
-            qr.make(fit=True)
-            
-            img = qr.make_image(fill_color="black", back_color="white")
-            img_buffer = io.BytesIO()
-            img.save(img_buffer, format='PNG')
-            img_str = base64.b64encode(img_buffer.getvalue()).decode()
+            qr_data_url = qr_data_uri(qr_url, border=5)
         except Exception:
             # Return a simple base64 placeholder image
-            img_str = "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg=="
+            qr_data_url = "data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg=="
         
 
         
         return ParticipantQRResponse(
             qr_token=qr_token,
-            qr_data_url=f"data:image/png;base64,{img_str}",
+            qr_data_url=qr_data_url,
             allocation_summary=qr_data
         )
     except Exception as e:
@@ -545,13 +545,13 @@ async def redirect_to_loi_by_record_id(
         base_url = os.getenv('FRONTEND_URL', 'http://localhost:3000').rstrip('/')
         redirect_url = f"{base_url}/public/loi/{slugified_id}"
         
-        print(f"🔄 LOI REDIRECT: Raw ID {record_id} -> Slugified {slugified_id}")
-        print(f"🔄 REDIRECT URL: {redirect_url}")
+        logger.debug(f"🔄 LOI REDIRECT: Raw ID {record_id} -> Slugified {slugified_id}")
+        logger.debug(f"🔄 REDIRECT URL: {redirect_url}")
         
         return RedirectResponse(url=redirect_url, status_code=302)
         
     except Exception as e:
-        print(f"❌ LOI REDIRECT ERROR: {e}")
+        logger.error(f"❌ LOI REDIRECT ERROR: {e}")
         raise HTTPException(
             status_code=400,
             detail=f"Invalid record ID: {record_id}"
@@ -564,7 +564,7 @@ async def get_loi_by_slug(
 ):
     """Get LOI document by slugified record ID (public endpoint)"""
     
-    print(f"🔍 LOI FETCH START: Slug={slug}")
+    logger.debug(f"🔍 LOI FETCH START: Slug={slug}")
     
     try:
         # First try to find the passport record by slug in database
@@ -573,21 +573,21 @@ async def get_loi_by_slug(
         ).first()
         
         if not passport_record:
-            print(f"❌ PASSPORT RECORD NOT FOUND: No record with slug '{slug}'")
+            logger.warning(f"❌ PASSPORT RECORD NOT FOUND: No record with slug '{slug}'")
             raise HTTPException(
                 status_code=404,
                 detail="Invalid LOI reference"
             )
         
         record_id = passport_record.record_id
-        print(f"🔍 FOUND RECORD ID: {record_id} for slug: {slug}")
+        logger.debug(f"🔍 FOUND RECORD ID: {record_id} for slug: {slug}")
         
         # Get passport data from external API using the record_id
         import os
         API_URL = f"{os.getenv('PASSPORT_API_URL', 'https://ko-hr.kenya.msf.org/api/v1')}/get-passport-data/{record_id}"
         API_KEY = os.getenv('PASSPORT_API_KEY', 'n5BOC1ZH*o64Ux^%!etd4$rfUoj7iQrXSXOgk6uW')
         
-        print(f"🔍 CALLING EXTERNAL API: {API_URL}")
+        logger.debug(f"🔍 CALLING EXTERNAL API: {API_URL}")
         
         headers = {
             "x-api-key": API_KEY,
@@ -598,47 +598,47 @@ async def get_loi_by_slug(
         # Use the same format as the working Python script
         payload = {"passport_id": record_id}
         
-        print(f"🔍 REQUEST HEADERS: {headers}")
-        print(f"🔍 REQUEST PAYLOAD: {payload}")
+        logger.debug(f"🔍 REQUEST HEADERS: {headers}")
+        logger.debug(f"🔍 REQUEST PAYLOAD: {payload}")
         
         response = requests.get(API_URL, json=payload, headers=headers, timeout=30)
         
-        print(f"🔍 EXTERNAL API RESPONSE:")
-        print(f"🔍 Status Code: {response.status_code}")
-        print(f"🔍 Response Headers: {dict(response.headers)}")
-        print(f"🔍 Response Text: {response.text[:500]}..." if len(response.text) > 500 else response.text)
+        logger.debug(f"🔍 EXTERNAL API RESPONSE:")
+        logger.debug(f"🔍 Status Code: {response.status_code}")
+        logger.debug(f"🔍 Response Headers: {dict(response.headers)}")
+        logger.debug(f"🔍 Response Text: {response.text[:500]}..." if len(response.text) > 500 else response.text)
         
         if response.status_code == 404:
-            print(f"❌ LOI DOCUMENT NOT FOUND: Record ID {record_id}")
+            logger.warning(f"❌ LOI DOCUMENT NOT FOUND: Record ID {record_id}")
             raise HTTPException(
                 status_code=404,
                 detail="LOI document not found"
             )
         elif response.status_code != 200:
-            print(f"❌ EXTERNAL API ERROR: Status {response.status_code}, Response: {response.text}")
+            logger.error(f"❌ EXTERNAL API ERROR: Status {response.status_code}, Response: {response.text}")
             raise HTTPException(
                 status_code=500,
                 detail=f"Error retrieving LOI document: {response.text}"
             )
         
-        print(f"✅ LOI DOCUMENT RETRIEVED SUCCESSFULLY")
+        logger.debug(f"✅ LOI DOCUMENT RETRIEVED SUCCESSFULLY")
         # Return the LOI document content
         return response.json()
         
     except ValueError as e:
-        print(f"❌ SLUG PARSING ERROR: {e}")
+        logger.warning(f"❌ SLUG PARSING ERROR: {e}")
         raise HTTPException(
             status_code=400,
             detail="Invalid LOI reference format"
         )
     except requests.RequestException as e:
-        print(f"❌ REQUEST ERROR: {e}")
+        logger.error(f"❌ REQUEST ERROR: {e}")
         raise HTTPException(
             status_code=500,
             detail=f"Error connecting to LOI service: {str(e)}"
         )
     except Exception as e:
-        print(f"❌ UNEXPECTED ERROR: {e}")
+        logger.exception(f"❌ UNEXPECTED ERROR: {e}")
         raise HTTPException(
             status_code=500,
             detail=f"Unexpected error: {str(e)}"
@@ -2,9 +2,6 @@ from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.responses import HTMLResponse
 from sqlalchemy.orm import Session
-import qrcode
-from io import BytesIO
-import base64
 import os
 from datetime import datetime
 import re
@@ -19,6 +16,7 @@ from app.models.tenant import Tenant
 from app.models.guesthouse import VendorAccommodation
 from app.models.event_participant import EventParticipant
 from app.models.event import Event
+from app.services.qr_service import qr_data_uri
 
 router = APIRouter()
 
@@ -215,15 +213,7 @@ async def generate_poa_from_template(
         api_url = os.getenv('NEXT_PUBLIC_API_URL', 'http://localhost:8000')
         poa_url = f"{api_url}/api/v1/poa-templates/vendor/{vendor_id}/generate/{participant_id}"
 
-        qr = qrcode.QRCode(version=1, box_size=10, border=2)
-        qr.add_data(poa_url)
-        qr.make(fit=True)
-        qr_img = qr.make_image(fill_color="black", back_color="white")
-
-        buffer = BytesIO()
-        qr_img.save(buffer, format='PNG')
-        qr_base64 = base64.b64encode(buffer.getvalue()).decode()
-        qr_img_tag = f'<img src="data:image/png;base64,{qr_base64}" alt="QR Code" style="width: 100px; height: 100px;" />'
+        qr_img_tag = f'<img src="{qr_data_uri(poa_url)}" alt="QR Code" style="width: 100px; height: 100px;" />'
 
         html_content = html_content.replace('{{qrCode}}', qr_img_tag)
 
@@ -1,14 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Request
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from app.db.database import get_db
+from app.core.http_cache import compute_etag, response_cache, row_version
 from app.models.event import Event
 from app.models.event_participant import EventParticipant
 from app.models.form_field import FormField, FormResponse
+from app.models.registration_idempotency_key import RegistrationIdempotencyKey
 from pydantic import BaseModel
 from typing import Optional, List
 import logging
 
 logger = logging.getLogger(__name__)
+
+# Unique indexes a concurrent duplicate registration can run into (the
+# idempotency key one is named differently when created by run_auto_migration)
+PARTICIPANT_EMAIL_INDEX = "uq_event_participants_public_email"
+IDEMPOTENCY_KEY_INDEXES = (
+    "ix_registration_idempotency_keys_idempotency_key",
+    "registration_idempotency_keys_idempotency_key_key",
+)
+
 router = APIRouter()
 
 class PublicRegistrationRequest(BaseModel):
@@ -98,7 +111,7 @@ async def check_email_registration(
 @router.get("/test-debug")
 async def test_debug():
     """Test endpoint to verify debug changes are deployed"""
-    print("🔥 BASIC DEBUG: Test endpoint called - changes are deployed!")
+    logger.debug("🔥 BASIC DEBUG: Test endpoint called - changes are deployed!")
     return {"message": "Debug test successful", "timestamp": "2024-10-13"}
 
 @router.get("/events/{event_id}/public")
@@ -140,23 +153,53 @@ async def get_public_event(
         "tenant_name": result[10]
     }
 
+def _registration_response(participant_id: int) -> dict:
+    return {
+        "message": "Registration successful",
+        "participant_id": participant_id,
+        "status": "registered"
+    }
+
+def _violated_constraint(error: IntegrityError) -> Optional[str]:
+    """Name of the constraint or unique index behind an IntegrityError, if the driver reports it"""
+    diag = getattr(error.orig, "diag", None)
+    return getattr(diag, "constraint_name", None)
+
+def _replayed_registration(db: Session, event_id: int, idempotency_key: Optional[str]) -> Optional[dict]:
+    """Return the original response if this Idempotency-Key was already processed"""
+    if not idempotency_key:
+        return None
+    previous = db.query(RegistrationIdempotencyKey).filter(
+        RegistrationIdempotencyKey.idempotency_key == idempotency_key
+    ).first()
+    if not previous:
+        return None
+    if previous.event_id != event_id:
+        raise HTTPException(status_code=422, detail="Idempotency-Key was already used for another event")
+    logger.debug(f"Replaying public registration for Idempotency-Key {idempotency_key}")
+    return _registration_response(previous.participant_id)
+
 @router.post("/events/{event_id}/public-register")
-async def public_register_for_event(
+def public_register_for_event(
     event_id: int,
     registration: PublicRegistrationRequest,
-    db: Session = Depends(get_db)
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
 ):
-    """Allow public registration for events without authentication"""
-    
-    print(f"🔥 BACKEND DEBUG: Public registration endpoint called for event {event_id}")
-    print(f"🔥 BACKEND DEBUG: Registration data received: {registration}")
-    print(f"🔥 BACKEND DEBUG: HRCO Email: '{registration.hrcoEmail}'")
-    print(f"🔥 BACKEND DEBUG: Career Manager Email: '{registration.careerManagerEmail}'")
-    print(f"🔥 BACKEND DEBUG: Line Manager Email: '{registration.lineManagerEmail}'")
-    
+    """Allow public registration for events without authentication.
+
+    Retries carrying the same Idempotency-Key get the original response.
+    Duplicate registrations are rejected up front and, when two requests
+    race, by the unique (event_id, email) index on public form rows;
+    recommendation emails are sent after the response has been returned.
+    """
     logger.info(f"🌐 Public registration request for event {event_id}")
-    logger.info(f"   Name: {registration.firstName} {registration.lastName}")
-    logger.info(f"   Email: {registration.personalEmail}")
+    logger.debug(f"Public registration payload for event {event_id}: {registration}")
+    
+    replay = _replayed_registration(db, event_id, idempotency_key)
+    if replay:
+        return replay
     
     # Check if event exists first
     event = db.query(Event).filter(Event.id == event_id).first()
@@ -165,27 +208,22 @@ async def public_register_for_event(
         logger.error(f"❌ Event {event_id} not found")
         raise HTTPException(status_code=404, detail="Event not found")
     
-    logger.info(f"📊 Event found - Status: '{event.status}' (type: {type(event.status)})")
-    logger.info(f"✅ Event registration allowed regardless of status")
-    
     # Determine primary email (MSF email if exists, otherwise personal/tembo email)
     primary_email = registration.msfEmail if registration.msfEmail else registration.personalEmail
     
-    # Check if user already registered with any email
-    existing = db.query(EventParticipant).filter(
-        EventParticipant.event_id == event_id
-    ).filter(
-        (EventParticipant.email == registration.personalEmail) |
-        (EventParticipant.email == registration.msfEmail if registration.msfEmail else False)
+    # The unique index only covers the primary email of public form rows, and
+    # is missing where legacy duplicates kept it from being created; it guards
+    # the race, this check covers the rest
+    emails = {email.strip().lower() for email in (primary_email, registration.personalEmail) if email and email.strip()}
+    existing = db.query(EventParticipant.email).filter(
+        EventParticipant.event_id == event_id,
+        func.lower(EventParticipant.email).in_(emails)
     ).first()
-    
     if existing:
-        logger.error(f"❌ User already registered for event {event_id} with email {existing.email}")
+        logger.warning(f"❌ User already registered for event {event_id} with email {existing.email}")
         raise HTTPException(status_code=400, detail="Already registered for this event")
     
     try:
-        print(f"🔥 BASIC DEBUG: Starting registration process for {registration.firstName} {registration.lastName}")
-        
         # Create participant record with all form data
         # Map participantRole to role column values
         role_mapping = {
@@ -240,8 +278,7 @@ async def public_register_for_event(
         )
         
         db.add(participant)
-        db.commit()
-        db.refresh(participant)
+        db.flush()
         
         # Save any additional dynamic form responses
         # Get all form fields for this event
@@ -264,56 +301,83 @@ async def public_register_for_event(
             'travelRequirementsConfirm'
         }
         
+        form_responses = []
         for field in form_fields:
             # Check if this is a dynamic field (not in standard fields)
             if field.field_name not in standard_fields and field.field_name in registration_dict:
                 value = registration_dict[field.field_name]
                 if value:  # Only save non-empty values
-                    form_response = FormResponse(
+                    form_responses.append(FormResponse(
                         registration_id=participant.id,
                         field_id=field.id,
                         field_value=str(value)
-                    )
-                    db.add(form_response)
-        
-        db.commit()
-        
-        # Send recommendation emails to all three contacts if provided
-        recommendation_contacts = []
-        if registration.hrcoEmail and registration.hrcoEmail.strip():
-            recommendation_contacts.append(("HRCO", registration.hrcoEmail))
-        if registration.careerManagerEmail and registration.careerManagerEmail.strip():
-            recommendation_contacts.append(("Career Manager", registration.careerManagerEmail))
-        if registration.lineManagerEmail and registration.lineManagerEmail.strip():
-            recommendation_contacts.append(("Line Manager", registration.lineManagerEmail))
+                    ))
+        db.add_all(form_responses)
         
-        print(f"🔥 DEBUG: Found {len(recommendation_contacts)} recommendation contacts: {recommendation_contacts}")
-        
-        if recommendation_contacts:
-            print(f"🔥 DEBUG: Calling send_recommendation_emails function")
-            await send_recommendation_emails(
-                db, event_id, participant.id, registration, event, recommendation_contacts
-            )
-            print(f"🔥 DEBUG: send_recommendation_emails function completed")
-        else:
-            print(f"🔥 DEBUG: No recommendation contacts found, skipping email sending")
+        if idempotency_key:
+            db.add(RegistrationIdempotencyKey(
+                idempotency_key=idempotency_key,
+                event_id=event_id,
+                participant_id=participant.id
+            ))
         
+        # Participant, form responses and idempotency key land in one transaction
         db.commit()
         
-        logger.info(f"✅ Public registration successful for {registration.firstName} {registration.lastName}")
-        
-        return {
-            "message": "Registration successful",
-            "participant_id": participant.id,
-            "status": "registered"
-        }
-        
+    except IntegrityError as e:
+        db.rollback()
+        constraint = _violated_constraint(e)
+        if constraint != PARTICIPANT_EMAIL_INDEX and constraint not in IDEMPOTENCY_KEY_INDEXES:
+            logger.exception(f"❌ Public registration for event {event_id} violated {constraint or 'a constraint'}")
+            raise
+        # A concurrent retry with the same key may have won the race
+        replay = _replayed_registration(db, event_id, idempotency_key)
+        if replay:
+            return replay
+        if constraint in IDEMPOTENCY_KEY_INDEXES:
+            raise
+        logger.warning(f"❌ User already registered for event {event_id} with email {primary_email}")
+        raise HTTPException(status_code=400, detail="Already registered for this event")
     except Exception as e:
         logger.error(f"❌ Error in public registration: {str(e)}")
         db.rollback()
         raise HTTPException(status_code=400, detail=f"Registration failed: {str(e)}")
+    
+    # Send recommendation emails to all three contacts if provided
+    recommendation_contacts = []
+    if registration.hrcoEmail and registration.hrcoEmail.strip():
+        recommendation_contacts.append(("HRCO", registration.hrcoEmail))
+    if registration.careerManagerEmail and registration.careerManagerEmail.strip():
+        recommendation_contacts.append(("Career Manager", registration.careerManagerEmail))
+    if registration.lineManagerEmail and registration.lineManagerEmail.strip():
+        recommendation_contacts.append(("Line Manager", registration.lineManagerEmail))
+    
+    if recommendation_contacts:
+        logger.debug(f"Queueing {len(recommendation_contacts)} recommendation emails for participant {participant.id}")
+        background_tasks.add_task(
+            send_recommendation_emails_task, event_id, participant.id, registration, recommendation_contacts
+        )
+    
+    logger.info(f"✅ Public registration successful for {registration.firstName} {registration.lastName}")
+    
+    return _registration_response(participant.id)
+
+def send_recommendation_emails_task(
+    event_id: int, participant_id: int, registration: PublicRegistrationRequest, contacts: list
+):
+    """Background wrapper for send_recommendation_emails with its own session"""
+    from app.db.database import SessionLocal
+    
+    db = SessionLocal()
+    try:
+        event = db.query(Event).filter(Event.id == event_id).first()
+        if not event:
+            return
+        send_recommendation_emails(db, event_id, participant_id, registration, event, contacts)
+    finally:
+        db.close()
 
-async def send_recommendation_emails(
+def send_recommendation_emails(
     db: Session, event_id: int, participant_id: int, registration: PublicRegistrationRequest, event: Event, contacts: list
 ):
     """Send recommendation request emails to HRCO, Career Manager, and Line Manager"""
@@ -321,15 +385,15 @@ async def send_recommendation_emails(
     import uuid
     from sqlalchemy import text
     
-    print(f"🔥 DEBUG: send_recommendation_emails called with {len(contacts)} contacts")
+    logger.debug(f"send_recommendation_emails called with {len(contacts)} contacts")
     
     try:
         for contact_type, email in contacts:
-            print(f"🔥 DEBUG: Processing {contact_type}: {email}")
+            logger.debug(f"Processing {contact_type}: {email}")
             
             # Generate unique token for each recommendation
             recommendation_token = str(uuid.uuid4())
-            print(f"🔥 DEBUG: Generated token: {recommendation_token}")
+            logger.debug(f"Generated token: {recommendation_token}")
             
             # Create recommendation record in database first
             try:
@@ -358,7 +422,7 @@ async def send_recommendation_emails(
                     }
                 )
                 db.commit()
-                print(f"🔥 DEBUG: Recommendation record created in database for {contact_type}")
+                logger.debug(f"Recommendation record created in database for {contact_type}")
                 
                 # Send email to contact
                 from app.core.email_service import email_service
@@ -366,7 +430,7 @@ async def send_recommendation_emails(
 
                 # Get base URL from environment variable
                 base_url = os.getenv("FRONTEND_URL", "http://localhost:3000")
-                print(f"🔥 DEBUG: Using base URL: {base_url}")
+                logger.debug(f"Using base URL: {base_url}")
                 
                 # Use different paths for different contact types
                 if contact_type == "HRCO":
@@ -376,7 +440,7 @@ async def send_recommendation_emails(
                 else:  # Line Manager
                     recommendation_url = f"{base_url}/public/line-manager-recommendation/{recommendation_token}"
                 
-                print(f"🔥 DEBUG: Recommendation URL: {recommendation_url}")
+                logger.debug(f"Recommendation URL: {recommendation_url}")
                 
                 subject = f"Recommendation Request - {registration.firstName} {registration.lastName} for {event.title}"
                 
@@ -420,7 +484,7 @@ async def send_recommendation_emails(
                 </div>
                 """
                 
-                print(f"🔥 DEBUG: Sending email to {email} with subject: {subject}")
+                logger.debug(f"Sending email to {email} with subject: {subject}")
                 
                 email_result = email_service.send_notification_email(
                     to_email=email,
@@ -429,7 +493,7 @@ async def send_recommendation_emails(
                     message=message
                 )
                 
-                print(f"🔥 DEBUG: Email send result for {contact_type}: {email_result}")
+                logger.debug(f"Email send result for {contact_type}: {email_result}")
                 
                 if email_result:
                     logger.info(f"✅ Recommendation email sent to {contact_type}: {email}")
@@ -437,14 +501,12 @@ async def send_recommendation_emails(
                     logger.error(f"❌ Failed to send recommendation email to {contact_type}: {email}")
                     
             except Exception as email_error:
-                print(f"🔥 DEBUG: Email error for {contact_type}: {email_error}")
                 logger.error(f"❌ Email error for {contact_type}: {email_error}")
         
         # Don't commit here since we're committing individually above
-        print(f"🔥 DEBUG: send_recommendation_emails function completed")
+        logger.debug(f"send_recommendation_emails function completed")
         
     except Exception as e:
-        print(f"🔥 DEBUG: General error in send_recommendation_emails: {e}")
         logger.error(f"❌ Error sending recommendation emails: {e}")
         # Don't fail the registration if email fails
         pass
@@ -473,36 +535,43 @@ class ParticipantStatusResponse(BaseModel):
 @router.get("/events/{event_id}/form-fields")
 async def get_public_form_fields(
     event_id: int,
+    request: Request,
     db: Session = Depends(get_db)
 ):
     """
     Get all active form fields for public registration form.
     Returns dynamic form fields configured by admin.
+    Answers If-None-Match with 304 while the form is unchanged.
     """
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = db.query(Event.id).filter(Event.id == event_id).first()
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
 
-    fields = db.query(FormField).filter(
+    fields_query = db.query(FormField).filter(
         FormField.event_id == event_id,
         FormField.is_active == True
-    ).order_by(FormField.order_index).all()
-
-    result = []
-    for field in fields:
-        field_data = {
-            "id": field.id,
-            "field_name": field.field_name,
-            "field_label": field.field_label,
-            "field_type": field.field_type,
-            "is_required": field.is_required,
-            "order_index": field.order_index,
-            "section": field.section if hasattr(field, 'section') else None,
-            "field_options": json.loads(field.field_options) if field.field_options else None
-        }
-        result.append(field_data)
+    )
+    etag = compute_etag(request, *row_version(fields_query, FormField))
+
+    def build():
+        fields = fields_query.order_by(FormField.order_index).all()
+
+        result = []
+        for field in fields:
+            field_data = {
+                "id": field.id,
+                "field_name": field.field_name,
+                "field_label": field.field_label,
+                "field_type": field.field_type,
+                "is_required": field.is_required,
+                "order_index": field.order_index,
+                "section": field.section if hasattr(field, 'section') else None,
+                "field_options": json.loads(field.field_options) if field.field_options else None
+            }
+            result.append(field_data)
+        return result
 
-    return result
+    return response_cache.respond(request, etag, build, max_age=300)
 
 @router.get("/events/{event_id}/participant-status")
 async def check_participant_status(
@@ -1,13 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func, text
+from sqlalchemy import text
 from typing import List
 from app.db.database import get_db
 from app.models.user import User
 from app.models.event import Event
 from app.models.event_participant import EventParticipant
 from app.models.allocation import EventAllocation
-from app.models.participant_voucher_redemption import ParticipantVoucherRedemption
+from app.services import voucher_ledger
 from app.models.user_roles import UserRole
 from pydantic import BaseModel
 from datetime import datetime
@@ -119,15 +119,13 @@ async def get_scanner_events(
             
             participants = participants_query.all()
             participant_voucher_info = []
-            
+
+            # Redeemed balances for the whole event in one query
+            balances = voucher_ledger.get_balances(db, [voucher_allocation.id]) if voucher_allocation else {}
+
             for participant in participants:
-                # Count redemptions for this participant
-                redemption_count = 0
-                if voucher_allocation:
-                    redemption_count = db.query(func.sum(ParticipantVoucherRedemption.quantity)).filter(
-                        ParticipantVoucherRedemption.allocation_id == voucher_allocation.id,
-                        ParticipantVoucherRedemption.participant_id == participant.id
-                    ).scalar() or 0
+                balance = balances.get((voucher_allocation.id, participant.id)) if voucher_allocation else None
+                redemption_count = balance.redeemed_quantity if balance else 0
                 
                 remaining_vouchers = max(0, vouchers_per_participant - redemption_count)
                 
@@ -193,40 +191,30 @@ async def redeem_voucher_scan(
         
         vouchers_per_participant = voucher_allocation.drink_vouchers_per_participant or 0
         
-        # Check current redemption count
-        current_redemptions = db.query(func.sum(ParticipantVoucherRedemption.quantity)).filter(
-            ParticipantVoucherRedemption.allocation_id == voucher_allocation.id,
-            ParticipantVoucherRedemption.participant_id == request.participant_id
-        ).scalar() or 0
-        
-        # Check if participant has remaining vouchers
-        remaining_vouchers = vouchers_per_participant - current_redemptions
-        if remaining_vouchers <= 0:
+        # Redeem one voucher only while the participant has some remaining
+        try:
+            total_redeemed = voucher_ledger.redeem(
+                db, voucher_allocation, request.participant_id, 1,
+                redeemed_by=str(scanner_user.id),
+                notes=request.notes or f"Scanned by {request.scanner_email}",
+                limit=vouchers_per_participant
+            )
+        except voucher_ledger.VoucherBalanceExceeded:
+            db.rollback()
             raise HTTPException(status_code=400, detail="No remaining vouchers for this participant")
-        
-        # Create redemption record
-        voucher_redemption = ParticipantVoucherRedemption(
-            allocation_id=voucher_allocation.id,
-            participant_id=request.participant_id,
-            quantity=1,
-            redeemed_by=str(scanner_user.id),
-            redeemed_at=datetime.utcnow(),
-            notes=request.notes or f"Scanned by {request.scanner_email}"
-        )
-        db.add(voucher_redemption)
         db.commit()
-        
 
-        
         return {
             "success": True,
             "message": "Voucher redeemed successfully",
             "participant_id": request.participant_id,
             "participant_name": participant.full_name,
-            "total_redeemed": current_redemptions + 1,
-            "remaining_vouchers": remaining_vouchers - 1
+            "total_redeemed": total_redeemed,
+            "remaining_vouchers": vouchers_per_participant - total_redeemed
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
 
         raise HTTPException(status_code=500, detail=f"Failed to redeem voucher: {str(e)}")
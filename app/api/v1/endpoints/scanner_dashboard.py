@@ -1,6 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 from typing import List, Optional
 from app.db.database import get_db
 from app.models.user import User
@@ -8,6 +7,7 @@ from app.models.event import Event
 from app.models.event_participant import EventParticipant
 from app.models.allocation import EventAllocation
 from app.models.participant_voucher_redemption import ParticipantVoucherRedemption
+from app.services import voucher_ledger
 from app.models.user_roles import UserRole
 from pydantic import BaseModel
 from datetime import datetime
@@ -80,38 +80,24 @@ async def redeem_voucher_scan(
         
         vouchers_per_participant = allocation.drink_vouchers_per_participant or 0
         
-        # Check remaining vouchers
-        total_redeemed = db.query(func.count(ParticipantVoucherRedemption.id)).filter(
+        # Redeem one voucher only while the participant has some remaining
+        try:
+            new_total_redeemed = voucher_ledger.redeem(
+                db, allocation, participant_id, 1,
+                redeemed_by=scanner_email, notes=notes, limit=vouchers_per_participant
+            )
+        except voucher_ledger.VoucherBalanceExceeded:
+            db.rollback()
+            raise HTTPException(status_code=400, detail="No vouchers remaining for this participant")
+
+        # The ledger row written by this redemption
+        redemption = db.query(ParticipantVoucherRedemption).filter(
             ParticipantVoucherRedemption.allocation_id == allocation.id,
             ParticipantVoucherRedemption.participant_id == participant_id
-        ).scalar() or 0
-        
-        remaining = vouchers_per_participant - total_redeemed
-        
-        if remaining <= 0:
-            raise HTTPException(status_code=400, detail="No vouchers remaining for this participant")
-        
-        # Get scanner user ID
-        scanner_user = db.query(User).filter(User.email == scanner_email).first()
-        if not scanner_user:
-            raise HTTPException(status_code=404, detail="Scanner user not found")
-        
-        # Create redemption record
-        redemption = ParticipantVoucherRedemption(
-            allocation_id=allocation.id,
-            participant_id=participant_id,
-            quantity=1,
-            redeemed_at=datetime.utcnow(),
-            redeemed_by=scanner_email,
-            notes=notes
-        )
-        
-        db.add(redemption)
+        ).order_by(ParticipantVoucherRedemption.id.desc()).first()
         db.commit()
-        db.refresh(redemption)
-        
+
         # Return updated voucher info
-        new_total_redeemed = total_redeemed + 1
         new_remaining = vouchers_per_participant - new_total_redeemed
         
         return {
@@ -124,6 +110,8 @@ async def redeem_voucher_scan(
             "redemption_id": redemption.id
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error redeeming voucher: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to redeem voucher: {str(e)}")
@@ -1,6 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query, Response
 from sqlalchemy.orm import Session
 from app.db.database import get_db
+from app import crud
 from app.models.perdiem_request import PerdiemRequest, PerdiemStatus
 from app.models.event import Event
 from app.models.tenant import Tenant
@@ -9,329 +10,195 @@ from app.models.user import User
 from app.models.event_participant import EventParticipant
 from app.schemas.perdiem_request import PerdiemApprovalAction
 from app.core.deps import get_current_user
+from app.core.query_stats import query_budget
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
 router = APIRouter()
 
-@router.get("/{tenant_slug}/per-diem-approvals/pending")
-async def get_tenant_pending_approvals(
+def _get_tenant_or_404(db: Session, tenant_slug: str) -> Tenant:
+    tenant = db.query(Tenant).filter(Tenant.slug == tenant_slug).first()
+    if not tenant:
+        raise HTTPException(status_code=404, detail="Tenant not found")
+    return tenant
+
+
+def _serialize_queue_request(request: PerdiemRequest, queue: str) -> dict:
+    """Format a per diem request for the approval queues (participant/event preloaded)"""
+    participant = request.participant
+    event = participant.event
+    item = {
+        "id": request.id,
+        "participant_name": participant.full_name or participant.email,
+        "participant_email": participant.email,
+        "event_name": event.title,
+        "event_dates": f"{event.start_date} to {event.end_date}",
+        "arrival_date": str(request.arrival_date),
+        "departure_date": str(request.departure_date),
+        "requested_days": request.requested_days,
+        "daily_rate": float(request.daily_rate) if request.daily_rate else None,
+        "total_amount": float(request.total_amount) if request.total_amount else None,
+        "currency": request.currency,
+        "purpose": request.purpose or request.justification or "Event participation",
+        "approver_title": request.approver_title or "Per Diem Approver",
+        "phone_number": request.phone_number or participant.phone_number or "",
+        "payment_method": request.payment_method.value if request.payment_method else "CASH",
+        "accommodation_type": request.accommodation_type or event.accommodation_type,
+        "accommodation_name": request.accommodation_name,
+        "accommodation_days": request.accommodation_days,
+        "accommodation_rate": float(request.accommodation_rate) if request.accommodation_rate else None,
+        "accommodation_deduction": float(request.accommodation_deduction) if request.accommodation_deduction else None,
+        "per_diem_base_amount": float(request.per_diem_base_amount) if request.per_diem_base_amount else None,
+        "status": request.status,
+        "created_at": request.created_at.isoformat() if request.created_at else None
+    }
+
+    if queue in ("approved", "issued", "completed"):
+        item.update({
+            "approved_by": request.approved_by,
+            "approved_by_name": request.approver_full_name,
+            "approved_by_email": request.approved_by,
+            "approved_at": request.approved_at.isoformat() if request.approved_at else None,
+            "budget_code": request.budget_code,
+            "activity_code": request.activity_code,
+            "cost_center": request.cost_center,
+            "section": request.section,
+            "approver_role": request.approver_role
+        })
+    elif queue == "rejected":
+        item.update({
+            "rejected_by": request.rejected_by,
+            "rejected_by_name": request.approver_full_name,
+            "rejected_by_email": request.rejected_by,
+            "rejected_at": request.rejected_at.isoformat() if request.rejected_at else None,
+            "rejection_reason": request.rejection_reason
+        })
+
+    return item
+
+
+def _queue_response(
+    queue: str,
+    tenant_slug: str,
+    response: Response,
+    current_user: User,
+    db: Session,
+    limit: Optional[int],
+    before: Optional[int]
+) -> List[dict]:
+    tenant = _get_tenant_or_404(db, tenant_slug)
+    requests, next_cursor = crud.perdiem_request.get_tenant_queues(
+        db,
+        tenant_id=tenant.id,
+        approver_email=current_user.email,
+        queues=[queue],
+        limit=limit,
+        before_id=before
+    )[queue]
+
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = str(next_cursor)
+    return [_serialize_queue_request(request, queue) for request in requests]
+
+
+@router.get("/{tenant_slug}/per-diem-approvals/queues")
+@query_budget(10)
+def get_tenant_approval_queues(
     tenant_slug: str,
+    counts_only: bool = False,
+    limit: Optional[int] = Query(None, ge=1, le=500),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get pending per diem requests for a specific tenant"""
-    
-    # Get tenant
-    tenant = db.query(Tenant).filter(Tenant.slug == tenant_slug).first()
-    if not tenant:
-        raise HTTPException(status_code=404, detail="Tenant not found")
-    
-    # Get pending requests for this tenant where current user is the approver
-    requests = db.query(PerdiemRequest).join(
-        EventParticipant, PerdiemRequest.participant_id == EventParticipant.id
-    ).join(
-        Event, EventParticipant.event_id == Event.id
-    ).filter(
-        Event.tenant_id == tenant.id,
-        PerdiemRequest.approver_email == current_user.email,
-        PerdiemRequest.status == "pending_approval"
-    ).all()
-    
-    # Format response to match frontend expectations
-    result = []
-    for request in requests:
-        participant = db.query(EventParticipant).filter(EventParticipant.id == request.participant_id).first()
-        event = db.query(Event).filter(Event.id == participant.event_id).first() if participant else None
-        
-        if participant and event:
-            result.append({
-                "id": request.id,
-                "participant_name": participant.full_name or participant.email,
-                "participant_email": participant.email,
-                "event_name": event.title,
-                "event_dates": f"{event.start_date} to {event.end_date}",
-                "arrival_date": str(request.arrival_date),
-                "departure_date": str(request.departure_date),
-                "requested_days": request.requested_days,
-                "daily_rate": float(request.daily_rate) if request.daily_rate else None,
-                "total_amount": float(request.total_amount) if request.total_amount else None,
-                "currency": request.currency,
-                "purpose": request.purpose or request.justification or "Event participation",
-                "approver_title": request.approver_title or "Per Diem Approver",
-                "phone_number": request.phone_number or participant.phone_number or "",
-                "payment_method": request.payment_method.value if request.payment_method else "CASH",
-                "accommodation_type": request.accommodation_type or event.accommodation_type,
-                "accommodation_name": request.accommodation_name,
-                "accommodation_days": request.accommodation_days,
-                "accommodation_rate": float(request.accommodation_rate) if request.accommodation_rate else None,
-                "accommodation_deduction": float(request.accommodation_deduction) if request.accommodation_deduction else None,
-                "per_diem_base_amount": float(request.per_diem_base_amount) if request.per_diem_base_amount else None,
-                "status": request.status,
-                "created_at": request.created_at.isoformat() if request.created_at else None
-            })
+    """Get all five approval queues (or just their counts) in one call.
+
+    With ``limit``, each queue returns its newest ``limit`` requests and a
+    ``next_cursors`` entry to continue on the per-queue endpoint via ``before``.
+    """
+    tenant = _get_tenant_or_404(db, tenant_slug)
+    counts = crud.perdiem_request.count_tenant_queues(
+        db, tenant_id=tenant.id, approver_email=current_user.email
+    )
+    if counts_only:
+        return {"counts": counts}
+
+    queues = crud.perdiem_request.get_tenant_queues(
+        db, tenant_id=tenant.id, approver_email=current_user.email, limit=limit
+    )
+    return {
+        "counts": counts,
+        "queues": {
+            queue: [_serialize_queue_request(request, queue) for request in requests]
+            for queue, (requests, _) in queues.items()
+        },
+        "next_cursors": {queue: next_cursor for queue, (_, next_cursor) in queues.items()}
+    }
+
 
-    return result
+@router.get("/{tenant_slug}/per-diem-approvals/pending")
+@query_budget(10)
+def get_tenant_pending_approvals(
+    tenant_slug: str,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    before: Optional[int] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get pending per diem requests for a specific tenant where current user is the approver"""
+    return _queue_response("pending", tenant_slug, response, current_user, db, limit, before)
 
 @router.get("/{tenant_slug}/per-diem-approvals/approved")
-async def get_tenant_approved_requests(
+@query_budget(10)
+def get_tenant_approved_requests(
     tenant_slug: str,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    before: Optional[int] = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get approved per diem requests for a specific tenant"""
-    
-    # Get tenant
-    tenant = db.query(Tenant).filter(Tenant.slug == tenant_slug).first()
-    if not tenant:
-        raise HTTPException(status_code=404, detail="Tenant not found")
-    
-    # Get approved requests for this tenant
-    requests = db.query(PerdiemRequest).join(
-        EventParticipant, PerdiemRequest.participant_id == EventParticipant.id
-    ).join(
-        Event, EventParticipant.event_id == Event.id
-    ).filter(
-        Event.tenant_id == tenant.id,
-        PerdiemRequest.status == "approved"
-    ).all()
-    
-    # Format response to match frontend expectations
-    result = []
-    for request in requests:
-        participant = db.query(EventParticipant).filter(EventParticipant.id == request.participant_id).first()
-        event = db.query(Event).filter(Event.id == participant.event_id).first() if participant else None
-        
-        if participant and event:
-            result.append({
-                "id": request.id,
-                "participant_name": participant.full_name or participant.email,
-                "participant_email": participant.email,
-                "event_name": event.title,
-                "event_dates": f"{event.start_date} to {event.end_date}",
-                "arrival_date": str(request.arrival_date),
-                "departure_date": str(request.departure_date),
-                "requested_days": request.requested_days,
-                "daily_rate": float(request.daily_rate) if request.daily_rate else None,
-                "total_amount": float(request.total_amount) if request.total_amount else None,
-                "currency": request.currency,
-                "purpose": request.purpose or request.justification or "Event participation",
-                "approver_title": request.approver_title or "Per Diem Approver",
-                "phone_number": request.phone_number or participant.phone_number or "",
-                "payment_method": request.payment_method.value if request.payment_method else "CASH",
-                "accommodation_type": request.accommodation_type or event.accommodation_type,
-                "accommodation_name": request.accommodation_name,
-                "accommodation_days": request.accommodation_days,
-                "accommodation_rate": float(request.accommodation_rate) if request.accommodation_rate else None,
-                "accommodation_deduction": float(request.accommodation_deduction) if request.accommodation_deduction else None,
-                "per_diem_base_amount": float(request.per_diem_base_amount) if request.per_diem_base_amount else None,
-                "status": request.status,
-                "created_at": request.created_at.isoformat() if request.created_at else None,
-                "approved_by": request.approved_by,
-                "approved_by_name": request.approver_full_name,
-                "approved_by_email": request.approved_by,
-                "approved_at": request.approved_at.isoformat() if request.approved_at else None,
-                "budget_code": request.budget_code,
-                "activity_code": request.activity_code,
-                "cost_center": request.cost_center,
-                "section": request.section,
-                "approver_role": request.approver_role
-            })
-
-    return result
+    return _queue_response("approved", tenant_slug, response, current_user, db, limit, before)
 
 @router.get("/{tenant_slug}/per-diem-approvals/issued")
-async def get_tenant_issued_requests(
+@query_budget(10)
+def get_tenant_issued_requests(
     tenant_slug: str,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    before: Optional[int] = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get issued per diem requests for a specific tenant"""
-    
-    # Get tenant
-    tenant = db.query(Tenant).filter(Tenant.slug == tenant_slug).first()
-    if not tenant:
-        raise HTTPException(status_code=404, detail="Tenant not found")
-    
-    # Get issued requests for this tenant
-    requests = db.query(PerdiemRequest).join(
-        EventParticipant, PerdiemRequest.participant_id == EventParticipant.id
-    ).join(
-        Event, EventParticipant.event_id == Event.id
-    ).filter(
-        Event.tenant_id == tenant.id,
-        PerdiemRequest.status == "issued"
-    ).all()
-    
-    # Format response to match frontend expectations
-    result = []
-    for request in requests:
-        participant = db.query(EventParticipant).filter(EventParticipant.id == request.participant_id).first()
-        event = db.query(Event).filter(Event.id == participant.event_id).first() if participant else None
-        
-        if participant and event:
-            result.append({
-                "id": request.id,
-                "participant_name": participant.full_name or participant.email,
-                "participant_email": participant.email,
-                "event_name": event.title,
-                "event_dates": f"{event.start_date} to {event.end_date}",
-                "arrival_date": str(request.arrival_date),
-                "departure_date": str(request.departure_date),
-                "requested_days": request.requested_days,
-                "daily_rate": float(request.daily_rate) if request.daily_rate else None,
-                "total_amount": float(request.total_amount) if request.total_amount else None,
-                "currency": request.currency,
-                "purpose": request.purpose or request.justification or "Event participation",
-                "approver_title": request.approver_title or "Per Diem Approver",
-                "phone_number": request.phone_number or participant.phone_number or "",
-                "payment_method": request.payment_method.value if request.payment_method else "CASH",
-                "accommodation_type": request.accommodation_type or event.accommodation_type,
-                "accommodation_name": request.accommodation_name,
-                "accommodation_days": request.accommodation_days,
-                "accommodation_rate": float(request.accommodation_rate) if request.accommodation_rate else None,
-                "accommodation_deduction": float(request.accommodation_deduction) if request.accommodation_deduction else None,
-                "per_diem_base_amount": float(request.per_diem_base_amount) if request.per_diem_base_amount else None,
-                "status": request.status,
-                "created_at": request.created_at.isoformat() if request.created_at else None,
-                "approved_by": request.approved_by,
-                "approved_by_name": request.approver_full_name,
-                "approved_by_email": request.approved_by,
-                "approved_at": request.approved_at.isoformat() if request.approved_at else None,
-                "budget_code": request.budget_code,
-                "activity_code": request.activity_code,
-                "cost_center": request.cost_center,
-                "section": request.section,
-                "approver_role": request.approver_role
-            })
-
-    return result
+    return _queue_response("issued", tenant_slug, response, current_user, db, limit, before)
 
 @router.get("/{tenant_slug}/per-diem-approvals/rejected")
-async def get_tenant_rejected_requests(
+@query_budget(10)
+def get_tenant_rejected_requests(
     tenant_slug: str,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    before: Optional[int] = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get rejected per diem requests for a specific tenant"""
-    
-    # Get tenant
-    tenant = db.query(Tenant).filter(Tenant.slug == tenant_slug).first()
-    if not tenant:
-        raise HTTPException(status_code=404, detail="Tenant not found")
-    
-    # Get rejected requests for this tenant
-    requests = db.query(PerdiemRequest).join(
-        EventParticipant, PerdiemRequest.participant_id == EventParticipant.id
-    ).join(
-        Event, EventParticipant.event_id == Event.id
-    ).filter(
-        Event.tenant_id == tenant.id,
-        PerdiemRequest.status == "rejected"
-    ).all()
-    
-    # Format response to match frontend expectations
-    result = []
-    for request in requests:
-        participant = db.query(EventParticipant).filter(EventParticipant.id == request.participant_id).first()
-        event = db.query(Event).filter(Event.id == participant.event_id).first() if participant else None
-        
-        if participant and event:
-            result.append({
-                "id": request.id,
-                "participant_name": participant.full_name or participant.email,
-                "participant_email": participant.email,
-                "event_name": event.title,
-                "event_dates": f"{event.start_date} to {event.end_date}",
-                "arrival_date": str(request.arrival_date),
-                "departure_date": str(request.departure_date),
-                "requested_days": request.requested_days,
-                "daily_rate": float(request.daily_rate) if request.daily_rate else None,
-                "total_amount": float(request.total_amount) if request.total_amount else None,
-                "currency": request.currency,
-                "purpose": request.purpose or request.justification or "Event participation",
-                "approver_title": request.approver_title or "Per Diem Approver",
-                "phone_number": request.phone_number or participant.phone_number or "",
-                "payment_method": request.payment_method.value if request.payment_method else "CASH",
-                "accommodation_type": request.accommodation_type or event.accommodation_type,
-                "accommodation_name": request.accommodation_name,
-                "status": request.status,
-                "created_at": request.created_at.isoformat() if request.created_at else None,
-                "rejected_by": request.rejected_by,
-                "rejected_by_name": request.approver_full_name,
-                "rejected_by_email": request.rejected_by,
-                "rejected_at": request.rejected_at.isoformat() if request.rejected_at else None,
-                "rejection_reason": request.rejection_reason
-            })
-    
-    return result
+    return _queue_response("rejected", tenant_slug, response, current_user, db, limit, before)
 
 @router.get("/{tenant_slug}/per-diem-approvals/completed")
-async def get_tenant_completed_requests(
+@query_budget(10)
+def get_tenant_completed_requests(
     tenant_slug: str,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    before: Optional[int] = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get completed per diem requests for a specific tenant (received by participant)"""
-
-    # Get tenant
-    tenant = db.query(Tenant).filter(Tenant.slug == tenant_slug).first()
-    if not tenant:
-        raise HTTPException(status_code=404, detail="Tenant not found")
-
-    # Get completed requests for this tenant
-    requests = db.query(PerdiemRequest).join(
-        EventParticipant, PerdiemRequest.participant_id == EventParticipant.id
-    ).join(
-        Event, EventParticipant.event_id == Event.id
-    ).filter(
-        Event.tenant_id == tenant.id,
-        PerdiemRequest.status == "completed"
-    ).all()
-
-    # Format response to match frontend expectations
-    result = []
-    for request in requests:
-        participant = db.query(EventParticipant).filter(EventParticipant.id == request.participant_id).first()
-        event = db.query(Event).filter(Event.id == participant.event_id).first() if participant else None
-
-        if participant and event:
-            result.append({
-                "id": request.id,
-                "participant_name": participant.full_name or participant.email,
-                "participant_email": participant.email,
-                "event_name": event.title,
-                "event_dates": f"{event.start_date} to {event.end_date}",
-                "arrival_date": str(request.arrival_date),
-                "departure_date": str(request.departure_date),
-                "requested_days": request.requested_days,
-                "daily_rate": float(request.daily_rate) if request.daily_rate else None,
-                "total_amount": float(request.total_amount) if request.total_amount else None,
-                "currency": request.currency,
-                "purpose": request.purpose or request.justification or "Event participation",
-                "approver_title": request.approver_title or "Per Diem Approver",
-                "phone_number": request.phone_number or participant.phone_number or "",
-                "payment_method": request.payment_method.value if request.payment_method else "CASH",
-                "accommodation_type": request.accommodation_type or event.accommodation_type,
-                "accommodation_name": request.accommodation_name,
-                "accommodation_days": request.accommodation_days,
-                "accommodation_rate": float(request.accommodation_rate) if request.accommodation_rate else None,
-                "accommodation_deduction": float(request.accommodation_deduction) if request.accommodation_deduction else None,
-                "per_diem_base_amount": float(request.per_diem_base_amount) if request.per_diem_base_amount else None,
-                "status": request.status,
-                "created_at": request.created_at.isoformat() if request.created_at else None,
-                "approved_by": request.approved_by,
-                "approved_by_name": request.approver_full_name,
-                "approved_by_email": request.approved_by,
-                "approved_at": request.approved_at.isoformat() if request.approved_at else None,
-                "budget_code": request.budget_code,
-                "activity_code": request.activity_code,
-                "cost_center": request.cost_center,
-                "section": request.section,
-                "approver_role": request.approver_role
-            })
-
-    return result
+    return _queue_response("completed", tenant_slug, response, current_user, db, limit, before)
 
 @router.post("/{tenant_slug}/per-diem-approvals/{request_id}/approve")
 async def approve_tenant_perdiem(
@@ -1,10 +1,11 @@
 # File: app/api/v1/endpoints/tenants.py (ENHANCED)
 from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Request
 from sqlalchemy.orm import Session
 from app import crud, schemas
 from app.api import deps
 from app.db.database import get_db
+from app.core.http_cache import compute_etag, response_cache, row_version
 from app.models.user import UserRole
 from app.core.enhanced_notifications import notification_service
 from app.core.tenant_admin_assignment import assign_user_to_tenant_on_admin_change
@@ -44,33 +45,13 @@ def read_tenants(
     else:
         tenants = crud.tenant.get_multi(db, skip=skip, limit=limit)
     
-    # Add user statistics for each tenant
+    # Add user statistics for each tenant from the precomputed stats table
+    stats = crud.tenant_stats.get_for_tenants(db, tenant_ids=[tenant.slug for tenant in tenants])
     enhanced_tenants = []
     for tenant in tenants:
-        # Get user statistics from user_tenants table
-        tenant_users = crud.user_tenant.get_tenant_users(db, tenant_id=tenant.slug)
-        total_users = len(tenant_users)
-        active_users = len([ut for ut in tenant_users if ut.is_active])
-        
-        # Get pending users (legacy support)
-        legacy_users = crud.user.get_by_tenant(db, tenant_id=tenant.slug, limit=1000)
-        pending_users = len([u for u in legacy_users if u.status.value == "pending_approval"])
-        
-        # Get last user activity from tenant users
-        last_activity = None
-        if tenant_users:
-            user_ids = [ut.user_id for ut in tenant_users[:5]]
-            users = [crud.user.get(db, id=uid) for uid in user_ids]
-            users = [u for u in users if u and u.last_login]
-            if users:
-                last_activity = max([u.last_login for u in users])
-        
         tenant_data = {
             **tenant.__dict__,
-            "total_users": total_users,
-            "active_users": active_users,
-            "pending_users": pending_users,
-            "last_user_activity": last_activity
+            **stats[tenant.slug],
         }
         enhanced_tenants.append(schemas.TenantWithStats(**tenant_data))
     
@@ -332,19 +313,11 @@ def read_tenant_by_public_id(
             )
     
     # Add statistics
-    total_users = len(crud.user.get_by_tenant(db, tenant_id=tenant.slug, limit=1000))
-    active_users = len([u for u in crud.user.get_by_tenant(db, tenant_id=tenant.slug, limit=1000) if u.is_active])
-    pending_users = len([u for u in crud.user.get_by_tenant(db, tenant_id=tenant.slug, limit=1000) if u.status.value == "pending_approval"])
-    
-    users = crud.user.get_by_tenant(db, tenant_id=tenant.slug, limit=5)
-    last_activity = max([u.last_login for u in users if u.last_login], default=None)
+    stats = crud.tenant_stats.get_for_tenant(db, tenant_id=tenant.slug)
     
     tenant_data = {
         **tenant.__dict__,
-        "total_users": total_users,
-        "active_users": active_users,
-        "pending_users": pending_users,
-        "last_user_activity": last_activity
+        **stats,
     }
     
     return schemas.TenantWithStats(**tenant_data)
@@ -363,12 +336,7 @@ def read_tenant_by_slug(
         )
     
     # Add statistics
-    total_users = len(crud.user.get_by_tenant(db, tenant_id=tenant.slug, limit=1000))
-    active_users = len([u for u in crud.user.get_by_tenant(db, tenant_id=tenant.slug, limit=1000) if u.is_active])
-    pending_users = len([u for u in crud.user.get_by_tenant(db, tenant_id=tenant.slug, limit=1000) if u.status.value == "pending_approval"])
-    
-    users = crud.user.get_by_tenant(db, tenant_id=tenant.slug, limit=5)
-    last_activity = max([u.last_login for u in users if u.last_login], default=None)
+    stats = crud.tenant_stats.get_for_tenant(db, tenant_id=tenant.slug)
     
     return schemas.TenantWithStats(
         id=tenant.id,
@@ -382,10 +350,10 @@ def read_tenant_by_slug(
         created_at=tenant.created_at,
         updated_at=tenant.updated_at,
         country=tenant.country,
-        total_users=total_users,
-        active_users=active_users,
-        pending_users=pending_users,
-        last_user_activity=last_activity
+        total_users=stats["total_users"],
+        active_users=stats["active_users"],
+        pending_users=stats["pending_users"],
+        last_user_activity=stats["last_user_activity"]
     )
 
 @router.get("/{tenant_slug}", response_model=schemas.TenantWithStats)
@@ -412,19 +380,11 @@ def read_tenant_by_slug_simple(
         )
     
     # Add statistics
-    total_users = len(crud.user.get_by_tenant(db, tenant_id=tenant.slug, limit=1000))
-    active_users = len([u for u in crud.user.get_by_tenant(db, tenant_id=tenant.slug, limit=1000) if u.is_active])
-    pending_users = len([u for u in crud.user.get_by_tenant(db, tenant_id=tenant.slug, limit=1000) if u.status.value == "pending_approval"])
-    
-    users = crud.user.get_by_tenant(db, tenant_id=tenant.slug, limit=5)
-    last_activity = max([u.last_login for u in users if u.last_login], default=None)
+    stats = crud.tenant_stats.get_for_tenant(db, tenant_id=tenant.slug)
     
     tenant_data = {
         **tenant.__dict__,
-        "total_users": total_users,
-        "active_users": active_users,
-        "pending_users": pending_users,
-        "last_user_activity": last_activity
+        **stats,
     }
     
     return schemas.TenantWithStats(**tenant_data)
@@ -451,19 +411,11 @@ def read_tenant_by_id(
         )
     
     # Add statistics
-    total_users = len(crud.user.get_by_tenant(db, tenant_id=tenant.slug, limit=1000))
-    active_users = len([u for u in crud.user.get_by_tenant(db, tenant_id=tenant.slug, limit=1000) if u.is_active])
-    pending_users = len([u for u in crud.user.get_by_tenant(db, tenant_id=tenant.slug, limit=1000) if u.status.value == "pending_approval"])
-    
-    users = crud.user.get_by_tenant(db, tenant_id=tenant.slug, limit=5)
-    last_activity = max([u.last_login for u in users if u.last_login], default=None)
+    stats = crud.tenant_stats.get_for_tenant(db, tenant_id=tenant.slug)
     
     tenant_data = {
         **tenant.__dict__,
-        "total_users": total_users,
-        "active_users": active_users,
-        "pending_users": pending_users,
-        "last_user_activity": last_activity
+        **stats,
     }
     
     return schemas.TenantWithStats(**tenant_data)
@@ -498,6 +450,7 @@ def get_my_tenant_mobile(
 @router.get("/mobile/all", response_model=List[schemas.TenantBasic])
 def get_all_tenants_mobile(
     *,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: schemas.User = Depends(deps.get_current_user),
 ) -> Any:
@@ -506,10 +459,16 @@ def get_all_tenants_mobile(
     Returns only basic tenant info (id, name, slug, country, city) for
     project visit destinations. Available to any authenticated user.
     """
-    tenants = crud.tenant.get_multi(db, limit=1000)
-    # Filter to only active tenants
-    active_tenants = [t for t in tenants if t.is_active]
-    return active_tenants
+    from app.models.tenant import Tenant
+
+    etag = compute_etag(request, *row_version(db.query(Tenant), Tenant))
+
+    def build():
+        tenants = crud.tenant.get_multi(db, limit=1000)
+        # Filter to only active tenants
+        return [schemas.TenantBasic.model_validate(t) for t in tenants if t.is_active]
+
+    return response_cache.respond(request, etag, build, max_age=3600, private=True)
 
 
 @router.post("/update-timezones")
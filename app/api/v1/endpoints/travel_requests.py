@@ -6,7 +6,6 @@ import sqlalchemy as sa
 from typing import List, Optional
 from datetime import datetime
 import logging
-import os
 
 from app.db.database import get_db
 from app.models.travel_request import (
@@ -28,21 +27,6 @@ from app.schemas.travel_request import (
 from app.services.traveler_validation_service import traveler_validation_service
 from app.api.deps import get_current_user
 
-# Azure Blob Storage
-try:
-    from azure.storage.blob import BlobServiceClient
-    azure_connection_string = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
-    azure_container_name = os.getenv("AZURE_STORAGE_CONTAINER", "travel-tickets")
-    if azure_connection_string:
-        blob_service_client = BlobServiceClient.from_connection_string(azure_connection_string)
-        azure_available = True
-    else:
-        blob_service_client = None
-        azure_available = False
-except Exception as e:
-    blob_service_client = None
-    azure_available = False
-
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
@@ -1003,8 +987,6 @@ async def save_traveler_passport(
 
     # Generate checklist for this traveler if nationality is provided
     if passport_data.nationality and travel_request.destinations:
-        from app.models.country_travel_requirements import CountryTravelRequirement
-        
         # Map ISO 3-letter codes to full country names (same as mobile app)
         iso_to_country = {
             'CAN': 'Canada', 'USA': 'United States', 'GBR': 'United Kingdom',
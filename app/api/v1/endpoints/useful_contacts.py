@@ -1,9 +1,10 @@
 from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Request
 from sqlalchemy.orm import Session
 from app import crud, schemas
 from app.api import deps
 from app.db.database import get_db
+from app.core.http_cache import compute_etag, response_cache, row_version
 from app.models.user import UserRole
 import logging
 
@@ -19,14 +20,22 @@ def test_endpoint():
 
 @router.get("/", response_model=List[schemas.UsefulContact])
 def get_contacts(
+    request: Request,
     db: Session = Depends(get_db),
     current_user: schemas.User = Depends(deps.get_current_user),
     tenant_context: str = Depends(deps.get_tenant_context),
 ) -> Any:
     """Get all useful contacts for tenant"""
-    contacts = crud.useful_contact.get_by_tenant(db, tenant_id=tenant_context)
-    
-    return contacts
+    from app.models.useful_contact import UsefulContact
+
+    contacts_query = db.query(UsefulContact).filter(UsefulContact.tenant_id == tenant_context)
+    etag = compute_etag(request, tenant_context, *row_version(contacts_query, UsefulContact))
+
+    def build():
+        contacts = crud.useful_contact.get_by_tenant(db, tenant_id=tenant_context)
+        return [schemas.UsefulContact.model_validate(contact) for contact in contacts]
+
+    return response_cache.respond(request, etag, build, max_age=300, private=True)
 
 @router.get("/mobile")
 def get_contacts_for_mobile(
@@ -1,6 +1,7 @@
 # File: app/api/v1/endpoints/vetting_committee.py
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
 from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, func, select
 from sqlalchemy.orm import Session
 from typing import List
 import csv
@@ -8,6 +9,7 @@ import io
 
 from app.db.database import get_db
 from app.api.deps import get_current_user
+from app.core import capabilities
 from app.models.user import User, UserRole, UserStatus, AuthProvider
 from app.models.event_participant import EventParticipant
 from app.schemas.vetting_committee import (
@@ -133,37 +135,24 @@ def get_my_committees(
 ):
     """Get committees where current user is a member or approver"""
 
-    # Get all user roles (primary + secondary)
-    all_roles = getattr(current_user, 'all_roles', [current_user.role.value if current_user.role else ''])
-    vetting_roles = ['VETTING_COMMITTEE', 'vetting_committee']
-    approver_roles = ['VETTING_APPROVER', 'vetting_approver']
-
-    has_vetting_role = current_user.role == UserRole.VETTING_COMMITTEE or \
-                       any(role in vetting_roles for role in all_roles)
-    has_approver_role = current_user.role == UserRole.VETTING_APPROVER or \
-                        any(role in approver_roles for role in all_roles)
+    caps = capabilities.resolve(db, current_user)
+    reasons = []
+    if caps.has_any(["VETTING_COMMITTEE"]):
+        reasons.append("committee_member")
+    if caps.has_any(["VETTING_APPROVER"]):
+        reasons.append("approver")
 
     committees = []
-
-    # Get committees where user is a member
-    if has_vetting_role:
-        member_committees = crud_vetting.get_committee_for_user(db, current_user.email)
-        committees.extend(member_committees)
-
-    # Get committees where user is an approver
-    if has_approver_role:
-        approver_committees = db.query(VettingCommittee).filter(
-            VettingCommittee.approver_email == current_user.email
-        ).all()
-        # Add only if not already in list
-        for c in approver_committees:
-            if c.id not in [x.id for x in committees]:
-                committees.append(c)
+    if reasons:
+        committees = crud_vetting.get_committees_for_user(
+            db, user_id=current_user.id, email=current_user.email, reasons=reasons
+        )
 
     # If user has neither role but is in a committee by email, still return those
     if not committees:
-        member_committees = crud_vetting.get_committee_for_user(db, current_user.email)
-        committees.extend(member_committees)
+        committees = crud_vetting.get_committees_for_user(
+            db, user_id=current_user.id, email=current_user.email, reasons=["committee_member"]
+        )
 
     return committees
 
@@ -174,93 +163,38 @@ def get_my_vetting_events(
 ):
     """Get events where current user has vetting roles with event details"""
 
-    from app.models.event import Event
-    from sqlalchemy import or_, func
     import logging
     logger = logging.getLogger(__name__)
 
-    user_email = current_user.email.lower() if current_user.email else ""
-    logger.info(f"🔍 my-vetting-events called for user: {user_email}, role: {current_user.role}")
-
-    # Get committees where user is member or approver
-    committees = []
-
-    # Check by role first
-    if current_user.role == UserRole.VETTING_COMMITTEE:
-        committees.extend(crud_vetting.get_committee_for_user(db, current_user.email))
-    elif current_user.role == UserRole.VETTING_APPROVER:
-        committees.extend(db.query(VettingCommittee).filter(
-            func.lower(VettingCommittee.approver_email) == user_email
-        ).all())
-
-    # Also check by database relationships (for users who might be members/approvers without explicit roles)
-    # Check if user is a committee member (case-insensitive)
-    member_committees = db.query(VettingCommittee).join(
-        VettingCommitteeMember, VettingCommittee.id == VettingCommitteeMember.committee_id
-    ).filter(
-        func.lower(VettingCommitteeMember.email) == user_email
-    ).all()
-    committees.extend(member_committees)
+    logger.info(f"🔍 my-vetting-events called for user: {current_user.email}, role: {current_user.role}")
 
-    # Check if user is an approver by email (case-insensitive) or user_id
-    approver_committees = db.query(VettingCommittee).filter(
-        or_(
-            func.lower(VettingCommittee.approver_email) == user_email,
-            VettingCommittee.approver_id == current_user.id
-        )
-    ).all()
-    committees.extend(approver_committees)
-    
-    # Check new approvers table
-    from app.models.vetting_committee import VettingCommitteeApprover
-    new_approver_committees = db.query(VettingCommittee).join(
-        VettingCommitteeApprover, VettingCommittee.id == VettingCommitteeApprover.committee_id
-    ).filter(
-        func.lower(VettingCommitteeApprover.email) == user_email
-    ).all()
-    committees.extend(new_approver_committees)
-    
-    # Remove duplicates
-    unique_committees = {}
-    for committee in committees:
-        unique_committees[committee.id] = committee
-    committees = list(unique_committees.values())
-    
-    # Get event details for each committee
+    # Committees where user is member or approver (legacy fields or approvers table)
     vetting_events = []
-    for committee in committees:
-        event = db.query(Event).filter(Event.id == committee.event_id).first()
-        if event:
-            # Get tenant information
-            from app.models.tenant import Tenant
-            tenant = db.query(Tenant).filter(Tenant.id == event.tenant_id).first() if event.tenant_id else None
-            
-            # Determine user's role in this committee
-            role = "unknown"
-            if current_user.role == UserRole.VETTING_COMMITTEE or any(
-                member.email == current_user.email for member in committee.members
-            ):
-                role = "committee_member"
-            elif (current_user.role == UserRole.VETTING_APPROVER or 
-                  committee.approver_email == current_user.email or 
-                  committee.approver_id == current_user.id):
-                role = "approver"
-            
-            vetting_events.append({
-                "event_id": event.id,
-                "event_title": event.title,
-                "event_start_date": event.start_date,
-                "event_end_date": event.end_date,
-                "committee_id": committee.id,
-                "committee_status": committee.status.value,
-                "role": role,
-                "selection_start_date": committee.selection_start_date,
-                "selection_end_date": committee.selection_end_date,
-                "tenant_id": tenant.id if tenant else event.tenant_id,
-                "tenant_name": tenant.name if tenant else "Unknown Tenant",
-                "tenant_slug": tenant.slug if tenant else event.tenant_id
-            })
-    
+    for committee, event, tenant, reasons in crud_vetting.get_vetting_events_for_user(
+        db, user_id=current_user.id, email=current_user.email
+    ):
+        # Determine user's role in this committee
+        role = "unknown"
+        if current_user.role == UserRole.VETTING_COMMITTEE or "committee_member" in reasons:
+            role = "committee_member"
+        elif current_user.role == UserRole.VETTING_APPROVER or "approver" in reasons:
+            role = "approver"
+
+        vetting_events.append({
+            "event_id": event.id,
+            "event_title": event.title,
+            "event_start_date": event.start_date,
+            "event_end_date": event.end_date,
+            "committee_id": committee.id,
+            "committee_status": committee.status.value,
+            "role": role,
+            "selection_start_date": committee.selection_start_date,
+            "selection_end_date": committee.selection_end_date,
+            "tenant_id": tenant.id if tenant else event.tenant_id,
+            "tenant_name": tenant.name if tenant else "Unknown Tenant",
+            "tenant_slug": tenant.slug if tenant else event.tenant_id
+        })
+
     return {"vetting_events": vetting_events}
 
 @router.get("/{committee_id}/participants")
@@ -276,85 +210,55 @@ def get_committee_participants(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
     
     # Check permissions based on committee status
+    caps = capabilities.resolve(db, current_user)
     if committee.status == VettingStatus.OPEN:
         # Only committee members can view when open
         if current_user.role == UserRole.VETTING_COMMITTEE:
-            is_member = any(member.email == current_user.email for member in committee.members)
-            if not is_member:
+            if not caps.is_committee_member(committee.id):
                 raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
         elif current_user.role not in [UserRole.SUPER_ADMIN, UserRole.EVENT_ADMIN]:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
-    elif committee.status == VettingStatus.PENDING_APPROVAL:
-        # Committee members (read-only) and approvers can view
+    elif committee.status in (VettingStatus.PENDING_APPROVAL, VettingStatus.APPROVED):
+        # Committee members (read-only) and approvers (legacy or new system) can view
         if current_user.role == UserRole.VETTING_COMMITTEE:
-            is_member = any(member.email == current_user.email for member in committee.members)
-            if not is_member:
+            if not caps.is_committee_member(committee.id):
                 raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
         elif current_user.role == UserRole.VETTING_APPROVER:
-            # Check if user is approver for this committee (legacy or new system)
-            is_approver = False
-            if committee.approver_email and committee.approver_email.lower() == current_user.email.lower():
-                is_approver = True
-            elif committee.approver_id == current_user.id:
-                is_approver = True
-            else:
-                from app.models.vetting_committee import VettingCommitteeApprover
-                approver_record = db.query(VettingCommitteeApprover).filter(
-                    VettingCommitteeApprover.committee_id == committee.id,
-                    VettingCommitteeApprover.email.ilike(current_user.email)
-                ).first()
-                if approver_record:
-                    is_approver = True
-            
-            if not is_approver:
-                raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
-        elif current_user.role not in [UserRole.SUPER_ADMIN, UserRole.EVENT_ADMIN]:
-            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
-    elif committee.status == VettingStatus.APPROVED:
-        # Read-only for all authorized users
-        if current_user.role == UserRole.VETTING_COMMITTEE:
-            is_member = any(member.email == current_user.email for member in committee.members)
-            if not is_member:
-                raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
-        elif current_user.role == UserRole.VETTING_APPROVER:
-            # Check if user is approver for this committee (legacy or new system)
-            is_approver = False
-            if committee.approver_email and committee.approver_email.lower() == current_user.email.lower():
-                is_approver = True
-            elif committee.approver_id == current_user.id:
-                is_approver = True
-            else:
-                from app.models.vetting_committee import VettingCommitteeApprover
-                approver_record = db.query(VettingCommitteeApprover).filter(
-                    VettingCommitteeApprover.committee_id == committee.id,
-                    VettingCommitteeApprover.email.ilike(current_user.email)
-                ).first()
-                if approver_record:
-                    is_approver = True
-            
-            if not is_approver:
+            if not caps.is_designated_approver(committee.id):
                 raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
         elif current_user.role not in [UserRole.SUPER_ADMIN, UserRole.EVENT_ADMIN]:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
     
-    # Get event participants
-    participants = db.query(EventParticipant).filter(
+    # Event participants with the committee's selection and the members' vote tally, in one query
+    tallies = crud_vetting.get_participant_tallies(db, event_id=committee.event_id)
+    member_count = select(func.count(VettingCommitteeMember.id)).where(
+        VettingCommitteeMember.committee_id == committee_id
+    ).scalar_subquery()
+    rows = db.query(
+        EventParticipant, ParticipantSelection, tallies.c.selected_count, tallies.c.not_selected_count, member_count
+    ).outerjoin(
+        ParticipantSelection, and_(
+            ParticipantSelection.participant_id == EventParticipant.id,
+            ParticipantSelection.committee_id == committee_id
+        )
+    ).outerjoin(
+        tallies, tallies.c.participant_id == EventParticipant.id
+    ).filter(
         EventParticipant.event_id == committee.event_id
-    ).all()
-    
-    # Get existing selections
-    selections = db.query(ParticipantSelection).filter(
-        ParticipantSelection.committee_id == committee_id
-    ).all()
-    
-    selection_map = {s.participant_id: s for s in selections}
+    ).order_by(EventParticipant.id).all()
     
     result = []
-    for participant in participants:
-        selection = selection_map.get(participant.id)
+    for participant, selection, selected_count, not_selected_count, member_count in rows:
+        selected_count = selected_count or 0
+        not_selected_count = not_selected_count or 0
         result.append({
             "participant": participant,
-            "selection": selection
+            "selection": selection,
+            "tally": {
+                "selected": selected_count,
+                "not_selected": not_selected_count,
+                "consensus": crud_vetting.selection_consensus(selected_count, not_selected_count, member_count)
+            }
         })
     
     # Add read-only flag based on status and user role
@@ -3,12 +3,13 @@ from sqlalchemy.orm import Session
 from typing import List, Dict, Any
 from app.db.database import get_db
 from app.models import VettingMemberSelection, VettingCommittee, EventParticipant, VettingMemberComment
-from app.models.vetting_member_selection import VettingMemberSubmission
 from app.schemas.vetting_member_selection import (
     VettingMemberSelectionCreate, VettingMemberSelectionResponse,
     VettingMemberCommentCreate, VettingMemberCommentResponse, VettingMemberCommentsListResponse
 )
+from app.core import capabilities
 from app.core.deps import get_current_user
+from app.crud import vetting_committee as crud_vetting
 from app.models.user import User, UserRole
 
 router = APIRouter()
@@ -183,7 +184,8 @@ def get_vetting_selections_summary(
 ) -> Dict[str, Any]:
     """Get a summary of all vetting selections for an event with committee member info.
 
-    Returns committee members and all their selections grouped by participant.
+    Returns committee members (with review progress) and all their selections
+    grouped by participant, plus each participant's vote tally and consensus.
     Used by the Selections tab to display individual member columns.
     """
     # Verify access
@@ -197,13 +199,10 @@ def get_vetting_selections_summary(
             detail="Vetting committee not found for this event"
         )
 
-    # Check if user is a committee member, approver, or admin
-    is_member = any(member.email.lower() == current_user.email.lower() for member in vetting_committee.members)
-    is_approver = any(approver.email.lower() == current_user.email.lower() for approver in vetting_committee.approvers)
-
-    # Also check legacy approver field
-    if not is_approver and vetting_committee.approver_email:
-        is_approver = vetting_committee.approver_email.lower() == current_user.email.lower()
+    # Check if user is a committee member, approver (legacy field included), or admin
+    caps = capabilities.resolve(db, current_user)
+    is_member = caps.is_committee_member(vetting_committee.id)
+    is_approver = caps.is_designated_approver(vetting_committee.id)
 
     # Allow admins access
     is_admin = current_user.role in [UserRole.SUPER_ADMIN, UserRole.MT_ADMIN, UserRole.EVENT_ADMIN]
@@ -214,50 +213,45 @@ def get_vetting_selections_summary(
             detail="User does not have access to vetting data"
         )
 
-    # Get all committee members
-    committee_members = [
-        {
+    # Committee members with their review progress
+    submitted_emails = crud_vetting.get_submitted_member_emails(db, event_id=event_id)
+    committee_members = []
+    member_progress: Dict[str, Dict[str, Any]] = {}
+    member_submissions: Dict[str, bool] = {}
+    for member in crud_vetting.get_member_progress(db, committee_id=vetting_committee.id, event_id=event_id):
+        member_email = member.email.lower()
+        committee_members.append({
             "email": member.email,
             "full_name": member.full_name
+        })
+        member_submissions[member_email] = member_email in submitted_emails
+        member_progress[member_email] = {
+            "reviewed": member.reviewed,
+            "selected": member.selected,
+            "not_selected": member.not_selected,
+            "submitted": member_submissions[member_email]
         }
-        for member in vetting_committee.members
-    ]
-
-    # Get all selections
-    selections = db.query(VettingMemberSelection).filter(
-        VettingMemberSelection.event_id == event_id
-    ).all()
 
-    # Group selections by participant_id, then by member_email
+    # Group selections by participant_id, then by member_email, with each participant's tally
     selections_by_participant: Dict[int, Dict[str, Any]] = {}
-    for selection in selections:
-        if selection.participant_id not in selections_by_participant:
-            selections_by_participant[selection.participant_id] = {}
-
-        selections_by_participant[selection.participant_id][selection.member_email] = {
-            "selection": selection.selection,
-            "comments": selection.comments,
-            "updated_at": selection.updated_at.isoformat() if selection.updated_at else None
+    participant_tallies: Dict[int, Dict[str, Any]] = {}
+    for row in crud_vetting.get_member_selection_rows(db, event_id=event_id):
+        selections_by_participant.setdefault(row.participant_id, {})[row.member_email] = {
+            "selection": row.selection,
+            "comments": row.comments,
+            "updated_at": row.updated_at.isoformat() if row.updated_at else None
         }
-
-    # Get member submissions to track who has submitted
-    member_submissions_query = db.query(VettingMemberSubmission).filter(
-        VettingMemberSubmission.event_id == event_id
-    ).all()
-
-    # Create a dict of email -> submitted status
-    member_submissions: Dict[str, bool] = {}
-    for member in committee_members:
-        member_email = member["email"].lower()
-        member_submissions[member_email] = any(
-            sub.member_email.lower() == member_email
-            for sub in member_submissions_query
-        )
+        if row.participant_id not in participant_tallies:
+            participant_tallies[row.participant_id] = {
+                "selected": row.selected_count,
+                "not_selected": row.not_selected_count,
+                "consensus": crud_vetting.selection_consensus(
+                    row.selected_count, row.not_selected_count, len(committee_members)
+                )
+            }
 
     # Check if current user has submitted
-    current_user_has_submitted = current_user.email.lower() in [
-        sub.member_email.lower() for sub in member_submissions_query
-    ]
+    current_user_has_submitted = current_user.email.lower() in submitted_emails
 
     # Check if all members have submitted
     all_members_submitted = all(member_submissions.values()) if member_submissions else False
@@ -267,6 +261,8 @@ def get_vetting_selections_summary(
         "committee_status": vetting_committee.status.value,
         "committee_members": committee_members,
         "selections_by_participant": selections_by_participant,
+        "participant_tallies": participant_tallies,
+        "member_progress": member_progress,
         "current_user_email": current_user.email,
         "current_user_is_member": is_member,
         "current_user_is_approver": is_approver,
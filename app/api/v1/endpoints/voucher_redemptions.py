@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from sqlalchemy import desc
 from typing import List, Optional
 from app.db.database import get_db
 from app.core.deps import get_current_user
@@ -8,8 +8,9 @@ from app.models.user import User
 from app.models.tenant import Tenant
 from app.models.event import Event
 from app.models.event_participant import EventParticipant
-from app.models.participant_voucher_redemption import ParticipantVoucherRedemption
+from app.models.participant_voucher_balance import ParticipantVoucherBalance
 from app.models.allocation import EventAllocation
+from app.services import voucher_ledger
 from pydantic import BaseModel
 from datetime import datetime
 import logging
@@ -66,61 +67,38 @@ async def get_participant_redemptions(
             vouchers_per_participant = voucher_allocation.drink_vouchers_per_participant or 0
 
         
-        # Get all participants for this event - UPDATED STATUS FILTER
-        participants_query = db.query(
-            EventParticipant.id,
-            EventParticipant.full_name,
-            EventParticipant.email
-        ).filter(
-            EventParticipant.event_id == event_id,
-            EventParticipant.status.in_(["confirmed", "registered", "selected", "attended"])
-        )
-        
-        participants = participants_query.all()
-
-        
-        # Get redemption data for each participant
+        # ONLY PARTICIPANTS WITH REDEMPTIONS - one query over the balances, highest
+        # first to show over-redemptions at top
         redemption_data = []
-        
-        for participant in participants:
-
-            
-            # Count total redemptions for this participant using allocation_id
-            redemption_count = 0
-            last_redemption_date = None
-            
-            if voucher_allocation:
-                redemption_count = db.query(func.sum(ParticipantVoucherRedemption.quantity)).filter(
-                    ParticipantVoucherRedemption.allocation_id == voucher_allocation.id,
-                    ParticipantVoucherRedemption.participant_id == participant.id
-                ).scalar() or 0
-                
 
-                
-                # Get last redemption date
-                last_redemption = db.query(ParticipantVoucherRedemption).filter(
-                    ParticipantVoucherRedemption.allocation_id == voucher_allocation.id,
-                    ParticipantVoucherRedemption.participant_id == participant.id
-                ).order_by(desc(ParticipantVoucherRedemption.redeemed_at)).first()
-                
-                last_redemption_date = last_redemption.redeemed_at if last_redemption else None
-
-            
-            # ONLY INCLUDE PARTICIPANTS WITH REDEMPTIONS
-            if redemption_count > 0:
-                participant_data = ParticipantRedemptionResponse(
-                    user_id=participant.id,
-                    participant_name=participant.full_name or "Unknown",
-                    participant_email=participant.email,
+        if voucher_allocation:
+            rows = db.query(
+                EventParticipant.id,
+                EventParticipant.full_name,
+                EventParticipant.email,
+                ParticipantVoucherBalance.redeemed_quantity,
+                ParticipantVoucherBalance.last_redeemed_at
+            ).join(
+                ParticipantVoucherBalance,
+                ParticipantVoucherBalance.participant_id == EventParticipant.id
+            ).filter(
+                ParticipantVoucherBalance.allocation_id == voucher_allocation.id,
+                ParticipantVoucherBalance.redeemed_quantity > 0,
+                EventParticipant.event_id == event_id,
+                EventParticipant.status.in_(["confirmed", "registered", "selected", "attended"])
+            ).order_by(desc(ParticipantVoucherBalance.redeemed_quantity)).all()
+
+            redemption_data = [
+                ParticipantRedemptionResponse(
+                    user_id=row.id,
+                    participant_name=row.full_name or "Unknown",
+                    participant_email=row.email,
                     allocated_count=vouchers_per_participant,
-                    redeemed_count=redemption_count,
-                    last_redemption_date=last_redemption_date
+                    redeemed_count=row.redeemed_quantity,
+                    last_redemption_date=row.last_redeemed_at
                 )
-                
-                redemption_data.append(participant_data)
-        
-        # Sort by redeemed count (highest first) to show over-redemptions at top
-        redemption_data.sort(key=lambda x: x.redeemed_count, reverse=True)
+                for row in rows
+            ]
         
 
         
@@ -167,37 +145,23 @@ async def redeem_voucher(
         
         vouchers_per_participant = voucher_allocation.drink_vouchers_per_participant or 0
         
-        # Check current redemption count
-        current_redemptions = db.query(func.sum(ParticipantVoucherRedemption.quantity)).filter(
-            ParticipantVoucherRedemption.allocation_id == voucher_allocation.id,
-            ParticipantVoucherRedemption.participant_id == redemption_data.participant_id
-        ).scalar() or 0
-        
-        # Check if redemption would exceed allocation (allow over-redemption but warn)
-        remaining_vouchers = vouchers_per_participant - current_redemptions
-        is_over_redemption = remaining_vouchers < redemption_data.quantity
-        
-        # Create redemption record
-        for _ in range(redemption_data.quantity):
-            voucher_redemption = ParticipantVoucherRedemption(
-                allocation_id=voucher_allocation.id,
-                participant_id=redemption_data.participant_id,
-                quantity=1,
-                redeemed_by=str(redeemed_by),
-                redeemed_at=datetime.utcnow(),
-                notes=f"Location: {redemption_data.location}. Notes: {redemption_data.notes or 'None'}"
-            )
-            db.add(voucher_redemption)
-        
+        # Record the redemption (allow over-redemption but warn)
+        total_redeemed = voucher_ledger.redeem(
+            db, voucher_allocation, redemption_data.participant_id, redemption_data.quantity,
+            redeemed_by=str(redeemed_by),
+            notes=f"Location: {redemption_data.location}. Notes: {redemption_data.notes or 'None'}"
+        )
         db.commit()
-        
+
+        is_over_redemption = total_redeemed > vouchers_per_participant
+
         response_data = {
             "message": "Voucher redeemed successfully",
             "participant_id": redemption_data.participant_id,
             "quantity_redeemed": redemption_data.quantity,
-            "total_redeemed": current_redemptions + redemption_data.quantity,
+            "total_redeemed": total_redeemed,
             "allocated_vouchers": vouchers_per_participant,
-            "remaining_vouchers": max(0, vouchers_per_participant - (current_redemptions + redemption_data.quantity)),
+            "remaining_vouchers": max(0, vouchers_per_participant - total_redeemed),
             "is_over_redemption": is_over_redemption
         }
         
@@ -206,7 +170,10 @@ async def redeem_voucher(
         
         return response_data
         
+    except HTTPException:
+        raise
     except Exception as e:
+        db.rollback()
         logger.error(f"Error redeeming voucher: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to redeem voucher: {str(e)}")
 
@@ -239,10 +206,7 @@ async def get_participant_voucher_balance(
         # Count redemptions
         redemption_count = 0
         if voucher_allocation:
-            redemption_count = db.query(func.sum(ParticipantVoucherRedemption.quantity)).filter(
-                ParticipantVoucherRedemption.allocation_id == voucher_allocation.id,
-                ParticipantVoucherRedemption.participant_id == participant_id
-            ).scalar() or 0
+            redemption_count = voucher_ledger.get_redeemed(db, voucher_allocation.id, participant_id)
         
         # Get participant info
         participant = db.query(User).filter(User.id == participant_id).first()
@@ -4,6 +4,7 @@ from app.db.database import get_db
 from app.models.user import User
 from app.models.event import Event
 from app.api.deps import get_current_user
+from app.core import capabilities
 from app.core.email_service import email_service
 from app.core.config import settings
 from pydantic import BaseModel
@@ -315,7 +316,7 @@ async def approve_vetting(
     current_user: User = Depends(get_current_user)
 ):
     """Approve vetting submission and send emails to participants"""
-    print(f"🚀 VETTING APPROVAL API CALLED - Event ID: {event_id}, User: {current_user.email}")
+    logger.debug(f"🚀 VETTING APPROVAL API CALLED - Event ID: {event_id}, User: {current_user.email}")
     try:
         from app.models.vetting_committee import VettingCommittee, VettingStatus, ApprovalStatus
         from app.models.event_participant import EventParticipant
@@ -323,29 +324,15 @@ async def approve_vetting(
         from datetime import datetime
         
         # Check if user is vetting approver (check both primary role and secondary roles)
-        from app.models.user_roles import UserRole
-        
-        print(f"🔍 CHECKING APPROVER PERMISSIONS for user {current_user.email}")
-        print(f"🔍 User primary role: {current_user.role}")
-
-        is_approver = current_user.role in ["VETTING_APPROVER", "vetting_approver"]
-        print(f"🔍 Primary role check: {is_approver}")
-        
-        if not is_approver:
-            # Check secondary roles
-            print(f"🔍 Checking secondary roles for user ID {current_user.id}")
-            approver_role = db.query(UserRole).filter(
-                UserRole.user_id == current_user.id,
-                UserRole.role == "VETTING_APPROVER"
-            ).first()
-            is_approver = approver_role is not None
-            print(f"🔍 Secondary role check: {is_approver}")
+        caps = capabilities.resolve(db, current_user, fresh=True)
+        is_approver = caps.has_any(["VETTING_APPROVER"])
+        logger.debug(f"🔍 CHECKING APPROVER PERMISSIONS for {current_user.email}: roles={sorted(caps.roles)}")
 
         if not is_approver:
-            print(f"❌ ACCESS DENIED: User {current_user.email} is not a vetting approver")
+            logger.warning(f"❌ ACCESS DENIED: User {current_user.email} is not a vetting approver")
             raise HTTPException(status_code=403, detail="Only vetting approvers can approve")
             
-        print(f"✅ APPROVER PERMISSIONS VERIFIED for {current_user.email}")
+        logger.debug(f"✅ APPROVER PERMISSIONS VERIFIED for {current_user.email}")
         
         # Get event details
         event = db.query(Event).filter(Event.id == event_id).first()
@@ -360,11 +347,11 @@ async def approve_vetting(
         if not committee:
             raise HTTPException(status_code=400, detail="No vetting committee found for this event")
             
-        print(f"🔍 COMMITTEE STATUS: {committee.status}")
+        logger.debug(f"🔍 COMMITTEE STATUS: {committee.status}")
         
         # Check if already approved
         if committee.status == VettingStatus.APPROVED:
-            print(f"ℹ️ VETTING ALREADY APPROVED: Status is {committee.status}")
+            logger.debug(f"ℹ️ VETTING ALREADY APPROVED: Status is {committee.status}")
             return {
                 "message": "Vetting already approved",
                 "status": "approved",
@@ -374,47 +361,24 @@ async def approve_vetting(
         # Allow approval for multiple statuses to handle different workflow states
         allowed_statuses = [VettingStatus.PENDING_APPROVAL, VettingStatus.OPEN]
         if committee.status not in allowed_statuses:
-            print(f"❌ INVALID STATUS: Current status {committee.status} not in allowed statuses {allowed_statuses}")
+            logger.warning(f"❌ INVALID STATUS: Current status {committee.status} not in allowed statuses {allowed_statuses}")
             raise HTTPException(status_code=400, detail=f"Vetting is not ready for approval. Current status: {committee.status}")
         
-        print(f"✅ STATUS CHECK PASSED: {committee.status} is allowed for approval")
+        logger.debug(f"✅ STATUS CHECK PASSED: {committee.status} is allowed for approval")
 
         # Verify this user is a designated approver for this committee
-        # Check both legacy approver_id and new VettingCommitteeApprover table
-        is_designated_approver = False
-
-        # Check legacy approver_id
-        if committee.approver_id and committee.approver_id == current_user.id:
-            is_designated_approver = True
-            print(f"✅ Matched legacy approver_id: {committee.approver_id}")
-
-        # Check legacy approver_email
-        if not is_designated_approver and committee.approver_email:
-            if committee.approver_email.lower() == current_user.email.lower():
-                is_designated_approver = True
-                print(f"✅ Matched legacy approver_email: {committee.approver_email}")
-
-        # Check VettingCommitteeApprover table for multiple approvers
-        if not is_designated_approver:
-            from app.models.vetting_committee import VettingCommitteeApprover
-            from sqlalchemy import func
-            approver_record = db.query(VettingCommitteeApprover).filter(
-                VettingCommitteeApprover.committee_id == committee.id,
-                func.lower(VettingCommitteeApprover.email) == current_user.email.lower()
-            ).first()
-            if approver_record:
-                is_designated_approver = True
-                print(f"✅ Matched approver in VettingCommitteeApprover table: {current_user.email}")
+        # (legacy approver_id/approver_email or the VettingCommitteeApprover table)
+        is_designated_approver = caps.is_designated_approver(committee.id)
 
         if not is_designated_approver:
-            print(f"❌ WRONG APPROVER: User {current_user.email} (id={current_user.id}) is not a designated approver")
-            print(f"   Committee approver_id={committee.approver_id}, approver_email={committee.approver_email}")
+            logger.warning(f"❌ WRONG APPROVER: User {current_user.email} (id={current_user.id}) is not a designated approver")
+            logger.warning(f"   Committee approver_id={committee.approver_id}, approver_email={committee.approver_email}")
             raise HTTPException(status_code=403, detail="You are not a designated approver for this vetting committee")
 
-        print(f"✅ APPROVER VERIFICATION PASSED")
+        logger.debug(f"✅ APPROVER VERIFICATION PASSED")
         
         # Update committee status
-        print(f"📝 UPDATING DATABASE - Setting status to APPROVED")
+        logger.debug(f"📝 UPDATING DATABASE - Setting status to APPROVED")
         committee.status = VettingStatus.APPROVED
         try:
             committee.approval_status = ApprovalStatus.APPROVED
@@ -424,7 +388,7 @@ async def approve_vetting(
         committee.approved_at = datetime.utcnow()
         committee.approved_by = current_user.email
         db.commit()
-        print(f"✅ DATABASE UPDATED - Committee status saved")
+        logger.debug(f"✅ DATABASE UPDATED - Committee status saved")
 
         # Lock the vetting chat when vetting is approved
         try:
@@ -438,10 +402,9 @@ async def approve_vetting(
                 vetting_chat.locked_at = datetime.utcnow()
                 vetting_chat.locked_reason = "approved"
                 db.commit()
-                print(f"🔒 Vetting chat locked for event {event_id}")
+                logger.debug(f"🔒 Vetting chat locked for event {event_id}")
                 logger.info(f"🔒 Vetting chat locked for event {event_id}")
         except Exception as lock_error:
-            print(f"⚠️ Failed to lock vetting chat: {lock_error}")
             logger.warning(f"Failed to lock vetting chat: {lock_error}")
             # Don't fail the approval if chat locking fails
 
@@ -450,10 +413,10 @@ async def approve_vetting(
             EventParticipant.event_id == event_id
         ).all()
         
-        print(f"🔍 Found {len(all_participants)} participants")
+        logger.debug(f"🔍 Found {len(all_participants)} participants")
         logger.info(f"🔍 PARTICIPANTS QUERY: Found {len(all_participants)} participants for event {event_id}")
         for i, participant in enumerate(all_participants):
-            print(f"🔍 PARTICIPANT {i+1}: {participant.email} - {participant.full_name} - Status: {participant.status}")
+            logger.debug(f"🔍 PARTICIPANT {i+1}: {participant.email} - {participant.full_name} - Status: {participant.status}")
             logger.info(f"🔍 PARTICIPANT {i+1}: {participant.email} - {participant.full_name} - Status: {participant.status}")
         
         # Get tenant slug for template
@@ -466,30 +429,30 @@ async def approve_vetting(
         # Load custom email template or use default
         custom_subject = approval_data.email_subject if approval_data else None
         custom_body = approval_data.email_body if approval_data else None
-        print(f"🔍 EMAIL TEMPLATE: Subject={custom_subject is not None}, Body={custom_body is not None}")
+        logger.debug(f"🔍 EMAIL TEMPLATE: Subject={custom_subject is not None}, Body={custom_body is not None}")
 
         logger.info(f"🔍 EMAIL TEMPLATE: Subject={custom_subject is not None}, Body={custom_body is not None}")
         logger.info(f"🔍 EMAIL SETTINGS: SEND_EMAILS={settings.SEND_EMAILS}")
         
         # Test email service
         try:
-            print(f"🧪 TESTING EMAIL SERVICE")
+            logger.debug(f"🧪 TESTING EMAIL SERVICE")
             test_result = email_service.send_email(
                 to_emails=["test@example.com"],
                 subject="Test Email",
                 html_content="This is a test"
             )
-            print(f"🧪 EMAIL SERVICE TEST RESULT: {test_result}")
+            logger.debug(f"🧪 EMAIL SERVICE TEST RESULT: {test_result}")
             logger.info(f"🔍 EMAIL SERVICE TEST: {test_result}")
         except Exception as e:
-            print(f"🧪 EMAIL SERVICE TEST FAILED: {str(e)}")
+            logger.debug(f"🧪 EMAIL SERVICE TEST FAILED: {str(e)}")
             logger.error(f"❌ EMAIL SERVICE TEST FAILED: {str(e)}")
         
         # Send emails to all participants (synchronously for debugging)
 
         emails_sent = 0
         for participant in all_participants:
-            print(f"📧 PROCESSING EMAIL for {participant.email} with status {participant.status}")
+            logger.debug(f"📧 PROCESSING EMAIL for {participant.email} with status {participant.status}")
             try:
                 await send_participant_notification(
                     participant.email,
@@ -503,16 +466,14 @@ async def approve_vetting(
                     custom_body
                 )
                 emails_sent += 1
-                print(f"✅ EMAIL SENT SUCCESSFULLY to {participant.email}")
+                logger.debug(f"✅ EMAIL SENT SUCCESSFULLY to {participant.email}")
             except Exception as e:
-                print(f"❌ FAILED TO SEND EMAIL to {participant.email}: {str(e)}")
-                import traceback
-                print(f"❌ EMAIL ERROR TRACEBACK: {traceback.format_exc()}")
+                logger.exception(f"❌ FAILED TO SEND EMAIL to {participant.email}: {str(e)}")
         
-        print(f"✅ Emails sent: {emails_sent}/{len(all_participants)}")
+        logger.debug(f"✅ Emails sent: {emails_sent}/{len(all_participants)}")
         
-        print(f"✅ VETTING APPROVED by {current_user.email}")
-        print(f"📧 NOTIFICATION PROCESS COMPLETE for {len(all_participants)} participants")
+        logger.debug(f"✅ VETTING APPROVED by {current_user.email}")
+        logger.debug(f"📧 NOTIFICATION PROCESS COMPLETE for {len(all_participants)} participants")
         
         result = {
             "message": "Vetting approved successfully",
@@ -520,8 +481,8 @@ async def approve_vetting(
             "participants_notified": emails_sent,
             "total_participants": len(all_participants)
         }
-        print(f"🎉 VETTING APPROVAL COMPLETE - Returning: {result}")
-        print(f"🔙 FUNCTION RETURNING TO FRONTEND")
+        logger.debug(f"🎉 VETTING APPROVAL COMPLETE - Returning: {result}")
+        logger.debug(f"🔙 FUNCTION RETURNING TO FRONTEND")
         return result
         
     except Exception as e:
@@ -593,7 +554,7 @@ async def send_participant_notification(
 ):
     """Send notification to participant based on their selection status"""
     try:
-        print(f"📧 SEND_PARTICIPANT_NOTIFICATION CALLED for {participant_email}")
+        logger.debug(f"📧 SEND_PARTICIPANT_NOTIFICATION CALLED for {participant_email}")
         logger.info(f"📧 STARTING EMAIL SEND to {participant_email} (status: {participant_status})")
         # Use custom template if provided, otherwise use default
         if custom_subject and custom_body:
@@ -644,24 +605,21 @@ The Event Organization Team"""
         body = body.replace('{{EVENT_DATE_RANGE}}', event_date_range)
         body = body.replace('{{PARTICIPANT_EMAIL}}', participant_email)
         
-        print(f"📧 CALLING EMAIL SERVICE for {participant_email}")
+        logger.debug(f"📧 CALLING EMAIL SERVICE for {participant_email}")
         result = email_service.send_email(
             to_emails=[participant_email],
             subject=subject,
             html_content=body.replace('\n', '<br>')
         )
-        print(f"📧 EMAIL SERVICE RESULT for {participant_email}: {result}")
+        logger.debug(f"📧 EMAIL SERVICE RESULT for {participant_email}: {result}")
         
         if result:
-            print(f"✅ EMAIL SERVICE SUCCESS for {participant_email}")
+            logger.debug(f"✅ EMAIL SERVICE SUCCESS for {participant_email}")
             logger.info(f"✅ PARTICIPANT NOTIFICATION SENT to {participant_email} (status: {participant_status})")
         else:
-            print(f"❌ EMAIL SERVICE FAILED for {participant_email}")
             logger.error(f"❌ FAILED TO SEND EMAIL to {participant_email} - email_service returned False")
         
     except Exception as e:
-        print(f"💥 EMAIL SEND EXCEPTION for {participant_email}: {str(e)}")
         logger.error(f"❌ FAILED TO SEND PARTICIPANT NOTIFICATION to {participant_email}: {str(e)}")
         import traceback
-        print(f"💥 EMAIL SEND TRACEBACK: {traceback.format_exc()}")
         logger.error(f"❌ EMAIL SEND TRACEBACK: {traceback.format_exc()}")
@@ -3,6 +3,7 @@ import logging
 from datetime import datetime
 from sqlalchemy.orm import Session
 from app.db.database import SessionLocal
+from app.core.metrics import timed_job
 from app.services.agenda_notification_service import send_agenda_start_notifications
 
 logger = logging.getLogger(__name__)
@@ -21,7 +22,7 @@ class AgendaNotificationScheduler:
                 # Check every 15 minutes for upcoming agenda items
                 db = SessionLocal()
                 try:
-                    send_agenda_start_notifications(db)
+                    timed_job("agenda_start_notifications", send_agenda_start_notifications)(db)
                 finally:
                     db.close()
                     
@@ -0,0 +1,35 @@
+"""Shared caching.
+
+An in-process LRU tier in front of an optional Redis tier (``REDIS_URL``),
+with per-entry TTLs, tag-based invalidation (``tenant:{slug}``,
+``event:{id}``, ...) and single-flight loading, so concurrent misses for the
+same key run the loader once.
+
+Reads are cached with ``cached`` (plain values) or ``cached_model`` /
+``cached_models`` (ORM instances). Writes invalidate through
+``invalidate_on_change``, which bumps a model's tags when its instances are
+flushed and the session commits; raw SQL writes call
+``invalidate_on_commit`` or ``cache.invalidate_tags`` directly.
+
+Invalidation only reaches other workers through Redis; without it their
+local entries are only bounded by ``CACHE_LOCAL_TTL``.
+"""
+from app.core.cache.cache import (
+    Cache,
+    cache,
+    cached,
+    invalidate_on_change,
+    invalidate_on_commit,
+)
+from app.core.cache.orm import attribute_values, cached_model, cached_models
+
+__all__ = [
+    "Cache",
+    "cache",
+    "cached",
+    "cached_model",
+    "cached_models",
+    "attribute_values",
+    "invalidate_on_change",
+    "invalidate_on_commit",
+]
@@ -0,0 +1,145 @@
+"""Cache storage tiers.
+
+Entries are stored together with the versions their tags had when the value
+was loaded; invalidating a tag bumps its version, so every entry carrying the
+tag becomes a miss without having to find and delete it.
+"""
+import logging
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (value, tag versions at load time)
+Entry = Tuple[Any, Dict[str, int]]
+
+
+class LocalBackend:
+    """In-process LRU with per-entry expiry"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Entry]]" = OrderedDict()
+        self._tag_versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Entry]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, entry = item
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: Entry, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, entry)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def tag_versions(self, tags: Iterable[str]) -> Dict[str, int]:
+        with self._lock:
+            return {tag: self._tag_versions.get(tag, 0) for tag in tags}
+
+    def bump_tags(self, tags: Iterable[str]) -> None:
+        with self._lock:
+            for tag in tags:
+                self._tag_versions[tag] = self._tag_versions.get(tag, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tag_versions.clear()
+
+
+class RedisBackend:
+    """Shared tier in Redis. Values are pickled; tag versions are plain counters.
+
+    Any Redis error disables the tier for RETRY_AFTER seconds so requests fall
+    back to the local tier and the database instead of failing.
+    """
+
+    RETRY_AFTER = 30
+    PREFIX = "msafiri:cache:"
+
+    def __init__(self, url: str):
+        import redis
+
+        self._client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        self._down_until = 0.0
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self._down_until
+
+    def _failed(self, operation: str, error: Exception) -> None:
+        logger.warning(f"Redis cache {operation} failed, bypassing it for {self.RETRY_AFTER}s: {error}")
+        self._down_until = time.monotonic() + self.RETRY_AFTER
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.PREFIX}tag:{tag}"
+
+    def get(self, key: str, tags: Iterable[str]) -> Tuple[Optional[Entry], Dict[str, int]]:
+        """Entry for ``key`` and the current versions of ``tags``, in one round trip"""
+        tags = list(tags)
+        if not self.available:
+            return None, {}
+        try:
+            pipe = self._client.pipeline(transaction=False)
+            pipe.get(self.PREFIX + key)
+            if tags:
+                pipe.mget([self._tag_key(tag) for tag in tags])
+            results = pipe.execute()
+        except Exception as e:
+            self._failed("get", e)
+            return None, {}
+
+        versions = {}
+        if tags:
+            versions = {tag: int(value or 0) for tag, value in zip(tags, results[1])}
+        if results[0] is None:
+            return None, versions
+        try:
+            return pickle.loads(results[0]), versions
+        except Exception:
+            return None, versions
+
+    def set(self, key: str, entry: Entry, ttl: float) -> None:
+        if not self.available:
+            return
+        try:
+            self._client.set(self.PREFIX + key, pickle.dumps(entry), ex=max(1, int(ttl)))
+        except Exception as e:
+            self._failed("set", e)
+
+    def delete(self, key: str) -> None:
+        if not self.available:
+            return
+        try:
+            self._client.delete(self.PREFIX + key)
+        except Exception as e:
+            self._failed("delete", e)
+
+    def bump_tags(self, tags: Iterable[str]) -> None:
+        tags = list(tags)
+        if not tags or not self.available:
+            return
+        try:
+            pipe = self._client.pipeline(transaction=False)
+            for tag in tags:
+                pipe.incr(self._tag_key(tag))
+            pipe.execute()
+        except Exception as e:
+            self._failed("invalidate", e)
@@ -0,0 +1,218 @@
+import logging
+import threading
+from functools import wraps
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Tuple, Type
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.cache.backends import LocalBackend, RedisBackend
+from app.core.config import settings
+from app.core.metrics import CACHE_LOOKUPS
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    """A load in progress that concurrent misses for the same key wait on"""
+
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error: Optional[BaseException] = None
+
+
+class Cache:
+    """Two-tier cache: an in-process LRU in front of an optional shared Redis.
+
+    Local entries live at most ``local_ttl`` seconds, which bounds how long
+    another worker's invalidation takes to be seen here. That holds with or
+    without Redis: without it, tag invalidation never reaches the other
+    workers at all, so the cap is the only bound on how stale their entries
+    get. Redis entries are checked against the shared tag versions on every
+    read and keep the full TTL.
+    """
+
+    def __init__(self, local: LocalBackend, remote: Optional[RedisBackend] = None,
+                 default_ttl: float = 300, local_ttl: float = 5):
+        self.local = local
+        self.remote = remote
+        self.default_ttl = default_ttl
+        self.local_ttl = local_ttl
+        self._inflight: Dict[str, _Call] = {}
+        self._inflight_lock = threading.Lock()
+
+    def _local_ttl(self, ttl: float) -> float:
+        return min(ttl, self.local_ttl)
+
+    def get_or_load(self, key: str, loader: Callable[[], Any], ttl: Optional[float] = None,
+                    tags: Iterable[str] = (), name: str = "default") -> Any:
+        """Cached value for ``key``, calling ``loader`` once per miss across concurrent callers.
+
+        None results are not cached.
+        """
+        ttl = ttl or self.default_ttl
+        tags = tuple(tags)
+
+        entry = self.local.get(key)
+        if entry is not None and entry[1] == self.local.tag_versions(tags):
+            CACHE_LOOKUPS.labels(name, "local_hit").inc()
+            return entry[0]
+
+        with self._inflight_lock:
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            CACHE_LOOKUPS.labels(name, "coalesced").inc()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = self._load(key, loader, ttl, tags, name)
+            return call.value
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+            call.done.set()
+
+    def _load(self, key: str, loader: Callable[[], Any], ttl: float, tags: Tuple[str, ...], name: str) -> Any:
+        # Versions are read before loading, so an invalidation that lands
+        # while the loader runs leaves the stored entry already outdated
+        local_versions = self.local.tag_versions(tags)
+        remote_versions: Dict[str, int] = {}
+        if self.remote is not None:
+            entry, remote_versions = self.remote.get(key, tags)
+            if entry is not None and entry[1] == remote_versions:
+                self.local.set(key, (entry[0], local_versions), self._local_ttl(ttl))
+                CACHE_LOOKUPS.labels(name, "redis_hit").inc()
+                return entry[0]
+
+        CACHE_LOOKUPS.labels(name, "miss").inc()
+        value = loader()
+        if value is not None:
+            self.local.set(key, (value, local_versions), self._local_ttl(ttl))
+            if self.remote is not None:
+                self.remote.set(key, (value, remote_versions), ttl)
+        return value
+
+    def delete(self, key: str) -> None:
+        self.local.delete(key)
+        if self.remote is not None:
+            self.remote.delete(key)
+
+    def invalidate_tags(self, *tags: str) -> None:
+        """Make every entry carrying one of ``tags`` a miss, here and in other workers"""
+        if not tags:
+            return
+        self.local.bump_tags(tags)
+        if self.remote is not None:
+            self.remote.bump_tags(tags)
+
+    def clear(self) -> None:
+        """Drop this worker's entries (shared entries expire by TTL)"""
+        self.local.clear()
+
+
+def _build_cache() -> Cache:
+    remote = None
+    if settings.REDIS_URL:
+        try:
+            remote = RedisBackend(settings.REDIS_URL)
+        except ImportError:
+            logger.warning("REDIS_URL is set but the redis package is not installed; using the local cache only")
+    return Cache(
+        LocalBackend(settings.CACHE_LOCAL_MAX_ENTRIES),
+        remote,
+        default_ttl=settings.CACHE_DEFAULT_TTL,
+        local_ttl=settings.CACHE_LOCAL_TTL,
+    )
+
+
+cache = _build_cache()
+
+
+def cached(
+    key: Callable[..., Any],
+    *,
+    name: str,
+    ttl: Optional[float] = None,
+    tags: Optional[Callable[..., Iterable[str]]] = None,
+    dump: Optional[Callable[[Any], Any]] = None,
+    load: Optional[Callable[..., Any]] = None,
+):
+    """Cache a function's result.
+
+    ``key`` and ``tags`` receive the function's arguments. Cached values must
+    be plain picklable data: ``dump`` converts the result before it is stored
+    and ``load(value, *args, **kwargs)`` converts it back for each caller
+    (see ``cached_model`` for ORM results). The undecorated function stays
+    available as ``fn.uncached``.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            cache_key = f"{name}:{key(*args, **kwargs)}"
+            cache_tags = tuple(tags(*args, **kwargs)) if tags else ()
+
+            def loader():
+                result = fn(*args, **kwargs)
+                return dump(result) if dump is not None and result is not None else result
+
+            value = cache.get_or_load(cache_key, loader, ttl=ttl, tags=cache_tags, name=name)
+            if load is not None and value is not None:
+                return load(value, *args, **kwargs)
+            return value
+
+        wrapper.uncached = fn
+        return wrapper
+    return decorator
+
+
+# Model class -> callables returning the tags a changed instance invalidates
+_invalidators: Dict[Type, list] = {}
+
+
+def invalidate_on_change(model: Type, tags: Callable[[Any], Iterable[str]]) -> None:
+    """Invalidate ``tags(instance)`` when an instance of ``model`` is flushed and the session commits"""
+    _invalidators.setdefault(model, []).append(tags)
+
+
+def invalidate_on_commit(session: Session, *tags: str) -> None:
+    """Invalidate ``tags`` once the session's transaction commits (for raw SQL writes)"""
+    session.info.setdefault("cache_invalidations", set()).update(tags)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_invalidations(session: Session, flush_context) -> None:
+    if not _invalidators:
+        return
+    tags: Set[str] = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        for model, callables in _invalidators.items():
+            if isinstance(obj, model):
+                for tags_for in callables:
+                    tags.update(tags_for(obj))
+    if tags:
+        invalidate_on_commit(session, *tags)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_invalidations(session: Session) -> None:
+    tags = session.info.pop("cache_invalidations", None)
+    if tags:
+        cache.invalidate_tags(*tags)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidations(session: Session) -> None:
+    session.info.pop("cache_invalidations", None)
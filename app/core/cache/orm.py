@@ -0,0 +1,69 @@
+"""Caching ORM results.
+
+Instances are never shared between sessions: the cache stores a snapshot of
+the row's column values, and each caller gets an instance attached to its own
+session without a query (the identity map's instance is reused if the session
+already has the row).
+"""
+from typing import Any, Dict, Iterable, List, Optional, Set, Type
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.core.cache.cache import cached
+
+
+def snapshot(obj) -> Dict[str, Any]:
+    """Column values of a persistent instance"""
+    return {attr.key: getattr(obj, attr.key) for attr in inspect(obj).mapper.column_attrs}
+
+
+def attach(db: Session, model: Type, values: Dict[str, Any]):
+    """Persistent instance of ``model`` in ``db`` built from a snapshot"""
+    mapper = inspect(model)
+    identity = mapper.identity_key_from_primary_key(
+        [values[mapper.get_property_by_column(column).key] for column in mapper.primary_key]
+    )
+    existing = db.identity_map.get(identity)
+    if existing is not None:
+        return existing
+
+    obj = mapper.class_manager.new_instance()
+    for key, value in values.items():
+        set_committed_value(obj, key, value)
+    make_transient_to_detached(obj)
+    db.add(obj)
+    return obj
+
+
+def attribute_values(obj, key: str) -> Set:
+    """Values of ``key`` before and after the pending change"""
+    history = inspect(obj).attrs[key].history
+    return {value for value in history.sum() if value is not None}
+
+
+def _session_argument(args, kwargs) -> Session:
+    if "db" in kwargs:
+        return kwargs["db"]
+    return next(arg for arg in args if isinstance(arg, Session))
+
+
+def cached_model(model: Type, key, *, name: str, ttl: Optional[float] = None, tags=None):
+    """``cached`` for functions returning one ``model`` instance (or None) and taking the session as ``db``"""
+    def load(values, *args, **kwargs):
+        return attach(_session_argument(args, kwargs), model, values)
+
+    return cached(key, name=name, ttl=ttl, tags=tags, dump=snapshot, load=load)
+
+
+def cached_models(model: Type, key, *, name: str, ttl: Optional[float] = None, tags=None):
+    """``cached`` for functions returning a list of ``model`` instances and taking the session as ``db``"""
+    def dump(objs: Iterable) -> List[Dict[str, Any]]:
+        return [snapshot(obj) for obj in objs]
+
+    def load(rows, *args, **kwargs):
+        db = _session_argument(args, kwargs)
+        return [attach(db, model, values) for values in rows]
+
+    return cached(key, name=name, ttl=ttl, tags=tags, dump=dump, load=load)
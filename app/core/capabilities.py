@@ -0,0 +1,198 @@
+"""Resolved permissions for a user.
+
+A user's roles (the primary ``users.role`` plus ``user_roles`` rows, possibly
+tenant-scoped) and vetting committee memberships are resolved once into an
+immutable ``Capabilities`` object. It is memoized on the request's session
+(``db.info``) and the database-backed part is kept in the shared cache, so
+permission checks after the first one in a request cost no queries and the
+first one usually costs none either.
+"""
+from dataclasses import dataclass
+from typing import FrozenSet, Iterable, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.cache import cached, invalidate_on_change
+from app.core.cache.orm import attribute_values
+from app.crud import vetting_committee
+from app.models.user import User
+from app.models.user_roles import UserRole as UserRoleModel
+from app.models.vetting_committee import (
+    VettingCommittee,
+    VettingCommitteeApprover,
+    VettingCommitteeMember,
+)
+
+ADMIN_ROLES = frozenset({"SUPER_ADMIN", "MT_ADMIN", "HR_ADMIN", "EVENT_ADMIN"})
+# Any admin role except SUPER_ADMIN can create and manage events
+EVENT_CREATOR_ROLES = frozenset({"MT_ADMIN", "HR_ADMIN", "EVENT_ADMIN"})
+VETTING_ROLES = frozenset({"VETTING_COMMITTEE", "VETTING_APPROVER"})
+
+CAPABILITIES_TTL = 60
+
+_MEMO_KEY = "capabilities"
+_UNCOMMITTED_KEY = "capabilities_uncommitted"
+
+
+def normalize_role(role) -> str:
+    """Role enum or (any-case) role name as the canonical upper-case name"""
+    value = getattr(role, "value", role)
+    return str(value).upper() if value is not None else ""
+
+
+def _normalize_all(roles: Iterable) -> FrozenSet[str]:
+    return frozenset(normalize_role(role) for role in roles)
+
+
+@dataclass(frozen=True)
+class Capabilities:
+    user_id: int
+    email: str
+    primary_role: str
+    # Every role the user holds in any tenant, primary role included
+    roles: FrozenSet[str]
+    # (tenant slug or None for global, role) for primary and secondary roles
+    scoped_roles: FrozenSet[Tuple[Optional[str], str]]
+    # Committees the user sits on, matched by user id or email
+    member_committee_ids: FrozenSet[int]
+    # Committees the user is a designated approver of (legacy approver
+    # fields or the approvers table), matched by user id or email
+    approver_committee_ids: FrozenSet[int]
+    # Events of all of the above committees
+    vetting_event_ids: FrozenSet[int]
+
+    def has_any(self, roles: Iterable, tenant: Optional[str] = None) -> bool:
+        """Whether the user holds any of ``roles``, optionally within ``tenant`` (global roles count)"""
+        wanted = _normalize_all(roles)
+        if tenant is None:
+            return not self.roles.isdisjoint(wanted)
+        return any(
+            role in wanted and scope in (None, tenant)
+            for scope, role in self.scoped_roles
+        )
+
+    def has_only(self, roles: Iterable) -> bool:
+        """Whether every role the user holds is one of ``roles``"""
+        return self.roles <= _normalize_all(roles)
+
+    @property
+    def is_super_admin(self) -> bool:
+        return "SUPER_ADMIN" in self.roles
+
+    @property
+    def is_admin(self) -> bool:
+        return not self.roles.isdisjoint(ADMIN_ROLES)
+
+    @property
+    def can_create_events(self) -> bool:
+        return not self.roles.isdisjoint(EVENT_CREATOR_ROLES)
+
+    def is_committee_member(self, committee_id: int) -> bool:
+        return committee_id in self.member_committee_ids
+
+    def is_designated_approver(self, committee_id: int) -> bool:
+        return committee_id in self.approver_committee_ids
+
+
+def _user_tag(user_id) -> str:
+    return f"permissions:user:{user_id}"
+
+
+def _email_tag(email) -> str:
+    return f"permissions:email:{email.lower()}"
+
+
+def _grant_tags(db: Session, user_id: int, email: str):
+    return (_user_tag(user_id), _email_tag(email))
+
+
+@cached(
+    lambda db, user_id, email: f"{user_id}:{email.lower()}",
+    name="user_grants",
+    ttl=CAPABILITIES_TTL,
+    tags=_grant_tags,
+)
+def _load_grants(db: Session, user_id: int, email: str) -> dict:
+    """Secondary roles and committee links (from user_event_access) of a user, in two queries"""
+    role_rows = db.query(UserRoleModel.tenant_id, UserRoleModel.role).filter(
+        UserRoleModel.user_id == user_id
+    ).all()
+
+    committee_rows = vetting_committee.get_event_access(db, user_id=user_id, email=email)
+
+    return {
+        "roles": [(tenant_id, normalize_role(role)) for tenant_id, role in role_rows],
+        "committees": committee_rows,
+    }
+
+
+def resolve(db: Session, user: User, fresh: bool = False) -> Capabilities:
+    """Capabilities of ``user``, resolved at most once per session.
+
+    ``fresh`` skips the memo and the shared cache (which other workers may
+    see invalidated up to ``CAPABILITIES_TTL`` late), for checks guarding
+    irreversible actions.
+    """
+    memo = db.info.setdefault(_MEMO_KEY, {})
+    capabilities = memo.get(user.id)
+    if capabilities is not None and not fresh:
+        return capabilities
+
+    # Also bypass the shared cache once this session has changed grants that
+    # are not committed (and so not invalidated) yet
+    load = _load_grants.uncached if fresh or db.info.get(_UNCOMMITTED_KEY) else _load_grants
+    grants = load(db, user.id, user.email or "")
+    primary_role = normalize_role(user.role)
+    scoped_roles = {(scope, role) for scope, role in grants["roles"]}
+    if primary_role:
+        scoped_roles.add((user.tenant_id, primary_role))
+
+    committees = grants["committees"]
+    capabilities = Capabilities(
+        user_id=user.id,
+        email=user.email or "",
+        primary_role=primary_role,
+        roles=frozenset(role for _, role in scoped_roles),
+        scoped_roles=frozenset(scoped_roles),
+        member_committee_ids=frozenset(c for c, _, reason in committees if reason == "committee_member"),
+        approver_committee_ids=frozenset(c for c, _, reason in committees if reason == "approver"),
+        vetting_event_ids=frozenset(e for _, e, _ in committees if e is not None),
+    )
+    memo[user.id] = capabilities
+    return capabilities
+
+
+def _link_tags(obj, user_key: str, email_key: str):
+    return [_user_tag(value) for value in attribute_values(obj, user_key)] + \
+        [_email_tag(value) for value in attribute_values(obj, email_key)]
+
+
+invalidate_on_change(UserRoleModel, lambda obj: [_user_tag(value) for value in attribute_values(obj, "user_id")])
+invalidate_on_change(VettingCommitteeMember, lambda obj: _link_tags(obj, "user_id", "email"))
+invalidate_on_change(VettingCommitteeApprover, lambda obj: _link_tags(obj, "user_id", "email"))
+invalidate_on_change(VettingCommittee, lambda obj: _link_tags(obj, "approver_id", "approver_email"))
+
+_GRANT_MODELS = (UserRoleModel, VettingCommittee, VettingCommitteeMember, VettingCommitteeApprover)
+
+
+@event.listens_for(Session, "after_flush")
+def _forget_memoized_capabilities(session: Session, flush_context) -> None:
+    """Re-resolve within the same session once a user, their roles or committee links change"""
+    changed = list(session.new) + list(session.dirty) + list(session.deleted)
+    if any(isinstance(obj, _GRANT_MODELS) for obj in changed):
+        session.info[_UNCOMMITTED_KEY] = True
+        session.info.pop(_MEMO_KEY, None)
+    elif any(isinstance(obj, User) for obj in changed):
+        session.info.pop(_MEMO_KEY, None)
+
+
+@event.listens_for(Session, "after_commit")
+def _grants_committed(session: Session) -> None:
+    session.info.pop(_UNCOMMITTED_KEY, None)
+
+
+@event.listens_for(Session, "after_rollback")
+def _grants_rolled_back(session: Session) -> None:
+    if session.info.pop(_UNCOMMITTED_KEY, None):
+        session.info.pop(_MEMO_KEY, None)
@@ -1,6 +1,7 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import Optional
 import os
+import tempfile
 
 
 class Settings(BaseSettings):
@@ -25,7 +26,36 @@ class Settings(BaseSettings):
 
     ENVIRONMENT: str = os.getenv("ENVIRONMENT", "development") 
     DEBUG: bool = os.getenv("DEBUG", "false").lower() == "true"
+    # Startup DDL: "fingerprint" (skip when schema unchanged), "always" or "never"
+    STARTUP_MIGRATION_MODE: str = os.getenv("STARTUP_MIGRATION_MODE", "fingerprint")
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "json")  # json or text
+    LOG_LEVELS: str = os.getenv("LOG_LEVELS", "")  # e.g. "app.api.v1.vetting=DEBUG,azure=WARNING"
+    LOG_SAMPLING: str = os.getenv("LOG_SAMPLING", "")  # e.g. "app.api.v1.endpoints.chat=0.1"
+
+    # Per-request query instrumentation (0 budget = unlimited)
+    DB_QUERY_BUDGET: int = int(os.getenv("DB_QUERY_BUDGET", "0"))
+    DB_QUERY_BUDGET_STRICT: bool = os.getenv("DB_QUERY_BUDGET_STRICT", "false").lower() == "true"
+    DB_REPEATED_QUERY_THRESHOLD: int = int(os.getenv("DB_REPEATED_QUERY_THRESHOLD", "10"))
+
+    # Bearer token required to scrape /metrics (open when unset)
+    METRICS_TOKEN: Optional[str] = os.getenv("METRICS_TOKEN")
+
+    # Generated QR images, named by payload hash (empty disables the disk cache)
+    QR_CACHE_DIR: str = os.getenv("QR_CACHE_DIR", os.path.join(tempfile.gettempdir(), "msafiri-qr"))
+
+    # Remote assets fetched while rendering PDFs (empty dir disables the disk cache)
+    PDF_ASSET_CACHE_DIR: str = os.getenv("PDF_ASSET_CACHE_DIR", os.path.join(tempfile.gettempdir(), "msafiri-pdf-assets"))
+    PDF_ASSET_CACHE_TTL: int = int(os.getenv("PDF_ASSET_CACHE_TTL", "3600"))  # seconds before revalidation
+
+    # Worker processes rendering bulk badge chunks (per web worker)
+    BULK_BADGE_WORKERS: int = int(os.getenv("BULK_BADGE_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+    # Shared cache (app/core/cache); without REDIS_URL only the per-worker LRU is used
+    REDIS_URL: Optional[str] = os.getenv("REDIS_URL")
+    CACHE_DEFAULT_TTL: int = int(os.getenv("CACHE_DEFAULT_TTL", "300"))
+    CACHE_LOCAL_TTL: int = int(os.getenv("CACHE_LOCAL_TTL", "5"))  # cap on per-worker entries, with or without Redis
+    CACHE_LOCAL_MAX_ENTRIES: int = int(os.getenv("CACHE_LOCAL_MAX_ENTRIES", "10000"))
 
 
     AZURE_TENANT_ID: Optional[str] = os.getenv("AZURE_TENANT_ID")
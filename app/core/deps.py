@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session, joinedload
 from jose import jwt, JWTError
 from app.db.database import get_db
 from app.core.config import settings
+from app.core import capabilities
 from app.core.security import decode_token
 from app.models.user import User
 from app.schemas.auth import TokenData
@@ -36,20 +37,15 @@ def get_current_user(
     token_data = TokenData(email=email, tenant_id=tenant_id)
     
     # First, try to find user by email only
-    user = db.query(User).options(joinedload(User.user_roles)).filter(User.email == token_data.email).first()
+    user = db.query(User).filter(User.email == token_data.email).first()
     
     if user is None:
         raise credentials_exception
     
-    # Add all_roles field to user object for role checking
+    # Add all_roles field to user object for role checking; resolving here
+    # also memoizes the capabilities for permission checks later in the request
     try:
-        from app.models.user_roles import UserRole as UserRoleModel
-        user_roles = db.query(UserRoleModel).filter(
-            UserRoleModel.user_id == user.id
-        ).all()
-        all_roles = [user.role.value]  # Primary role
-        all_roles.extend([role.role for role in user_roles])  # Secondary roles
-        user.all_roles = list(set(all_roles))  # Remove duplicates
+        user.all_roles = sorted(capabilities.resolve(db, user).roles)
     except Exception:
         user.all_roles = [user.role.value]  # Fallback to primary role only
     
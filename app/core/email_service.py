@@ -7,6 +7,7 @@ from email import encoders
 import os
 from typing import List, Optional
 from app.core.config import settings
+from app.core.metrics import track_outbound
 
 class EmailService:
     def __init__(self):
@@ -69,13 +70,14 @@ class EmailService:
             # Create secure connection and send email
             context = ssl.create_default_context()
             
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls(context=context)
-                server.login(self.username, self.password)
-                
-                # Include CC recipients in the actual recipient list
-                all_recipients = to_emails + (cc_emails or [])
-                server.sendmail(self.from_email, all_recipients, message.as_string())
+            with track_outbound("smtp"):
+                with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
+                    server.starttls(context=context)
+                    server.login(self.username, self.password)
+                
+                    # Include CC recipients in the actual recipient list
+                    all_recipients = to_emails + (cc_emails or [])
+                    server.sendmail(self.from_email, all_recipients, message.as_string())
 
             print(f"Email sent successfully to {to_emails}")
             return True
@@ -0,0 +1,122 @@
+# File: app/core/http_cache.py
+"""HTTP caching helpers for public and mobile read endpoints.
+
+ETags are derived from a cheap row-version fingerprint (row count, latest
+updated_at and highest id) of the rows a response is built from, so a
+conditional request can be answered with 304 before anything is loaded or
+serialized. Serialized bodies are optionally kept in a small in-process LRU
+keyed by ETag; any write changes the fingerprint and therefore the key, so
+stale bodies are never served and simply age out.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import func
+from sqlalchemy.orm import Query
+
+
+def row_version(query: Query, model: Any) -> tuple:
+    """Fingerprint the rows matched by ``query`` with a single aggregate query"""
+    updated_at = getattr(model, "updated_at", None)
+    created_at = getattr(model, "created_at", None)
+    columns = [func.count(model.id), func.max(model.id)]
+    if updated_at is not None and created_at is not None:
+        columns.append(func.max(func.coalesce(updated_at, created_at)))
+    elif updated_at is not None or created_at is not None:
+        columns.append(func.max(updated_at if updated_at is not None else created_at))
+
+    row = query.order_by(None).with_entities(*columns).one()
+    return tuple(str(value) for value in row)
+
+
+def compute_etag(request: Request, *parts: Any) -> str:
+    """Build a weak ETag from the request URL and version parts"""
+    digest = hashlib.sha1()
+    digest.update(request.url.path.encode())
+    digest.update(str(sorted(request.query_params.multi_items())).encode())
+    for part in parts:
+        digest.update(b"|")
+        digest.update(str(part).encode())
+    return f'W/"{digest.hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check If-None-Match against an ETag (weak comparison)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [value.strip() for value in header.split(",")]
+    bare = etag[2:] if etag.startswith("W/") else etag
+    return any(
+        (candidate[2:] if candidate.startswith("W/") else candidate) == bare
+        for candidate in candidates
+    )
+
+
+class ResponseCache:
+    """Conditional-response helper with an optional bounded body cache"""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._bodies: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_body(self, etag: str) -> Optional[bytes]:
+        with self._lock:
+            body = self._bodies.get(etag)
+            if body is not None:
+                self._bodies.move_to_end(etag)
+            return body
+
+    def _set_body(self, etag: str, body: bytes) -> None:
+        with self._lock:
+            self._bodies[etag] = body
+            self._bodies.move_to_end(etag)
+            while len(self._bodies) > self.max_entries:
+                self._bodies.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._bodies.clear()
+
+    def respond(
+        self,
+        request: Request,
+        etag: str,
+        build: Callable[[], Any],
+        *,
+        max_age: int = 60,
+        private: bool = False,
+        cache_body: bool = True,
+    ) -> Response:
+        """Return 304 when the client copy is current, otherwise the JSON body.
+
+        ``build`` is only called on a miss; it must return a JSON-encodable
+        payload (pydantic models are fine).
+        """
+        headers = {
+            "ETag": etag,
+            "Cache-Control": f"{'private' if private else 'public'}, max-age={max_age}, must-revalidate",
+            "Vary": "Authorization" if private else "Accept-Encoding",
+        }
+
+        if etag_matches(request, etag):
+            return Response(status_code=304, headers=headers)
+
+        body = self._get_body(etag) if cache_body else None
+        if body is None:
+            body = json.dumps(jsonable_encoder(build()), separators=(",", ":")).encode()
+            if cache_body:
+                self._set_body(etag, body)
+
+        return Response(content=body, media_type="application/json", headers=headers)
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,180 @@
+# File: app/core/logging_config.py
+"""Application logging setup.
+
+Request handlers only put records on an in-memory queue; a background
+``QueueListener`` thread formats them and does the blocking stdout write, so
+slow terminals or log shippers never add to request latency. Records are JSON
+by default (``LOG_FORMAT=text`` for local development) and carry the id of the
+request that produced them.
+
+Environment:
+- ``LOG_LEVEL``: root level (INFO by default)
+- ``LOG_LEVELS``: per-logger levels, e.g. ``app.api.v1.vetting=DEBUG,azure=WARNING``
+- ``LOG_SAMPLING``: keep only a fraction of sub-WARNING records per logger,
+  e.g. ``app.api.v1.endpoints.chat=0.1``
+"""
+import atexit
+import json
+import os
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from app.core.config import settings
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# LogRecord attributes that are not user-supplied "extra" fields
+_RESERVED_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "request_id"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.handlers.QueueHandler] = None
+_stream_handler: Optional[logging.Handler] = None
+
+
+def _parse_mapping(value: str) -> Dict[str, str]:
+    """Parse ``name=value,name=value`` settings"""
+    mapping = {}
+    for item in (value or "").split(","):
+        if "=" in item:
+            name, _, setting = item.partition("=")
+            mapping[name.strip()] = setting.strip()
+    return mapping
+
+
+class RequestIdFilter(logging.Filter):
+    """Attach the current request id (runs in the emitting thread)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keep a fraction of DEBUG/INFO records for noisy loggers; WARNING and up always pass"""
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+
+    def _rate_for(self, name: str) -> float:
+        while name:
+            if name in self.rates:
+                return self.rates[name]
+            name = name.rpartition(".")[0]
+        return 1.0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        rate = self._rate_for(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_text:
+            payload["exception"] = record.exc_text
+        elif record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        if not hasattr(record, "request_id"):
+            record.request_id = None
+        return super().format(record)
+
+
+class _StructuredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that keeps the record's fields instead of pre-formatting it"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _start_listener() -> None:
+    """Give this process a fresh queue and its own writer thread"""
+    global _listener
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _queue_handler.queue = log_queue
+    _listener = logging.handlers.QueueListener(log_queue, _stream_handler, respect_handler_level=True)
+    _listener.start()
+
+
+def _restart_listener_after_fork() -> None:
+    # A forked child (e.g. a gunicorn worker of a preloaded app) inherits the
+    # handler and queue but not the writer thread, so its records would pile
+    # up unwritten; records queued by the parent are the parent's to write
+    global _listener
+    if _queue_handler is not None:
+        _listener = None
+        _start_listener()
+
+
+def setup_logging() -> None:
+    """Route all logging through a queue to a background writer thread (one per process)"""
+    global _queue_handler, _stream_handler
+    if _queue_handler is not None:
+        return
+
+    _stream_handler = logging.StreamHandler(sys.stdout)
+    _stream_handler.setFormatter(
+        TextFormatter() if settings.LOG_FORMAT.lower() == "text" else JsonFormatter()
+    )
+
+    _queue_handler = _StructuredQueueHandler(queue.SimpleQueue())
+    _queue_handler.addFilter(RequestIdFilter())
+    _queue_handler.addFilter(SamplingFilter({
+        name: float(rate) for name, rate in _parse_mapping(settings.LOG_SAMPLING).items()
+    }))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_queue_handler)
+    root.setLevel(settings.LOG_LEVEL.upper())
+
+    # Azure SDK HTTP logging is very verbose
+    logging.getLogger("azure.core.pipeline.policies.http_logging_policy").setLevel(logging.WARNING)
+    for name, level in _parse_mapping(settings.LOG_LEVELS).items():
+        logging.getLogger(name).setLevel(level.upper())
+
+    _start_listener()
+    os.register_at_fork(after_in_child=_restart_listener_after_fork)
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop this process's writer thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,179 @@
+# File: app/core/metrics.py
+"""Prometheus metrics.
+
+Under gunicorn each worker keeps its own counters, so when
+``PROMETHEUS_MULTIPROC_DIR`` is set (gunicorn.conf.py does this) every worker
+writes its samples to that directory and ``/metrics`` aggregates them with a
+``MultiProcessCollector``. Gauges use ``livesum`` so values from dead workers
+drop out.
+"""
+import inspect
+import os
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+MULTIPROCESS_MODE = bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being served",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_SIZE = Gauge(
+    "db_pool_size",
+    "Configured connection pool size per worker",
+    multiprocess_mode="max",
+)
+DB_POOL_OPEN = Gauge(
+    "db_pool_open_connections",
+    "Open database connections",
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections",
+    "Database connections currently checked out of the pool",
+    multiprocess_mode="livesum",
+)
+WEBSOCKET_CONNECTIONS = Gauge(
+    "websocket_connections",
+    "Open WebSocket connections",
+    ["kind"],
+    multiprocess_mode="livesum",
+)
+SCHEDULER_JOB_DURATION = Histogram(
+    "scheduler_job_duration_seconds",
+    "Scheduled job run time",
+    ["job", "status"],
+    buckets=(0.1, 0.5, 1, 5, 15, 30, 60, 120, 300, 900),
+)
+OUTBOUND_LATENCY = Histogram(
+    "outbound_request_duration_seconds",
+    "Latency of calls to external services",
+    ["service", "outcome"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+PDF_ASSET_LOOKUPS = Counter(
+    "pdf_asset_lookups_total",
+    "Remote assets (logos, signatures, fonts) resolved while rendering PDFs",
+    ["outcome"],
+)
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total",
+    "Shared cache lookups by cached function and outcome",
+    ["name", "outcome"],
+)
+
+
+def route_template(scope: dict) -> str:
+    """Templated path of the matched route, so ids don't explode label cardinality"""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+def observe_request(method: str, route: str, status: int, duration: float) -> None:
+    REQUEST_LATENCY.labels(method, route, str(status)).observe(duration)
+
+
+@contextmanager
+def track_outbound(service: str):
+    """Time a call to an external service (smtp, fcm, cloudinary, azure, absolute_cabs)"""
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "success"
+    finally:
+        OUTBOUND_LATENCY.labels(service, outcome).observe(time.perf_counter() - start)
+
+
+def timed_job(job: str, func: Callable) -> Callable:
+    """Wrap a scheduler job (sync or async) so its run time is recorded"""
+    if inspect.iscoroutinefunction(func):
+        @wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            status = "error"
+            try:
+                result = await func(*args, **kwargs)
+                status = "success"
+                return result
+            finally:
+                SCHEDULER_JOB_DURATION.labels(job, status).observe(time.perf_counter() - start)
+        return async_wrapper
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        status = "error"
+        try:
+            result = func(*args, **kwargs)
+            status = "success"
+            return result
+        finally:
+            SCHEDULER_JOB_DURATION.labels(job, status).observe(time.perf_counter() - start)
+    return wrapper
+
+
+def instrument_pool(engine: Engine) -> None:
+    """Track open and checked-out connections with pool events.
+
+    Nothing is recorded at import time: under a preloading server the
+    importing process is the master, which never serves requests.
+    """
+    size = getattr(engine.pool, "size", None)
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        if callable(size):
+            DB_POOL_SIZE.set(size())
+        DB_POOL_OPEN.inc()
+
+    @event.listens_for(engine, "close")
+    def _on_close(dbapi_connection, connection_record):
+        DB_POOL_OPEN.dec()
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_POOL_CHECKED_OUT.inc()
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        DB_POOL_CHECKED_OUT.dec()
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Exposition body and content type, aggregated across workers when needed"""
+    if MULTIPROCESS_MODE:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid: int) -> None:
+    """Drop live gauges of an exited gunicorn worker"""
+    if MULTIPROCESS_MODE:
+        multiprocess.mark_process_dead(pid)
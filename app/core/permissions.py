@@ -1,30 +1,20 @@
 from typing import List
 from sqlalchemy.orm import Session
+from app.core import capabilities
 from app.models.user import User
-from app.models.user_roles import UserRole
 
 def has_any_role(user: User, db: Session, required_roles: List[str]) -> bool:
-    """Check if user has any of the required roles"""
-    # Check primary role first (for backward compatibility)
-    if user.role and user.role.value in required_roles:
-        return True
-    
-    # Check additional roles from user_roles table
-    user_roles = db.query(UserRole).filter(
-        UserRole.user_id == user.id
-    ).all()
-    
-    user_role_names = [role.role for role in user_roles]
-    return any(role in required_roles for role in user_role_names)
+    """Check if user has any of the required roles (primary role or user_roles table)"""
+    return capabilities.resolve(db, user).has_any(required_roles)
 
 def has_transport_permissions(user: User, db: Session) -> bool:
     """Check if user has permissions for transport management"""
-    required_roles = ["super_admin", "mt_admin", "hr_admin", "SUPER_ADMIN", "MT_ADMIN", "HR_ADMIN"]
+    required_roles = ["SUPER_ADMIN", "MT_ADMIN", "HR_ADMIN"]
     return has_any_role(user, db, required_roles)
 
 def has_accommodation_permissions(user: User, db: Session) -> bool:
     """Check if user has permissions for accommodation management"""
-    required_roles = ["super_admin", "mt_admin", "hr_admin", "SUPER_ADMIN", "MT_ADMIN", "HR_ADMIN"]
+    required_roles = ["SUPER_ADMIN", "MT_ADMIN", "HR_ADMIN"]
     return has_any_role(user, db, required_roles)
 
 def can_edit_vetting_participants(user: User, db: Session, event_id: int) -> dict:
@@ -35,8 +25,10 @@ def can_edit_vetting_participants(user: User, db: Session, event_id: int) -> dic
     from app.models.vetting_committee import VettingCommittee, VettingStatus, ApprovalStatus
     from datetime import datetime
 
+    caps = capabilities.resolve(db, user)
+
     # Always allow super admins and event admins
-    if user.role and user.role.value in ["super_admin", "event_admin", "SUPER_ADMIN", "EVENT_ADMIN"]:
+    if caps.primary_role in ("SUPER_ADMIN", "EVENT_ADMIN"):
         return {'can_edit': True, 'reason': 'admin', 'is_committee': False, 'is_approver': False}
 
     # Get committee for this event
@@ -48,12 +40,11 @@ def can_edit_vetting_participants(user: User, db: Session, event_id: int) -> dic
         return {'can_edit': False, 'reason': 'no_committee', 'is_committee': False, 'is_approver': False}
 
     # Check if user is vetting committee member
-    is_committee_member = has_any_role(user, db, ["vetting_committee", "VETTING_COMMITTEE"])
-    committee_member = any(member.user_id == user.id for member in committee.members)
+    is_committee_member = caps.has_any(["VETTING_COMMITTEE"])
+    committee_member = caps.is_committee_member(committee.id)
 
     # Check if user is approver
-    is_approver = has_any_role(user, db, ["vetting_approver", "VETTING_APPROVER"]) or \
-                  committee.approver_id == user.id
+    is_approver = caps.has_any(["VETTING_APPROVER"]) or committee.approver_id == user.id
 
     # Committee members can edit during OPEN status only
     if is_committee_member and committee_member:
@@ -76,8 +67,10 @@ def can_view_vetting(user: User, db: Session, event_id: int) -> bool:
     from app.models.vetting_committee import VettingCommittee
     from datetime import datetime
 
+    caps = capabilities.resolve(db, user)
+
     # Admins can always view
-    if user.role and user.role.value in ["super_admin", "event_admin", "SUPER_ADMIN", "EVENT_ADMIN"]:
+    if caps.primary_role in ("SUPER_ADMIN", "EVENT_ADMIN"):
         return True
 
     committee = db.query(VettingCommittee).filter(
@@ -88,15 +81,14 @@ def can_view_vetting(user: User, db: Session, event_id: int) -> bool:
         return False
 
     # Approver can always view (even after approval)
-    is_approver = has_any_role(user, db, ["vetting_approver", "VETTING_APPROVER"]) or \
-                  committee.approver_id == user.id
+    is_approver = caps.has_any(["VETTING_APPROVER"]) or committee.approver_id == user.id
 
     if is_approver:
         return True
 
     # Committee members can view until deadline
-    is_committee_member = has_any_role(user, db, ["vetting_committee", "VETTING_COMMITTEE"])
-    committee_member = any(member.user_id == user.id for member in committee.members)
+    is_committee_member = caps.has_any(["VETTING_COMMITTEE"])
+    committee_member = caps.is_committee_member(committee.id)
 
     if is_committee_member and committee_member:
         # Check if deadline passed
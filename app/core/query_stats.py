@@ -0,0 +1,130 @@
+# File: app/core/query_stats.py
+"""Per-request SQL instrumentation.
+
+Engine events count every statement and its DB time against the stats object
+of the current request (a context variable set by the HTTP middleware), and
+group statements by their SQL text so an N+1 pattern shows up as one
+statement repeated many times. Routes can declare a query budget with
+``@query_budget(n)``; ``settings.DB_QUERY_BUDGET`` is the default for all
+routes. Over-budget requests are logged, or fail when
+``settings.DB_QUERY_BUDGET_STRICT`` is on (useful in CI).
+"""
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+_current_stats: ContextVar[Optional["QueryStats"]] = ContextVar("query_stats", default=None)
+
+
+class QueryBudgetExceeded(Exception):
+    """Raised in strict mode when a request runs more queries than its budget"""
+
+
+class QueryStats:
+    """Statement count, DB time and repeated statements for one unit of work"""
+
+    def __init__(self):
+        self.count = 0
+        self.db_time = 0.0
+        self.statements: Counter = Counter()
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.db_time += duration
+        self.statements[statement] += 1
+
+    def repeated(self, threshold: Optional[int] = None) -> list:
+        """Statements executed at least ``threshold`` times, most repeated first"""
+        threshold = threshold or settings.DB_REPEATED_QUERY_THRESHOLD
+        return [(sql, count) for sql, count in self.statements.most_common() if count >= threshold]
+
+    @property
+    def max_repeats(self) -> int:
+        return self.statements.most_common(1)[0][1] if self.statements else 0
+
+
+def current_stats() -> Optional[QueryStats]:
+    return _current_stats.get()
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryStats]:
+    """Collect query stats for a block of code in the current context.
+
+    Example::
+
+        with count_queries() as stats:
+            crud.perdiem_request.get_tenant_queues(db, ...)
+        assert stats.count <= 2
+    """
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def query_budget(max_queries: int) -> Callable:
+    """Declare the maximum number of queries a route may run"""
+    def decorator(func: Callable) -> Callable:
+        func.__query_budget__ = max_queries
+        return func
+    return decorator
+
+
+def budget_for(endpoint: Optional[Callable]) -> int:
+    """Budget declared on the endpoint, else the global default (0 = unlimited)"""
+    return getattr(endpoint, "__query_budget__", None) or settings.DB_QUERY_BUDGET
+
+
+def check_request(stats: QueryStats, method: str, path: str, endpoint: Optional[Callable]) -> None:
+    """Log repeated statements and enforce the route's query budget"""
+    repeated = stats.repeated()
+    if repeated:
+        sql, count = repeated[0]
+        logger.warning(
+            f"⚠️ Possible N+1 on {method} {path}: statement ran {count} times "
+            f"({stats.count} queries total): {sql[:200]}"
+        )
+
+    budget = budget_for(endpoint)
+    if budget and stats.count > budget:
+        message = f"{method} {path} ran {stats.count} queries (budget {budget})"
+        if settings.DB_QUERY_BUDGET_STRICT:
+            raise QueryBudgetExceeded(message)
+        logger.warning(f"⚠️ Query budget exceeded: {message}")
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Attach the counting listeners to an engine"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _current_stats.get() is not None:
+            conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        stats = _current_stats.get()
+        if stats is None:
+            return
+        started = conn.info.get("query_start_time")
+        duration = time.perf_counter() - started.pop() if started else 0.0
+        stats.record(statement, duration)
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("query_start_time"):
+            connection.info["query_start_time"].pop()
@@ -1,6 +1,7 @@
 # File: app/core/scheduler.py
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
+from app.core.metrics import timed_job
 import logging
 
 logger = logging.getLogger(__name__)
@@ -17,7 +18,7 @@ def start_scheduler():
     try:
         # Check for deadline reminders every hour
         scheduler.add_job(
-            check_and_send_deadline_reminders,
+            timed_job('vetting_deadline_reminders', check_and_send_deadline_reminders),
             trigger=IntervalTrigger(hours=1),
             id='vetting_deadline_reminders',
             name='Check and send vetting deadline reminders',
@@ -26,7 +27,7 @@ def start_scheduler():
 
         # Check for expired roles every hour
         scheduler.add_job(
-            check_and_remove_expired_roles,
+            timed_job('vetting_role_removal', check_and_remove_expired_roles),
             trigger=IntervalTrigger(hours=1),
             id='vetting_role_removal',
             name='Remove expired vetting roles',
@@ -0,0 +1,118 @@
+# File: app/core/schema_state.py
+"""Schema fingerprinting for fast startup.
+
+The startup DDL (``run_auto_migration``) and the alembic revisions are hashed
+into a fingerprint that is stored in ``app_schema_state`` after a successful
+run. Workers that boot against a database with the same fingerprint skip the
+DDL entirely; when it differs, the first worker to take a Postgres advisory
+lock runs the migration and the others wait, re-check and skip.
+"""
+import hashlib
+import inspect
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from types import ModuleType
+from typing import Callable, Dict, Optional, Union
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.db.database import engine
+import logging
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_STATE_NAME = "auto_migration"
+# Arbitrary application-wide key for pg_advisory_lock
+MIGRATION_LOCK_KEY = 72630001
+
+ALEMBIC_VERSIONS_DIR = Path(__file__).resolve().parent.parent.parent / "alembic" / "versions"
+
+
+def schema_fingerprint(*sources: Union[Callable, ModuleType]) -> str:
+    """Hash the source of the given migration functions/modules and the alembic revision files"""
+    digest = hashlib.sha256()
+    for source in sources:
+        digest.update(inspect.getsource(source).encode())
+    if ALEMBIC_VERSIONS_DIR.is_dir():
+        for path in sorted(ALEMBIC_VERSIONS_DIR.glob("*.py")):
+            digest.update(path.name.encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def _stored_fingerprint(conn: Connection) -> Optional[str]:
+    try:
+        fingerprint = conn.execute(
+            text("SELECT fingerprint FROM app_schema_state WHERE name = :name"),
+            {"name": SCHEMA_STATE_NAME}
+        ).scalar()
+        conn.commit()
+        return fingerprint
+    except SQLAlchemyError:
+        # Table not created yet
+        conn.rollback()
+        return None
+
+
+def _store_fingerprint(conn: Connection, fingerprint: str) -> None:
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS app_schema_state (
+            name VARCHAR(100) PRIMARY KEY,
+            fingerprint VARCHAR(64) NOT NULL,
+            applied_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+        )
+    """))
+    conn.execute(text("""
+        INSERT INTO app_schema_state (name, fingerprint, applied_at)
+        VALUES (:name, :fingerprint, CURRENT_TIMESTAMP)
+        ON CONFLICT (name) DO UPDATE
+        SET fingerprint = EXCLUDED.fingerprint, applied_at = EXCLUDED.applied_at
+    """), {"name": SCHEMA_STATE_NAME, "fingerprint": fingerprint})
+    conn.commit()
+
+
+def ensure_schema(migrate: Callable[[], bool], fingerprint: str, force: bool = False) -> str:
+    """Run ``migrate`` once per fingerprint across all workers.
+
+    ``migrate`` returns True on success; the fingerprint is only recorded then.
+    Returns "unchanged", "migrated" or "failed".
+    """
+    with engine.connect() as conn:
+        if not force and _stored_fingerprint(conn) == fingerprint:
+            return "unchanged"
+
+        conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        conn.commit()
+        try:
+            # Another worker may have migrated while we waited for the lock
+            if not force and _stored_fingerprint(conn) == fingerprint:
+                return "unchanged"
+            if not migrate():
+                return "failed"
+            _store_fingerprint(conn, fingerprint)
+            return "migrated"
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY})
+            conn.commit()
+
+
+class StartupTimer:
+    """Collect per-phase durations for the startup log line"""
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = round(time.perf_counter() - start, 4)
+
+    def report(self) -> Dict[str, float]:
+        return {**self.phases, "total": round(time.perf_counter() - self._started, 4)}
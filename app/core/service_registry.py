@@ -0,0 +1,103 @@
+# File: app/core/service_registry.py
+"""Lazily constructed services and heavy SDK modules.
+
+Azure, OpenAI, Cloudinary and similar SDKs take hundreds of milliseconds to
+import and hold memory for the life of the worker. Routers ask the registry
+for them at call time instead of importing them at module level, so a worker
+that never serves a receipt-extraction or upload route never loads them.
+
+    document_service = service_registry.get("azure_document_intelligence")
+
+Factories run once per process (thread-safe); a failing factory is not
+cached, so the next call retries. ``optional()`` returns None instead of
+raising, for routes that degrade gracefully when an SDK is unavailable.
+"""
+import importlib
+import os
+import threading
+from typing import Any, Callable, Dict, List
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceRegistry:
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._instances: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+
+    def register(self, name: str, factory: Callable[[], Any]) -> None:
+        self._factories[name] = factory
+
+    def provider(self, name: str) -> Callable:
+        """Decorator form of ``register``"""
+        def decorator(factory: Callable[[], Any]) -> Callable[[], Any]:
+            self.register(name, factory)
+            return factory
+        return decorator
+
+    def get(self, name: str) -> Any:
+        if name in self._instances:
+            return self._instances[name]
+        with self._lock:
+            if name not in self._instances:
+                if name not in self._factories:
+                    raise KeyError(f"Unknown service: {name}")
+                self._instances[name] = self._factories[name]()
+                logger.debug(f"Loaded service '{name}'")
+            return self._instances[name]
+
+    def optional(self, name: str) -> Any:
+        try:
+            return self.get(name)
+        except Exception as e:
+            logger.warning(f"Service '{name}' unavailable: {e}")
+            return None
+
+    def loaded(self) -> List[str]:
+        return sorted(self._instances)
+
+
+service_registry = ServiceRegistry()
+
+
+@service_registry.provider("azure_document_intelligence")
+def _azure_document_intelligence():
+    from app.services.azure_services import AzureDocumentIntelligenceService
+    return AzureDocumentIntelligenceService()
+
+
+@service_registry.provider("azure_openai")
+def _azure_openai():
+    from app.services.azure_services import AzureOpenAIService
+    return AzureOpenAIService()
+
+
+@service_registry.provider("azure_blob")
+def _azure_blob():
+    """The azure.storage.blob module (BlobServiceClient, ContentSettings)"""
+    return importlib.import_module("azure.storage.blob")
+
+
+@service_registry.provider("azure_blob_client")
+def _azure_blob_client():
+    """BlobServiceClient for AZURE_STORAGE_CONNECTION_STRING"""
+    connection_string = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
+    if not connection_string:
+        raise RuntimeError("AZURE_STORAGE_CONNECTION_STRING is not configured")
+    return service_registry.get("azure_blob").BlobServiceClient.from_connection_string(connection_string)
+
+
+@service_registry.provider("cloudinary")
+def _cloudinary():
+    """The cloudinary module, configured from the environment, with uploader/utils loaded"""
+    cloudinary = importlib.import_module("cloudinary")
+    importlib.import_module("cloudinary.uploader")
+    importlib.import_module("cloudinary.utils")
+    cloudinary.config(
+        cloud_name=os.getenv("CLOUDINARY_CLOUD_NAME"),
+        api_key=os.getenv("CLOUDINARY_API_KEY"),
+        api_secret=os.getenv("CLOUDINARY_API_SECRET")
+    )
+    return cloudinary
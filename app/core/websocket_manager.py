@@ -1,5 +1,6 @@
 from typing import Dict, List
 from fastapi import WebSocket
+from app.core.metrics import WEBSOCKET_CONNECTIONS
 import json
 
 class ConnectionManager:
@@ -17,6 +18,12 @@ class ConnectionManager:
         
         self.active_connections[chat_room_id].append(websocket)
         self.connection_users[websocket] = user_info
+        self._update_metrics()
+
+    def _update_metrics(self):
+        WEBSOCKET_CONNECTIONS.labels("chat").set(
+            sum(len(connections) for connections in self.active_connections.values())
+        )
     
     def disconnect(self, websocket: WebSocket, chat_room_id: int):
         if chat_room_id in self.active_connections:
@@ -25,6 +32,7 @@ class ConnectionManager:
         
         if websocket in self.connection_users:
             del self.connection_users[websocket]
+        self._update_metrics()
     
     async def send_personal_message(self, message: str, websocket: WebSocket):
         await websocket.send_text(message)
@@ -42,6 +50,7 @@ class ConnectionManager:
                     print(f"❌ Failed to send to WebSocket connection: {e}")
                     # Remove broken connections
                     self.active_connections[chat_room_id].remove(connection)
+                    self._update_metrics()
         else:
             print(f"⚠️ No active connections found for room {chat_room_id}")
     
@@ -66,6 +75,7 @@ class NotificationManager:
         await websocket.accept()
         self.user_connections[user_email] = websocket
         self.user_tenants[user_email] = tenant_id
+        WEBSOCKET_CONNECTIONS.labels("notifications").set(len(self.user_connections))
         print(f"User {user_email} connected for notifications")
     
     def disconnect_user(self, websocket: WebSocket, user_email: str = None):
@@ -73,6 +83,7 @@ class NotificationManager:
             del self.user_connections[user_email]
             if user_email in self.user_tenants:
                 del self.user_tenants[user_email]
+            WEBSOCKET_CONNECTIONS.labels("notifications").set(len(self.user_connections))
             print(f"User {user_email} disconnected from notifications")
     
     async def send_user_notification(self, notification: dict, user_email: str):
@@ -13,5 +13,8 @@ from .emergency_contact import emergency_contact
 from .user_consent import user_consent
 from .app_feedback import app_feedback
 from .poa_template import poa_template
+from .tenant_stats import tenant_stats
+from .perdiem_request import perdiem_request
+from .notification_counter import notification_counter
 
-__all__ = ["tenant", "user", "notification", "role", "event", "event_item", "participant_allocation", "redemption_log", "admin_invitation", "user_tenant", "useful_contact", "guesthouse", "room", "vendor_accommodation", "accommodation_allocation", "emergency_contact", "user_consent", "app_feedback", "poa_template"]
+__all__ = ["tenant", "user", "notification", "role", "event", "event_item", "participant_allocation", "redemption_log", "admin_invitation", "user_tenant", "useful_contact", "guesthouse", "room", "vendor_accommodation", "accommodation_allocation", "emergency_contact", "user_consent", "app_feedback", "poa_template", "tenant_stats", "perdiem_request", "notification_counter"]
@@ -1,12 +1,20 @@
 # File: app/crud/event.py
-from typing import List, Optional
+from typing import Any, List, Optional
 from sqlalchemy.orm import Session
+from app.core.cache import cached_model, invalidate_on_change
 from app.crud.base import CRUDBase
 from app.models.event import Event
 from app.schemas.event import EventCreate, EventUpdate
 from sqlalchemy.orm import joinedload
 
+invalidate_on_change(Event, lambda event: [f"event:{event.id}"] if event.id is not None else [])
+
 class CRUDEvent(CRUDBase[Event, EventCreate, EventUpdate]):
+
+    @cached_model(Event, lambda self, db, id: id, name="event", ttl=60,
+                  tags=lambda self, db, id: [f"event:{id}"])
+    def get(self, db: Session, id: Any) -> Optional[Event]:
+        return super().get(db, id)
     
     def get_by_tenant(self, db: Session, *, tenant_id: int, skip: int = 0, limit: int = 100) -> List[Event]:
         return (
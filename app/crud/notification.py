@@ -1,8 +1,10 @@
 # File: app/crud/notification.py (ENHANCED with edit support)
-from typing import Any, Dict, List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import and_, or_, desc, func, select, tuple_, union_all
 from app.crud.base import CRUDBase
+from app.crud.notification_counter import notification_counter
 from app.models.notification import Notification, NotificationType, NotificationPriority
 from app.models.user import User  # Added import for User model
 from app.schemas.notification import NotificationCreate, NotificationUpdate
@@ -281,6 +283,7 @@ class CRUDNotification(CRUDBase[Notification, NotificationCreate, NotificationUp
             "is_read": True,
             "read_at": func.now()
         })
+        notification_counter.mark_stale(db, user_ids=[user_id])
         
         db.commit()
         return result
@@ -289,62 +292,15 @@ class CRUDNotification(CRUDBase[Notification, NotificationCreate, NotificationUp
         """Get notification statistics for a user - includes chat notifications"""
 
         try:
-            # Always filter by user to prevent cross-user data leakage
-            # Users can see: their own notifications + system-wide broadcasts
-            if tenant_id is not None and tenant_id != "system":
-                # Regular users with a tenant
-                base_query = db.query(Notification).filter(
-                    or_(
-                        # User's own notifications
-                        Notification.user_id == user_id,
-                        # Tenant-wide broadcasts for their tenant
-                        and_(
-                            Notification.user_id.is_(None),
-                            Notification.tenant_id == tenant_id
-                        ),
-                        # System-wide broadcasts
-                        and_(
-                            Notification.user_id.is_(None),
-                            or_(
-                                Notification.tenant_id == "system",
-                                Notification.tenant_id.is_(None)
-                            )
-                        )
-                    )
-                )
-            else:
-                # Mobile users without tenant or super admins
-                base_query = db.query(Notification).filter(
-                    or_(
-                        # User's own notifications
-                        Notification.user_id == user_id,
-                        # System-wide broadcasts only
-                        and_(
-                            Notification.user_id.is_(None),
-                            or_(
-                                Notification.tenant_id == "system",
-                                Notification.tenant_id.is_(None)
-                            )
-                        )
-                    )
-                )
-
-            total = base_query.count()
-
-            unread = base_query.filter(Notification.is_read == False).count()
-
-            # Handle priority filtering safely - use string comparison
-            urgent = base_query.filter(
-                and_(
-                    Notification.priority.in_(['URGENT', 'urgent']),
-                    Notification.is_read == False
-                )
-            ).count()
+            # Users can see: their own notifications (counted in notification_counters)
+            # + their tenant's and system-wide broadcasts (counted live)
+            own = notification_counter.get_for_user(db, user_id=user_id)
+            broadcasts = self.get_broadcast_stats(db, tenant_id=tenant_id)
 
             return {
-                "total": total,
-                "unread": unread,
-                "urgent": urgent
+                "total": own["total"] + broadcasts["total"],
+                "unread": own["unread"] + broadcasts["unread"],
+                "urgent": own["urgent"] + broadcasts["urgent"]
             }
         except Exception as e:
             print(f"❌ Error in get_notification_stats: {str(e)}")
@@ -358,6 +314,52 @@ class CRUDNotification(CRUDBase[Notification, NotificationCreate, NotificationUp
                 "urgent": 0
             }
     
+    def _broadcast_filter(self, tenant_id: Optional[str]):
+        """Broadcast rows visible to users of ``tenant_id`` (system broadcasts only without a tenant)"""
+        scopes = [Notification.tenant_id == "system", Notification.tenant_id.is_(None)]
+        if tenant_id is not None and tenant_id != "system":
+            scopes.append(Notification.tenant_id == tenant_id)
+        return and_(Notification.user_id.is_(None), or_(*scopes))
+
+    def get_broadcast_stats(self, db: Session, *, tenant_id: Optional[str]) -> Dict[str, int]:
+        """Counts of broadcast notifications visible to users of a tenant, in one query"""
+        total, unread, urgent = db.query(
+            func.count(Notification.id),
+            func.count(Notification.id).filter(Notification.is_read == False),
+            func.count(Notification.id).filter(
+                Notification.is_read == False,
+                Notification.priority.in_(['URGENT', 'urgent'])
+            ),
+        ).filter(self._broadcast_filter(tenant_id)).one()
+        return {"total": total, "unread": unread, "urgent": urgent}
+
+    def get_changes(
+        self,
+        db: Session,
+        *,
+        user_id: int,
+        tenant_id: Optional[str],
+        since: Optional[Tuple[datetime, int]] = None,
+        limit: int = 100
+    ) -> List[Notification]:
+        """Notifications created or changed after the ``since`` (updated_at, id) position, oldest first.
+
+        The user's own rows and the visible broadcasts are read as two
+        branches so each walks its own (…, updated_at, id) index instead of
+        one OR filter across both.
+        """
+        branches = []
+        for visible in (Notification.user_id == user_id, self._broadcast_filter(tenant_id)):
+            branch = select(Notification).where(visible)
+            if since is not None:
+                branch = branch.where(tuple_(Notification.updated_at, Notification.id) > tuple_(*since))
+            branches.append(
+                branch.order_by(Notification.updated_at, Notification.id).limit(limit)
+            )
+
+        changed = aliased(Notification, union_all(*branches).subquery())
+        return db.query(changed).order_by(changed.updated_at, changed.id).limit(limit).all()
+
     def _send_notification(self, db: Session, notification: Notification):
         """Internal method to trigger notification sending"""
         try:
@@ -0,0 +1,77 @@
+from typing import Dict, Iterable, Set
+from sqlalchemy import event, func, inspect
+from sqlalchemy.orm import Session
+from app.crud.precomputed import CRUDPrecomputed
+from app.models.notification import Notification
+from app.models.notification_counter import NotificationCounter
+
+# Notification columns that feed into the counters
+_COUNTED_FIELDS = ("user_id", "is_read", "priority")
+
+
+def _empty_counts() -> dict:
+    return {"total": 0, "unread": 0, "urgent": 0}
+
+
+class CRUDNotificationCounter(CRUDPrecomputed[NotificationCounter]):
+    key_column = "user_id"
+    value_fields = ("total", "unread", "urgent")
+
+    def compute(self, db: Session, *, user_ids: Iterable[int]) -> Dict[int, dict]:
+        """Count the users' own notifications with one grouped query"""
+        user_ids = list(set(user_ids))
+        if not user_ids:
+            return {}
+
+        rows = db.query(
+            Notification.user_id,
+            func.count(Notification.id),
+            func.count(Notification.id).filter(Notification.is_read == False),
+            func.count(Notification.id).filter(
+                Notification.is_read == False,
+                Notification.priority.in_(['URGENT', 'urgent'])
+            ),
+        ).filter(
+            Notification.user_id.in_(user_ids)
+        ).group_by(Notification.user_id).all()
+
+        counts = {user_id: _empty_counts() for user_id in user_ids}
+        for user_id, total, unread, urgent in rows:
+            counts[user_id] = {"total": total, "unread": unread, "urgent": urgent}
+        return counts
+
+    def _compute(self, db: Session, keys: list) -> Dict[int, dict]:
+        return self.compute(db, user_ids=keys)
+
+    def get_for_user(self, db: Session, *, user_id: int) -> dict:
+        """Counts of the user's own notifications, refreshing a missing or stale row only"""
+        return self.get_many(db, [user_id]).get(user_id, _empty_counts())
+
+    def mark_stale(self, db: Session, *, user_ids: Iterable[int]) -> None:
+        """Mark counters stale after bulk updates that bypass the session (Query.update)"""
+        user_ids = list(set(user_ids))
+        if user_ids:
+            self.invalidate(db, NotificationCounter.user_id.in_(user_ids))
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_notification_counters_stale(session: Session, flush_context) -> None:
+    """Mark counters stale when a user's own notifications change"""
+    user_ids: Set[int] = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Notification):
+            changed = obj in session.new or obj in session.deleted or any(
+                inspect(obj).attrs[field].history.has_changes() for field in _COUNTED_FIELDS
+            )
+            if not changed:
+                continue
+            history = inspect(obj).attrs["user_id"].history
+            user_ids.update(value for value in history.sum() if value is not None)
+
+    if not user_ids:
+        return
+
+    notification_counter.invalidate_in_flush(session, NotificationCounter.user_id.in_(user_ids))
+
+
+notification_counter = CRUDNotificationCounter(NotificationCounter)
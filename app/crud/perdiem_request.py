@@ -1,11 +1,23 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session, contains_eager
+from sqlalchemy import and_, func, or_, select
 
 from app.crud.base import CRUDBase
 from app.models.perdiem_request import PerdiemRequest, PerdiemStatus
+from app.models.event_participant import EventParticipant
+from app.models.event import Event
 from app.schemas.perdiem_request import PerdiemRequestCreate, PerdiemRequestUpdate
 
+# Tenant approval queues and the request status each one lists
+APPROVAL_QUEUES = {
+    "pending": PerdiemStatus.PENDING_APPROVAL.value,
+    "approved": PerdiemStatus.APPROVED.value,
+    "issued": PerdiemStatus.ISSUED.value,
+    "rejected": PerdiemStatus.REJECTED.value,
+    "completed": PerdiemStatus.COMPLETED.value,
+}
+
+
 class CRUDPerdiemRequest(CRUDBase[PerdiemRequest, PerdiemRequestCreate, PerdiemRequestUpdate]):
     def get_by_participant(
         self, db: Session, *, participant_id: int
@@ -68,4 +80,96 @@ class CRUDPerdiemRequest(CRUDBase[PerdiemRequest, PerdiemRequestCreate, PerdiemR
             db.refresh(request)
         return request
 
+    def _queue_filter(self, queues: List[str], approver_email: str):
+        """Status filter for the given queues; pending is limited to the approver"""
+        conditions = []
+        other_statuses = [APPROVAL_QUEUES[queue] for queue in queues if queue != "pending"]
+        if "pending" in queues:
+            conditions.append(and_(
+                PerdiemRequest.status == APPROVAL_QUEUES["pending"],
+                PerdiemRequest.approver_email == approver_email
+            ))
+        if other_statuses:
+            conditions.append(PerdiemRequest.status.in_(other_statuses))
+        return or_(*conditions)
+
+    def _tenant_queue_query(self, db: Session, *, tenant_id: int, queues: List[str], approver_email: str):
+        return db.query(PerdiemRequest).join(
+            EventParticipant, PerdiemRequest.participant_id == EventParticipant.id
+        ).join(
+            Event, EventParticipant.event_id == Event.id
+        ).filter(
+            Event.tenant_id == tenant_id,
+            self._queue_filter(queues, approver_email)
+        )
+
+    def get_tenant_queues(
+        self,
+        db: Session,
+        *,
+        tenant_id: int,
+        approver_email: str,
+        queues: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        before_id: Optional[int] = None
+    ) -> Dict[str, Tuple[List[PerdiemRequest], Optional[int]]]:
+        """Load one or more tenant approval queues with a single query.
+
+        Participant and event are loaded in the same joined query. Each queue is
+        ordered newest first and keyset-paginated on id: pass the returned
+        cursor back as ``before_id`` to get the next page. Returns
+        ``{queue: (requests, next_cursor)}``; the cursor is None on the last page.
+        """
+        queues = queues or list(APPROVAL_QUEUES)
+        query = self._tenant_queue_query(
+            db, tenant_id=tenant_id, queues=queues, approver_email=approver_email
+        ).options(
+            contains_eager(PerdiemRequest.participant).contains_eager(EventParticipant.event)
+        )
+        if before_id is not None:
+            query = query.filter(PerdiemRequest.id < before_id)
+
+        if limit is not None:
+            # Fetch one extra row per queue to know whether another page exists
+            ranked = self._tenant_queue_query(
+                db, tenant_id=tenant_id, queues=queues, approver_email=approver_email
+            ).with_entities(
+                PerdiemRequest.id.label("id"),
+                func.row_number().over(
+                    partition_by=PerdiemRequest.status,
+                    order_by=PerdiemRequest.id.desc()
+                ).label("position")
+            )
+            if before_id is not None:
+                ranked = ranked.filter(PerdiemRequest.id < before_id)
+            ranked = ranked.subquery()
+            query = query.filter(PerdiemRequest.id.in_(
+                select(ranked.c.id).where(ranked.c.position <= limit + 1)
+            ))
+
+        status_to_queue = {APPROVAL_QUEUES[queue]: queue for queue in queues}
+        grouped: Dict[str, List[PerdiemRequest]] = {queue: [] for queue in queues}
+        for request in query.order_by(PerdiemRequest.id.desc()).all():
+            grouped[status_to_queue[request.status]].append(request)
+
+        result = {}
+        for queue, requests in grouped.items():
+            next_cursor = None
+            if limit is not None and len(requests) > limit:
+                requests = requests[:limit]
+                next_cursor = requests[-1].id
+            result[queue] = (requests, next_cursor)
+        return result
+
+    def count_tenant_queues(self, db: Session, *, tenant_id: int, approver_email: str) -> Dict[str, int]:
+        """Count every tenant approval queue with one grouped query"""
+        rows = self._tenant_queue_query(
+            db, tenant_id=tenant_id, queues=list(APPROVAL_QUEUES), approver_email=approver_email
+        ).with_entities(
+            PerdiemRequest.status, func.count(PerdiemRequest.id)
+        ).group_by(PerdiemRequest.status).all()
+
+        counts = dict(rows)
+        return {queue: counts.get(status, 0) for queue, status in APPROVAL_QUEUES.items()}
+
 perdiem_request = CRUDPerdiemRequest(PerdiemRequest)
@@ -0,0 +1,148 @@
+"""
+Precomputed aggregates kept in a table, one row per key, marked stale by
+writers and recomputed lazily by readers.
+
+Every invalidation marks the row stale and bumps its ``version``. A refresh
+reads the versions before it computes and writes back (clearing ``is_stale``)
+only where the version is still the same, so an invalidation that lands while
+the numbers are being computed keeps the row stale instead of being
+overwritten. Refreshes run in a session and transaction of their own: read
+paths never commit the caller's session. A session holding invalidations it
+has not committed yet gets live numbers that include its own changes.
+"""
+from typing import Any, Dict, Iterable, Tuple
+
+from sqlalchemy import bindparam, event, func, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.crud.base import CRUDBase, ModelType
+from app.db.database import SessionLocal
+import logging
+
+logger = logging.getLogger(__name__)
+
+# session.info key: tables this session has invalidated but not committed
+_PENDING_KEY = "precomputed_pending"
+
+
+class CRUDPrecomputed(CRUDBase[ModelType, dict, dict]):
+    """Subclasses set ``key_column`` and ``value_fields`` and implement
+    ``_compute``; the model needs ``is_stale``, ``version`` and
+    ``refreshed_at`` columns besides those."""
+
+    key_column: str
+    value_fields: Tuple[str, ...]
+
+    def _compute(self, db: Session, keys: list) -> Dict[Any, dict]:
+        """Values of every key in ``keys``, including keys with nothing to count"""
+        raise NotImplementedError
+
+    @property
+    def _key(self):
+        return getattr(self.model, self.key_column)
+
+    def refresh(self, keys: Iterable) -> Dict[Any, dict]:
+        """Recompute and persist the values for ``keys`` in a separate transaction"""
+        keys = list(set(keys))
+        if not keys:
+            return {}
+
+        table = self.model.__table__
+        db = SessionLocal()
+        try:
+            # Rows have to exist before computing, so that an invalidation
+            # racing with the computation has a version to bump
+            db.execute(
+                insert(table)
+                .values([{self.key_column: key, "is_stale": True, "version": 0} for key in keys])
+                .on_conflict_do_nothing(index_elements=[self.key_column])
+            )
+            db.commit()
+
+            versions = dict(db.query(self._key, self.model.version).filter(self._key.in_(keys)).all())
+            values = self._compute(db, keys)
+
+            db.connection().execute(
+                update(table)
+                .where(
+                    table.c[self.key_column] == bindparam("row_key"),
+                    table.c.version == bindparam("row_version"),
+                )
+                .values(
+                    is_stale=False,
+                    refreshed_at=func.now(),
+                    updated_at=func.now(),
+                    **{field: bindparam(f"new_{field}") for field in self.value_fields},
+                ),
+                [
+                    {
+                        "row_key": key,
+                        "row_version": versions.get(key),
+                        **{f"new_{field}": values[key][field] for field in self.value_fields},
+                    }
+                    for key in keys
+                ],
+            )
+            db.commit()
+            return values
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def get_many(self, db: Session, keys: Iterable) -> Dict[Any, dict]:
+        """Values keyed by ``key_column``, refreshing missing or stale rows only"""
+        keys = list(set(keys))
+        if not keys:
+            return {}
+
+        stored = db.query(
+            self._key, self.model.is_stale, *(getattr(self.model, field) for field in self.value_fields)
+        ).filter(self._key.in_(keys)).all()
+        values = {
+            row[0]: dict(zip(self.value_fields, row[2:]))
+            for row in stored if not row[1]
+        }
+
+        outdated = [key for key in keys if key not in values]
+        if not outdated:
+            return values
+        if self.model.__tablename__ in db.info.get(_PENDING_KEY, ()):
+            values.update(self._compute(db, outdated))
+            return values
+        try:
+            values.update(self.refresh(outdated))
+        except Exception as e:
+            # Fall back to live numbers if the table cannot be written
+            logger.warning(f"Failed to refresh {self.model.__tablename__} for {outdated}: {e}")
+            values.update(self._compute(db, outdated))
+        return values
+
+    def invalidate(self, session: Session, condition) -> None:
+        """Mark the rows matching ``condition`` stale within the session's transaction"""
+        table = self.model.__table__
+        session.info.setdefault(_PENDING_KEY, set()).add(table.name)
+        session.connection().execute(
+            update(table).where(condition).values(is_stale=True, version=table.c.version + 1)
+        )
+
+    def invalidate_in_flush(self, session: Session, condition) -> None:
+        """``invalidate`` for after_flush listeners: in a savepoint, never failing the flush"""
+        connection = session.connection()
+        try:
+            with connection.begin_nested():
+                self.invalidate(session, condition)
+        except Exception as e:
+            logger.warning(f"Failed to mark {self.model.__tablename__} stale: {e}")
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidations_committed(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+@event.listens_for(Session, "after_rollback")
+def _invalidations_rolled_back(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -1,5 +1,6 @@
 from typing import Optional
 from sqlalchemy.orm import Session
+from app.core.cache import attribute_values, cached_model, invalidate_on_change
 from app.crud.base import CRUDBase
 from app.models.tenant import Tenant
 from app.schemas.tenant import TenantCreate, TenantUpdate
@@ -9,7 +10,12 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+invalidate_on_change(Tenant, lambda tenant: [f"tenant:{slug}" for slug in attribute_values(tenant, "slug")])
+
+
 class CRUDTenant(CRUDBase[Tenant, TenantCreate, TenantUpdate]):
+    @cached_model(Tenant, lambda self, db, *, slug: slug, name="tenant_by_slug",
+                  tags=lambda self, db, *, slug: [f"tenant:{slug}"])
     def get_by_slug(self, db: Session, *, slug: str) -> Optional[Tenant]:
         return db.query(Tenant).filter(Tenant.slug == slug).first()
     
@@ -0,0 +1,123 @@
+from typing import Dict, Iterable, Set
+from sqlalchemy import event, func, inspect, or_, select, union
+from sqlalchemy.orm import Session
+from app.crud.precomputed import CRUDPrecomputed
+from app.models.tenant_stats import TenantStats
+from app.models.user import User, UserStatus
+from app.models.user_roles import UserRole as UserRoleModel
+from app.models.user_tenants import UserTenant
+
+# User columns that feed into the tenant statistics
+_USER_STAT_FIELDS = ("tenant_id", "is_active", "status", "last_login")
+
+
+def _empty_stats() -> dict:
+    return {
+        "total_users": 0,
+        "active_users": 0,
+        "pending_users": 0,
+        "last_user_activity": None,
+    }
+
+
+class CRUDTenantStats(CRUDPrecomputed[TenantStats]):
+    key_column = "tenant_id"
+    value_fields = ("total_users", "active_users", "pending_users", "last_user_activity")
+
+    def _compute(self, db: Session, keys: list) -> Dict[str, dict]:
+        return self.compute(db, tenant_ids=keys)
+
+    def compute(self, db: Session, *, tenant_ids: Iterable[str]) -> Dict[str, dict]:
+        """Compute user statistics for the given tenants with one grouped query.
+
+        A user belongs to a tenant when their primary tenant_id matches, when
+        they hold a role in the tenant, or when they have an active user_tenants
+        assignment.
+        """
+        tenant_ids = list(set(tenant_ids))
+        if not tenant_ids:
+            return {}
+
+        members = union(
+            select(User.tenant_id.label("tenant_id"), User.id.label("user_id"))
+            .where(User.tenant_id.in_(tenant_ids)),
+            select(UserRoleModel.tenant_id, UserRoleModel.user_id)
+            .where(UserRoleModel.tenant_id.in_(tenant_ids)),
+            select(UserTenant.tenant_id, UserTenant.user_id)
+            .where(UserTenant.tenant_id.in_(tenant_ids), UserTenant.is_active == True),
+        ).subquery()
+
+        rows = db.query(
+            members.c.tenant_id,
+            func.count(User.id),
+            func.count(User.id).filter(User.is_active == True),
+            func.count(User.id).filter(User.status == UserStatus.PENDING_APPROVAL),
+            func.max(User.last_login),
+        ).join(
+            User, User.id == members.c.user_id
+        ).group_by(members.c.tenant_id).all()
+
+        stats = {tenant_id: _empty_stats() for tenant_id in tenant_ids}
+        for tenant_id, total, active, pending, last_activity in rows:
+            stats[tenant_id] = {
+                "total_users": total,
+                "active_users": active,
+                "pending_users": pending,
+                "last_user_activity": last_activity,
+            }
+        return stats
+
+    def get_for_tenants(self, db: Session, *, tenant_ids: Iterable[str]) -> Dict[str, dict]:
+        """Get statistics keyed by tenant slug, refreshing missing or stale rows only"""
+        return self.get_many(db, tenant_ids)
+
+    def get_for_tenant(self, db: Session, *, tenant_id: str) -> dict:
+        return self.get_for_tenants(db, tenant_ids=[tenant_id]).get(tenant_id, _empty_stats())
+
+    def mark_stale(self, db: Session, *, tenant_ids: Iterable[str]) -> None:
+        tenant_ids = list(set(tenant_ids))
+        if tenant_ids:
+            self.invalidate(db, TenantStats.tenant_id.in_(tenant_ids))
+
+
+def _attribute_values(obj, key: str) -> Set:
+    history = inspect(obj).attrs[key].history
+    return {value for value in history.sum() if value is not None}
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_tenant_stats_stale(session: Session, flush_context) -> None:
+    """Mark tenant statistics stale when users, roles or memberships change"""
+    tenant_ids: Set[str] = set()
+    user_ids: Set[int] = set()
+
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, User):
+            changed = obj in session.new or obj in session.deleted or any(
+                inspect(obj).attrs[field].history.has_changes() for field in _USER_STAT_FIELDS
+            )
+            if changed:
+                tenant_ids.update(_attribute_values(obj, "tenant_id"))
+                if obj.id is not None:
+                    user_ids.add(obj.id)
+        elif isinstance(obj, (UserRoleModel, UserTenant)):
+            tenant_ids.update(_attribute_values(obj, "tenant_id"))
+
+    if not tenant_ids and not user_ids:
+        return
+
+    conditions = []
+    if tenant_ids:
+        conditions.append(TenantStats.tenant_id.in_(tenant_ids))
+    if user_ids:
+        conditions.append(TenantStats.tenant_id.in_(
+            select(UserRoleModel.tenant_id).where(UserRoleModel.user_id.in_(user_ids))
+        ))
+        conditions.append(TenantStats.tenant_id.in_(
+            select(UserTenant.tenant_id).where(UserTenant.user_id.in_(user_ids))
+        ))
+
+    tenant_stats.invalidate_in_flush(session, or_(*conditions))
+
+
+tenant_stats = CRUDTenantStats(TenantStats)
@@ -1,17 +1,20 @@
 # File: app/crud/vetting_committee.py
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from typing import List, Optional
+from sqlalchemy import and_, delete, event, func, insert, inspect, literal, or_, select, union
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 from datetime import datetime
 import secrets
 
-from app.models.vetting_committee import VettingCommittee, VettingCommitteeMember, ParticipantSelection
+from app.models.vetting_committee import VettingCommittee, VettingCommitteeMember, VettingCommitteeApprover, ParticipantSelection
 from app.models.user import User, UserRole as UserRoleEnum, UserStatus, AuthProvider
 from app.models.user_roles import UserRole
 from app.models.user_tenants import UserTenant, UserTenantRole
 from app.models.vetting_role_assignment import VettingRoleAssignment
 from app.models.event_participant import EventParticipant
 from app.models.event import Event
+from app.models.tenant import Tenant
+from app.models.user_event_access import UserEventAccess
+from app.models.vetting_member_selection import VettingMemberSelection, VettingMemberSubmission
 from app.models.chat import ChatRoom, ChatType, VettingChatRoom, VettingChatMember
 from app.schemas.vetting_committee import VettingCommitteeCreate, ParticipantSelectionCreate
 from app.core.security import get_password_hash
@@ -607,6 +610,133 @@ def get_committee_for_user(db: Session, user_email: str) -> List[VettingCommitte
         VettingCommitteeMember.email == user_email
     ).all()
 
+def _access_filter(user_id: int, email: Optional[str]):
+    """user_event_access rows granted to a user, by user id or email"""
+    conditions = [UserEventAccess.user_id == user_id]
+    if email:
+        conditions.append(UserEventAccess.email == email.lower())
+    return or_(*conditions)
+
+def get_event_access(db: Session, *, user_id: int, email: Optional[str]) -> List[Tuple[int, int, str]]:
+    """(committee_id, event_id, reason) for every committee the user sits on or approves"""
+    return [
+        tuple(row) for row in db.query(
+            UserEventAccess.committee_id, UserEventAccess.event_id, UserEventAccess.reason
+        ).filter(_access_filter(user_id, email)).distinct().all()
+    ]
+
+def get_events_for_user(
+    db: Session, *, user_id: int, email: Optional[str], skip: int = 0, limit: int = 100
+) -> List[Event]:
+    """Events the user vets as a committee member or approver"""
+    accessible = select(UserEventAccess.event_id).where(_access_filter(user_id, email))
+    return db.query(Event).filter(Event.id.in_(accessible)).order_by(Event.id).offset(skip).limit(limit).all()
+
+def get_committees_for_user(
+    db: Session, *, user_id: int, email: Optional[str], reasons: Optional[Iterable[str]] = None
+) -> List[VettingCommittee]:
+    """Committees the user is a member (reason ``committee_member``) or approver (``approver``) of"""
+    accessible = select(UserEventAccess.committee_id).where(_access_filter(user_id, email))
+    if reasons is not None:
+        accessible = accessible.where(UserEventAccess.reason.in_(list(reasons)))
+    return db.query(VettingCommittee).filter(VettingCommittee.id.in_(accessible)).order_by(VettingCommittee.id).all()
+
+def get_vetting_events_for_user(
+    db: Session, *, user_id: int, email: Optional[str]
+) -> List[Tuple[VettingCommittee, Event, Optional[Tenant], Set[str]]]:
+    """Committees the user has access to with their event, tenant and access reasons, in one query"""
+    rows = db.query(VettingCommittee, Event, Tenant, UserEventAccess.reason).join(
+        UserEventAccess, UserEventAccess.committee_id == VettingCommittee.id
+    ).join(
+        Event, Event.id == VettingCommittee.event_id
+    ).outerjoin(
+        Tenant, Tenant.id == Event.tenant_id
+    ).filter(
+        _access_filter(user_id, email)
+    ).order_by(VettingCommittee.id).all()
+
+    grouped: Dict[int, Tuple[VettingCommittee, Event, Optional[Tenant], Set[str]]] = {}
+    for committee, event_row, tenant, reason in rows:
+        grouped.setdefault(committee.id, (committee, event_row, tenant, set()))[3].add(reason)
+    return list(grouped.values())
+
+def _selection_counts():
+    """count(*) of member votes that are ``selected`` / ``not_selected``"""
+    return (
+        func.count().filter(VettingMemberSelection.selection == "selected"),
+        func.count().filter(VettingMemberSelection.selection == "not_selected"),
+    )
+
+def get_member_selection_rows(db: Session, *, event_id: int):
+    """Every member selection of an event with its participant's vote tallies, in one query"""
+    selected, not_selected = _selection_counts()
+    by_participant = VettingMemberSelection.participant_id
+    return db.query(
+        VettingMemberSelection.participant_id,
+        VettingMemberSelection.member_email,
+        VettingMemberSelection.selection,
+        VettingMemberSelection.comments,
+        VettingMemberSelection.updated_at,
+        selected.over(partition_by=by_participant).label("selected_count"),
+        not_selected.over(partition_by=by_participant).label("not_selected_count"),
+    ).filter(
+        VettingMemberSelection.event_id == event_id
+    ).order_by(VettingMemberSelection.participant_id, VettingMemberSelection.id).all()
+
+def get_participant_tallies(db: Session, *, event_id: int):
+    """Grouped member vote counts per participant of an event, as a subquery (participant_id, selected_count, not_selected_count)"""
+    selected, not_selected = _selection_counts()
+    return db.query(
+        VettingMemberSelection.participant_id.label("participant_id"),
+        selected.label("selected_count"),
+        not_selected.label("not_selected_count"),
+    ).filter(
+        VettingMemberSelection.event_id == event_id
+    ).group_by(VettingMemberSelection.participant_id).subquery()
+
+def get_member_progress(db: Session, *, committee_id: int, event_id: int):
+    """Committee members with how many participants each has reviewed, in one grouped query"""
+    selected, not_selected = _selection_counts()
+    member_email = func.lower(VettingMemberSelection.member_email)
+    counts = db.query(
+        member_email.label("email"),
+        func.count().label("reviewed"),
+        selected.label("selected"),
+        not_selected.label("not_selected"),
+    ).filter(
+        VettingMemberSelection.event_id == event_id
+    ).group_by(member_email).subquery()
+
+    return db.query(
+        VettingCommitteeMember.email,
+        VettingCommitteeMember.full_name,
+        func.coalesce(counts.c.reviewed, 0).label("reviewed"),
+        func.coalesce(counts.c.selected, 0).label("selected"),
+        func.coalesce(counts.c.not_selected, 0).label("not_selected"),
+    ).outerjoin(
+        counts, counts.c.email == func.lower(VettingCommitteeMember.email)
+    ).filter(
+        VettingCommitteeMember.committee_id == committee_id
+    ).order_by(VettingCommitteeMember.id).all()
+
+def get_submitted_member_emails(db: Session, *, event_id: int) -> Set[str]:
+    """Lower-cased emails of everyone who has submitted their vetting for an event"""
+    return {
+        email for (email,) in db.query(
+            func.lower(VettingMemberSubmission.member_email)
+        ).filter(VettingMemberSubmission.event_id == event_id).distinct()
+    }
+
+def selection_consensus(selected: int, not_selected: int, member_count: int) -> str:
+    """``selected`` / ``not_selected`` once every member agrees, ``split`` on any disagreement, else ``pending``"""
+    if selected and not_selected:
+        return "split"
+    if member_count and selected >= member_count:
+        return "selected"
+    if member_count and not_selected >= member_count:
+        return "not_selected"
+    return "pending"
+
 def submit_selections(
     db: Session,
     committee_id: int,
@@ -704,3 +834,63 @@ def approve_selections(
     
     db.refresh(committee)
     return committee
+
+
+def _event_access_grants(committee_ids: Optional[List[int]]):
+    """(email, user_id, event_id, committee_id, reason) rows of the committees' members and approvers"""
+    def scoped(query):
+        if committee_ids is None:
+            return query
+        return query.where(VettingCommittee.id.in_(committee_ids))
+
+    return union(
+        scoped(select(
+            func.lower(VettingCommitteeMember.email), VettingCommitteeMember.user_id,
+            VettingCommittee.event_id, VettingCommittee.id, literal("committee_member")
+        ).join(VettingCommittee, VettingCommittee.id == VettingCommitteeMember.committee_id)),
+        scoped(select(
+            func.lower(VettingCommittee.approver_email), VettingCommittee.approver_id,
+            VettingCommittee.event_id, VettingCommittee.id, literal("approver")
+        ).where(or_(VettingCommittee.approver_email.isnot(None), VettingCommittee.approver_id.isnot(None)))),
+        scoped(select(
+            func.lower(VettingCommitteeApprover.email), VettingCommitteeApprover.user_id,
+            VettingCommittee.event_id, VettingCommittee.id, literal("approver")
+        ).join(VettingCommittee, VettingCommittee.id == VettingCommitteeApprover.committee_id)),
+    )
+
+def rebuild_event_access(connection, committee_ids: Optional[Iterable[int]] = None) -> None:
+    """Recompute user_event_access rows for the given committees (all committees if None)"""
+    if committee_ids is not None:
+        committee_ids = list(set(committee_ids))
+        if not committee_ids:
+            return
+
+    clear = delete(UserEventAccess)
+    if committee_ids is not None:
+        clear = clear.where(UserEventAccess.committee_id.in_(committee_ids))
+    connection.execute(clear)
+    connection.execute(
+        insert(UserEventAccess).from_select(
+            ["email", "user_id", "event_id", "committee_id", "reason"],
+            _event_access_grants(committee_ids),
+        )
+    )
+
+@event.listens_for(Session, "after_flush")
+def _refresh_event_access(session: Session, flush_context) -> None:
+    """Keep user_event_access in step with committees, members and approvers in the same transaction"""
+    committee_ids: Set[int] = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, VettingCommittee):
+            if obj not in session.deleted and obj.id is not None:
+                committee_ids.add(obj.id)
+        elif isinstance(obj, (VettingCommitteeMember, VettingCommitteeApprover)):
+            history = inspect(obj).attrs["committee_id"].history
+            committee_ids.update(value for value in history.sum() if value is not None)
+
+    if not committee_ids:
+        return
+
+    # The index drives authorization: a failed rebuild fails the flush, and
+    # with it the transaction, rather than leaving stale grants behind
+    rebuild_event_access(session.connection(), committee_ids)
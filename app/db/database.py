@@ -2,8 +2,12 @@ from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core.query_stats import instrument_engine
+from app.core.metrics import instrument_pool
 
 engine = create_engine(settings.DATABASE_URL)
+instrument_engine(engine)
+instrument_pool(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
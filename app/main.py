@@ -1,6 +1,7 @@
 # File: app/main.py (CORS SECTION FIX)
 import os
 import time
+import uuid
 import logging
 from typing import Callable
 from fastapi import FastAPI, Request, Response
@@ -8,17 +9,20 @@ from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
 from pydantic import ValidationError
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 from app.api.v1.api import api_router
 from app.core.config import settings
+from app.core.query_stats import count_queries, check_request
+from app.core.metrics import REQUESTS_IN_PROGRESS, observe_request, render_metrics, route_template
+from app.core.logging_config import setup_logging, request_id_var
+from app.core.schema_state import StartupTimer, ensure_schema, schema_fingerprint
+from app.db.database import engine as db_engine
+from app.services import event_deletion_service, voucher_ledger
 
-# Configure logging - Set to INFO to see debug messages
-logging.basicConfig(level=logging.INFO)
+# Configure logging - queued JSON records, level from LOG_LEVEL
+setup_logging()
 logger = logging.getLogger(__name__)
 
-# Disable Azure SDK verbose logging
-logging.getLogger("azure.core.pipeline.policies.http_logging_policy").setLevel(logging.WARNING)
-
 # Create FastAPI app
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -51,7 +55,7 @@ app.add_middleware(
         "Authorization",  # Allow auth headers
         "Content-Type",  # Allow content type headers
     ],
-    expose_headers=["X-Process-Time"],
+    expose_headers=["X-Process-Time", "X-Request-ID", "X-DB-Query-Count", "X-DB-Time", "X-DB-Repeated-Queries", "ETag", "X-Next-Cursor"],
     max_age=3600,  # Cache preflight requests for 1 hour
 )
 
@@ -60,24 +64,35 @@ app.add_middleware(
 async def log_requests(request: Request, call_next: Callable) -> Response:
     """Log requests with minimal output"""
     start_time = time.time()
+    request_id = request.headers.get("x-request-id") or uuid.uuid4().hex
+    request_id_var.set(request_id)
 
-    # Log cash claims requests specifically
+    # Log cash claims requests specifically (headers are not logged, they carry tokens)
     if "cash-claims" in str(request.url.path):
-        logger.info(f"💰 CASH CLAIMS REQUEST: {request.method} {request.url.path}")
-        logger.info(f"💰 Query params: {dict(request.query_params)}")
-        logger.info(f"💰 Headers: {dict(request.headers)}")
+        logger.debug("💰 CASH CLAIMS REQUEST", extra={
+            "method": request.method, "path": request.url.path, "query_params": dict(request.query_params)
+        })
         
         # Note: Do NOT read request body here - it interferes with FastAPI's Pydantic model parsing
         # Body will be logged by the endpoint itself
 
+    status_code = 500
+    REQUESTS_IN_PROGRESS.labels(request.method).inc()
     try:
-        response = await call_next(request)
+        with count_queries() as query_stats:
+            response = await call_next(request)
+        status_code = response.status_code
         process_time = time.time() - start_time
         response.headers["X-Process-Time"] = str(process_time)
+        response.headers["X-Request-ID"] = request_id
+        response.headers["X-DB-Query-Count"] = str(query_stats.count)
+        response.headers["X-DB-Time"] = f"{query_stats.db_time:.4f}"
+        response.headers["X-DB-Repeated-Queries"] = str(query_stats.max_repeats)
+        check_request(query_stats, request.method, request.url.path, request.scope.get("endpoint"))
 
         # Log cash claims responses
         if "cash-claims" in str(request.url.path):
-            logger.info(f"💰 CASH CLAIMS RESPONSE: {response.status_code}")
+            logger.debug(f"💰 CASH CLAIMS RESPONSE: {response.status_code}")
             if response.status_code >= 400:
                 logger.error(f"💰 CASH CLAIMS ERROR: {response.status_code} for {request.method} {request.url.path}")
                 # Try to read response body for error details
@@ -104,6 +119,7 @@ async def log_requests(request: Request, call_next: Callable) -> Response:
             logger.error(f"💰 Exception type: {type(e).__name__}")
         
         if "ValidationError" in str(type(e)) or "validation" in str(e).lower():
+            status_code = 422
             return JSONResponse(
                 status_code=422,
                 content={"error": "Validation error", "message": str(e), "detail": str(e)},
@@ -115,6 +131,17 @@ async def log_requests(request: Request, call_next: Callable) -> Response:
             content={"error": "Internal server error", "message": str(e)},
             headers={"Access-Control-Allow-Origin": "*"}
         )
+    finally:
+        REQUESTS_IN_PROGRESS.labels(request.method).dec()
+        observe_request(request.method, route_template(request.scope), status_code, time.time() - start_time)
+
+# Prometheus scrape endpoint (aggregated across gunicorn workers)
+@app.get("/metrics", include_in_schema=False)
+def metrics(request: Request):
+    if settings.METRICS_TOKEN and request.headers.get("authorization") != f"Bearer {settings.METRICS_TOKEN}":
+        return JSONResponse(status_code=401, content={"detail": "Not authenticated"})
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
 
 # Test CORS endpoint (for debugging)
 @app.get("/test-cors")
@@ -137,61 +164,49 @@ def test_connection():
     }
 
 def create_default_roles():
-    """Create default system roles for all tenants"""
+    """Create default system roles for all tenants (one set-based statement)"""
     try:
-        engine = create_engine(settings.DATABASE_URL)
-        with engine.connect() as conn:
-            # Get all tenants
-            tenants_result = conn.execute(text("SELECT slug FROM tenants"))
-            tenants = [row[0] for row in tenants_result.fetchall()]
-            
-            # Default roles to create
-            default_roles = [
-                {"name": "Admin", "description": "Full administrative access to tenant resources"},
-                {"name": "Event Manager", "description": "Can create and manage events"},
-                {"name": "User Manager", "description": "Can manage users and their roles"},
-                {"name": "Viewer", "description": "Read-only access to tenant resources"},
-                {"name": "Facilitator", "description": "Can facilitate events and manage participants"},
-                {"name": "Organizer", "description": "Can organize and coordinate events"},
-                {"name": "Visitor", "description": "Default role for event participants"}
-            ]
-            
-            for tenant_id in tenants:
-                for role_data in default_roles:
-                    # Check if role already exists
-                    check_sql = "SELECT id FROM roles WHERE name = :name AND tenant_id = :tenant_id"
-                    existing = conn.execute(text(check_sql), {
-                        "name": role_data["name"],
-                        "tenant_id": tenant_id
-                    }).fetchone()
-                    
-                    if not existing:
-                        # Create the role
-                        insert_sql = """
-                        INSERT INTO roles (name, description, tenant_id, is_active, created_by, created_at)
-                        VALUES (:name, :description, :tenant_id, true, 'system', CURRENT_TIMESTAMP)
-                        """
-                        conn.execute(text(insert_sql), {
-                            "name": role_data["name"],
-                            "description": role_data["description"],
-                            "tenant_id": tenant_id
-                        })
-            
-            conn.commit()
+        # Default roles to create
+        default_roles = [
+            {"name": "Admin", "description": "Full administrative access to tenant resources"},
+            {"name": "Event Manager", "description": "Can create and manage events"},
+            {"name": "User Manager", "description": "Can manage users and their roles"},
+            {"name": "Viewer", "description": "Read-only access to tenant resources"},
+            {"name": "Facilitator", "description": "Can facilitate events and manage participants"},
+            {"name": "Organizer", "description": "Can organize and coordinate events"},
+            {"name": "Visitor", "description": "Default role for event participants"}
+        ]
+
+        values_sql = ", ".join(f"(:name_{i}, :description_{i})" for i in range(len(default_roles)))
+        params = {}
+        for i, role_data in enumerate(default_roles):
+            params[f"name_{i}"] = role_data["name"]
+            params[f"description_{i}"] = role_data["description"]
+
+        insert_sql = f"""
+        INSERT INTO roles (name, description, tenant_id, is_active, created_by, created_at)
+        SELECT d.name, d.description, t.slug, true, 'system', CURRENT_TIMESTAMP
+        FROM tenants t
+        CROSS JOIN (VALUES {values_sql}) AS d(name, description)
+        WHERE NOT EXISTS (
+            SELECT 1 FROM roles r WHERE r.name = d.name AND r.tenant_id = t.slug
+        )
+        """
+        with db_engine.begin() as conn:
+            conn.execute(text(insert_sql), params)
             
     except Exception as e:
         # Don't fail startup if role creation fails
-        pass
+        logger.warning(f"Default role creation failed: {e}")
 
 # Auto-migration function
-def run_auto_migration():
-    """Run database migrations automatically on startup"""
+def run_auto_migration() -> bool:
+    """Run database migrations; returns True when the schema is up to date"""
     try:
         # Try direct SQL migration first (safer)
         try:
             # Run direct SQL migration
-            engine = create_engine(settings.DATABASE_URL)
-            with engine.connect() as conn:
+            with db_engine.connect() as conn:
                 trans = conn.begin()
                 try:
                     # Add columns to users table
@@ -706,15 +721,158 @@ def run_auto_migration():
                     )
                     """
                     conn.execute(text(create_claim_conversation_messages_table))
+                    conn.execute(text("ALTER TABLE claim_conversations ADD COLUMN IF NOT EXISTS summary TEXT"))
+                    conn.execute(text("ALTER TABLE claim_conversations ADD COLUMN IF NOT EXISTS summary_through_id INTEGER"))
+                    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_claim_conversation_messages_conversation ON claim_conversation_messages(conversation_id, id)"))
+
+                    # Create tenant_stats table (precomputed tenant user statistics)
+                    create_tenant_stats_table = """
+                    CREATE TABLE IF NOT EXISTS tenant_stats (
+                        id SERIAL PRIMARY KEY,
+                        tenant_id VARCHAR NOT NULL UNIQUE REFERENCES tenants(slug) ON DELETE CASCADE,
+                        total_users INTEGER NOT NULL DEFAULT 0,
+                        active_users INTEGER NOT NULL DEFAULT 0,
+                        pending_users INTEGER NOT NULL DEFAULT 0,
+                        last_user_activity TIMESTAMP WITH TIME ZONE,
+                        is_stale BOOLEAN NOT NULL DEFAULT TRUE,
+                        refreshed_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+                        created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+                        updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+                    )
+                    """
+                    conn.execute(text(create_tenant_stats_table))
+                    conn.execute(text("ALTER TABLE tenant_stats ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 0"))
+
+                    # Row version for conditional GETs on public form fields
+                    conn.execute(text("ALTER TABLE form_fields ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP"))
+
+                    # Idempotency keys and duplicate guard for public registration
+                    create_registration_idempotency_table = """
+                    CREATE TABLE IF NOT EXISTS registration_idempotency_keys (
+                        id SERIAL PRIMARY KEY,
+                        idempotency_key VARCHAR(255) NOT NULL UNIQUE,
+                        event_id INTEGER NOT NULL REFERENCES events(id) ON DELETE CASCADE,
+                        participant_id INTEGER NOT NULL REFERENCES event_participants(id) ON DELETE CASCADE,
+                        created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+                        updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+                    )
+                    """
+                    conn.execute(text(create_registration_idempotency_table))
+                    conn.execute(text("""
+                        CREATE INDEX IF NOT EXISTS ix_user_tenants_tenant_active ON user_tenants(tenant_id, is_active)
+                    """))
+
+                    # Per diem approval queue lookups
+                    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_perdiem_requests_status_approver ON perdiem_requests(status, approver_email, id)"))
+                    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_perdiem_requests_participant_status ON perdiem_requests(participant_id, status)"))
+                    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_events_tenant_id ON events(tenant_id)"))
+
+                    # Materialized voucher balances, seeded from the redemption ledger
+                    create_voucher_balances_table = """
+                    CREATE TABLE IF NOT EXISTS participant_voucher_balances (
+                        id SERIAL PRIMARY KEY,
+                        allocation_id INTEGER NOT NULL REFERENCES event_allocations(id) ON DELETE CASCADE,
+                        participant_id INTEGER NOT NULL REFERENCES event_participants(id) ON DELETE CASCADE,
+                        redeemed_quantity INTEGER NOT NULL DEFAULT 0,
+                        redemption_count INTEGER NOT NULL DEFAULT 0,
+                        last_redeemed_at TIMESTAMP,
+                        created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+                        updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+                        CONSTRAINT uq_participant_voucher_balances_allocation_participant UNIQUE (allocation_id, participant_id)
+                    )
+                    """
+                    conn.execute(text(create_voucher_balances_table))
+                    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_participant_voucher_balances_participant_id ON participant_voucher_balances(participant_id)"))
+                    conn.execute(text(voucher_ledger.BALANCE_BACKFILL_SQL))
+
+                    # Per-day check-in counts for the event attendance stats
+                    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_event_checkins_event_date ON event_checkins(event_id, checkin_date)"))
+
+                    # Per-user notification counters and delta sync indexes
+                    create_notification_counters_table = """
+                    CREATE TABLE IF NOT EXISTS notification_counters (
+                        id SERIAL PRIMARY KEY,
+                        user_id INTEGER NOT NULL UNIQUE REFERENCES users(id) ON DELETE CASCADE,
+                        total INTEGER NOT NULL DEFAULT 0,
+                        unread INTEGER NOT NULL DEFAULT 0,
+                        urgent INTEGER NOT NULL DEFAULT 0,
+                        is_stale BOOLEAN NOT NULL DEFAULT TRUE,
+                        refreshed_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+                        created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+                        updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+                    )
+                    """
+                    conn.execute(text(create_notification_counters_table))
+                    conn.execute(text("ALTER TABLE notification_counters ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 0"))
+                    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_notifications_user_updated ON notifications(user_id, updated_at, id)"))
+                    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_notifications_broadcast_updated ON notifications(tenant_id, updated_at, id) WHERE user_id IS NULL"))
+
+                    # Vetting committee access index, backfilled once when first created
+                    create_user_event_access_table = """
+                    CREATE TABLE IF NOT EXISTS user_event_access (
+                        id SERIAL PRIMARY KEY,
+                        email VARCHAR(255),
+                        user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
+                        event_id INTEGER NOT NULL REFERENCES events(id) ON DELETE CASCADE,
+                        committee_id INTEGER NOT NULL REFERENCES vetting_committees(id) ON DELETE CASCADE,
+                        reason VARCHAR(20) NOT NULL,
+                        created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+                        updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+                    )
+                    """
+                    conn.execute(text(create_user_event_access_table))
+                    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_user_event_access_committee_id ON user_event_access(committee_id)"))
+                    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_user_event_access_email_event ON user_event_access(email, event_id)"))
+                    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_user_event_access_user_event ON user_event_access(user_id, event_id)"))
+                    if conn.execute(text("SELECT NOT EXISTS (SELECT 1 FROM user_event_access)")).scalar():
+                        from app.crud.vetting_committee import rebuild_event_access
+                        rebuild_event_access(conn)
+
+                    # Event-owned tables: cascading, indexed foreign keys for single-statement event deletes
+                    for sql in event_deletion_service.event_cascade_statements():
+                        conn.execute(text(sql))
 
                     trans.commit()
-                    
-                    # Create default roles after successful migration
-                    create_default_roles()
-                    return
                 except Exception as e:
                     trans.rollback()
                     raise e
+
+            # Unique email per event for public form registrations. Other paths
+            # register one email once per role, so only public_form rows are
+            # covered; built CONCURRENTLY (outside a transaction) so
+            # event_participants stays writable
+            try:
+                with db_engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                    conn.execute(text("DROP INDEX CONCURRENTLY IF EXISTS uq_event_participants_event_email"))
+                    # An interrupted concurrent build leaves an invalid index behind
+                    if conn.execute(text("""
+                        SELECT NOT indisvalid FROM pg_index
+                        WHERE indexrelid = to_regclass('uq_event_participants_public_email')
+                    """)).scalar():
+                        conn.execute(text("DROP INDEX CONCURRENTLY uq_event_participants_public_email"))
+                    duplicate_registrations = conn.execute(text("""
+                        SELECT COUNT(*) FROM (
+                            SELECT 1 FROM event_participants
+                            WHERE invited_by = 'public_form'
+                            GROUP BY event_id, lower(email) HAVING COUNT(*) > 1
+                        ) duplicates
+                    """)).scalar()
+                    if duplicate_registrations:
+                        # Registration still rejects duplicates with an explicit check,
+                        # but without the index two concurrent requests can both get in
+                        logger.error(
+                            f"❌ uq_event_participants_public_email skipped: {duplicate_registrations} "
+                            f"(event, email) pairs are registered more than once through the public form"
+                        )
+                    else:
+                        conn.execute(text("""
+                            CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_event_participants_public_email
+                                ON event_participants (event_id, lower(email))
+                                WHERE invited_by = 'public_form'
+                        """))
+            except Exception as e:
+                logger.error(f"❌ Could not build uq_event_participants_public_email: {e}")
+            return True
         except Exception as e:
             pass  # Try alembic fallback
         
@@ -732,15 +890,12 @@ def run_auto_migration():
             cwd=str(project_root)
         )
         
-        if result.returncode == 0:
-            # Create default roles after successful alembic migration
-            create_default_roles()
-        else:
-            pass  # Migration failed
+        return result.returncode == 0
             
     except Exception as e:
         # Don't fail startup if migration fails
-        pass
+        logger.warning(f"Auto-migration failed: {e}")
+        return False
 
 # Database connection test on startup
 @app.on_event("startup")
@@ -753,30 +908,46 @@ async def startup_event():
     print(f"🚀 API Base URL: {settings.API_V1_STR}")
     print(f"🚀 " + "="*50)
     
+    timer = StartupTimer()
     try:
         # Test database connection
-        engine = create_engine(settings.DATABASE_URL)
-        with engine.connect() as conn:
-            result = conn.execute(text("SELECT version()"))
-            version_info = result.fetchone()[0]
-            print(f"🗄️ Database connected: {version_info[:50]}...")
-        
-        # Run auto-migration in production
-        if settings.ENVIRONMENT == "production":
-            run_auto_migration()
+        with timer.phase("db_connect"):
+            with db_engine.connect() as conn:
+                result = conn.execute(text("SELECT version()"))
+                version_info = result.fetchone()[0]
+                print(f"🗄️ Database connected: {version_info[:50]}...")
         
-        # Start agenda notification scheduler
-        from app.core.agenda_scheduler import agenda_scheduler
-        import asyncio
-        asyncio.create_task(agenda_scheduler.start())
+        # Run auto-migration in production, only when the schema fingerprint changed
+        mode = settings.STARTUP_MIGRATION_MODE.lower()
+        if settings.ENVIRONMENT == "production" and mode != "never":
+            with timer.phase("migration"):
+                migration_status = ensure_schema(
+                    run_auto_migration,
+                    schema_fingerprint(run_auto_migration, event_deletion_service, voucher_ledger),
+                    force=(mode == "always")
+                )
+            logger.info(f"🗄️ Schema {migration_status}")
+            with timer.phase("default_roles"):
+                create_default_roles()
         
-        # Start background tasks
-        from app.tasks.background_tasks import background_task_manager
-        await background_task_manager.start_background_tasks()
+        with timer.phase("schedulers"):
+            # Start agenda notification scheduler
+            from app.core.agenda_scheduler import agenda_scheduler
+            import asyncio
+            asyncio.create_task(agenda_scheduler.start())
+            
+            # Start background tasks
+            from app.tasks.background_tasks import background_task_manager
+            await background_task_manager.start_background_tasks()
 
-        # Start vetting deadline scheduler
-        from app.core.scheduler import start_scheduler
-        start_scheduler()
+            # Start vetting deadline scheduler
+            from app.core.scheduler import start_scheduler
+            start_scheduler()
+
+            # Finish event purges a failure or restart left behind
+            asyncio.create_task(asyncio.to_thread(event_deletion_service.resume_pending_purges))
+
+        logger.info("🚀 Startup complete", extra={"startup_phases": timer.report()})
         
     except Exception as e:
         # Don't exit in production - let the app start anyway
@@ -798,6 +969,10 @@ async def shutdown_event():
     from app.tasks.background_tasks import background_task_manager
     await background_task_manager.stop_background_tasks()
 
+    # Stop bulk badge render workers
+    from app.services.bulk_badge_printing import shutdown_executor
+    shutdown_executor()
+
 # Add a test endpoint to verify error handling
 @app.put("/test-validation")
 def test_validation_endpoint(data: dict):
@@ -838,8 +1013,7 @@ def health_check():
     """Health check endpoint"""
     try:
         # Quick database check
-        engine = create_engine(settings.DATABASE_URL)
-        with engine.connect() as conn:
+        with db_engine.connect() as conn:
             conn.execute(text("SELECT 1"))
         
         return {
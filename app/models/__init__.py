@@ -43,6 +43,11 @@ from .travel_request_checklist import TravelRequestChecklist
 from .travel_request_approval_step import TravelRequestApprovalStep
 from .travel_advance import TravelAdvance, ExpenseCategory, AdvanceStatus
 from .voucher_venue import VoucherVenue
+from .tenant_stats import TenantStats
+from .registration_idempotency_key import RegistrationIdempotencyKey
+from .participant_voucher_balance import ParticipantVoucherBalance
+from .notification_counter import NotificationCounter
+from .user_event_access import UserEventAccess
 
 __all__ = [
     "BaseModel", "TenantBaseModel", "Tenant", "User", "UserRole",
@@ -63,5 +68,5 @@ __all__ = [
     "Dependant", "TravelRequestTraveler", "DependantRelationship", "TravelerType",
     "TravelRequestChecklist", "TravelRequestApprovalStep",
     "TravelAdvance", "ExpenseCategory", "AdvanceStatus",
-    "VoucherVenue"
+    "VoucherVenue", "TenantStats", "RegistrationIdempotencyKey", "ParticipantVoucherBalance", "NotificationCounter", "UserEventAccess"
 ]
@@ -10,6 +10,9 @@ class ClaimConversation(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     title = Column(String(255), default="New Conversation")
+    # Rolling summary of the messages up to and including summary_through_id
+    summary = Column(Text)
+    summary_through_id = Column(Integer)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
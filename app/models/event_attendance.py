@@ -5,8 +5,8 @@ from app.models.base import BaseModel
 class EventCheckin(BaseModel):
     __tablename__ = "event_checkins"
     
-    participant_id = Column(Integer, ForeignKey("event_participants.id"), nullable=False)
-    event_id = Column(Integer, ForeignKey("events.id"), nullable=False)
+    participant_id = Column(Integer, ForeignKey("event_participants.id", ondelete="CASCADE"), nullable=False, index=True)
+    event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), nullable=False, index=True)
     checkin_date = Column(Date, nullable=False)
     checkin_time = Column(DateTime, nullable=False)
     checked_in_by = Column(String(255), nullable=False)  # Admin who scanned QR
@@ -22,8 +22,8 @@ class EventCheckin(BaseModel):
 class EquipmentRequest(BaseModel):
     __tablename__ = "equipment_requests"
     
-    participant_id = Column(Integer, ForeignKey("event_participants.id"), nullable=False)
-    event_id = Column(Integer, ForeignKey("events.id"), nullable=False)
+    participant_id = Column(Integer, ForeignKey("event_participants.id", ondelete="CASCADE"), nullable=False, index=True)
+    event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), nullable=False, index=True)
     equipment_name = Column(String(255), nullable=False)
     quantity = Column(Integer, default=1)
     description = Column(Text)
@@ -41,8 +41,8 @@ class EquipmentRequest(BaseModel):
 class EventReview(BaseModel):
     __tablename__ = "event_reviews"
     
-    participant_id = Column(Integer, ForeignKey("event_participants.id"), nullable=False)
-    event_id = Column(Integer, ForeignKey("events.id"), nullable=False)
+    participant_id = Column(Integer, ForeignKey("event_participants.id", ondelete="CASCADE"), nullable=False, index=True)
+    event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), nullable=False, index=True)
     overall_rating = Column(Integer, nullable=False)  # 1-5 stars
     content_rating = Column(Integer)  # 1-5 stars
     organization_rating = Column(Integer)  # 1-5 stars
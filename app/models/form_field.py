@@ -1,5 +1,6 @@
 from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
 from app.db.database import Base
 
 class FormField(Base):
@@ -17,6 +18,7 @@ class FormField(Base):
     is_protected = Column(Boolean, default=False)  # Protected fields cannot be deleted
     section = Column(String(50), nullable=True)  # personal, contact, travel, final
     created_at = Column(DateTime, server_default="CURRENT_TIMESTAMP")
+    updated_at = Column(DateTime, server_default="CURRENT_TIMESTAMP", onupdate=func.now())
     
     # Relationships
     event = relationship("Event", back_populates="form_fields")
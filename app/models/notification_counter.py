@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, Boolean, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from app.models.base import BaseModel
+
+class NotificationCounter(BaseModel):
+    """Precomputed counts of a user's own (non-broadcast) notifications.
+
+    Rows are marked stale (and their version bumped) whenever one of the
+    user's notifications is created, read or deleted and are recomputed
+    lazily on the next read. Broadcast
+    notifications are shared rows and are counted live.
+    """
+    __tablename__ = "notification_counters"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), unique=True, nullable=False, index=True)
+    total = Column(Integer, nullable=False, default=0)
+    unread = Column(Integer, nullable=False, default=0)
+    urgent = Column(Integer, nullable=False, default=0)
+    is_stale = Column(Boolean, nullable=False, default=True)
+    version = Column(Integer, nullable=False, default=0, server_default="0")
+    refreshed_at = Column(DateTime(timezone=True), server_default=func.now())
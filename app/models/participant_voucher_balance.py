@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, UniqueConstraint
+from app.models.base import BaseModel
+
+class ParticipantVoucherBalance(BaseModel):
+    """Running total of a participant's redemptions against one voucher allocation.
+
+    Maintained by app.services.voucher_ledger in the same transaction as each
+    ParticipantVoucherRedemption row, which stays the source of truth.
+    """
+    __tablename__ = "participant_voucher_balances"
+    __table_args__ = (
+        UniqueConstraint("allocation_id", "participant_id", name="uq_participant_voucher_balances_allocation_participant"),
+    )
+
+    allocation_id = Column(Integer, ForeignKey("event_allocations.id", ondelete="CASCADE"), nullable=False)
+    participant_id = Column(Integer, ForeignKey("event_participants.id", ondelete="CASCADE"), nullable=False, index=True)
+    redeemed_quantity = Column(Integer, nullable=False, default=0)
+    redemption_count = Column(Integer, nullable=False, default=0)
+    last_redeemed_at = Column(DateTime, nullable=True)
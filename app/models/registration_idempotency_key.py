@@ -0,0 +1,10 @@
+from sqlalchemy import Column, String, Integer, ForeignKey
+from app.models.base import BaseModel
+
+class RegistrationIdempotencyKey(BaseModel):
+    """Idempotency-Key sent with a public registration and the participant it created"""
+    __tablename__ = "registration_idempotency_keys"
+
+    idempotency_key = Column(String(255), unique=True, nullable=False, index=True)
+    event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), nullable=False)
+    participant_id = Column(Integer, ForeignKey("event_participants.id", ondelete="CASCADE"), nullable=False)
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from app.models.base import BaseModel
+
+class TenantStats(BaseModel):
+    """Precomputed user statistics per tenant.
+
+    Rows are marked stale (and their version bumped) whenever users, user
+    roles or tenant memberships change and are recomputed lazily on the next
+    read.
+    """
+    __tablename__ = "tenant_stats"
+
+    tenant_id = Column(String, ForeignKey("tenants.slug", ondelete="CASCADE"), unique=True, nullable=False, index=True)
+    total_users = Column(Integer, nullable=False, default=0)
+    active_users = Column(Integer, nullable=False, default=0)
+    pending_users = Column(Integer, nullable=False, default=0)
+    last_user_activity = Column(DateTime(timezone=True), nullable=True)
+    is_stale = Column(Boolean, nullable=False, default=True)
+    version = Column(Integer, nullable=False, default=0, server_default="0")
+    refreshed_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
+from app.models.base import BaseModel
+
+class UserEventAccess(BaseModel):
+    """Which users can see which events through a vetting committee.
+
+    One row per committee member or approver (the legacy ``approver_email`` /
+    ``approver_id`` fields included), keyed by lower-cased email and, when
+    known, user id, so "events this user vets" is an indexed lookup instead
+    of case-insensitive scans of the committee tables. Rows are rebuilt per
+    committee by ``crud.vetting_committee.rebuild_event_access`` whenever a
+    committee, member or approver is flushed.
+    """
+    __tablename__ = "user_event_access"
+
+    email = Column(String(255), nullable=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=True)
+    event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), nullable=False)
+    committee_id = Column(Integer, ForeignKey("vetting_committees.id", ondelete="CASCADE"), nullable=False, index=True)
+    reason = Column(String(20), nullable=False)  # committee_member | approver
+
+    __table_args__ = (
+        Index('ix_user_event_access_email_event', 'email', 'event_id'),
+        Index('ix_user_event_access_user_event', 'user_id', 'event_id'),
+    )
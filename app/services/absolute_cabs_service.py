@@ -15,6 +15,7 @@ from typing import Dict, List, Optional, Any
 from sqlalchemy.orm import Session
 from app.models.transport_provider import TransportProvider
 from app.core.config import settings
+from app.core.metrics import track_outbound
 import logging
 
 logger = logging.getLogger(__name__)
@@ -38,13 +39,14 @@ class AbsoluteCabsService:
         }
         
         try:
-            response = requests.post(
-                self.token_url,
-                json=payload,
-                headers={"Content-Type": "application/json"},
-                timeout=30
-            )
-            response.raise_for_status()
+            with track_outbound("absolute_cabs"):
+                response = requests.post(
+                    self.token_url,
+                    json=payload,
+                    headers={"Content-Type": "application/json"},
+                    timeout=30
+                )
+                response.raise_for_status()
             
             data = response.json()
             self.access_token = data.get('access_token')
@@ -102,14 +104,15 @@ class AbsoluteCabsService:
         }
         
         try:
-            if method == "GET":
-                response = requests.get(url, headers=headers, timeout=30)
-            elif method == "POST":
-                response = requests.post(url, headers=headers, json=data, timeout=30)
-            else:
-                raise ValueError(f"Unsupported method: {method}")
-            
-            response.raise_for_status()
+            with track_outbound("absolute_cabs"):
+                if method == "GET":
+                    response = requests.get(url, headers=headers, timeout=30)
+                elif method == "POST":
+                    response = requests.post(url, headers=headers, json=data, timeout=30)
+                else:
+                    raise ValueError(f"Unsupported method: {method}")
+
+                response.raise_for_status()
             return response.json()
             
         except requests.exceptions.HTTPError as e:
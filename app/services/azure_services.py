@@ -10,6 +10,7 @@ from azure.ai.documentintelligence import DocumentIntelligenceClient
 from azure.ai.documentintelligence.models import AnalyzeDocumentRequest
 from azure.core.credentials import AzureKeyCredential
 from openai import AzureOpenAI
+from app.core.metrics import track_outbound
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -37,11 +38,12 @@ class AzureDocumentIntelligenceService:
     def _sync_extract_receipt(self, image_url: str):
         """Synchronous receipt extraction - runs in thread executor"""
         logger.info("📤 Sending request to Azure Document Intelligence...")
-        poller = self.client.begin_analyze_document(
-            "prebuilt-receipt", AnalyzeDocumentRequest(url_source=image_url)
-        )
-        logger.info("⏳ Waiting for analysis to complete...")
-        result = poller.result()
+        with track_outbound("azure"):
+            poller = self.client.begin_analyze_document(
+                "prebuilt-receipt", AnalyzeDocumentRequest(url_source=image_url)
+            )
+            logger.info("⏳ Waiting for analysis to complete...")
+            result = poller.result()
         return result
 
     async def extract_receipt_data(self, image_url: str) -> Dict[str, Any]:
@@ -198,15 +200,16 @@ class AzureOpenAIService:
             Keep the response conversational and helpful.
             """
             
-            response = self.client.chat.completions.create(
-                model=self.deployment_name,
-                messages=[
-                    {"role": "system", "content": "You are a helpful AI assistant that validates expense claims for business travelers."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=500,
-                temperature=0.3
-            )
+            with track_outbound("azure"):
+                response = self.client.chat.completions.create(
+                    model=self.deployment_name,
+                    messages=[
+                        {"role": "system", "content": "You are a helpful AI assistant that validates expense claims for business travelers."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    max_tokens=500,
+                    temperature=0.3
+                )
             
             return response.choices[0].message.content
 
@@ -230,15 +233,16 @@ class AzureOpenAIService:
             if context:
                 context_info = f"\nContext: {json.dumps(context, indent=2)}"
             
-            response = self.client.chat.completions.create(
-                model=self.deployment_name,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": f"{message}{context_info}"}
-                ],
-                max_tokens=300,
-                temperature=0.7
-            )
+            with track_outbound("azure"):
+                response = self.client.chat.completions.create(
+                    model=self.deployment_name,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": f"{message}{context_info}"}
+                    ],
+                    max_tokens=300,
+                    temperature=0.7
+                )
             
             return response.choices[0].message.content
 
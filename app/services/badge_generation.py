@@ -7,20 +7,22 @@ Generates personalized badges for event participants using badge templates.
 import os
 import logging
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Hashable
 import uuid
 from io import BytesIO
+from app.core.metrics import track_outbound
+from app.services.pdf_assets import fetch_asset
+from app.services.qr_service import qr_data_uri
+from app.services.template_engine import render_template
 
 logger = logging.getLogger(__name__)
 
 
-def replace_template_variables(template_html: str, data: Dict[str, Any]) -> str:
+def replace_template_variables(template_html: str, data: Dict[str, Any], cache_key: Optional[Hashable] = None) -> str:
     """
-    Replace template variables with actual data.
+    Replace template variables ({{variable}} and {{{variable}}}) with actual data.
     """
-    result = template_html
-
-    # Define all supported variables with both formats
+    # Define all supported variables
     variables = {
         # New format - use badge_name as participantName
         'participantName': data.get('badge_name', '') or data.get('participant_name', ''),
@@ -40,27 +42,15 @@ def replace_template_variables(template_html: str, data: Dict[str, Any]) -> str:
         'qrCode': data.get('qr_code', ''),
     }
 
-    # Replace each variable with both {{variable}} and {{{variable}}} formats
-    for key, value in variables.items():
-        # Handle image variables by creating img tags
-        if key == 'logo' and value and value.startswith('http'):
-            img_tag = f'<img src="{value}" alt="Logo" style="max-width:150px;max-height:100px" />'
-            result = result.replace(f'{{{{{key}}}}}', img_tag)
-            result = result.replace(f'{{{{{{{key}}}}}}}', img_tag)
-        elif key in ['qr_code', 'qrCode', 'QR'] and value and value.startswith('http'):
-            img_tag = f'<img src="{value}" alt="QR Code" style="width:74px;height:74px;margin:3px;background:white;display:block;object-fit:contain;border:0.5px solid #d1d5db" />'
-            result = result.replace(f'{{{{{key}}}}}', img_tag)
-            result = result.replace(f'{{{{{{{key}}}}}}}', img_tag)
-        elif key == 'avatar' and value and value.startswith('http'):
-            img_tag = f'<img src="{value}" alt="Avatar" style="max-width:100px;max-height:100px;border-radius:50%" />'
-            result = result.replace(f'{{{{{key}}}}}', img_tag)
-            result = result.replace(f'{{{{{{{key}}}}}}}', img_tag)
-        else:
-            # Regular text replacement
-            result = result.replace(f'{{{{{key}}}}}', str(value))
-            result = result.replace(f'{{{{{{{key}}}}}}}', str(value))
-
-    return result
+    # Image variables become img tags
+    logo = variables['logo']
+    if logo and logo.startswith('http'):
+        variables['logo'] = f'<img src="{logo}" alt="Logo" style="max-width:150px;max-height:100px" />'
+    qr_code = variables['qrCode']
+    if qr_code and qr_code.startswith(('http', 'data:')):
+        variables['qrCode'] = f'<img src="{qr_code}" alt="QR Code" style="width:74px;height:74px;margin:3px;background:white;display:block;object-fit:contain;border:0.5px solid #d1d5db" />'
+
+    return render_template(template_html, variables, cache_key=cache_key)
 
 
 async def html_to_pdf_bytes(html_content: str) -> BytesIO:
@@ -79,8 +69,8 @@ async def html_to_pdf_bytes(html_content: str) -> BytesIO:
             /* Preserve original template styles */
         """
 
-        css = CSS(string=css_string)
-        pdf_bytes = HTML(string=html_content).write_pdf(stylesheets=[css])
+        css = CSS(string=css_string, url_fetcher=fetch_asset)
+        pdf_bytes = HTML(string=html_content, url_fetcher=fetch_asset).write_pdf(stylesheets=[css])
 
         return BytesIO(pdf_bytes)
 
@@ -114,16 +104,17 @@ async def upload_pdf_to_cloudinary(pdf_bytes: BytesIO, filename: str) -> str:
 
         pdf_bytes.seek(0)
         
-        result = cloudinary.uploader.upload(
-            pdf_bytes,
-            public_id=filename,
-            folder="msafiri-documents/badges",
-            resource_type="raw",
-            format="pdf",
-            use_filename=False,
-            unique_filename=False,
-            overwrite=True
-        )
+        with track_outbound("cloudinary"):
+            result = cloudinary.uploader.upload(
+                pdf_bytes,
+                public_id=filename,
+                folder="msafiri-documents/badges",
+                resource_type="raw",
+                format="pdf",
+                use_filename=False,
+                unique_filename=False,
+                overwrite=True
+            )
 
         return result["secure_url"]
 
@@ -159,7 +150,7 @@ async def generate_badge(
         # Generate QR code URL that points to the badge itself
         base_url = os.getenv('API_BASE_URL', 'http://localhost:8000')
         badge_view_url = f"{base_url}/api/v1/events/{event_id}/participant/{participant_id}/badge/generate"
-        qr_code_url = f"https://api.qrserver.com/v1/create-qr-code/?size=200x200&data={badge_view_url}"
+        qr_code_url = qr_data_uri(badge_view_url)
 
         # Prepare data for template - only use template variables, no text replacement
         template_data = {
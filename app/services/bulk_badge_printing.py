@@ -0,0 +1,174 @@
+"""
+Bulk Badge Printing
+
+Renders large badge batches in fixed-size chunks instead of one giant HTML
+document. Each chunk (BADGES_PER_CHUNK badges, two per A4 page) is laid out by
+WeasyPrint in a worker process, so peak layout memory depends on the chunk
+size rather than the participant count, and chunks render in parallel across
+BULK_BADGE_WORKERS processes.
+
+Chunk PDFs are either merged into one document (the default) or, with
+format=zip, streamed to the client in a zip as each chunk finishes. A PDF's
+cross-reference table can only be written once every page is known, so the
+merged path holds the whole document in a PdfWriter and sends its first byte
+only after the last chunk is rendered; its memory grows with the participant
+count. The zip path stays bounded by the chunks in flight, which makes it the
+one to use for very large batches.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import tempfile
+import threading
+import zipfile
+from concurrent.futures import Future, ProcessPoolExecutor
+from io import BytesIO
+from typing import AsyncIterator, Iterable, Iterator, List, Optional
+
+from app.core.config import settings
+from app.services.tabular_export import ChunkSink
+
+logger = logging.getLogger(__name__)
+
+# Even, so the two-badges-per-page layout never splits across chunks
+BADGES_PER_CHUNK = 40
+# Bytes read from the merged PDF per streamed chunk
+STREAM_CHUNK_BYTES = 64 * 1024
+# Merged output stays in memory up to this size, then spills to disk
+SPOOL_MAX_BYTES = 8 * 1024 * 1024
+
+_PAGE_STYLES = """
+    @page {
+        size: A4 landscape;
+        margin: 0;
+    }
+    body {
+        margin: 0;
+        padding: 0;
+    }
+    .badge-container {
+        width: 50%;
+        height: 100vh;
+        float: left;
+        page-break-inside: avoid;
+    }
+    .badge-container:nth-child(2n+1) {
+        page-break-after: avoid;
+    }
+    .badge-container:nth-child(2n) {
+        page-break-after: always;
+    }
+    .badge-container:last-child {
+        page-break-after: auto;
+    }
+"""
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # spawn: never fork a web worker holding DB connections and threads
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.BULK_BADGE_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+
+def shutdown_executor() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+def chunk_document(badges_html: List[str]) -> str:
+    """Standalone HTML document for one chunk of rendered badges"""
+    containers = "".join(f'<div class="badge-container">{badge}</div>' for badge in badges_html)
+    return f"<!DOCTYPE html><html><head><style>{_PAGE_STYLES}</style></head><body>{containers}</body></html>"
+
+
+def chunked(badges: Iterable[str], size: int = BADGES_PER_CHUNK) -> Iterator[str]:
+    """Group rendered badges into chunk documents, building each only when needed"""
+    batch: List[str] = []
+    for badge in badges:
+        batch.append(badge)
+        if len(batch) >= size:
+            yield chunk_document(batch)
+            batch = []
+    if batch:
+        yield chunk_document(batch)
+
+
+def render_chunk(html: str) -> bytes:
+    """Lay out one chunk; runs in a worker process"""
+    from weasyprint import HTML
+    from app.services.pdf_assets import fetch_asset
+
+    return HTML(string=html, url_fetcher=fetch_asset).write_pdf()
+
+
+async def render_chunks(documents: Iterable[str]) -> AsyncIterator[bytes]:
+    """Chunk PDFs in order, with at most two chunks per worker queued or rendering"""
+    executor = _get_executor()
+    max_in_flight = settings.BULK_BADGE_WORKERS * 2
+    pending: List[Future] = []
+    documents = iter(documents)
+    try:
+        while True:
+            while len(pending) < max_in_flight:
+                # Building a chunk document renders its badges and QR codes:
+                # keep that off the event loop
+                document = await asyncio.to_thread(next, documents, None)
+                if document is None:
+                    break
+                pending.append(executor.submit(render_chunk, document))
+            if not pending:
+                return
+            yield await asyncio.wrap_future(pending.pop(0))
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+async def stream_merged_pdf(documents: Iterable[str]) -> AsyncIterator[bytes]:
+    """One PDF of all chunks, merged as chunks complete and streamed from a spooled file
+
+    Unbounded: the merged document is kept in memory until every chunk is in.
+    """
+    from pypdf import PdfWriter
+
+    writer = PdfWriter()
+    chunk_count = 0
+    async for pdf_bytes in render_chunks(documents):
+        await asyncio.to_thread(writer.append, BytesIO(pdf_bytes))
+        chunk_count += 1
+    logger.info(f"Merged {chunk_count} badge chunks ({len(writer.pages)} pages)")
+
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as output:
+        await asyncio.to_thread(writer.write, output)
+        writer.close()
+        output.seek(0)
+        while True:
+            data = output.read(STREAM_CHUNK_BYTES)
+            if not data:
+                break
+            yield data
+
+
+async def stream_zip(documents: Iterable[str], name_prefix: str) -> AsyncIterator[bytes]:
+    """Zip of per-chunk PDFs, each sent as soon as it is rendered"""
+    sink = ChunkSink()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED) as archive:
+        number = 0
+        async for pdf_bytes in render_chunks(documents):
+            number += 1
+            archive.writestr(f"{name_prefix}-part-{number:03d}.pdf", pdf_bytes)
+            yield sink.drain()
+    yield sink.drain()
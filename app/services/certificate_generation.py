@@ -7,19 +7,20 @@ Generates personalized certificates for event participants using certificate tem
 import os
 import logging
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Hashable
 import uuid
 from io import BytesIO
+from app.core.metrics import track_outbound
+from app.services.pdf_assets import fetch_asset
+from app.services.template_engine import render_template
 
 logger = logging.getLogger(__name__)
 
 
-def replace_template_variables(template_html: str, data: Dict[str, Any]) -> str:
+def replace_template_variables(template_html: str, data: Dict[str, Any], cache_key: Optional[Hashable] = None) -> str:
     """
     Replace template variables with actual data.
     """
-    result = template_html
-
     # Define all supported variables
     variables = {
         'participantName': data.get('participant_name', ''),
@@ -32,12 +33,7 @@ def replace_template_variables(template_html: str, data: Dict[str, Any]) -> str:
         'issueDate': data.get('issue_date', datetime.now().strftime('%B %d, %Y')),
     }
 
-    # Replace each variable
-    for key, value in variables.items():
-        placeholder = f'{{{{{key}}}}}'
-        result = result.replace(placeholder, str(value))
-
-    return result
+    return render_template(template_html, variables, cache_key=cache_key)
 
 
 async def html_to_pdf_bytes(html_content: str) -> BytesIO:
@@ -68,8 +64,8 @@ async def html_to_pdf_bytes(html_content: str) -> BytesIO:
             }
         """
 
-        css = CSS(string=css_string)
-        pdf_bytes = HTML(string=html_content).write_pdf(stylesheets=[css])
+        css = CSS(string=css_string, url_fetcher=fetch_asset)
+        pdf_bytes = HTML(string=html_content, url_fetcher=fetch_asset).write_pdf(stylesheets=[css])
 
         return BytesIO(pdf_bytes)
 
@@ -103,16 +99,17 @@ async def upload_pdf_to_cloudinary(pdf_bytes: BytesIO, filename: str) -> str:
 
         pdf_bytes.seek(0)
         
-        result = cloudinary.uploader.upload(
-            pdf_bytes,
-            public_id=filename,
-            folder="msafiri-documents/certificates",
-            resource_type="raw",
-            format="pdf",
-            use_filename=False,
-            unique_filename=False,
-            overwrite=True
-        )
+        with track_outbound("cloudinary"):
+            result = cloudinary.uploader.upload(
+                pdf_bytes,
+                public_id=filename,
+                folder="msafiri-documents/certificates",
+                resource_type="raw",
+                format="pdf",
+                use_filename=False,
+                unique_filename=False,
+                overwrite=True
+            )
 
         return result["secure_url"]
 
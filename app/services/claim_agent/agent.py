@@ -1,7 +1,7 @@
 import os
 import json
 import logging
-from typing import TypedDict, Annotated, Sequence, Any, List, Dict
+from typing import TypedDict, Annotated, Sequence, Any, List, Dict, Optional
 
 from langchain_core.messages import (
     BaseMessage,
@@ -19,6 +19,10 @@ from app.services.claim_agent.tools import get_claim_tools
 
 logger = logging.getLogger(__name__)
 
+# Most recent messages sent to the LLM each turn; older turns reach it through
+# the conversation's rolling summary
+MAX_HISTORY_MESSAGES = 30
+
 SYSTEM_PROMPT = """You are an AI expense claims assistant for OCA (Operational Centre Amsterdam) MSF. You ONLY help users raise and manage expense claims. You must NOT engage in any conversation that is not related to expense claims.
 
 IMPORTANT RULES:
@@ -105,6 +109,13 @@ Today's date is {today}.
 """
 
 
+SUMMARY_PROMPT = """You maintain a running summary of a conversation between a user and an expense claims assistant.
+Update the existing summary with the new messages. Keep every fact the assistant may still need: claim IDs, receipt
+details (merchant, amounts WITH currency, dates), expense type, description, payment method and payment details,
+which step of the claim flow was reached, and what the user confirmed, corrected or declined.
+Write plain text, at most 250 words. Do not add anything that is not in the messages."""
+
+
 class AgentState(TypedDict):
     messages: Annotated[Sequence[BaseMessage], lambda x, y: list(x) + list(y)]
 
@@ -152,12 +163,45 @@ def build_agent_graph(db: Session, user_id: int):
     return graph.compile()
 
 
+def _message_text(msg: Dict[str, Any]) -> str:
+    """Text of a stored message; assistant turns with no text fall back to their tool results."""
+    content = msg.get("content", "")
+    if msg.get("role") == "assistant":
+        # Include a summary of tool results in the text if tools were called
+        # but the content is empty (rare edge case)
+        tool_results_list = msg.get("tool_results") or []
+        if not content and tool_results_list:
+            # Build a text summary from tool results so the LLM has context
+            summaries = []
+            for tr in tool_results_list:
+                tool_name = tr.get("tool_name", "unknown")
+                result = tr.get("result", {})
+                summaries.append(f"[Tool {tool_name} returned: {json.dumps(result)}]")
+            content = "\n".join(summaries)
+    return content
+
+
+async def summarize_history(previous_summary: Optional[str], message_history: List[Dict[str, Any]]) -> str:
+    """Fold older messages into the conversation's rolling summary."""
+    transcript = "\n".join(
+        f"{msg.get('role', 'user')}: {_message_text(msg)}"
+        for msg in message_history
+        if _message_text(msg)
+    )
+    response = await _get_llm().ainvoke([
+        SystemMessage(content=SUMMARY_PROMPT),
+        HumanMessage(content=f"Existing summary:\n{previous_summary or '(none)'}\n\nNew messages:\n{transcript}"),
+    ])
+    return response.content
+
+
 async def run_agent(
     db: Session,
     user_id: int,
     message_history: List[Dict[str, Any]],
     user_message: str,
     image_url: str | None = None,
+    summary: Optional[str] = None,
 ) -> dict:
     """Run the agent with a user message and return the response.
 
@@ -167,6 +211,7 @@ async def run_agent(
         message_history: Previous messages in LangChain format.
         user_message: The new user message.
         image_url: Optional receipt image URL.
+        summary: Rolling summary of the messages older than message_history.
 
     Returns:
         dict with keys: response (str), tool_results (list of dicts)
@@ -180,15 +225,17 @@ async def run_agent(
         SystemMessage(content=SYSTEM_PROMPT.format(today=date.today().isoformat()))
     ]
 
+    if summary:
+        messages.append(SystemMessage(content=f"Summary of the earlier part of this conversation:\n{summary}"))
+
     # Add conversation history
     # Only include user/assistant text messages - skip tool_calls/tool_results
     # to avoid OpenAI message ordering issues. The assistant's text response
     # already summarizes what tools did, and tools remain available for current turn.
     #
-    # Truncate to the most recent MAX_HISTORY_MESSAGES to avoid exceeding token
-    # limits on long conversations, which causes the AI to lose context and give
-    # unrelated answers.
-    MAX_HISTORY_MESSAGES = 30
+    # Callers load at most MAX_HISTORY_MESSAGES; truncate anyway to avoid
+    # exceeding token limits on long conversations, which causes the AI to lose
+    # context and give unrelated answers.
     recent_history = message_history
     if len(message_history) > MAX_HISTORY_MESSAGES:
         recent_history = message_history[-MAX_HISTORY_MESSAGES:]
@@ -199,23 +246,11 @@ async def run_agent(
 
     for msg in recent_history:
         role = msg.get("role", "user")
-        content = msg.get("content", "")
+        content = _message_text(msg)
         if role == "user":
             messages.append(HumanMessage(content=content))
-        elif role == "assistant":
-            # Include a summary of tool results in the text if tools were called
-            # but the content is empty (rare edge case)
-            tool_results_list = msg.get("tool_results") or []
-            if not content and tool_results_list:
-                # Build a text summary from tool results so the LLM has context
-                summaries = []
-                for tr in tool_results_list:
-                    tool_name = tr.get("tool_name", "unknown")
-                    result = tr.get("result", {})
-                    summaries.append(f"[Tool {tool_name} returned: {json.dumps(result)}]")
-                content = "\n".join(summaries)
-            if content:
-                messages.append(AIMessage(content=content))
+        elif role == "assistant" and content:
+            messages.append(AIMessage(content=content))
 
     # Add the new user message
     content_text = user_message
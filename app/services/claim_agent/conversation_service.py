@@ -5,11 +5,93 @@ from typing import Optional, List, Dict, Any
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+from app.db.database import SessionLocal
 from app.models.claim_conversation import ClaimConversation, ClaimConversationMessage
-from app.services.claim_agent.agent import run_agent
+from app.services.claim_agent.agent import MAX_HISTORY_MESSAGES, run_agent, summarize_history
 
 logger = logging.getLogger(__name__)
 
+# Unsummarized messages that trigger folding the oldest ones into the summary,
+# and how many recent ones stay verbatim afterwards. The gap up to
+# MAX_HISTORY_MESSAGES absorbs turns sent while a summary is being computed.
+SUMMARIZE_AFTER_MESSAGES = 20
+KEEP_UNSUMMARIZED_MESSAGES = 10
+# Messages folded per summarization call
+SUMMARY_BATCH_MESSAGES = 100
+
+
+def _history_entry(msg: ClaimConversationMessage) -> Dict[str, Any]:
+    """A stored message in LangChain-compatible format."""
+    entry = {
+        "role": msg.role,
+        "content": msg.content or "",
+    }
+    if msg.tool_calls:
+        entry["tool_calls"] = msg.tool_calls
+    if msg.tool_results:
+        entry["tool_results"] = msg.tool_results
+    return entry
+
+
+async def refresh_conversation_summary(conversation_id: int) -> None:
+    """Fold messages that fell out of the history window into the rolling summary.
+
+    Runs as a background task after each reply, with its own session.
+    """
+    db = SessionLocal()
+    try:
+        conversation = db.query(ClaimConversation).filter(ClaimConversation.id == conversation_id).first()
+        if not conversation:
+            return
+
+        through_id = conversation.summary_through_id or 0
+        unsummarized = (
+            db.query(func.count(ClaimConversationMessage.id))
+            .filter(
+                ClaimConversationMessage.conversation_id == conversation_id,
+                ClaimConversationMessage.id > through_id,
+            )
+            .scalar()
+        )
+        if unsummarized <= SUMMARIZE_AFTER_MESSAGES:
+            return
+
+        to_fold = (
+            db.query(ClaimConversationMessage)
+            .filter(
+                ClaimConversationMessage.conversation_id == conversation_id,
+                ClaimConversationMessage.id > through_id,
+            )
+            .order_by(ClaimConversationMessage.id)
+            .limit(min(unsummarized - KEEP_UNSUMMARIZED_MESSAGES, SUMMARY_BATCH_MESSAGES))
+            .all()
+        )
+        summary = await summarize_history(conversation.summary, [_history_entry(msg) for msg in to_fold])
+
+        # Only apply if no concurrent refresh moved the summary on meanwhile
+        updated = (
+            db.query(ClaimConversation)
+            .filter(
+                ClaimConversation.id == conversation_id,
+                func.coalesce(ClaimConversation.summary_through_id, 0) == through_id,
+            )
+            .update(
+                {"summary": summary, "summary_through_id": to_fold[-1].id},
+                synchronize_session=False,
+            )
+        )
+        db.commit()
+        if updated:
+            logger.info(
+                f"Summarized {len(to_fold)} messages of conversation {conversation_id} "
+                f"through message {to_fold[-1].id}"
+            )
+    except Exception as e:
+        logger.error(f"Failed to summarize conversation {conversation_id}: {e}", exc_info=True)
+        db.rollback()
+    finally:
+        db.close()
+
 
 class ConversationService:
     def __init__(self, db: Session, user_id: int):
@@ -53,28 +135,19 @@ class ConversationService:
             self.db.commit()
 
     def _load_message_history(
-        self, conversation_id: int
+        self,
+        conversation_id: int,
+        after_id: Optional[int] = None,
+        limit: int = MAX_HISTORY_MESSAGES,
     ) -> List[Dict[str, Any]]:
-        """Load previous messages for the conversation in LangChain-compatible format."""
-        messages = (
-            self.db.query(ClaimConversationMessage)
-            .filter(ClaimConversationMessage.conversation_id == conversation_id)
-            .order_by(ClaimConversationMessage.created_at)
-            .all()
+        """Load the most recent messages after ``after_id`` in LangChain-compatible format, oldest first."""
+        query = self.db.query(ClaimConversationMessage).filter(
+            ClaimConversationMessage.conversation_id == conversation_id
         )
-
-        history = []
-        for msg in messages:
-            entry = {
-                "role": msg.role,
-                "content": msg.content or "",
-            }
-            if msg.tool_calls:
-                entry["tool_calls"] = msg.tool_calls
-            if msg.tool_results:
-                entry["tool_results"] = msg.tool_results
-            history.append(entry)
-        return history
+        if after_id:
+            query = query.filter(ClaimConversationMessage.id > after_id)
+        messages = query.order_by(ClaimConversationMessage.id.desc()).limit(limit).all()
+        return [_history_entry(msg) for msg in reversed(messages)]
 
     def _save_user_message(
         self,
@@ -132,8 +205,13 @@ class ConversationService:
         # Save user message
         self._save_user_message(conversation.id, message, image_url)
 
-        # Load history (excluding the message we just saved — it will be passed separately)
-        history = self._load_message_history(conversation.id)
+        # Load history after the summarized part (excluding the message we just
+        # saved — it will be passed separately, hence the extra row)
+        history = self._load_message_history(
+            conversation.id,
+            after_id=conversation.summary_through_id,
+            limit=MAX_HISTORY_MESSAGES + 1,
+        )
         # Remove the last entry (the user message we just saved) since we pass it separately
         if history and history[-1]["role"] == "user":
             history = history[:-1]
@@ -145,6 +223,7 @@ class ConversationService:
             message_history=history,
             user_message=message,
             image_url=image_url,
+            summary=conversation.summary,
         )
 
         # Save assistant response
@@ -3,6 +3,7 @@ import logging
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 from app.db.database import SessionLocal
+from app.core.metrics import timed_job
 from app.services.data_deletion_service import DataDeletionService
 
 logger = logging.getLogger(__name__)
@@ -50,7 +51,7 @@ class DataDeletionScheduler:
                 await asyncio.sleep(wait_seconds)
                 
                 # Run the cleanup
-                await DataDeletionScheduler.run_daily_cleanup()
+                await timed_job("data_deletion_cleanup", DataDeletionScheduler.run_daily_cleanup)()
                 
             except Exception as e:
                 logger.error(f"Error in cleanup scheduler: {e}")
@@ -4,6 +4,7 @@ from email.mime.multipart import MIMEMultipart
 from typing import List, Optional
 import logging
 from app.core.config import settings
+from app.core.metrics import track_outbound
 
 logger = logging.getLogger(__name__)
 
@@ -29,13 +30,14 @@ def send_email(
         msg.attach(MIMEText(body, 'html' if is_html else 'plain'))
         
         # Send email
-        with smtplib.SMTP(settings.SMTP_SERVER, settings.SMTP_PORT) as server:
-            server.starttls()
-            if settings.SMTP_USERNAME and settings.SMTP_PASSWORD:
-                server.login(settings.SMTP_USERNAME, settings.SMTP_PASSWORD)
+        with track_outbound("smtp"):
+            with smtplib.SMTP(settings.SMTP_SERVER, settings.SMTP_PORT) as server:
+                server.starttls()
+                if settings.SMTP_USERNAME and settings.SMTP_PASSWORD:
+                    server.login(settings.SMTP_USERNAME, settings.SMTP_PASSWORD)
             
-            all_recipients = to_emails + (cc_emails or [])
-            server.send_message(msg, to_addrs=all_recipients)
+                all_recipients = to_emails + (cc_emails or [])
+                server.send_message(msg, to_addrs=all_recipients)
         
         logger.info(f"Email sent successfully to {to_emails}")
         return True
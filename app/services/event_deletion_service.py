@@ -0,0 +1,301 @@
+"""
+Event Deletion Service
+
+Every table owned by an event is linked to its parent with an
+``ON DELETE CASCADE`` foreign key (``EVENT_CASCADE_GRAPH``), and every one of
+those foreign key columns is indexed, so ``DELETE FROM events`` removes the
+whole event in one statement without sequential scans of the child tables.
+
+Events with many participants are purged in the background instead: their
+participants (and everything hanging off them) are deleted in small committed
+chunks so no single transaction holds locks for long. Such an event keeps the
+Deleting status until the purge finishes; a purge that fails or is cut short
+by a restart is picked up again on startup or by another delete request.
+"""
+
+import logging
+import time
+from typing import List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.cache import invalidate_on_commit
+from app.db.database import SessionLocal, engine
+from app.models.event import Event
+
+logger = logging.getLogger(__name__)
+
+# Above this many participants the purge runs in the background in chunks
+LARGE_EVENT_PARTICIPANTS = 1000
+PURGE_CHUNK_SIZE = 500
+PURGE_CHUNK_PAUSE_SECONDS = 0.05
+DELETING_STATUS = "Deleting"
+# Namespace of the per-event pg_advisory_lock keeping one purge per event running
+PURGE_LOCK_NAMESPACE = 72630002
+
+# (child table, foreign key column, parent table); the parent key is always id
+EVENT_CASCADE_GRAPH: List[Tuple[str, str, str]] = [
+    # Owned directly by the event
+    ("event_participants", "event_id", "events"),
+    ("event_agenda", "event_id", "events"),
+    ("event_allocations", "event_id", "events"),
+    ("event_attachments", "event_id", "events"),
+    ("event_badges", "event_id", "events"),
+    ("event_certificates", "event_id", "events"),
+    ("event_items", "event_id", "events"),
+    ("event_welcome_packages", "event_id", "events"),
+    ("event_feedback", "event_id", "events"),
+    ("event_food_menu", "event_id", "events"),
+    ("event_travel_requirements", "event_id", "events"),
+    ("chat_rooms", "event_id", "events"),
+    ("flight_itineraries", "event_id", "events"),
+    ("form_fields", "event_id", "events"),
+    ("passport_records", "event_id", "events"),
+    ("security_briefs", "event_id", "events"),
+    ("security_briefings", "event_id", "events"),
+    ("transport_bookings", "event_id", "events"),
+    ("transport_requests", "event_id", "events"),
+    ("accommodation_allocations", "event_id", "events"),
+    ("vendor_event_accommodations", "event_id", "events"),
+    ("line_manager_recommendations", "event_id", "events"),
+    ("public_registrations", "event_id", "events"),
+    ("registration_idempotency_keys", "event_id", "events"),
+    ("vetting_committees", "event_id", "events"),
+    ("vetting_chat_rooms", "event_id", "events"),
+    ("vetting_member_selections", "event_id", "events"),
+    ("vetting_member_comments", "event_id", "events"),
+    ("vetting_member_submissions", "event_id", "events"),
+    ("event_checkins", "event_id", "events"),
+    ("equipment_requests", "event_id", "events"),
+    ("event_reviews", "event_id", "events"),
+    # Owned by a participant
+    ("accommodation_allocations", "participant_id", "event_participants"),
+    ("event_feedback", "participant_id", "event_participants"),
+    ("form_responses", "registration_id", "event_participants"),
+    ("participant_allocations", "participant_id", "event_participants"),
+    ("participant_badges", "participant_id", "event_participants"),
+    ("participant_certificates", "participant_id", "event_participants"),
+    ("participant_qr_codes", "participant_id", "event_participants"),
+    ("participant_selections", "participant_id", "event_participants"),
+    ("participant_voucher_redemptions", "participant_id", "event_participants"),
+    ("participant_voucher_balances", "participant_id", "event_participants"),
+    ("pending_voucher_redemptions", "participant_id", "event_participants"),
+    ("participant_welcome_deliveries", "participant_id", "event_participants"),
+    ("participant_requirement_status", "participant_id", "event_participants"),
+    ("perdiem_requests", "participant_id", "event_participants"),
+    ("public_registrations", "participant_id", "event_participants"),
+    ("registration_idempotency_keys", "participant_id", "event_participants"),
+    ("room_assignments", "participant_id", "event_participants"),
+    ("vetting_member_selections", "participant_id", "event_participants"),
+    ("vetting_member_comments", "participant_id", "event_participants"),
+    ("event_checkins", "participant_id", "event_participants"),
+    ("equipment_requests", "participant_id", "event_participants"),
+    ("event_reviews", "participant_id", "event_participants"),
+    # Further down the graph
+    ("chat_messages", "chat_room_id", "chat_rooms"),
+    ("vetting_chat_rooms", "chat_room_id", "chat_rooms"),
+    ("vetting_chat_members", "vetting_chat_id", "vetting_chat_rooms"),
+    ("agenda_feedback", "agenda_id", "event_agenda"),
+    ("feedback_responses", "feedback_id", "agenda_feedback"),
+    ("participant_voucher_redemptions", "allocation_id", "event_allocations"),
+    ("participant_voucher_balances", "allocation_id", "event_allocations"),
+    ("pending_voucher_redemptions", "allocation_id", "event_allocations"),
+    ("voucher_venues", "allocation_id", "event_allocations"),
+    ("participant_badges", "event_badge_id", "event_badges"),
+    ("participant_certificates", "event_certificate_id", "event_certificates"),
+    ("participant_allocations", "item_id", "event_items"),
+    ("redemption_logs", "allocation_id", "participant_allocations"),
+    ("participant_welcome_deliveries", "package_item_id", "event_welcome_packages"),
+    ("participant_requirement_status", "requirement_id", "event_travel_requirements"),
+    ("transport_requests", "flight_itinerary_id", "flight_itineraries"),
+    ("form_responses", "field_id", "form_fields"),
+    ("user_brief_acknowledgments", "brief_id", "security_briefs"),
+    ("transport_status_updates", "booking_id", "transport_bookings"),
+    ("perdiem_approval_steps", "perdiem_request_id", "perdiem_requests"),
+    ("participant_selections", "committee_id", "vetting_committees"),
+    ("vetting_chat_rooms", "vetting_committee_id", "vetting_committees"),
+    ("vetting_committee_members", "committee_id", "vetting_committees"),
+    ("vetting_committee_approvers", "committee_id", "vetting_committees"),
+    ("vetting_role_assignments", "committee_id", "vetting_committees"),
+]
+
+
+def cascade_ddl(child: str, column: str, parent: str) -> str:
+    """Idempotent DDL making child.column a cascading, indexed foreign key to parent.id.
+
+    Existing non-cascading constraints on the column are replaced; the new one is
+    added NOT VALID (no full-table check under an exclusive lock) and validated
+    afterwards when the existing rows allow it. Tables that don't exist are skipped.
+    """
+    return f"""
+    DO $$
+    DECLARE
+        fk record;
+        column_number smallint;
+    BEGIN
+        IF to_regclass('{child}') IS NULL OR to_regclass('{parent}') IS NULL THEN
+            RETURN;
+        END IF;
+        SELECT attnum INTO column_number FROM pg_attribute
+        WHERE attrelid = '{child}'::regclass AND attname = '{column}' AND NOT attisdropped;
+        IF column_number IS NULL THEN
+            RETURN;
+        END IF;
+
+        FOR fk IN
+            SELECT conname FROM pg_constraint
+            WHERE contype = 'f' AND conrelid = '{child}'::regclass AND confrelid = '{parent}'::regclass
+              AND conkey = ARRAY[column_number] AND confdeltype <> 'c'
+        LOOP
+            EXECUTE format('ALTER TABLE {child} DROP CONSTRAINT %I', fk.conname);
+        END LOOP;
+
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_constraint
+            WHERE contype = 'f' AND conrelid = '{child}'::regclass AND confrelid = '{parent}'::regclass
+              AND conkey = ARRAY[column_number]
+        ) THEN
+            ALTER TABLE {child} ADD CONSTRAINT {child}_{column}_fkey
+                FOREIGN KEY ({column}) REFERENCES {parent}(id) ON DELETE CASCADE NOT VALID;
+            BEGIN
+                ALTER TABLE {child} VALIDATE CONSTRAINT {child}_{column}_fkey;
+            EXCEPTION WHEN foreign_key_violation THEN
+                RAISE NOTICE 'orphaned rows in {child}.{column}; constraint left NOT VALID';
+            END;
+        END IF;
+
+        -- Any index leading with the column serves the cascade lookup
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_index
+            WHERE indrelid = '{child}'::regclass AND indkey[0] = column_number
+        ) THEN
+            CREATE INDEX ix_{child}_{column} ON {child} ({column});
+        END IF;
+    END $$;
+    """
+
+
+def event_cascade_statements() -> List[str]:
+    return [cascade_ddl(child, column, parent) for child, column, parent in EVENT_CASCADE_GRAPH]
+
+
+def count_participants(db: Session, event_id: int) -> int:
+    return db.execute(
+        text("SELECT COUNT(*) FROM event_participants WHERE event_id = :event_id"),
+        {"event_id": event_id}
+    ).scalar() or 0
+
+
+def _cleanup_vetting_roles(db: Session, event_id: int) -> None:
+    # Needs the committee rows, so it runs before they are cascaded away
+    try:
+        from app.services.vetting_role_cleanup_service import cleanup_orphaned_vetting_roles_for_deleted_event
+        cleanup_orphaned_vetting_roles_for_deleted_event(db, event_id)
+    except Exception as e:
+        logger.warning(f"⚠️ Failed to cleanup vetting roles for event {event_id}: {str(e)}")
+
+
+def delete_event(db: Session, event_id: int) -> None:
+    """Delete an event and everything it owns in a single transaction"""
+    _cleanup_vetting_roles(db, event_id)
+    try:
+        db.execute(text("DELETE FROM events WHERE id = :event_id"), {"event_id": event_id})
+        invalidate_on_commit(db, f"event:{event_id}")
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    logger.info(f"🗑️ Event {event_id} deleted")
+
+
+def mark_for_purge(db: Session, event: Event) -> None:
+    """Hide the event behind the Deleting status until purge_event finishes"""
+    event.status = DELETING_STATUS
+    db.commit()
+
+
+def purge_event(event_id: int, chunk_size: int = PURGE_CHUNK_SIZE) -> None:
+    """Background purge for large events: participants in chunks, then the event.
+
+    Safe to run again after a failure (it carries on where it stopped) and a
+    no-op while another worker is already purging the same event.
+    """
+    with engine.connect() as lock_connection:
+        locked = lock_connection.execute(
+            text("SELECT pg_try_advisory_lock(:namespace, :event_id)"),
+            {"namespace": PURGE_LOCK_NAMESPACE, "event_id": event_id}
+        ).scalar()
+        # Session-level lock: it outlives this transaction, so don't sit idle in one
+        lock_connection.commit()
+        if not locked:
+            logger.info(f"🗑️ Purge of event {event_id} already running elsewhere")
+            return
+        try:
+            _purge(event_id, chunk_size)
+        finally:
+            lock_connection.execute(
+                text("SELECT pg_advisory_unlock(:namespace, :event_id)"),
+                {"namespace": PURGE_LOCK_NAMESPACE, "event_id": event_id}
+            )
+            lock_connection.commit()
+
+
+def _purge(event_id: int, chunk_size: int) -> None:
+    db = SessionLocal()
+    started = time.perf_counter()
+    purged = 0
+    try:
+        _cleanup_vetting_roles(db, event_id)
+        while True:
+            deleted = db.execute(text("""
+                DELETE FROM event_participants
+                WHERE id IN (
+                    SELECT id FROM event_participants
+                    WHERE event_id = :event_id
+                    ORDER BY id
+                    LIMIT :chunk_size
+                )
+            """), {"event_id": event_id, "chunk_size": chunk_size}).rowcount
+            db.commit()
+            purged += deleted
+            if deleted < chunk_size:
+                break
+            # Let other writers in between chunks
+            time.sleep(PURGE_CHUNK_PAUSE_SECONDS)
+
+        db.execute(text("DELETE FROM events WHERE id = :event_id"), {"event_id": event_id})
+        invalidate_on_commit(db, f"event:{event_id}")
+        db.commit()
+        logger.info(
+            f"🗑️ Event {event_id} purged: {purged} participants in {time.perf_counter() - started:.1f}s"
+        )
+    except Exception as e:
+        db.rollback()
+        # The event stays in the Deleting status; the purge is retried on
+        # startup or when the event is deleted again
+        logger.exception(
+            f"❌ Purge of event {event_id} failed after {purged} participants, left in {DELETING_STATUS}: {str(e)}"
+        )
+    finally:
+        db.close()
+
+
+def resume_pending_purges() -> None:
+    """Purge events left in the Deleting status by a failed or interrupted purge"""
+    db = SessionLocal()
+    try:
+        event_ids = [
+            event_id for (event_id,) in
+            db.query(Event.id).filter(Event.status == DELETING_STATUS).order_by(Event.id).all()
+        ]
+    finally:
+        db.close()
+
+    if event_ids:
+        logger.warning(f"🗑️ Resuming purge of {len(event_ids)} event(s) left in {DELETING_STATUS}: {event_ids}")
+    for event_id in event_ids:
+        try:
+            purge_event(event_id)
+        except Exception as e:
+            logger.exception(f"❌ Could not resume purge of event {event_id}: {str(e)}")
@@ -0,0 +1,182 @@
+"""
+Event Statistics
+
+Counts behind the event dashboards (statistics, accommodation stats, room
+stats and attendance) computed with one aggregate query per table, using
+FILTER clauses for every breakdown instead of one COUNT query per number.
+
+Results are cached per event and section. Flushes that touch participants,
+accommodation allocations or check-ins of an event drop its cached numbers
+once the transaction commits; EVENT_STATS_TTL bounds how long other workers
+(and writes made with raw SQL) can see older numbers while dashboards poll.
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional, Set, Tuple
+
+from sqlalchemy import event as sa_event, inspect, text
+from sqlalchemy.orm import Session
+
+from app.models.event_attendance import EventCheckin
+from app.models.event_participant import EventParticipant
+from app.models.guesthouse import AccommodationAllocation
+
+logger = logging.getLogger(__name__)
+
+# Seconds a cached section may be served
+EVENT_STATS_TTL = 10
+
+_PARTICIPANT_STATS_SQL = text("""
+    SELECT
+        COUNT(*) AS registered,
+        COUNT(*) FILTER (WHERE status = 'selected') AS selected,
+        COUNT(*) FILTER (WHERE status = 'registered') AS waiting,
+        COUNT(*) FILTER (WHERE status = 'checked_in') AS checked_in,
+        COUNT(*) FILTER (WHERE role = 'facilitator' OR participant_role = 'facilitator') AS facilitators,
+        COUNT(*) FILTER (WHERE role = 'organizer' OR participant_role = 'organizer') AS organizers,
+        COUNT(*) FILTER (WHERE role = 'visitor' OR participant_role = 'visitor'
+                         OR role IS NULL OR participant_role IS NULL) AS visitors,
+        COUNT(*) FILTER (WHERE status = 'confirmed') AS confirmed,
+        COUNT(*) FILTER (WHERE status = 'confirmed'
+                         AND accommodation_preference = 'staying_at_venue') AS confirmed_staying_at_venue,
+        COUNT(*) FILTER (WHERE status = 'confirmed'
+                         AND accommodation_preference = 'travelling_daily') AS confirmed_travelling_daily,
+        COUNT(*) FILTER (WHERE status = 'confirmed'
+                         AND (accommodation_preference IS NULL OR accommodation_preference = '')) AS confirmed_not_specified,
+        COUNT(*) FILTER (WHERE status = 'attended'
+                         AND accommodation_preference = 'staying_at_venue') AS attended_staying_at_venue,
+        COUNT(*) FILTER (WHERE status = 'attended'
+                         AND accommodation_preference = 'travelling_daily') AS attended_travelling_daily
+    FROM event_participants
+    WHERE event_id = :event_id
+""")
+
+# Bookings are matched through the participant (accommodation stats) while room
+# occupancy uses the allocation's own event_id (room stats), as before
+_ACCOMMODATION_STATS_SQL = text("""
+    SELECT
+        COUNT(*) FILTER (WHERE ep.event_id = :event_id
+                         AND aa.status IN ('booked', 'checked_in', 'released')) AS bookings,
+        COUNT(*) FILTER (WHERE ep.event_id = :event_id AND aa.status = 'checked_in') AS checked_in,
+        COUNT(*) FILTER (WHERE ep.event_id = :event_id AND aa.status = 'released') AS checked_out,
+        COUNT(*) FILTER (WHERE aa.event_id = :event_id AND aa.status IN ('booked', 'checked_in')
+                         AND aa.room_type = 'single') AS single_guests,
+        COUNT(DISTINCT CONCAT(aa.vendor_accommodation_id, '-', aa.check_in_date, '-', aa.check_out_date))
+            FILTER (WHERE aa.event_id = :event_id AND aa.status IN ('booked', 'checked_in')
+                    AND aa.room_type = 'double') AS double_rooms_occupied,
+        COUNT(*) FILTER (WHERE aa.event_id = :event_id AND aa.status IN ('booked', 'checked_in')
+                         AND aa.room_type = 'double') AS double_guests
+    FROM accommodation_allocations aa
+    LEFT JOIN event_participants ep ON ep.id = aa.participant_id
+    WHERE aa.event_id = :event_id
+       OR aa.participant_id IN (SELECT id FROM event_participants WHERE event_id = :event_id)
+""")
+
+# The grand-total grouping set gives distinct participants across all days
+_CHECKIN_STATS_SQL = text("""
+    SELECT
+        checkin_date,
+        COUNT(*) AS checkins,
+        COUNT(DISTINCT participant_id) AS participants,
+        COUNT(*) FILTER (WHERE badge_printed) AS badges_printed
+    FROM event_checkins
+    WHERE event_id = :event_id
+    GROUP BY GROUPING SETS ((checkin_date), ())
+    ORDER BY checkin_date
+""")
+
+
+def _participant_stats(db: Session, event_id: int) -> dict:
+    return dict(db.execute(_PARTICIPANT_STATS_SQL, {"event_id": event_id}).mappings().one())
+
+
+def _accommodation_stats(db: Session, event_id: int) -> dict:
+    row = db.execute(_ACCOMMODATION_STATS_SQL, {"event_id": event_id}).mappings().one()
+    return {key: value or 0 for key, value in row.items()}
+
+
+def _checkin_stats(db: Session, event_id: int) -> dict:
+    stats = {"participants": 0, "badges_printed": 0, "daily": []}
+    for row in db.execute(_CHECKIN_STATS_SQL, {"event_id": event_id}):
+        if row.checkin_date is None:
+            stats["participants"] = row.participants
+            stats["badges_printed"] = row.badges_printed
+        else:
+            stats["daily"].append({"date": str(row.checkin_date), "checkins": row.checkins})
+    return stats
+
+
+_SECTIONS: Dict[str, Callable[[Session, int], dict]] = {
+    "participants": _participant_stats,
+    "accommodation": _accommodation_stats,
+    "checkins": _checkin_stats,
+}
+
+_cache: Dict[Tuple[int, str], Tuple[float, dict]] = {}
+_cache_lock = threading.Lock()
+
+
+def get_stats(db: Session, event_id: int, section: str) -> dict:
+    """Cached statistics section ("participants", "accommodation" or "checkins") of an event"""
+    key = (event_id, section)
+    now = time.monotonic()
+    with _cache_lock:
+        cached = _cache.get(key)
+    if cached is not None and now - cached[0] < EVENT_STATS_TTL:
+        return cached[1]
+
+    stats = _SECTIONS[section](db, event_id)
+    with _cache_lock:
+        _cache[key] = (now, stats)
+    return stats
+
+
+def invalidate(*event_ids: int) -> None:
+    with _cache_lock:
+        for key in [key for key in _cache if key[0] in event_ids]:
+            del _cache[key]
+
+
+def clear_cache() -> None:
+    with _cache_lock:
+        _cache.clear()
+
+
+def _event_ids(obj) -> Set[int]:
+    """Event ids an allocation, check-in or participant row belonged to before and after the flush"""
+    state = inspect(obj)
+    event_ids = set()
+    if "event_id" in state.attrs:
+        event_ids.update(value for value in state.attrs["event_id"].history.sum() if value is not None)
+    return event_ids
+
+
+_STATS_MODELS = (EventParticipant, AccommodationAllocation, EventCheckin)
+
+
+@sa_event.listens_for(Session, "after_flush")
+def _collect_changed_events(session: Session, flush_context) -> None:
+    changed: Set[int] = session.info.setdefault("event_stats_changed", set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, _STATS_MODELS):
+            changed.update(_event_ids(obj))
+            if isinstance(obj, AccommodationAllocation) and obj.participant_id is not None:
+                # Accommodation stats also count allocations through their participant
+                changed.update(
+                    participant.event_id for participant in [session.get(EventParticipant, obj.participant_id)]
+                    if participant is not None
+                )
+
+
+@sa_event.listens_for(Session, "after_commit")
+def _invalidate_changed_events(session: Session) -> None:
+    changed: Optional[Set[int]] = session.info.pop("event_stats_changed", None)
+    if changed:
+        invalidate(*changed)
+
+
+@sa_event.listens_for(Session, "after_rollback")
+def _discard_changed_events(session: Session) -> None:
+    session.info.pop("event_stats_changed", None)
@@ -4,6 +4,7 @@ from typing import Optional, Dict, Any
 from google.oauth2 import service_account
 from google.auth.transport.requests import Request
 import requests
+from app.core.metrics import track_outbound
 
 logger = logging.getLogger(__name__)
 
@@ -100,7 +101,8 @@ class FirebaseService:
             if data:
                 message["message"]["data"] = {k: str(v) for k, v in data.items()}
             
-            response = requests.post(url, headers=headers, json=message)
+            with track_outbound("fcm"):
+                response = requests.post(url, headers=headers, json=message)
             
             if response.status_code == 200:
                 logger.info(f"Push notification sent successfully to token: {fcm_token[:20]}...")
@@ -9,10 +9,13 @@ import os
 import logging
 import hashlib
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Hashable
 import uuid
 from io import BytesIO
-import base64
+from app.core.metrics import track_outbound
+from app.services.pdf_assets import fetch_asset
+from app.services.qr_service import qr_data_uri
+from app.services.template_engine import compile_template
 
 logger = logging.getLogger(__name__)
 
@@ -23,19 +26,13 @@ AZURE_LOI_CONTAINER = os.getenv("AZURE_LOI_DOCUMENTS_CONTAINER", "loi-documents"
 API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:8000")
 
 
-def replace_template_variables(template_html: str, data: Dict[str, Any]) -> str:
+def replace_template_variables(template_html: str, data: Dict[str, Any], cache_key: Optional[Hashable] = None) -> str:
     """
     Replace template variables with actual participant data and make them bold.
     Also auto-format emails, phones, and URLs.
 
-    Template variables format: {{variableName}}
+    Template variables format: {{variableName}} (whitespace and case are ignored)
     """
-    import re
-    result = template_html
-    
-    # Find template variables in the template
-    template_vars = re.findall(r'\{\{\s*([^}]+)\s*\}\}', template_html)
-
     # Define all supported variables with multiple naming conventions
     variables = {
         # Participant data
@@ -69,34 +66,25 @@ def replace_template_variables(template_html: str, data: Dict[str, Any]) -> str:
         'current_date': datetime.now().strftime('%B %d, %Y'),
     }
 
-    # Replace each variable with bold formatting
-    for key, value in variables.items():
-        if value:  # Only replace if value is not empty
-            bold_value = f'<span class="variable">{value}</span>'
-            patterns = [
-                f'{{{{{key}}}}}',  # {{variable}}
-                f'{{{{ {key} }}}}',  # {{ variable }}
-            ]
-            for pattern in patterns:
-                if pattern.replace('{{', '').replace('}}', '').strip() in template_vars or key in template_vars:
-                    result = result.replace(pattern, bold_value)
-
-    # Also try regex replacement for whitespace variations
+    # Bold formatting; empty values leave the placeholder in place
+    bold_values = {}
     for key, value in variables.items():
-        if value:  # Only replace if value is not empty
-            bold_value = f'<span class="variable">{value}</span>'
-            pattern = f'{{{{\s*{re.escape(key)}\s*}}}}'
-            matches = re.findall(pattern, result, re.IGNORECASE)
-            if matches:
-                result = re.sub(pattern, bold_value, result, flags=re.IGNORECASE)
-
-    # Format standalone URLs in address section only (not in src/href attributes)
-    result = format_address_links(result)
-    
-    # Add inline styles to all <a> tags to ensure they are blue and underlined
-    result = add_link_styles(result)
+        if value:
+            value = str(value)
+            if 'http' in value:
+                # URLs inside values are linked the same way as in the template text
+                value = add_link_styles(format_address_links(value))
+            bold_values[key] = f'<span class="variable">{value}</span>'
+
+    # Links in the template text are formatted once, when the template is compiled
+    compiled = compile_template(template_html, cache_key, prepare=_format_template_links)
+    return compiled.render(bold_values, ignore_case=True)
 
-    return result
+
+def _format_template_links(html: str) -> str:
+    # Format standalone URLs in address section only (not in src/href attributes),
+    # then add inline styles to all <a> tags to ensure they are blue and underlined
+    return add_link_styles(format_address_links(html))
 
 
 def add_link_styles(html: str) -> str:
@@ -220,33 +208,8 @@ def generate_qr_code(url: str) -> str:
         Base64 encoded QR code image (PNG)
     """
     try:
-        import qrcode
-        from qrcode.image.pure import PyPNGImage
-
-        # Create QR code instance with smaller size for mobile
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=6,  # Reduced from 10 to 6
-            border=2,    # Reduced from 4 to 2
-        )
-
-        qr.add_data(url)
-        qr.make(fit=True)
-
-        # Create image with smaller dimensions
-        img = qr.make_image(fill_color="black", back_color="white")
-
-        # Convert to bytes
-        buffer = BytesIO()
-        img.save(buffer, format='PNG')
-        buffer.seek(0)
-
-        # Encode to base64
-        img_base64 = base64.b64encode(buffer.read()).decode('utf-8')
-
-        return f"data:image/png;base64,{img_base64}"
-
+        # Smaller modules and border for mobile
+        return qr_data_uri(url, box_size=6, border=2, error_correction="L")
     except ImportError:
         logger.error("qrcode library not installed")
         return ""
@@ -401,8 +364,8 @@ async def html_to_pdf_bytes(html_content: str) -> BytesIO:
         """
 
         print("🔄 Creating HTML and CSS objects...")
-        html_obj = HTML(string=html_content)
-        css_obj = CSS(string=css_string)
+        html_obj = HTML(string=html_content, url_fetcher=fetch_asset)
+        css_obj = CSS(string=css_string, url_fetcher=fetch_asset)
         print("✅ HTML and CSS objects created")
         
         print("🔄 Generating PDF bytes...")
@@ -449,16 +412,17 @@ async def upload_pdf_to_cloudinary(pdf_bytes: BytesIO, filename: str) -> str:
 
         pdf_bytes.seek(0)
         
-        result = cloudinary.uploader.upload(
-            pdf_bytes,
-            public_id=filename,
-            folder="msafiri-documents/loi",
-            resource_type="raw",
-            format="pdf",
-            use_filename=False,
-            unique_filename=False,
-            overwrite=True
-        )
+        with track_outbound("cloudinary"):
+            result = cloudinary.uploader.upload(
+                pdf_bytes,
+                public_id=filename,
+                folder="msafiri-documents/loi",
+                resource_type="raw",
+                format="pdf",
+                use_filename=False,
+                unique_filename=False,
+                overwrite=True
+            )
 
         return result["secure_url"]
 
@@ -5,10 +5,17 @@ from app.models.user_roles import UserRole as UserRoleModel
 # Using existing notifications table structure
 from app.models.event import Event
 from app.core.email_service import email_service
+from app.core.cache import attribute_values, cached_models, invalidate_on_change
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Admin lists change with users' tenant, role or active flag and with role assignments
+invalidate_on_change(User, lambda user: [f"tenant-admins:{tenant}" for tenant in attribute_values(user, "tenant_id")])
+invalidate_on_change(UserRoleModel, lambda role: [f"tenant-admins:{tenant}" for tenant in attribute_values(role, "tenant_id")])
+
+@cached_models(User, lambda db, tenant_id: tenant_id, name="tenant_admins", ttl=60,
+               tags=lambda db, tenant_id: [f"tenant-admins:{tenant_id}"])
 def get_tenant_admins(db: Session, tenant_id: int) -> List[User]:
     """Get all admin users for a tenant"""
     from app.models.user import UserRole
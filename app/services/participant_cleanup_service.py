@@ -110,6 +110,7 @@ class ParticipantCleanupService:
                 ("notifications", "user_email", participant_email),
                 ("user_fcm_tokens", "user_email", participant_email),
                 ("participant_voucher_redemptions", "participant_id", participant_id),
+                ("participant_voucher_balances", "participant_id", participant_id),
                 ("pending_voucher_redemptions", "participant_id", participant_id),
                 ("transport_requests", "user_email", participant_email),
                 ("flight_itineraries", "user_email", participant_email),
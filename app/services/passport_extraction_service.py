@@ -3,6 +3,7 @@ import os
 import logging
 from typing import Dict, Any, Optional
 from datetime import datetime
+from app.core.metrics import track_outbound
 
 logger = logging.getLogger(__name__)
 
@@ -50,11 +51,12 @@ class PassportExtractionService:
             )
 
             # Use the prebuilt-idDocument model for passport extraction
-            poller = client.begin_analyze_document_from_url(
-                model_id="prebuilt-idDocument",
-                document_url=image_url
-            )
-            result = poller.result()
+            with track_outbound("azure"):
+                poller = client.begin_analyze_document_from_url(
+                    model_id="prebuilt-idDocument",
+                    document_url=image_url
+                )
+                result = poller.result()
 
             # Extract passport-specific fields
             extracted_data = {
@@ -154,11 +156,12 @@ class PassportExtractionService:
             )
 
             # Use the prebuilt-idDocument model for passport extraction
-            poller = client.begin_analyze_document(
-                model_id="prebuilt-idDocument",
-                document=BytesIO(image_bytes)
-            )
-            result = poller.result()
+            with track_outbound("azure"):
+                poller = client.begin_analyze_document(
+                    model_id="prebuilt-idDocument",
+                    document=BytesIO(image_bytes)
+                )
+                result = poller.result()
 
             # Extract passport-specific fields (same logic as URL-based extraction)
             extracted_data = {
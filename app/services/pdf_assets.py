@@ -0,0 +1,223 @@
+"""
+PDF Asset Cache
+
+WeasyPrint URL fetcher shared by every PDF generator. Badge, certificate, LOI
+and POA templates reference the same remote logos, signatures and fonts for a
+whole event; without a cache each write_pdf() downloads all of them again.
+
+Remote (http/https) assets are kept in a bounded in-memory LRU and in a
+directory shared by the workers on the host. Entries are fresh for
+PDF_ASSET_CACHE_TTL seconds; after that they are revalidated with
+If-None-Match / If-Modified-Since, and a stale copy is served when the origin
+is unreachable. Other schemes (data:, file:) go to WeasyPrint's default
+fetcher untouched.
+
+Lookups are counted in the ``pdf_asset_lookups_total`` metric by outcome
+(memory_hit, disk_hit, revalidated, fetched, stale, error).
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import requests
+
+from app.core.config import settings
+from app.core.metrics import PDF_ASSET_LOOKUPS, track_outbound
+
+logger = logging.getLogger(__name__)
+
+# In-memory budget; larger assets are only cached on disk
+ASSET_MEMORY_CACHE_BYTES = 32 * 1024 * 1024
+ASSET_MEMORY_MAX_ENTRY_BYTES = 4 * 1024 * 1024
+
+_session = requests.Session()
+_cache: "OrderedDict[str, dict]" = OrderedDict()
+_cache_bytes = 0
+_cache_lock = threading.Lock()
+# One download per URL at a time; concurrent renders wait for the first
+_url_locks: Dict[str, threading.Lock] = {}
+
+
+def _key(url: str) -> str:
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+def _url_lock(key: str) -> threading.Lock:
+    with _cache_lock:
+        return _url_locks.setdefault(key, threading.Lock())
+
+
+def _is_fresh(entry: dict) -> bool:
+    return time.time() - entry["fetched_at"] < settings.PDF_ASSET_CACHE_TTL
+
+
+def _remember(key: str, entry: dict) -> None:
+    global _cache_bytes
+    size = len(entry["body"])
+    if size > ASSET_MEMORY_MAX_ENTRY_BYTES:
+        return
+    with _cache_lock:
+        previous = _cache.pop(key, None)
+        if previous is not None:
+            _cache_bytes -= len(previous["body"])
+        _cache[key] = entry
+        _cache_bytes += size
+        while _cache_bytes > ASSET_MEMORY_CACHE_BYTES and _cache:
+            _, evicted = _cache.popitem(last=False)
+            _cache_bytes -= len(evicted["body"])
+
+
+def _from_memory(key: str) -> Optional[dict]:
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is not None:
+            _cache.move_to_end(key)
+        return entry
+
+
+def _disk_paths(key: str):
+    if not settings.PDF_ASSET_CACHE_DIR:
+        return None, None
+    base = os.path.join(settings.PDF_ASSET_CACHE_DIR, key[:2], key)
+    return f"{base}.body", f"{base}.json"
+
+
+def _from_disk(key: str) -> Optional[dict]:
+    body_path, meta_path = _disk_paths(key)
+    if not body_path or not os.path.exists(meta_path):
+        return None
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            entry = json.load(f)
+        with open(body_path, "rb") as f:
+            entry["body"] = f.read()
+    except (OSError, ValueError):
+        return None
+    return entry
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _to_disk(key: str, entry: dict, body_changed: bool = True) -> None:
+    body_path, meta_path = _disk_paths(key)
+    if not body_path:
+        return
+    try:
+        os.makedirs(os.path.dirname(body_path), exist_ok=True)
+        if body_changed:
+            _atomic_write(body_path, entry["body"])
+        meta = {name: value for name, value in entry.items() if name != "body"}
+        _atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+    except OSError as e:
+        logger.warning(f"Could not write PDF asset cache for {entry['url']}: {e}")
+
+
+def _download(url: str, timeout: float, cached: Optional[dict]) -> Optional[dict]:
+    """Fetch ``url``, conditionally when a cached copy exists; None means not modified"""
+    headers = {"User-Agent": "msafiri-pdf-renderer"}
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    with track_outbound("pdf_assets"):
+        response = _session.get(url, headers=headers, timeout=timeout)
+        if cached and response.status_code == 304:
+            return None
+        response.raise_for_status()
+
+    content_type = response.headers.get("Content-Type", "")
+    mime_type, _, params = content_type.partition(";")
+    encoding = None
+    if "charset=" in params:
+        encoding = params.split("charset=", 1)[1].strip().strip('"') or None
+    return {
+        "url": url,
+        "body": response.content,
+        "mime_type": mime_type.strip() or None,
+        "encoding": encoding,
+        "redirected_url": response.url,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "fetched_at": time.time(),
+    }
+
+
+def _weasyprint_result(entry: dict) -> dict:
+    return {
+        "string": entry["body"],
+        "mime_type": entry["mime_type"],
+        "encoding": entry["encoding"],
+        "redirected_url": entry["redirected_url"],
+    }
+
+
+def fetch_asset(url: str, timeout: float = 10, ssl_context=None) -> dict:
+    """url_fetcher for weasyprint.HTML / CSS"""
+    if not url.lower().startswith(("http://", "https://")):
+        from weasyprint import default_url_fetcher
+        return default_url_fetcher(url, timeout=timeout, ssl_context=ssl_context)
+
+    key = _key(url)
+    entry = _from_memory(key)
+    if entry is not None and _is_fresh(entry):
+        PDF_ASSET_LOOKUPS.labels("memory_hit").inc()
+        return _weasyprint_result(entry)
+
+    with _url_lock(key):
+        # Another render may have fetched it while we waited
+        entry = _from_memory(key)
+        if entry is not None and _is_fresh(entry):
+            PDF_ASSET_LOOKUPS.labels("memory_hit").inc()
+            return _weasyprint_result(entry)
+
+        if entry is None:
+            entry = _from_disk(key)
+            if entry is not None and _is_fresh(entry):
+                _remember(key, entry)
+                PDF_ASSET_LOOKUPS.labels("disk_hit").inc()
+                return _weasyprint_result(entry)
+
+        try:
+            fetched = _download(url, timeout, entry)
+        except Exception as e:
+            if entry is None:
+                PDF_ASSET_LOOKUPS.labels("error").inc()
+                raise
+            logger.warning(f"Revalidating PDF asset {url} failed, serving cached copy: {e}")
+            # Keep using the copy in this worker rather than waiting on the origin for every render
+            _remember(key, {**entry, "fetched_at": time.time()})
+            PDF_ASSET_LOOKUPS.labels("stale").inc()
+            return _weasyprint_result(entry)
+
+        if fetched is None:
+            entry = {**entry, "fetched_at": time.time()}
+            _to_disk(key, entry, body_changed=False)
+            PDF_ASSET_LOOKUPS.labels("revalidated").inc()
+        else:
+            entry = fetched
+            _to_disk(key, entry)
+            PDF_ASSET_LOOKUPS.labels("fetched").inc()
+        _remember(key, entry)
+        return _weasyprint_result(entry)
+
+
+def clear_cache() -> None:
+    """Drop the in-memory cache (the disk cache expires by TTL)"""
+    global _cache_bytes
+    with _cache_lock:
+        _cache.clear()
+        _cache_bytes = 0
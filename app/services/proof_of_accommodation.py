@@ -8,9 +8,13 @@ from HTML templates and uploads them to Azure Blob Storage.
 import os
 import logging
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Hashable
 import uuid
 from io import BytesIO
+from app.core.metrics import track_outbound
+from app.services.pdf_assets import fetch_asset
+from app.services.qr_service import qr_data_uri
+from app.services.template_engine import render_template
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +24,7 @@ CLOUDINARY_API_KEY = os.getenv("CLOUDINARY_API_KEY")
 CLOUDINARY_API_SECRET = os.getenv("CLOUDINARY_API_SECRET")
 
 
-def replace_template_variables(template_html: str, data: Dict[str, Any]) -> str:
+def replace_template_variables(template_html: str, data: Dict[str, Any], cache_key: Optional[Hashable] = None) -> str:
     """
     Replace template variables with actual data.
 
@@ -29,12 +33,11 @@ def replace_template_variables(template_html: str, data: Dict[str, Any]) -> str:
     Args:
         template_html: HTML template with variables
         data: Dictionary containing variable values
+        cache_key: (kind, template id, updated_at) of the template, if known
 
     Returns:
         HTML with variables replaced
     """
-    result = template_html
-
     # Define all supported variables (excluding image URLs which are handled separately)
     variables = {
         'participantName': data.get('participant_name', ''),
@@ -50,12 +53,7 @@ def replace_template_variables(template_html: str, data: Dict[str, Any]) -> str:
         # Note: qrCode, hotelLogo, signature are handled separately as images
     }
 
-    # Replace each variable
-    for key, value in variables.items():
-        placeholder = f'{{{{{key}}}}}'
-        result = result.replace(placeholder, str(value))
-
-    return result
+    return render_template(template_html, variables, cache_key=cache_key)
 
 
 def generate_poa_slug(participant_id: int, event_id: int) -> str:
@@ -74,28 +72,7 @@ def generate_qr_code(url: str) -> str:
     Generate QR code image as base64 string.
     """
     try:
-        import qrcode
-        import base64
-        from io import BytesIO
-
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=10,
-            border=4,
-        )
-
-        qr.add_data(url)
-        qr.make(fit=True)
-
-        img = qr.make_image(fill_color="black", back_color="white")
-        buffer = BytesIO()
-        img.save(buffer, format='PNG')
-        buffer.seek(0)
-
-        img_base64 = base64.b64encode(buffer.read()).decode('utf-8')
-        return f"data:image/png;base64,{img_base64}"
-
+        return qr_data_uri(url, box_size=10, border=4, error_correction="L")
     except ImportError:
         logger.error("qrcode library not installed")
         return ""
@@ -170,8 +147,8 @@ async def html_to_pdf_bytes(html_content: str) -> BytesIO:
             }
         """
 
-        css = CSS(string=css_string)
-        pdf_bytes = HTML(string=html_content).write_pdf(stylesheets=[css])
+        css = CSS(string=css_string, url_fetcher=fetch_asset)
+        pdf_bytes = HTML(string=html_content, url_fetcher=fetch_asset).write_pdf(stylesheets=[css])
 
         return BytesIO(pdf_bytes)
 
@@ -216,16 +193,17 @@ async def upload_pdf_to_cloudinary(pdf_bytes: BytesIO, filename: str) -> str:
         pdf_bytes.seek(0)
         
         # Upload to Cloudinary
-        result = cloudinary.uploader.upload(
-            pdf_bytes,
-            public_id=filename,  # Keep full filename with .pdf extension
-            folder="msafiri-documents/poa",
-            resource_type="raw",
-            format="pdf",  # Explicitly set format as PDF
-            use_filename=False,  # Don't use original filename
-            unique_filename=False,  # Use our custom filename
-            overwrite=True
-        )
+        with track_outbound("cloudinary"):
+            result = cloudinary.uploader.upload(
+                pdf_bytes,
+                public_id=filename,  # Keep full filename with .pdf extension
+                folder="msafiri-documents/poa",
+                resource_type="raw",
+                format="pdf",  # Explicitly set format as PDF
+                use_filename=False,  # Don't use original filename
+                unique_filename=False,  # Use our custom filename
+                overwrite=True
+            )
 
         return result["secure_url"]
 
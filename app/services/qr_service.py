@@ -0,0 +1,154 @@
+"""
+QR Service
+
+Generates QR images locally and caches them by a hash of the payload and
+rendering options. Badges, certificates, LOIs and POAs encode the same
+participant URLs over and over, so each image is encoded once and then served
+from an in-memory LRU, backed by a directory of content-addressed files shared
+by all workers on the host.
+
+Callers get raw image bytes or a data URI to inline in HTML (no network
+fetch when the document is rendered or printed).
+"""
+
+import base64
+import hashlib
+import logging
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from io import BytesIO
+from typing import Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Images kept in memory (a PNG is ~1-2 KB)
+QR_MEMORY_CACHE_SIZE = 2048
+
+MEDIA_TYPES = {
+    "png": "image/png",
+    "svg": "image/svg+xml",
+}
+
+_DIGEST = re.compile(r"^[0-9a-f]{32}$")
+
+_cache: "OrderedDict[str, bytes]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def qr_digest(payload: str, image_format: str = "png", box_size: int = 10, border: int = 2,
+              error_correction: str = "M") -> str:
+    """Content address of a QR image: same payload and options, same digest"""
+    key = f"{image_format}:{box_size}:{border}:{error_correction}\n{payload}"
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _encode(payload: str, image_format: str, box_size: int, border: int, error_correction: str) -> bytes:
+    import qrcode
+    from qrcode.image.svg import SvgPathImage
+
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=getattr(qrcode.constants, f"ERROR_CORRECT_{error_correction}"),
+        box_size=box_size,
+        border=border,
+    )
+    qr.add_data(payload)
+    qr.make(fit=True)
+
+    if image_format == "svg":
+        return qr.make_image(image_factory=SvgPathImage).to_string()
+
+    img = qr.make_image(fill_color="black", back_color="white")
+    buffer = BytesIO()
+    img.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _disk_path(digest: str, image_format: str) -> Optional[str]:
+    if not settings.QR_CACHE_DIR:
+        return None
+    # Two-level fan-out keeps directories small
+    return os.path.join(settings.QR_CACHE_DIR, digest[:2], f"{digest}.{image_format}")
+
+
+def _remember(digest: str, image_format: str, data: bytes) -> None:
+    with _cache_lock:
+        _cache[f"{digest}.{image_format}"] = data
+        _cache.move_to_end(f"{digest}.{image_format}")
+        while len(_cache) > QR_MEMORY_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+def _write_to_disk(path: str, data: bytes) -> None:
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write-then-rename so concurrent workers never read a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Could not write QR cache file {path}: {e}")
+
+
+def load_cached(digest: str, image_format: str) -> Optional[bytes]:
+    """Cached image for a digest, from memory or disk; None if it was never generated here"""
+    if image_format not in MEDIA_TYPES or not _DIGEST.match(digest):
+        return None
+
+    with _cache_lock:
+        data = _cache.get(f"{digest}.{image_format}")
+        if data is not None:
+            _cache.move_to_end(f"{digest}.{image_format}")
+            return data
+
+    path = _disk_path(digest, image_format)
+    if path and os.path.exists(path):
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        _remember(digest, image_format, data)
+        return data
+    return None
+
+
+def qr_image(payload: str, image_format: str = "png", box_size: int = 10, border: int = 2,
+             error_correction: str = "M", persist: bool = True) -> bytes:
+    """PNG or SVG bytes for ``payload``, encoded only on a cache miss.
+
+    Pass ``persist=False`` for one-off payloads (e.g. single-use redemption
+    tokens) that should not be written to the shared disk cache.
+    """
+    if image_format not in MEDIA_TYPES:
+        raise ValueError(f"Unsupported QR image format: {image_format}")
+
+    digest = qr_digest(payload, image_format, box_size, border, error_correction)
+    data = load_cached(digest, image_format)
+    if data is not None:
+        return data
+
+    data = _encode(payload, image_format, box_size, border, error_correction)
+    _remember(digest, image_format, data)
+    path = _disk_path(digest, image_format)
+    if persist and path:
+        _write_to_disk(path, data)
+    return data
+
+
+def qr_data_uri(payload: str, image_format: str = "png", box_size: int = 10, border: int = 2,
+                error_correction: str = "M", persist: bool = True) -> str:
+    """QR image as a data URI for inlining in HTML"""
+    data = qr_image(payload, image_format, box_size, border, error_correction, persist)
+    return f"data:{MEDIA_TYPES[image_format]};base64,{base64.b64encode(data).decode()}"
+
+
+def clear_cache() -> None:
+    with _cache_lock:
+        _cache.clear()
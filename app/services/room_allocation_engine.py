@@ -0,0 +1,198 @@
+"""In-memory room allocation engine for event auto-booking.
+
+Participants, room inventory and vendor rates are loaded once, the whole
+event is planned in a single pass, and the resulting allocations are
+written with one bulk INSERT. Planning is deterministic: the same
+participants and inventory always produce the same rooms.
+
+Rules (same as the per-participant booking paths):
+- facilitators and organizers never share, they get a single room
+- visitors are paired into double rooms with someone of the same gender
+- visitors whose gender is unknown or not man/woman get a single room
+- when single rooms run out, a free double room is used by one person
+"""
+from itertools import zip_longest
+from typing import Iterable, List, Optional
+
+from sqlalchemy import func, insert, text
+from sqlalchemy.orm import Session
+
+from app.models.guesthouse import AccommodationAllocation, VendorAccommodation
+import logging
+
+logger = logging.getLogger(__name__)
+
+SINGLE_ROOM_ROLES = ("facilitator", "organizer")
+
+
+def normalize_gender(gender_identity: Optional[str]) -> str:
+    """Convert registration gender to male/female/other"""
+    if not gender_identity:
+        return "other"
+    gender = gender_identity.lower()
+    if gender in ("man", "male"):
+        return "male"
+    if gender in ("woman", "female"):
+        return "female"
+    return "other"
+
+
+def needs_single_room(participant) -> bool:
+    """Facilitators/organizers (by either role field) always get a single room"""
+    role_value = (getattr(participant, "role", None) or "").lower()
+    participant_role_value = (getattr(participant, "participant_role", None) or "").lower()
+    return role_value in SINGLE_ROOM_ROLES or participant_role_value in SINGLE_ROOM_ROLES
+
+
+def plan_room_allocations(participants: Iterable, single_rooms: int, double_rooms: int) -> dict:
+    """Assign participants to rooms for a whole event.
+
+    ``participants`` are rows/objects with ``id``, ``role``,
+    ``participant_role`` and ``gender_identity``. Returns
+    ``{"rooms": [{"room_type", "occupants"}], "unassigned": [...]}``.
+    """
+    single_rooms = max(single_rooms or 0, 0)
+    double_rooms = max(double_rooms or 0, 0)
+
+    facilitators, others = [], []
+    by_gender = {"male": [], "female": []}
+    for participant in sorted(participants, key=lambda p: p.id):
+        if needs_single_room(participant):
+            facilitators.append(participant)
+            continue
+        gender = normalize_gender(participant.gender_identity)
+        if gender == "other":
+            others.append(participant)
+        else:
+            by_gender[gender].append(participant)
+
+    # Same-gender pairs, interleaved so neither gender is starved of doubles
+    pairs_by_gender = {
+        gender: [(group[i], group[i + 1]) for i in range(0, len(group) - 1, 2)]
+        for gender, group in by_gender.items()
+    }
+    odd_ones = [group[-1] for group in by_gender.values() if len(group) % 2 == 1]
+    pairs = [
+        pair
+        for round_pairs in zip_longest(pairs_by_gender["male"], pairs_by_gender["female"])
+        for pair in round_pairs if pair is not None
+    ]
+
+    rooms = []
+    for pair in pairs[:double_rooms]:
+        rooms.append({"room_type": "double", "occupants": list(pair)})
+    doubles_left = double_rooms - min(len(pairs), double_rooms)
+
+    # Pairs that did not get a double room fall back to singles
+    unpaired = [participant for pair in pairs[double_rooms:] for participant in pair]
+    needs_single = facilitators + others + odd_ones + sorted(unpaired, key=lambda p: p.id)
+
+    unassigned = []
+    for participant in needs_single:
+        if single_rooms > 0:
+            rooms.append({"room_type": "single", "occupants": [participant]})
+            single_rooms -= 1
+        elif doubles_left > 0:
+            rooms.append({"room_type": "double", "occupants": [participant]})
+            doubles_left -= 1
+        else:
+            unassigned.append(participant)
+
+    return {"rooms": rooms, "unassigned": unassigned}
+
+
+def get_vendor_rate(db: Session, vendor_accommodation_id: Optional[int], board_type: Optional[str]):
+    """Look up the daily rate for a board type once per event"""
+    if not vendor_accommodation_id:
+        return None, "KES"
+
+    vendor = db.execute(text("""
+        SELECT rate_bed_breakfast, rate_half_board, rate_full_board, rate_bed_only, rate_currency
+        FROM vendor_accommodations WHERE id = :vendor_id
+    """), {"vendor_id": vendor_accommodation_id}).fetchone()
+
+    if not vendor:
+        return None, "KES"
+
+    rates = {
+        "FullBoard": vendor.rate_full_board,
+        "HalfBoard": vendor.rate_half_board,
+        "BedAndBreakfast": vendor.rate_bed_breakfast,
+        "BedOnly": vendor.rate_bed_only,
+    }
+    return rates.get(board_type), vendor.rate_currency or "KES"
+
+
+def write_room_plan(
+    db: Session,
+    plan: dict,
+    *,
+    event,
+    vendor_accommodation_id: int,
+    tenant_id: int,
+    created_by: Optional[int] = None,
+) -> List[dict]:
+    """Insert all planned allocations with one statement.
+
+    ``event`` needs ``id``, ``start_date``, ``end_date`` and
+    ``accommodation_type`` (board type). Does not commit.
+    """
+    board_type = getattr(event, "accommodation_type", None)
+    rate_per_day, rate_currency = get_vendor_rate(db, vendor_accommodation_id, board_type)
+
+    rows, booked = [], []
+    for room in plan["rooms"]:
+        occupants = room["occupants"]
+        for participant in occupants:
+            roommates = [other.full_name for other in occupants if other is not participant]
+            notes = f"Auto-assigned {room['room_type']} room"
+            if roommates:
+                notes += f" (shared with {roommates[0]})"
+            elif room["room_type"] == "double":
+                notes += " (sole occupant)"
+            rows.append({
+                "tenant_id": tenant_id,
+                "accommodation_type": "vendor",
+                "participant_id": participant.id,
+                "event_id": event.id,
+                "vendor_accommodation_id": vendor_accommodation_id,
+                "guest_name": participant.full_name,
+                "guest_email": participant.email,
+                "check_in_date": event.start_date,
+                "check_out_date": event.end_date,
+                "number_of_guests": len(occupants),
+                "room_type": room["room_type"],
+                "status": "booked",
+                "notes": notes,
+                "board_type": board_type,
+                "rate_per_day": rate_per_day,
+                "rate_currency": rate_currency,
+                "created_by": created_by,
+            })
+            booked.append({
+                "participant": participant,
+                "room_type": room["room_type"],
+                "paired_with": roommates[0] if roommates else None,
+            })
+
+    if not rows:
+        return []
+
+    allocation_ids = db.scalars(
+        insert(AccommodationAllocation).returning(AccommodationAllocation.id, sort_by_parameter_order=True),
+        rows,
+    ).all()
+    for entry, allocation_id in zip(booked, allocation_ids):
+        entry["allocation_id"] = allocation_id
+
+    # Same occupancy figure CRUDAccommodationAllocation maintains, computed once
+    occupants = db.query(func.sum(AccommodationAllocation.number_of_guests)).filter(
+        AccommodationAllocation.vendor_accommodation_id == vendor_accommodation_id,
+        AccommodationAllocation.status.in_(["booked", "checked_in"])
+    ).scalar() or 0
+    db.query(VendorAccommodation).filter(
+        VendorAccommodation.id == vendor_accommodation_id
+    ).update({"current_occupants": occupants}, synchronize_session=False)
+
+    logger.info(f"Bulk-inserted {len(rows)} room allocations for event {event.id}")
+    return booked
@@ -45,7 +45,7 @@ def assign_room_with_sharing(db: Session, participant_id: int, event_id: int, te
     participant_gender = participant.gender_identity or participant.sex or participant.gender
     if not participant_gender:
         logger.warning(f"Participant {participant_id} missing gender information")
-        return create_single_room_allocation(db, participant_id, event_id, tenant_id)
+        return create_single_room_allocation(db, participant_id, event_id, tenant_id, participant=participant, event=event)
     
     # 🔥 CRITICAL FIX: Find other participants of same gender in same event AND same hotel with single rooms
     same_gender_participants = db.query(AccommodationAllocation).join(
@@ -99,16 +99,19 @@ def assign_room_with_sharing(db: Session, participant_id: int, event_id: int, te
     
     else:
         # No same-gender participant found, create single room
-        return create_single_room_allocation(db, participant_id, event_id, tenant_id)
+        return create_single_room_allocation(db, participant_id, event_id, tenant_id, participant=participant, event=event)
 
-def create_single_room_allocation(db: Session, participant_id: int, event_id: int, tenant_id: int):
-    """Create a single room allocation"""
+def create_single_room_allocation(db: Session, participant_id: int, event_id: int, tenant_id: int,
+                                  participant: EventParticipant = None, event: Event = None):
+    """Create a single room allocation (reuses participant/event already loaded by the caller)"""
     
-    participant = db.query(EventParticipant).filter(
-        EventParticipant.id == participant_id
-    ).first()
+    if participant is None:
+        participant = db.query(EventParticipant).filter(
+            EventParticipant.id == participant_id
+        ).first()
     
-    event = db.query(Event).filter(Event.id == event_id).first()
+    if event is None:
+        event = db.query(Event).filter(Event.id == event_id).first()
     
     # 🔥 CRITICAL FIX: Use the event's specific vendor accommodation, not just any vendor
     vendor_accommodation = None
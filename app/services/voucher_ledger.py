@@ -0,0 +1,168 @@
+"""
+Voucher Ledger
+
+Every redemption is written as a ParticipantVoucherRedemption row (the ledger)
+and applied to the participant's ParticipantVoucherBalance row in the same
+transaction. The balance update is a single conditional UPDATE, so concurrent
+scans of the same participant serialize on that row and can never take the
+balance past the allocation: the second scanner re-checks the limit after the
+first one commits. Balance reads are a primary-key lookup instead of a SUM
+over the ledger.
+
+Callers commit; nothing here commits on its own.
+"""
+
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.allocation import EventAllocation
+from app.models.participant_voucher_balance import ParticipantVoucherBalance
+from app.models.participant_voucher_redemption import ParticipantVoucherRedemption
+
+logger = logging.getLogger(__name__)
+
+# Voucher types participants may redeem beyond their allocation
+OVER_REDEEMABLE_TYPES = ("Drinks",)
+
+# Seeds balances from ledger rows written before the balances table existed
+BALANCE_BACKFILL_SQL = """
+    INSERT INTO participant_voucher_balances
+        (allocation_id, participant_id, redeemed_quantity, redemption_count, last_redeemed_at)
+    SELECT allocation_id, participant_id, COALESCE(SUM(quantity), 0), COUNT(*), MAX(redeemed_at)
+    FROM participant_voucher_redemptions
+    GROUP BY allocation_id, participant_id
+    ON CONFLICT (allocation_id, participant_id) DO NOTHING
+"""
+
+
+class VoucherBalanceExceeded(Exception):
+    def __init__(self, remaining: int, voucher_type: str):
+        self.remaining = remaining
+        self.voucher_type = voucher_type
+        super().__init__(f"Only {remaining} {voucher_type} remaining")
+
+
+def voucher_type(allocation: EventAllocation) -> str:
+    return allocation.voucher_type if allocation.voucher_type else "Drinks"
+
+
+def voucher_quantity(allocation: EventAllocation) -> int:
+    """Vouchers per participant - prefer the generic field, fall back to the legacy drinks field"""
+    if allocation.vouchers_per_participant and allocation.vouchers_per_participant > 0:
+        return allocation.vouchers_per_participant
+    return allocation.drink_vouchers_per_participant or 0
+
+
+def allows_over_redemption(allocation: EventAllocation) -> bool:
+    return voucher_type(allocation) in OVER_REDEEMABLE_TYPES
+
+
+def get_redeemed(db: Session, allocation_id: int, participant_id: int) -> int:
+    redeemed = db.query(ParticipantVoucherBalance.redeemed_quantity).filter(
+        ParticipantVoucherBalance.allocation_id == allocation_id,
+        ParticipantVoucherBalance.participant_id == participant_id
+    ).scalar()
+    return redeemed or 0
+
+
+def get_balances(
+    db: Session,
+    allocation_ids: Iterable[int],
+    participant_ids: Optional[Iterable[int]] = None
+) -> Dict[Tuple[int, int], ParticipantVoucherBalance]:
+    """Balance rows keyed by (allocation_id, participant_id) in one query"""
+    allocation_ids = list(allocation_ids)
+    if not allocation_ids:
+        return {}
+    query = db.query(ParticipantVoucherBalance).filter(
+        ParticipantVoucherBalance.allocation_id.in_(allocation_ids)
+    )
+    if participant_ids is not None:
+        query = query.filter(ParticipantVoucherBalance.participant_id.in_(list(participant_ids)))
+    return {(balance.allocation_id, balance.participant_id): balance for balance in query.all()}
+
+
+def total_redeemed(db: Session, allocation_ids: Iterable[int]) -> int:
+    allocation_ids = list(allocation_ids)
+    if not allocation_ids:
+        return 0
+    return db.execute(
+        text("""
+            SELECT COALESCE(SUM(redeemed_quantity), 0) FROM participant_voucher_balances
+            WHERE allocation_id = ANY(:allocation_ids)
+        """),
+        {"allocation_ids": allocation_ids}
+    ).scalar() or 0
+
+
+def redeem(
+    db: Session,
+    allocation: EventAllocation,
+    participant_id: int,
+    quantity: int,
+    redeemed_by: Optional[str] = None,
+    notes: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> int:
+    """Record a redemption (negative quantity re-assigns vouchers) and return the new redeemed total.
+
+    With ``limit`` the redemption only succeeds while the redeemed total stays
+    within it; otherwise VoucherBalanceExceeded is raised before anything but an
+    empty balance row is written.
+    """
+    now = datetime.utcnow()
+    db.execute(
+        insert(ParticipantVoucherBalance.__table__)
+        .values(allocation_id=allocation.id, participant_id=participant_id,
+                redeemed_quantity=0, redemption_count=0)
+        .on_conflict_do_nothing(index_elements=["allocation_id", "participant_id"])
+    )
+    # Row lock + re-check: a concurrent redemption waits here and sees the updated total
+    redeemed = db.execute(
+        text("""
+            UPDATE participant_voucher_balances
+            SET redeemed_quantity = redeemed_quantity + :quantity,
+                redemption_count = redemption_count + 1,
+                last_redeemed_at = :now,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE allocation_id = :allocation_id AND participant_id = :participant_id
+              AND (CAST(:limit AS INTEGER) IS NULL OR redeemed_quantity + :quantity <= :limit)
+            RETURNING redeemed_quantity
+        """),
+        {"quantity": quantity, "now": now, "allocation_id": allocation.id,
+         "participant_id": participant_id, "limit": limit}
+    ).scalar()
+
+    if redeemed is None:
+        remaining = (limit or 0) - get_redeemed(db, allocation.id, participant_id)
+        raise VoucherBalanceExceeded(max(0, remaining), voucher_type(allocation))
+
+    db.add(ParticipantVoucherRedemption(
+        allocation_id=allocation.id,
+        participant_id=participant_id,
+        quantity=quantity,
+        redeemed_at=now,
+        redeemed_by=redeemed_by,
+        notes=notes
+    ))
+    db.flush()
+    return redeemed
+
+
+def claim_pending(db: Session, token: str, processed_by: str):
+    """Atomically move a pending redemption to completed; None if it was already processed"""
+    return db.execute(
+        text("""
+            UPDATE pending_voucher_redemptions
+            SET status = 'completed', processed_at = :now, processed_by = :processed_by,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE token = :token AND status = 'pending'
+            RETURNING id, allocation_id, participant_id, quantity, notes
+        """),
+        {"token": token, "now": datetime.utcnow(), "processed_by": processed_by}
+    ).first()
@@ -1,4 +1,5 @@
 import os
+import shutil
 
 bind = f"0.0.0.0:{os.getenv('PORT', 8000)}"
 workers = int(os.getenv('WEB_CONCURRENCY', 1))
@@ -7,3 +8,20 @@ worker_connections = 1000
 max_requests = 1000
 max_requests_jitter = 100
 preload_app = True
+
+# Workers write Prometheus samples here so /metrics can aggregate them. The
+# directory is prepared here rather than in on_starting because preload_app
+# imports the app (which may already record samples) before on_starting runs;
+# the marker keeps a config reload (HUP) from wiping live workers' files.
+prometheus_dir = os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR", os.path.join(os.getenv("TMPDIR", "/tmp"), "msafiri-prometheus")
+)
+if not os.environ.get("MSAFIRI_PROMETHEUS_DIR_READY"):
+    shutil.rmtree(prometheus_dir, ignore_errors=True)
+    os.makedirs(prometheus_dir, exist_ok=True)
+    os.environ["MSAFIRI_PROMETHEUS_DIR_READY"] = "1"
+
+
+def child_exit(server, worker):
+    from app.core.metrics import mark_process_dead
+    mark_process_dead(worker.pid)
@@ -0,0 +1,237 @@
+"""Synthetic tenant for benchmarks.
+
+Creates one tenant with an admin, a main event with ``participants`` registered
+users, a number of smaller events, agenda, vouchers with partial redemptions,
+an event chat room with history, news updates and per-user notifications.
+Volumes are parameters so runs stay comparable when they are recorded in the
+report.
+"""
+import random
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.core.security import get_password_hash
+from app.db.database import Base
+from app.models.allocation import EventAllocation
+from app.models.chat import ChatMessage, ChatRoom, ChatType
+from app.models.event import Event
+from app.models.event_agenda import EventAgenda
+from app.models.event_participant import EventParticipant
+from app.models.inventory import Inventory
+from app.models.news_update import NewsUpdate
+from app.models.notification import Notification, NotificationType
+from app.models.participant_voucher_redemption import ParticipantVoucherRedemption
+from app.models.tenant import Tenant
+from app.models.user import User, UserRole, UserStatus
+from app.services.voucher_ledger import BALANCE_BACKFILL_SQL
+
+TENANT_SLUG = "benchmark"
+ADMIN_EMAIL = "admin@benchmark.local"
+PASSWORD = "Benchmark123!"
+
+PARTICIPANT_STATUSES = ("selected", "confirmed", "registered", "waiting", "attended")
+
+
+@dataclass
+class SeedConfig:
+    participants: int = 1000
+    events: int = 20
+    participants_per_event: int = 50
+    agenda_items: int = 30
+    chat_messages: int = 3000
+    notifications_per_user: int = 10
+    news_updates: int = 50
+    seed: int = 42
+
+
+@dataclass
+class SeedResult:
+    tenant_id: int
+    tenant_slug: str
+    admin_email: str
+    mobile_email: str
+    main_event_id: int
+    chat_room_id: int
+    counts: dict = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def create_schema(engine, reset: bool = False) -> None:
+    """Create all tables (dropping them first with ``reset``) plus the startup DDL"""
+    if reset:
+        Base.metadata.drop_all(engine)
+    if engine.dialect.name == "postgresql":
+        # Enums declared with create_type=False are normally created by migrations
+        with engine.begin() as conn:
+            for table in Base.metadata.sorted_tables:
+                for column in table.columns:
+                    if isinstance(column.type, postgresql.ENUM) and not column.type.create_type:
+                        column.type.create(conn, checkfirst=True)
+    Base.metadata.create_all(engine)
+    if engine.dialect.name == "postgresql":
+        # Indexes and columns that production gets from the startup migration
+        from app.main import run_auto_migration
+        run_auto_migration()
+
+
+def seed(db: Session, config: SeedConfig) -> SeedResult:
+    rng = random.Random(config.seed)
+    today = date.today()
+    password_hash = get_password_hash(PASSWORD)
+
+    tenant = Tenant(
+        name="Benchmark Tenant", slug=TENANT_SLUG, public_id="benchmark001",
+        contact_email=ADMIN_EMAIL, admin_email=ADMIN_EMAIL, is_active=True
+    )
+    db.add(tenant)
+    db.flush()
+
+    admin = User(
+        email=ADMIN_EMAIL, full_name="Benchmark Admin", hashed_password=password_hash,
+        role=UserRole.MT_ADMIN, status=UserStatus.ACTIVE, is_active=True, tenant_id=TENANT_SLUG
+    )
+    db.add(admin)
+
+    users = [
+        User(
+            email=f"participant{i}@benchmark.local", full_name=f"Participant {i}",
+            hashed_password=password_hash, role=UserRole.GUEST, status=UserStatus.ACTIVE,
+            is_active=True, tenant_id=TENANT_SLUG, country=rng.choice(["Kenya", "Uganda", "Nigeria", "France"])
+        )
+        for i in range(config.participants)
+    ]
+    db.add_all(users)
+    db.flush()
+
+    events = []
+    for index in range(config.events):
+        start = today + timedelta(days=rng.randint(-60, 90))
+        events.append(Event(
+            title=f"Benchmark Event {index}", description="Synthetic benchmark event",
+            event_type="Training", status="Published",
+            start_date=start, end_date=start + timedelta(days=4), duration_days=5,
+            location="Nairobi", country="Kenya",
+            registration_deadline=datetime.combine(start, datetime.min.time()) - timedelta(days=7),
+            expected_participants=config.participants if index == 0 else config.participants_per_event,
+            tenant_id=tenant.id, created_by=ADMIN_EMAIL
+        ))
+    db.add_all(events)
+    db.flush()
+    main_event = events[0]
+
+    participants = []
+    for event in events:
+        attendees = users if event is main_event else rng.sample(users, min(config.participants_per_event, len(users)))
+        for user in attendees:
+            participants.append(EventParticipant(
+                event_id=event.id, email=user.email, full_name=user.full_name,
+                status=rng.choice(PARTICIPANT_STATUSES), participant_role="visitor",
+                invited_by=ADMIN_EMAIL, country=user.country, gender=rng.choice(["Man", "Woman"]),
+                accommodation_type=rng.choice(["Residential", "Non-Residential"]),
+                travelling_internationally=rng.choice(["Yes", "No"])
+            ))
+    db.add_all(participants)
+    db.flush()
+
+    db.add_all([
+        EventAgenda(
+            event_id=main_event.id, day_number=index % 5 + 1,
+            event_date=main_event.start_date + timedelta(days=index % 5),
+            time=f"{8 + index % 9:02d}:00", end_time=f"{9 + index % 9:02d}:00",
+            title=f"Session {index}", description="Synthetic session", created_by=ADMIN_EMAIL
+        )
+        for index in range(config.agenda_items)
+    ])
+
+    voucher_item = Inventory(
+        tenant_id=tenant.id, name="Drink voucher", category="equipment", quantity=100000, created_by=ADMIN_EMAIL
+    )
+    db.add(voucher_item)
+    db.flush()
+    allocation = EventAllocation(
+        event_id=main_event.id, inventory_item_id=voucher_item.id, quantity_per_participant=0,
+        voucher_type="Drinks", vouchers_per_participant=5, status="approved",
+        tenant_id=tenant.id, created_by=ADMIN_EMAIL, approved_by=ADMIN_EMAIL
+    )
+    db.add(allocation)
+    db.flush()
+    main_participants = [p for p in participants if p.event_id == main_event.id]
+    redemptions = [
+        ParticipantVoucherRedemption(
+            allocation_id=allocation.id, participant_id=participant.id, quantity=1,
+            redeemed_at=datetime.utcnow() - timedelta(hours=rng.randint(0, 72)), redeemed_by=ADMIN_EMAIL
+        )
+        for participant in main_participants
+        for _ in range(rng.randint(0, 3))
+    ]
+    db.add_all(redemptions)
+    db.flush()
+    db.execute(text(BALANCE_BACKFILL_SQL))
+
+    room = ChatRoom(
+        chat_type=ChatType.EVENT_CHATROOM, name=main_event.title, event_id=main_event.id,
+        tenant_id=tenant.id, created_by=admin.id
+    )
+    db.add(room)
+    db.flush()
+    db.add_all([
+        ChatMessage(
+            chat_room_id=room.id, sender_email=sender.email, sender_name=sender.full_name,
+            message=f"Benchmark message {index}"
+        )
+        for index, sender in enumerate(rng.choice(users) for _ in range(config.chat_messages))
+    ])
+
+    db.add_all([
+        NewsUpdate(
+            tenant_id=tenant.id, title=f"News {index}", summary="Synthetic news update",
+            content="Benchmark content " * 20, is_published=True,
+            published_at=datetime.utcnow() - timedelta(days=index), created_by=ADMIN_EMAIL
+        )
+        for index in range(config.news_updates)
+    ])
+
+    notifications = [
+        Notification(
+            user_id=user.id, user_email=user.email, tenant_id=TENANT_SLUG,
+            title=f"Notification {index}", message="Synthetic notification",
+            notification_type=NotificationType.SYSTEM_ANNOUNCEMENT, priority="MEDIUM",
+            is_read=rng.random() < 0.6
+        )
+        for user in users + [admin]
+        for index in range(config.notifications_per_user)
+    ]
+    db.add_all(notifications)
+    db.commit()
+
+    return SeedResult(
+        tenant_id=tenant.id,
+        tenant_slug=TENANT_SLUG,
+        admin_email=ADMIN_EMAIL,
+        mobile_email=users[0].email,
+        main_event_id=main_event.id,
+        chat_room_id=room.id,
+        counts={
+            "users": len(users) + 1,
+            "events": len(events),
+            "participants": len(participants),
+            "agenda_items": config.agenda_items,
+            "voucher_redemptions": len(redemptions),
+            "chat_messages": config.chat_messages,
+            "news_updates": config.news_updates,
+            "notifications": len(notifications),
+        },
+    )
+
+
+def analyze(db: Session) -> None:
+    """Refresh planner statistics so query plans match a warmed-up database"""
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("ANALYZE"))
+        db.commit()
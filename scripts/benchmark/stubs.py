@@ -0,0 +1,149 @@
+"""Local stand-ins for external services during benchmarks.
+
+Nothing leaves the machine while the benchmark runs:
+- SMTP: ``smtplib.SMTP``/``SMTP_SSL`` accept and discard messages
+- HTTP via requests/httpx (FCM, Google Maps, Absolute Cabs, Azure OpenAI):
+  answered in-process with canned JSON per host
+- Azure Document Intelligence/OpenAI/Blob and Cloudinary: registered in the
+  service registry as recording stubs
+
+Every intercepted call is counted so the report shows which endpoints talk to
+which service.
+"""
+import json
+import smtplib
+import threading
+from collections import Counter
+from urllib.parse import urlparse
+
+import httpx
+import requests
+
+calls: Counter = Counter()
+_lock = threading.Lock()
+
+# Canned response bodies by host suffix; anything else gets {}
+CANNED_RESPONSES = {
+    "fcm.googleapis.com": {"name": "projects/benchmark/messages/0"},
+    "oauth2.googleapis.com": {"access_token": "benchmark", "expires_in": 3600, "token_type": "Bearer"},
+    "maps.googleapis.com": {"status": "OK", "results": [], "predictions": [], "routes": []},
+    "absolutecabs.co.ke": {"access_token": "benchmark", "expires_in": 3600, "data": [], "status": "success"},
+    "openai.azure.com": {"choices": [{"message": {"role": "assistant", "content": "{}"}}], "usage": {}},
+}
+
+
+def _record(service: str) -> None:
+    with _lock:
+        calls[service] += 1
+
+
+def _canned_body(host: str) -> bytes:
+    for suffix, body in CANNED_RESPONSES.items():
+        if host.endswith(suffix):
+            return json.dumps(body).encode()
+    return b"{}"
+
+
+class _StubSMTP:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def send_message(self, *args, **kwargs):
+        _record("smtp")
+        return {}
+
+    def sendmail(self, *args, **kwargs):
+        _record("smtp")
+        return {}
+
+    def __getattr__(self, name):
+        # starttls, login, ehlo, quit, ...
+        return lambda *args, **kwargs: (250, b"OK")
+
+
+def _requests_send(self, request, **kwargs):
+    host = urlparse(request.url).hostname or ""
+    _record(f"http:{host}")
+    response = requests.Response()
+    response.status_code = 200
+    response._content = _canned_body(host)
+    response.headers["Content-Type"] = "application/json"
+    response.url = request.url
+    response.request = request
+    response.encoding = "utf-8"
+    return response
+
+
+def _httpx_handle(self, request):
+    _record(f"http:{request.url.host}")
+    return httpx.Response(200, json=json.loads(_canned_body(request.url.host)), request=request)
+
+
+async def _httpx_handle_async(self, request):
+    return _httpx_handle(self, request)
+
+
+class _StubResult(dict):
+    """Canned SDK result; also awaitable so async SDK methods can be stubbed the same way"""
+
+    def __getattr__(self, name):
+        return self.get(name)
+
+    def __await__(self):
+        if False:
+            yield
+        return self
+
+
+class _StubService:
+    """Accepts any attribute chain and call, e.g. ``cloudinary.uploader.upload(...)``"""
+
+    def __init__(self, path: str):
+        self._path = path
+
+    def __getattr__(self, name):
+        return _StubService(f"{self._path}.{name}")
+
+    def __call__(self, *args, **kwargs):
+        _record(self._path)
+        return _StubResult(
+            secure_url=f"https://stub.local/{self._path}",
+            url=f"https://stub.local/{self._path}",
+            public_id="benchmark",
+        )
+
+
+def install() -> None:
+    """Patch outbound transports; call before the first request"""
+    smtplib.SMTP = _StubSMTP
+    smtplib.SMTP_SSL = _StubSMTP
+    requests.Session.send = _requests_send
+    # TestClient brings its own transport, so only the network transports are replaced
+    httpx.HTTPTransport.handle_request = _httpx_handle
+    httpx.AsyncHTTPTransport.handle_async_request = _httpx_handle_async
+
+    from app.core.service_registry import service_registry
+    for name in ("azure_document_intelligence", "azure_openai", "azure_blob", "azure_blob_client", "cloudinary"):
+        service_registry.register(name, lambda name=name: _StubService(name))
+
+    # Push notifications are skipped without credentials; give FCM a fake token
+    # so the send path (and its stubbed HTTP call) is exercised
+    from app.services.firebase_service import firebase_service
+    firebase_service.project_id = "benchmark"
+    firebase_service.credentials = object()
+    firebase_service._get_access_token = lambda: "benchmark"
+
+    # Exercise the email code paths against the SMTP stub
+    from app.core.config import settings
+    settings.SEND_EMAILS = True
+
+
+def snapshot() -> dict:
+    with _lock:
+        return dict(sorted(calls.items()))
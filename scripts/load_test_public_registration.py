@@ -0,0 +1,117 @@
+"""Burst load test for public event registration.
+
+Simulates registration opening for a large training: many people submit the
+public form within a short window, some of them retrying (same
+Idempotency-Key) and some submitting twice (new key, same email).
+
+Usage:
+    python scripts/load_test_public_registration.py --event-id 42 \
+        --base-url http://localhost:8000 --registrants 300 --concurrency 50
+
+Expected outcome: every registrant gets exactly one participant, retries
+return the same participant_id, and double submissions get a 400.
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+from collections import Counter
+
+import httpx
+
+
+def build_payload(event_id: int, index: int, run_id: str) -> dict:
+    return {
+        "eventId": event_id,
+        "firstName": f"Load{index}",
+        "lastName": f"Test{run_id}",
+        "oc": "OCA",
+        "contractStatus": "On contract",
+        "genderIdentity": "Woman" if index % 2 else "Man",
+        "personalEmail": f"load.{run_id}.{index}@example.org",
+        "phoneNumber": "+254700000000",
+        "codeOfConductConfirm": "Yes",
+    }
+
+
+async def submit(client: httpx.AsyncClient, url: str, payload: dict, key: str, latencies: list) -> httpx.Response:
+    start = time.perf_counter()
+    response = await client.post(url, json=payload, headers={"Idempotency-Key": key})
+    latencies.append(time.perf_counter() - start)
+    return response
+
+
+async def run(args) -> int:
+    run_id = uuid.uuid4().hex[:8]
+    url = f"{args.base_url.rstrip('/')}/api/v1/public-registration/events/{args.event_id}/public-register"
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies: list = []
+    statuses: Counter = Counter()
+    participants: dict = {}
+    mismatched_replays = 0
+
+    async with httpx.AsyncClient(timeout=args.timeout) as client:
+
+        async def registrant(index: int):
+            nonlocal mismatched_replays
+            payload = build_payload(args.event_id, index, run_id)
+            key = f"{run_id}-{index}"
+            attempts = [key]
+            if index % args.retry_every == 0:
+                attempts.append(key)  # client retry after a timeout
+            if index % args.duplicate_every == 0:
+                attempts.append(f"{key}-dup")  # user pressed submit again
+
+            results = []
+            async with semaphore:
+                results = await asyncio.gather(*[
+                    submit(client, url, payload, attempt_key, latencies) for attempt_key in attempts
+                ], return_exceptions=True)
+
+            for attempt_key, result in zip(attempts, results):
+                if isinstance(result, Exception):
+                    statuses[type(result).__name__] += 1
+                    continue
+                statuses[result.status_code] += 1
+                if result.status_code == 200:
+                    participant_id = result.json().get("participant_id")
+                    previous = participants.setdefault(attempt_key, participant_id)
+                    if previous != participant_id:
+                        mismatched_replays += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*[registrant(i) for i in range(1, args.registrants + 1)])
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print(f"Requests: {len(latencies)} in {elapsed:.2f}s ({len(latencies) / elapsed:.1f} req/s)")
+    if latencies:
+        print(f"Latency p50={statistics.median(latencies) * 1000:.0f}ms "
+              f"p95={latencies[int(len(latencies) * 0.95) - 1] * 1000:.0f}ms "
+              f"max={latencies[-1] * 1000:.0f}ms")
+    print(f"Status codes: {dict(statuses)}")
+    print(f"Distinct participants created: {len(set(participants.values()))}")
+    print(f"Replays returning a different participant: {mismatched_replays}")
+
+    failed = mismatched_replays or any(
+        code not in (200, 400) for code in statuses
+    )
+    return 1 if failed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--event-id", type=int, required=True)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--registrants", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--retry-every", type=int, default=5, help="every Nth registrant retries with the same key")
+    parser.add_argument("--duplicate-every", type=int, default=7, help="every Nth registrant submits twice")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    sys.exit(asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
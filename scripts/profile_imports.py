@@ -0,0 +1,118 @@
+"""Import-time profile of the API.
+
+Runs ``python -X importtime -c "import app.main"`` in a fresh interpreter and
+reports total import time and the slowest modules. Also fails when a heavy SDK
+that should only load on first use (see app/core/service_registry.py) is
+imported at startup, so the lazy-loading does not silently regress.
+
+Usage:
+    python scripts/profile_imports.py
+    python scripts/profile_imports.py --top 30 --max-seconds 4 --json importtime.json
+
+Exit code is 1 when a deferred module is imported eagerly or the total
+exceeds --max-seconds.
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Must not be imported by `import app.main`
+DEFERRED_MODULES = (
+    "openai",
+    "azure.ai.documentintelligence",
+    "azure.storage.blob",
+    "reportlab",
+    "weasyprint",
+    "langchain_core",
+    "langchain_openai",
+    "langgraph",
+    "cloudinary",
+)
+
+LINE_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def run_importtime(target: str) -> str:
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", "sqlite:///:memory:")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=str(PROJECT_ROOT),
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr[-4000:])
+        raise SystemExit(f"import {target} failed")
+    return result.stderr
+
+
+def parse(output: str) -> list:
+    rows = []
+    for line in output.splitlines():
+        match = LINE_RE.match(line)
+        if match:
+            rows.append({
+                "module": match.group(4),
+                "self_us": int(match.group(1)),
+                "cumulative_us": int(match.group(2)),
+                "depth": len(match.group(3)) // 2,
+            })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", default="app.main")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--max-seconds", type=float, default=None, help="fail when total import time exceeds this")
+    parser.add_argument("--json", dest="json_path", help="write the full report to this file")
+    args = parser.parse_args()
+
+    rows = parse(run_importtime(args.target))
+    target_row = next((row for row in rows if row["module"] == args.target), None)
+    total = (target_row["cumulative_us"] if target_row else sum(row["self_us"] for row in rows)) / 1e6
+
+    app_modules = sorted(
+        (row for row in rows if row["module"].startswith("app.")),
+        key=lambda row: row["cumulative_us"], reverse=True
+    )
+    packages = {}
+    for row in rows:
+        if "." not in row["module"] and not row["module"].startswith("app"):
+            packages[row["module"]] = max(packages.get(row["module"], 0), row["cumulative_us"])
+    imported = {row["module"] for row in rows}
+    eager = [module for module in DEFERRED_MODULES if module in imported]
+
+    print(f"Total import time for {args.target}: {total:.3f}s ({len(rows)} modules)")
+    print("\nSlowest app modules (cumulative):")
+    for row in app_modules[:args.top]:
+        print(f"  {row['cumulative_us'] / 1e6:8.3f}s  {row['module']}")
+    print("\nSlowest third-party packages (cumulative):")
+    for name, cumulative in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {cumulative / 1e6:8.3f}s  {name}")
+    print(f"\nDeferred modules imported at startup: {eager or 'none'}")
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps({
+            "target": args.target,
+            "total_seconds": round(total, 4),
+            "module_count": len(rows),
+            "eager_deferred_modules": eager,
+            "app_modules": app_modules[:args.top],
+            "packages": dict(sorted(packages.items(), key=lambda item: item[1], reverse=True)[:args.top]),
+        }, indent=2))
+
+    failed = bool(eager) or (args.max_seconds is not None and total > args.max_seconds)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Concurrent scan test for voucher redemption.
+
+Simulates several scanners redeeming the same participant's voucher at the
+same moment (double taps, two stations scanning one badge) and checks the
+participant's balance afterwards.
+
+Usage:
+    python scripts/stress_voucher_redemptions.py --allocation-id 12 \
+        --participant-id 345 --participant-email jane@example.org \
+        --base-url http://localhost:8000 --attempts 50
+
+    # Also replay one QR token from the mobile app 20 times at once
+    python scripts/stress_voucher_redemptions.py ... --qr-token <token> --replays 20
+
+Expected outcome: for allocations that can't be over-redeemed, exactly
+min(attempts, remaining) scans succeed and the rest get a 400; drinks accept
+every scan. The redeemed total moves by exactly the number of successes, and
+a replayed QR token is redeemed once.
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from collections import Counter
+
+import httpx
+
+
+async def get_voucher(client: httpx.AsyncClient, base_url: str, participant_id: int, allocation_id: int) -> dict:
+    response = await client.get(f"{base_url}/api/v1/allocations/participant/{participant_id}/vouchers")
+    response.raise_for_status()
+    for allocation in response.json()["allocations"]:
+        if allocation["id"] == allocation_id:
+            return allocation
+    raise SystemExit(f"Allocation {allocation_id} is not a voucher allocation of participant {participant_id}")
+
+
+async def burst(client: httpx.AsyncClient, url: str, payloads: list, latencies: list) -> Counter:
+    statuses: Counter = Counter()
+
+    async def scan(payload: dict):
+        start = time.perf_counter()
+        try:
+            response = await client.post(url, json=payload)
+            statuses[response.status_code] += 1
+        except httpx.HTTPError as e:
+            statuses[type(e).__name__] += 1
+        latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*[scan(payload) for payload in payloads])
+    return statuses
+
+
+async def run(args) -> int:
+    base_url = args.base_url.rstrip("/")
+    url = f"{base_url}/api/v1/mobile-allocations/participant/voucher-redemption/complete"
+    latencies: list = []
+    violations = []
+
+    async with httpx.AsyncClient(timeout=args.timeout) as client:
+        before = await get_voucher(client, base_url, args.participant_id, args.allocation_id)
+        print(f"{before['voucher_type']}: {before['redeemed_quantity']} redeemed, "
+              f"{before['remaining_quantity']} remaining of {before['total_quantity']}")
+
+        payload = {
+            "allocation_id": args.allocation_id,
+            "quantity": 1,
+            "participant_email": args.participant_email,
+            "scanner_email": args.scanner_email,
+        }
+        started = time.perf_counter()
+        statuses = await burst(client, url, [payload] * args.attempts, latencies)
+        elapsed = time.perf_counter() - started
+
+        after = await get_voucher(client, base_url, args.participant_id, args.allocation_id)
+        successes = statuses[200]
+        if before["allows_over_redemption"]:
+            expected = args.attempts
+        else:
+            expected = min(args.attempts, max(0, before["remaining_quantity"]))
+        if successes != expected:
+            violations.append(f"{successes} scans succeeded, expected {expected}")
+        if statuses[400] != args.attempts - expected:
+            violations.append(f"{statuses[400]} scans rejected, expected {args.attempts - expected}")
+        # The raw total is not clamped below zero the way redeemed_quantity is
+        redeemed_before = before["total_quantity"] - before["remaining_quantity"]
+        redeemed_after = after["total_quantity"] - after["remaining_quantity"]
+        if redeemed_after - redeemed_before != successes:
+            violations.append(f"balance moved by {redeemed_after - redeemed_before}, {successes} scans succeeded")
+        if not before["allows_over_redemption"] and after["remaining_quantity"] < 0:
+            violations.append(f"balance went negative: {after['remaining_quantity']}")
+
+        print(f"Scans: {args.attempts} in {elapsed:.2f}s, status codes: {dict(statuses)}")
+        print(f"After: {after['redeemed_quantity']} redeemed, {after['remaining_quantity']} remaining")
+
+        if args.qr_token:
+            replay_statuses = await burst(client, url, [{
+                "qr_token": args.qr_token,
+                "scanner_email": args.scanner_email,
+            }] * args.replays, latencies)
+            print(f"QR token replays: {args.replays}, status codes: {dict(replay_statuses)}")
+            if replay_statuses[200] != 1:
+                violations.append(f"QR token redeemed {replay_statuses[200]} times, expected once")
+
+    latencies.sort()
+    if latencies:
+        print(f"Latency p50={statistics.median(latencies) * 1000:.0f}ms "
+              f"p95={latencies[int(len(latencies) * 0.95) - 1] * 1000:.0f}ms "
+              f"max={latencies[-1] * 1000:.0f}ms")
+
+    for violation in violations:
+        print(f"VIOLATION: {violation}")
+    return 1 if violations else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--allocation-id", type=int, required=True)
+    parser.add_argument("--participant-id", type=int, required=True)
+    parser.add_argument("--participant-email", required=True)
+    parser.add_argument("--scanner-email", default="stress-scanner@example.org")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--attempts", type=int, default=50, help="concurrent single-voucher scans")
+    parser.add_argument("--qr-token", help="pending redemption token to replay concurrently")
+    parser.add_argument("--replays", type=int, default=20)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    sys.exit(asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()